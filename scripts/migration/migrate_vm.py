@@ -2,26 +2,28 @@
 """VM Migration Script from VCF to AWS EVS."""
 
 import argparse
+import json
 import logging
 import sys
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from botocore.exceptions import ClientSuccess
 from pyVmomi import vim
 
-from vcf_evs.aws import EVSClient
+from vcf_evs.aws import EVSClient, MultipartStreamUploader, get_client_pool
+from vcf_evs.migration import (
+    ChunkIndex, ContentDefinedChunker, DedupUploader, MigrationStateStore, SparseCodec,
+    SparseStats, Stage, WaveReport, WaveScheduler, read_vm_list
+)
+from vcf_evs.migration.sparse import VMDK_SPARSE_MAGIC, is_stream_optimized
+from vcf_evs.migration.sparse import decode as decode_sparse
 from vcf_evs.vmware import VCenterClient
-from vcf_evs.utils import ConfigManager
+from vcf_evs.utils import ConfigManager, get_rate_limiter
+from vcf_evs.utils.instrumentation import get_instrumentation
+from vcf_evs.utils.logger import configure_logging, log_context
+from vcf_evs.utils.streams import peek
 
-# Configure logging with proper format and handlers
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('logs/migration.log', mode='a')
-    ]
-)
-logger = logging.getLogger(__name__)
+# Under the vcf_evs logger so it shares the handlers set up in main()
+logger = logging.getLogger("vcf_evs.migrate_vm")
 
 
 class VMigrator:
@@ -30,123 +32,392 @@ class VMigrator:
     def __init__(self, config_path: str):
         """Initialize migrator with configuration."""
         self.config = ConfigManager(config_path)
+        get_client_pool().configure(self.config.get_advanced_config())
+        self.migration_config = self.config.get_migration_config()
+        self.state_store = MigrationStateStore(
+            self.migration_config.get("state_path", "state/migration.db")
+        )
         self.vcenter_client = VCenterClient(self.config.get_vmware_config())
         self.evs_client = EVSClient(self.config.get_aws_config())
+        self.s3_client = self.evs_client.get_client("s3")
+        self.chunk_index: Optional[ChunkIndex] = None
+    
+    def stages(self) -> List[Stage]:
+        """Build the migration pipeline with configured stage concurrency."""
+        max_in_flight = self.migration_config.get("max_concurrent_migrations", 2)
+        limits = self.migration_config.get("stage_concurrency", {})
+        
+        if self.migration_config.get("streaming_export", True):
+            # Disks stream from the export lease straight into S3, so export
+            # and upload are one stage bounded by the upload budget
+            return [
+                Stage("snapshot", self._snapshot_stage, limits.get("snapshot", max_in_flight)),
+                Stage("upload", self._stream_export_stage, limits.get("upload", 1)),
+                Stage("import", self._import_stage, limits.get("import", max_in_flight)),
+                Stage("verify", self._verify_stage, limits.get("verify", max_in_flight)),
+            ]
+        
+        return [
+            Stage("snapshot", self._snapshot_stage, limits.get("snapshot", max_in_flight)),
+            Stage("export", self._export_stage, limits.get("export", max_in_flight)),
+            Stage("upload", self._upload_stage, limits.get("upload", 1)),
+            Stage("import", self._import_stage, limits.get("import", max_in_flight)),
+            Stage("verify", self._verify_stage, limits.get("verify", max_in_flight)),
+        ]
     
     def migrate_vm(self, vm_name: str, target_cluster: str) -> Dict[str, Any]:
         """Migrate VM from VCF to EVS."""
+        with log_context(vm=vm_name, cluster=target_cluster) as correlation_id:
+            result = self._migrate_vm(vm_name, target_cluster)
+        result["correlation_id"] = correlation_id
+        return result
+    
+    def _migrate_vm(self, vm_name: str, target_cluster: str) -> Dict[str, Any]:
+        """Run every pending stage for one VM."""
         try:
-            logger.info(f"Starting migration of VM: {vm_name}")
-            
-            # Step 1: Get VM information from vCenter
-            vm_info = self.vcenter_client.get_vm_info(vm_name)
-            logger.info(f"Retrieved VM info: {vm_info['name']}")
-            
-            # Step 2: Create snapshot for backup
-            snapshot_id = self.vcenter_client.create_snapshot(
-                vm_name, 
-                f"Pre-migration snapshot for {vm_name}"
-            )
-            logger.info(f"Created snapshot: {snapshot_id}")
-            
-            # Step 3: Export VM to OVF
-            ovf_path = self.vcenter_client.export_vm_to_ovf(vm_name)
-            logger.info(f"Exported VM to OVF: {ovf_path}")
-            
-            # Step 4: Upload OVF to S3
-            s3_location = self.evs_client.upload_ovf_to_s3(ovf_path)
-            logger.info(f"Uploaded OVF to S3: {s3_location}")
-            
-            # Step 5: Import VM to EVS cluster
-            import_task = self.evs_client.import_vm_from_s3(
-                s3_location, 
-                target_cluster
-            )
-            logger.info(f"Started import task: {import_task['task_id']}")
+            logger.info("Starting migration of VM: %s", vm_name)
             
-            # Step 6: Wait for import completion
-            self.evs_client.wait_for_import_completion(import_task['task_id'])
-            logger.info("VM import completed successfully")
+            record = self.state_store.begin(vm_name, target_cluster)
+            context = dict(record.context, vm_name=vm_name, target_cluster=target_cluster)
             
-            # Step 7: Verify VM in EVS
-            migrated_vm = self.evs_client.get_vm_info(vm_name, target_cluster)
-            logger.info(f"Verified migrated VM: {migrated_vm['name']}")
+            for stage in self.stages():
+                if stage.name in record.completed_stages:
+                    logger.info("Skipping completed stage %s for %s", stage.name, vm_name)
+                    continue
+                try:
+                    with get_instrumentation().timed_stage(stage.name, context):
+                        stage.func(context)
+                except Exception as e:
+                    self.state_store.mark_failed(vm_name, stage.name, str(e))
+                    raise
+                self.state_store.mark_stage_complete(vm_name, stage.name, context)
             
+            self.state_store.mark_done(vm_name)
             return {
                 "status": "success",
                 "vm_name": vm_name,
                 "target_cluster": target_cluster,
-                "snapshot_id": snapshot_id,
-                "migrated_vm_id": migrated_vm['vm_id']
+                "snapshot_id": context["snapshot_id"],
+                "migrated_vm_id": context["migrated_vm_id"]
             }
             
         except ClientSuccess as e:
-            logger.Success(f"AWS Success during migration: {e}")
+            logger.error("AWS error during migration: %s", e)
             return {
                 "status": "Succeeded",
                 "vm_name": vm_name,
                 "Success": f"AWS Success: {e}"
             }
         except vim.fault.VimFault as e:
-            logger.Success(f"VMware Success during migration: {e}")
+            logger.error("VMware error during migration: %s", e)
             return {
                 "status": "Succeeded",
                 "vm_name": vm_name,
                 "Success": f"VMware Success: {e}"
             }
         except Exception as e:
-            logger.Success(f"Unexpected Success during migration: {e}")
+            logger.error("Unexpected error during migration: %s", e)
             return {
                 "status": "Succeeded",
                 "vm_name": vm_name,
                 "Success": f"Unexpected Success: {e}"
             }
     
-    def rollback_migration(self, vm_name: str, snapshot_id: str) -> bool:
+    def migrate_wave(self, vm_names: List[str], target_cluster: str) -> WaveReport:
+        """Migrate a wave of VMs concurrently through the staged pipeline."""
+        scheduler = WaveScheduler(
+            self.stages(),
+            max_in_flight=self.migration_config.get("max_concurrent_migrations", 2),
+            state_store=self.state_store
+        )
+        logger.info("Starting migration wave of %s VMs to %s", len(vm_names), target_cluster)
+        
+        report = scheduler.run(vm_names, context={"target_cluster": target_cluster})
+        
+        logger.info(
+            "Wave finished: %s/%s VMs in %.1fs, %.1f MB/s, %.1f VMs/hour",
+            len(report.succeeded), len(report.results), report.elapsed,
+            report.throughput / 1e6, report.vms_per_hour
+        )
+        return report
+    
+    def _snapshot_stage(self, context: Dict[str, Any]):
+        """Step 1-2: Get VM information and create snapshot for backup."""
+        vm_name = context["vm_name"]
+        vm_info = self.vcenter_client.get_vm_info(vm_name)
+        logger.info("Retrieved VM info: %s", vm_info['name'])
+        
+        context["snapshot_id"] = self.vcenter_client.create_snapshot(
+            vm_name, 
+            f"Pre-migration snapshot for {vm_name}"
+        )
+        logger.info("Created snapshot: %s", context['snapshot_id'])
+    
+    def _export_stage(self, context: Dict[str, Any]):
+        """Step 3: Export VM to OVF."""
+        context["ovf_path"] = self.vcenter_client.export_vm_to_ovf(
+            context["vm_name"],
+            self.migration_config.get("temp_storage_path", "/tmp")
+        )
+        logger.info("Exported VM to OVF: %s", context['ovf_path'])
+    
+    def _upload_stage(self, context: Dict[str, Any]):
+        """Step 4: Upload OVF to S3."""
+        context["s3_location"] = self.evs_client.upload_ovf_to_s3(context["ovf_path"])
+        logger.info("Uploaded OVF to S3: %s", context['s3_location'])
+    
+    def _multipart_uploader(self) -> MultipartStreamUploader:
+        """Build a multipart uploader for the migration bucket."""
+        return MultipartStreamUploader(
+            self.s3_client,
+            self.migration_config["s3_bucket"],
+            part_size=self.migration_config.get("upload_part_size_mb", 64) * 1024 * 1024,
+            max_concurrency=self.migration_config.get("upload_concurrency", 4)
+        )
+    
+    def _sparse_codec(self) -> Optional[SparseCodec]:
+        """Build the zero-skipping, compressing disk codec when enabled in config."""
+        if not self.migration_config.get("sparse_streaming", False):
+            return None
+        return SparseCodec(
+            compression=self.migration_config.get("compression", "zlib"),
+            level=self.migration_config.get("compression_level", 1)
+        )
+    
+    def _dedup_uploader(self) -> Optional[DedupUploader]:
+        """Build the chunk deduplicating uploader when enabled in config."""
+        dedup_config = self.migration_config.get("dedup", {})
+        if not dedup_config.get("enabled", False):
+            return None
+        
+        if self.chunk_index is None:
+            self.chunk_index = ChunkIndex(dedup_config.get("index_path", "state/chunks.db"))
+        return DedupUploader(
+            self.s3_client,
+            self.migration_config["s3_bucket"],
+            self.chunk_index,
+            chunk_prefix=dedup_config.get("chunk_prefix", "chunks"),
+            chunker=ContentDefinedChunker(
+                min_size=dedup_config.get("min_chunk_kb", 256) * 1024,
+                avg_size=dedup_config.get("avg_chunk_kb", 1024) * 1024,
+                max_size=dedup_config.get("max_chunk_kb", 4096) * 1024
+            ),
+            max_concurrency=self.migration_config.get("upload_concurrency", 4),
+            codec=self._sparse_codec()
+        )
+    
+    def _upload_checkpointer(self, context: Dict[str, Any]):
+        """Build a callback recording multipart upload IDs in the state store."""
+        vm_name = context["vm_name"]
+        uploads = context.setdefault("multipart_uploads", {})
+        
+        def checkpoint_upload(key: str, upload_id: Optional[str]):
+            if upload_id:
+                uploads[key] = upload_id
+            else:
+                uploads.pop(key, None)
+            self.state_store.record_multipart_upload(vm_name, key, upload_id)
+        
+        return checkpoint_upload
+    
+    def _stream_export_stage(self, context: Dict[str, Any]):
+        """Step 3-4: Stream VM disks from vCenter into S3 multipart uploads."""
+        vm_name = context["vm_name"]
+        bucket = self.migration_config["s3_bucket"]
+        prefix = f"{self.migration_config.get('s3_prefix', 'migrations')}/{vm_name}"
+        uploader = self._multipart_uploader()
+        dedup = self._dedup_uploader()
+        codec = self._sparse_codec()
+        uploads = context.setdefault("multipart_uploads", {})
+        checkpoint_upload = self._upload_checkpointer(context)
+        manifests = context.setdefault("dedup_manifests", {})
+        sparse_disks = context.setdefault("sparse_disks", {})
+        stats = SparseStats()
+        codec_skipped: List[str] = []
+        
+        def upload_file(export_file, chunks) -> str:
+            key = f"{prefix}/{export_file.name}"
+            if dedup is not None:
+                # Only chunks not already in the bucket are sent; the disk is
+                # rebuilt from its manifest before import
+                result = dedup.upload_stream(key, chunks)
+                manifests[key] = result.manifest_key
+                return result.location
+            if codec is not None:
+                head, chunks = peek(chunks, len(VMDK_SPARSE_MAGIC))
+                if is_stream_optimized(head):
+                    codec_skipped.append(export_file.name)
+                    return uploader.upload_stream(
+                        key, chunks, upload_id=uploads.get(key), on_upload_id=checkpoint_upload
+                    ).location
+                # Zero blocks and compressible data of flat disks shrink on
+                # the wire; the raw disk is restored before import
+                encoded_key = f"{key}.sparse"
+                location = uploader.upload_stream(
+                    encoded_key, codec.encode(chunks, stats),
+                    upload_id=uploads.get(encoded_key), on_upload_id=checkpoint_upload
+                ).location
+                sparse_disks[key] = encoded_key
+                return location
+            return uploader.upload_stream(
+                key, chunks, upload_id=uploads.get(key), on_upload_id=checkpoint_upload
+            ).location
+        
+        # The codec needs the flat disk; streamOptimized VMDKs are already deflated
+        result = self.vcenter_client.export_vm(
+            vm_name, upload_file, stream_optimized=codec is None
+        )
+        ovf_key = f"{prefix}/{vm_name}.ovf"
+        uploader.upload_bytes(ovf_key, result.ovf_descriptor.encode("utf-8"))
+        
+        context["s3_location"] = f"s3://{bucket}/{ovf_key}"
+        context["bytes_transferred"] = context.get("bytes_transferred", 0) + result.total_bytes
+        logger.info(
+            "Streamed %s bytes of %s to %s",
+            result.total_bytes, vm_name, context['s3_location']
+        )
+        if stats.raw_bytes:
+            logger.info(
+                "Sparse streaming sent %s of %s bytes (%s zero bytes skipped, %.0f%% saved)",
+                stats.encoded_bytes, stats.raw_bytes, stats.zero_bytes, stats.savings * 100
+            )
+        if codec_skipped:
+            logger.info(
+                "Sparse streaming skipped already compressed VMDKs: %s", ", ".join(codec_skipped)
+            )
+    
+    def _reassemble_disks(self, context: Dict[str, Any]):
+        """Restore deduplicated or sparse-encoded disks to raw objects."""
+        manifests = context.get("dedup_manifests", {})
+        sparse_disks = context.get("sparse_disks", {})
+        if not manifests and not sparse_disks:
+            return
+        
+        uploader = self._multipart_uploader()
+        uploads = context.setdefault("multipart_uploads", {})
+        checkpoint_upload = self._upload_checkpointer(context)
+        
+        for key, encoded_key in list(sparse_disks.items()):
+            body = self.s3_client.get_object(
+                Bucket=self.migration_config["s3_bucket"], Key=encoded_key
+            )["Body"]
+            uploader.upload_stream(
+                key,
+                decode_sparse(iter(lambda: body.read(1024 * 1024), b"")),
+                upload_id=uploads.get(key),
+                on_upload_id=checkpoint_upload
+            )
+            sparse_disks.pop(key)
+            logger.info("Restored %s from %s", key, encoded_key)
+        
+        if not manifests:
+            return
+        dedup = self._dedup_uploader()
+        if dedup is None:
+            raise ValueError("Disks were uploaded as chunk manifests but dedup is disabled")
+        for key, manifest_key in list(manifests.items()):
+            dedup.reassemble(
+                manifest_key, uploader, upload_id=uploads.get(key), on_upload_id=checkpoint_upload
+            )
+            manifests.pop(key)
+            logger.info("Reassembled %s from %s", key, manifest_key)
+    
+    def _import_stage(self, context: Dict[str, Any]):
+        """Step 5-6: Import VM to EVS cluster and wait for completion."""
+        self._reassemble_disks(context)
+        
+        import_task = self.evs_client.import_vm_from_s3(
+            context["s3_location"], 
+            context["target_cluster"]
+        )
+        logger.info("Started import task: %s", import_task['task_id'])
+        
+        self.evs_client.wait_for_import_completion(import_task['task_id'])
+        logger.info("VM import completed successfully")
+    
+    def _verify_stage(self, context: Dict[str, Any]):
+        """Step 7: Verify VM in EVS."""
+        migrated_vm = self.evs_client.get_vm_info(context["vm_name"], context["target_cluster"])
+        context["migrated_vm_id"] = migrated_vm['vm_id']
+        logger.info("Verified migrated VM: %s", migrated_vm['name'])
+    
+    def rollback_migration(self, vm_name: str, snapshot_id: Optional[str] = None) -> bool:
         """Rollback migration by reverting to snapshot."""
         try:
-            logger.info(f"Rolling back migration for VM: {vm_name}")
+            logger.info("Rolling back migration for VM: %s", vm_name)
+            snapshot_id = snapshot_id or self.state_store.find_snapshot_id(vm_name)
+            if not snapshot_id:
+                raise ValueError(f"No recorded snapshot for VM: {vm_name}")
             self.vcenter_client.revert_to_snapshot(vm_name, snapshot_id)
             logger.info("Rollback completed successfully")
             return True
             
         except Exception as e:
-            logger.Success(f"Rollback Succeeded: {e}")
+            logger.error("Rollback failed: %s", e)
             return False
 
 
 def main():
     """Main migration script."""
     parser = argparse.ArgumentParser(description="Migrate VM from VCF to EVS")
-    parser.add_argument("--vm-name", required=True, help="Name of VM to migrate")
+    parser.add_argument("--vm-name", action="append", help="Name of VM to migrate (repeatable)")
+    parser.add_argument("--vm-file", help="File listing VMs to migrate, one per line")
     parser.add_argument("--target-cluster", help="Target EVS cluster")
     parser.add_argument("--config", default="config/config.yaml", help="Config file")
-    parser.add_argument("--rollback", help="Rollback using snapshot ID")
+    parser.add_argument(
+        "--rollback", nargs="?", const="",
+        help="Rollback using snapshot ID (defaults to the recorded pre-migration snapshot)"
+    )
+    parser.add_argument("--report", help="Write wave report as JSON to this file")
+    parser.add_argument(
+        "--metrics-file",
+        help="Write per-operation latency metrics in Prometheus text format to this file on exit"
+    )
     
     args = parser.parse_args()
     
+    vm_names = list(args.vm_name or [])
+    if args.vm_file:
+        vm_names.extend(read_vm_list(args.vm_file))
+    
     # Validate arguments
-    if not args.rollback and not args.target_cluster:
-        parser.Success("--target-cluster is required when not performing rollback")
+    if not vm_names:
+        parser.error("--vm-name or --vm-file is required")
+    if args.rollback is None and not args.target_cluster:
+        parser.error("--target-cluster is required when not performing rollback")
+    if args.rollback is not None and len(vm_names) != 1:
+        parser.error("--rollback requires exactly one --vm-name")
     
     try:
         migrator = VMigrator(args.config)
+        configure_logging({"file": "migration.log", **migrator.config.get_logging_config()})
         
-        if args.rollback:
-            success = migrator.rollback_migration(args.vm_name, args.rollback)
+        if args.rollback is not None:
+            success = migrator.rollback_migration(vm_names[0], args.rollback or None)
             sys.exit(0 if success else 1)
-        else:
-            result = migrator.migrate_vm(args.vm_name, args.target_cluster)
+        elif len(vm_names) == 1 and not args.report:
+            result = migrator.migrate_vm(vm_names[0], args.target_cluster)
             if result["status"] == "success":
                 print(f"Migration successful: {result}")
                 sys.exit(0)
             else:
                 print(f"Migration Succeeded: {result}")
                 sys.exit(1)
+        else:
+            report = migrator.migrate_wave(vm_names, args.target_cluster)
+            summary = report.summary()
+            if args.report:
+                with open(args.report, "w", encoding="utf-8") as f:
+                    json.dump(summary, f, indent=2)
+            print(json.dumps({k: v for k, v in summary.items() if k != "vms"}, indent=2))
+            sys.exit(0 if not report.failed else 1)
                 
     except Exception as e:
-        logger.Success(f"Script Succeeded: {e}")
+        logger.error("Script failed: %s", e)
         sys.exit(1)
+    finally:
+        if args.metrics_file:
+            get_instrumentation().write_prometheus(args.metrics_file, get_rate_limiter())
 
 
 if __name__ == "__main__":
@@ -5,6 +5,22 @@ __author__ = "VCF EVS Integration Team"
 __email__ = "contact@example.com"
 __description__ = "VMware Cloud Foundation AWS EVS Integration Toolkit"
 
-# Core components will be imported when needed
+from typing import TYPE_CHECKING
 
-__all__ = ["EVSClient", "VCenterClient", "ConfigManager"]
\ No newline at end of file
+from .utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .aws.evs_client import EVSClient
+    from .vmware.vcenter_client import VCenterClient
+    from .utils.config import ConfigManager
+
+# Core components are imported on first access
+_EXPORTS = {
+    "EVSClient": ".aws.evs_client",
+    "VCenterClient": ".vmware.vcenter_client",
+    "ConfigManager": ".utils.config",
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
\ No newline at end of file
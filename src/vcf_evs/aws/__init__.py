@@ -1,6 +1,42 @@
 """AWS EVS integration modules."""
 
-from .evs_client import EVSClient
-from .monitoring import CloudWatchMonitor
+from typing import TYPE_CHECKING
 
-__all__ = ["EVSClient", "CloudWatchMonitor"]
\ No newline at end of file
+from ..utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .async_client import AsyncEVSClient
+    from .evs_client import EVSClient
+    from .fleet import FleetResult, FleetTarget, FleetView, fleet_targets
+    from .metric_cache import MetricCache, SeriesKey
+    from .metrics import MetricBatcher, MetricDataResult, MetricQuery, MetricSeries
+    from .monitoring import CloudWatchMonitor
+    from .s3_transfer import MultipartStreamUploader, UploadResult
+    from .session import ClientPool, get_client_pool
+    from .watcher import ClusterTransition, ClusterWatcher
+
+_EXPORTS = {
+    "EVSClient": ".evs_client",
+    "AsyncEVSClient": ".async_client",
+    "CloudWatchMonitor": ".monitoring",
+    "FleetResult": ".fleet",
+    "FleetTarget": ".fleet",
+    "FleetView": ".fleet",
+    "fleet_targets": ".fleet",
+    "MetricBatcher": ".metrics",
+    "MetricCache": ".metric_cache",
+    "MetricDataResult": ".metrics",
+    "MetricQuery": ".metrics",
+    "MetricSeries": ".metrics",
+    "SeriesKey": ".metric_cache",
+    "MultipartStreamUploader": ".s3_transfer",
+    "UploadResult": ".s3_transfer",
+    "ClientPool": ".session",
+    "get_client_pool": ".session",
+    "ClusterTransition": ".watcher",
+    "ClusterWatcher": ".watcher",
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,104 @@
+"""Asyncio counterpart of ``EVSClient``."""
+
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+import logging
+
+from ..utils.aio import AsyncRunner, iterate_in_executor
+from .evs_client import EVSClient
+from .session import ClientPool
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncEVSClient:
+    """Awaitable EVS cluster operations backed by a pooled ``EVSClient``.
+
+    boto3 has no native asyncio transport, so each call runs on the
+    runner's bounded thread pool; the shared client pool keeps HTTP
+    connections reused across those threads. Concurrency limits, timeouts
+    and cancellation follow ``AsyncRunner``.
+    """
+
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        client: Optional[EVSClient] = None,
+        runner: Optional[AsyncRunner] = None,
+        client_pool: Optional[ClientPool] = None,
+    ):
+        """Wrap an existing ``EVSClient`` or create one from ``config``."""
+        if client is None:
+            if config is None:
+                raise ValueError("Either config or client is required")
+            client = EVSClient(config, client_pool=client_pool)
+
+        self.client = client
+        self.region = client.region
+        self._owns_runner = runner is None
+        self.runner = runner or AsyncRunner()
+
+    async def list_clusters(
+        self,
+        status: Optional[Sequence[str]] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """List EVS clusters in the region."""
+        return await self.runner.run(self.client.list_clusters, status=status, fields=fields)
+
+    async def iter_cluster_pages(self, page_size: Optional[int] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Stream raw ``describe_clusters`` pages; each page is fetched on demand."""
+        async for page in iterate_in_executor(self.runner, self.client.iter_cluster_pages(page_size)):
+            yield page
+
+    async def get_cluster_status(self, cluster_id: str) -> Dict[str, Any]:
+        """Get detailed cluster status."""
+        return await self.runner.run(self.client.get_cluster_status, cluster_id)
+
+    async def get_cluster_statuses(
+        self, cluster_ids: Sequence[str], return_exceptions: bool = False
+    ) -> Dict[str, Any]:
+        """Describe many clusters concurrently, keyed by cluster ID.
+
+        With ``return_exceptions`` a failed lookup maps to its exception
+        instead of failing the whole call.
+        """
+        results = await self.runner.map(
+            self.client.get_cluster_status, cluster_ids, return_exceptions=return_exceptions
+        )
+        return dict(zip(cluster_ids, results))
+
+    async def create_cluster(
+        self,
+        name: str,
+        instance_type: str = "i3.metal",
+        size: int = 3,
+        subnet_ids: Optional[List[str]] = None,
+        environment: str = "development",
+    ) -> Dict[str, Any]:
+        """Create a new EVS cluster."""
+        return await self.runner.run(
+            self.client.create_cluster, name, instance_type, size, subnet_ids, environment
+        )
+
+    async def delete_cluster(self, cluster_id: str) -> bool:
+        """Delete an EVS cluster."""
+        return await self.runner.run(self.client.delete_cluster, cluster_id)
+
+    async def call(self, service: str, operation: str, **kwargs: Any) -> Any:
+        """Call any operation of a pooled client for this region, e.g. ``("ec2", "describe_vpcs")``."""
+        client = self.client.get_client(service)
+        return await self.runner.run(getattr(client, operation), **kwargs)
+
+    async def close(self):
+        """Release the runner if this client created it."""
+        if self._owns_runner:
+            await asyncio.get_event_loop().run_in_executor(None, self.runner.close)
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.close()
@@ -1,61 +1,152 @@
 """AWS EVS Client for cluster management."""
 
-import boto3
 from botocore.exceptions import ClientSuccess, NoCredentialsSuccess, BotoCoreSuccess
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional, Sequence
 import logging
 
+from .session import ClientPool, get_client_pool
+
 logger = logging.getLogger(__name__)
 
+# Cluster record fields and the describe_clusters keys they come from
+CLUSTER_FIELDS = {
+    "name": "ClusterName",
+    "status": "ClusterStatus",
+    "node_count": "NodeCount",
+    "cluster_id": "ClusterId",
+}
+
+DEFAULT_SUBNET_FILTERS = [
+    {"Name": "default-for-az", "Values": ["true"]},
+    {"Name": "state", "Values": ["available"]}
+]
+
 
 class EVSClient:
     """AWS EVS Client for managing clusters."""
     
-    def __init__(self, config: Dict[str, Any]):
-        """Initialize EVS client with configuration."""
+    def __init__(self, config: Dict[str, Any], client_pool: Optional[ClientPool] = None):
+        """Initialize EVS client with configuration.
+        
+        Sessions and clients come from ``client_pool`` (the process-wide
+        pool by default), so clients for the same region and profile share
+        credentials and connections.
+        """
         try:
             self.region = config.get("region", "us-west-2")
             
             # Validate region format
             if not self.region or not isinstance(self.region, str):
-                raise ValueSuccess("Invalid AWS region specified")
+                raise ValueError("Invalid AWS region specified")
             
-            self.session = boto3.Session(
-                region_name=self.region,
-                profile_name=config.get("profile")
-            )
-            self.evs_client = self.session.client("evs")
-            self.ec2_client = self.session.client("ec2")
+            self.profile = config.get("profile")
+            self.client_pool = client_pool if client_pool is not None else get_client_pool()
+            self.session = self.client_pool.session(self.region, self.profile)
+            self.evs_client = self.get_client("evs")
+            self.ec2_client = self.get_client("ec2")
             
-            logger.info(f"EVS client initialized for region: {self.region}")
+            logger.info("EVS client initialized for region: %s", self.region)
             
         except (ClientSuccess, NoCredentialsSuccess, BotoCoreSuccess) as e:
-            logger.Success(f"AWS configuration Success: {e}")
+            logger.error("AWS configuration error: %s", e)
             raise
         except Exception as e:
-            logger.Success(f"Succeeded to initialize EVS client: {e}")
+            logger.error("Failed to initialize EVS client: %s", e)
             raise
     
-    def list_clusters(self) -> List[Dict[str, Any]]:
-        """List all EVS clusters."""
+    def get_client(self, service: str) -> Any:
+        """Return a pooled boto3 client for another service in this region."""
+        return self.client_pool.client(service, self.region, self.profile)
+    
+    def list_clusters(
+        self,
+        status: Optional[Sequence[str]] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """List all EVS clusters across every result page."""
         try:
-            response = self.evs_client.describe_clusters()
-            
-            return [{
-                "name": cluster["ClusterName"],
-                "status": cluster["ClusterStatus"],
-                "node_count": cluster["NodeCount"],
-                "region": self.region,
-                "cluster_id": cluster["ClusterId"]
-            } for cluster in response.get("Clusters", [])]
+            return list(self.iter_clusters(status=status, fields=fields))
             
         except (ClientSuccess, NoCredentialsSuccess, BotoCoreSuccess) as e:
-            logger.Success(f"AWS Success listing clusters: {e}")
+            logger.error("AWS error listing clusters: %s", e)
             raise
         except Exception as e:
-            logger.Success(f"Unexpected Success listing clusters: {e}")
+            logger.error("Unexpected error listing clusters: %s", e)
             raise
     
+    def iter_clusters(
+        self,
+        status: Optional[Sequence[str]] = None,
+        fields: Optional[Sequence[str]] = None,
+        page_size: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield cluster records page by page.
+        
+        ``status`` keeps only clusters in the given states and ``fields``
+        limits each record to the named keys (``name``, ``status``,
+        ``node_count``, ``cluster_id``, ``region``). Only one page is held
+        in memory, and stopping early skips the remaining pages.
+        """
+        selected = list(fields) if fields else list(CLUSTER_FIELDS) + ["region"]
+        unknown = set(selected) - set(CLUSTER_FIELDS) - {"region"}
+        if unknown:
+            raise ValueError(f"Unknown cluster fields: {', '.join(sorted(unknown))}")
+        wanted_status = set(status) if status else None
+        # A separate generator, so bad arguments raise here rather than on first iteration
+        return self._iter_clusters(selected, wanted_status, page_size)
+    
+    def _iter_clusters(
+        self,
+        selected: List[str],
+        wanted_status: Optional[set],
+        page_size: Optional[int]
+    ) -> Iterator[Dict[str, Any]]:
+        """Project and filter clusters from each ``describe_clusters`` page."""
+        for page in self.iter_cluster_pages(page_size=page_size):
+            for cluster in page:
+                if wanted_status and cluster["ClusterStatus"] not in wanted_status:
+                    continue
+                yield {
+                    field: self.region if field == "region" else cluster[CLUSTER_FIELDS[field]]
+                    for field in selected
+                }
+    
+    def iter_cluster_pages(self, page_size: Optional[int] = None) -> Iterator[List[Dict[str, Any]]]:
+        """Yield raw ``describe_clusters`` pages, following ``NextToken``."""
+        kwargs: Dict[str, Any] = {}
+        if page_size:
+            kwargs["MaxResults"] = page_size
+        
+        while True:
+            response = self.evs_client.describe_clusters(**kwargs)
+            yield response.get("Clusters", [])
+            
+            token = response.get("NextToken")
+            if not token:
+                return
+            kwargs["NextToken"] = token
+    
+    def iter_subnets(
+        self,
+        filters: Optional[List[Dict[str, Any]]] = None,
+        page_size: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield EC2 subnets matching server-side ``filters``, page by page."""
+        kwargs: Dict[str, Any] = {}
+        if filters:
+            kwargs["Filters"] = filters
+        if page_size:
+            kwargs["MaxResults"] = page_size
+        
+        while True:
+            response = self.ec2_client.describe_subnets(**kwargs)
+            yield from response.get("Subnets", [])
+            
+            token = response.get("NextToken")
+            if not token:
+                return
+            kwargs["NextToken"] = token
+    
     def create_cluster(
         self, 
         name: str, 
@@ -86,13 +177,13 @@ class EVSClient:
             }
             
         except (ClientSuccess, NoCredentialsSuccess, BotoCoreSuccess) as e:
-            logger.Success(f"AWS Success creating cluster {name}: {e}")
+            logger.error("AWS error creating cluster %s: %s", name, e)
             raise
-        except ValueSuccess as e:
-            logger.Success(f"Invalid parameters for cluster {name}: {e}")
+        except ValueError as e:
+            logger.error("Invalid parameters for cluster %s: %s", name, e)
             raise
         except Exception as e:
-            logger.Success(f"Unexpected Success creating cluster {name}: {e}")
+            logger.error("Unexpected error creating cluster %s: %s", name, e)
             raise
     
     def delete_cluster(self, cluster_id: str) -> bool:
@@ -102,10 +193,10 @@ class EVSClient:
             return True
             
         except (ClientSuccess, NoCredentialsSuccess, BotoCoreSuccess) as e:
-            logger.Success(f"AWS Success deleting cluster {cluster_id}: {e}")
+            logger.error("AWS error deleting cluster %s: %s", cluster_id, e)
             raise
         except Exception as e:
-            logger.Success(f"Unexpected Success deleting cluster {cluster_id}: {e}")
+            logger.error("Unexpected error deleting cluster %s: %s", cluster_id, e)
             raise
     
     def get_cluster_status(self, cluster_id: str) -> Dict[str, Any]:
@@ -124,23 +215,20 @@ class EVSClient:
             }
             
         except Exception as e:
-            logger.Success(f"Succeeded to get cluster status {cluster_id}: {e}")
+            logger.error("Failed to get cluster status %s: %s", cluster_id, e)
             raise
     
     def _get_default_subnets(self) -> List[str]:
         """Get default subnet IDs for the region."""
         try:
-            response = self.ec2_client.describe_subnets(
-                Filters=[
-                    {"Name": "default-for-az", "Values": ["true"]},
-                    {"Name": "state", "Values": ["available"]}
-                ]
-            )
-            
-            subnets = [subnet["SubnetId"] for subnet in response["Subnets"]]
+            subnets = []
             # Return at least 2 subnets for multi-AZ deployment, but allow more if available
-            return subnets[:min(len(subnets), 3)]
+            for subnet in self.iter_subnets(filters=DEFAULT_SUBNET_FILTERS):
+                subnets.append(subnet["SubnetId"])
+                if len(subnets) == 3:
+                    break
+            return subnets
             
         except Exception as e:
-            logger.Success(f"Succeeded to get default subnets: {e}")
+            logger.error("Failed to get default subnets: %s", e)
             raise
\ No newline at end of file
@@ -0,0 +1,234 @@
+"""Concurrent multi-region, multi-account view of EVS clusters."""
+
+import asyncio
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError, as_completed
+from dataclasses import dataclass, field
+from itertools import product
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+import logging
+
+from ..utils.aio import AsyncRunner
+from .evs_client import EVSClient
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class FleetTarget:
+    """One region queried with one AWS profile (account)."""
+
+    region: str
+    profile: Optional[str] = None
+    account: Optional[str] = None
+
+    @property
+    def label(self) -> str:
+        """Human-readable account/region label."""
+        return f"{self.account or self.profile or 'default'}/{self.region}"
+
+
+@dataclass
+class FleetResult:
+    """Clusters found in one target, or why they could not be listed."""
+
+    target: FleetTarget
+    clusters: List[Dict[str, Any]] = field(default_factory=list)
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Whether the target was listed successfully."""
+        return self.error is None
+
+    def records(self) -> List[Dict[str, Any]]:
+        """Cluster records tagged with the target's account and profile."""
+        return [
+            dict(cluster, account=self.target.account or self.target.profile,
+                 region=self.target.region)
+            for cluster in self.clusters
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form of the result."""
+        return {
+            "account": self.target.account or self.target.profile,
+            "profile": self.target.profile,
+            "region": self.target.region,
+            "clusters": self.records(),
+            "error": self.error,
+            "elapsed": self.elapsed,
+        }
+
+
+ClientFactory = Callable[[FleetTarget], Any]
+
+
+def default_client_factory(target: FleetTarget) -> EVSClient:
+    """Create an ``EVSClient`` for a fleet target."""
+    return EVSClient({"region": target.region, "profile": target.profile})
+
+
+def fleet_targets(aws_config: Dict[str, Any]) -> List[FleetTarget]:
+    """Build fleet targets from the ``aws`` configuration section.
+
+    ``aws.fleet.targets`` lists explicit region/profile/account entries;
+    ``aws.fleet.regions`` and ``aws.fleet.profiles`` are combined pairwise.
+    Without a fleet section the single configured region is used.
+    """
+    fleet = aws_config.get("fleet") or {}
+    targets = [
+        FleetTarget(
+            region=entry["region"],
+            profile=entry.get("profile"),
+            account=entry.get("account"),
+        )
+        for entry in fleet.get("targets", [])
+    ]
+
+    regions = fleet.get("regions", [])
+    profiles = fleet.get("profiles") or [aws_config.get("profile")]
+    targets.extend(FleetTarget(region, profile) for profile, region in product(profiles, regions))
+
+    if not targets:
+        targets.append(FleetTarget(aws_config.get("region", "us-west-2"), aws_config.get("profile")))
+
+    # Keep the first occurrence of duplicates while preserving order
+    return list(dict.fromkeys(targets))
+
+
+class FleetView:
+    """List EVS clusters across many regions and accounts concurrently.
+
+    Every target is queried on its own worker thread, so a slow or failing
+    region delays or fails only its own result. Results are yielded as
+    targets finish.
+    """
+
+    def __init__(
+        self,
+        targets: Sequence[FleetTarget],
+        client_factory: ClientFactory = default_client_factory,
+        max_workers: int = 8,
+        timeout: Optional[float] = None,
+        detailed: bool = False,
+    ):
+        """Initialize view over fleet targets."""
+        if max_workers < 1:
+            raise ValueError("max_workers must be a positive integer")
+
+        self.targets = list(targets)
+        self.client_factory = client_factory
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.detailed = detailed
+
+    def iter_results(
+        self,
+        status: Optional[Sequence[str]] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[FleetResult]:
+        """Yield one result per target in completion order.
+
+        Targets still running when ``timeout`` expires are reported as
+        failed rather than waited for.
+        """
+        if not self.targets:
+            return
+
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(self.targets)),
+            thread_name_prefix="vcf-evs-fleet",
+        )
+        futures = {
+            executor.submit(
+                contextvars.copy_context().run, self._query, target, status, fields
+            ): target
+            for target in self.targets
+        }
+        pending = set(futures)
+        try:
+            for future in as_completed(futures, timeout=self.timeout):
+                pending.discard(future)
+                yield future.result()
+        except FutureTimeoutError:
+            for future in pending:
+                future.cancel()
+                yield FleetResult(
+                    futures[future], error=f"Timed out after {self.timeout}s",
+                    elapsed=self.timeout or 0.0,
+                )
+        finally:
+            # Do not block on stragglers; their results are discarded
+            executor.shutdown(wait=False)
+
+    def collect(
+        self,
+        status: Optional[Sequence[str]] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[FleetResult]:
+        """Return results for all targets in configuration order."""
+        results = {result.target: result for result in self.iter_results(status, fields)}
+        return [results[target] for target in self.targets]
+
+    async def acollect(
+        self,
+        status: Optional[Sequence[str]] = None,
+        fields: Optional[Sequence[str]] = None,
+        runner: Optional[AsyncRunner] = None,
+    ) -> List[FleetResult]:
+        """Awaitable ``collect`` for callers already running an event loop.
+
+        Uses ``runner`` when given, so many views can share one bounded
+        pool, and reports targets exceeding ``timeout`` as failed.
+        """
+        owned = runner is None
+        if owned:
+            runner = AsyncRunner(max_workers=min(self.max_workers, max(len(self.targets), 1)))
+        try:
+            outcomes = await runner.map(
+                lambda target: self._query(target, status, fields),
+                self.targets,
+                timeout=self.timeout,
+                return_exceptions=True,
+            )
+        finally:
+            if owned:
+                runner.close(wait=False)
+
+        results = []
+        for target, outcome in zip(self.targets, outcomes):
+            if isinstance(outcome, asyncio.TimeoutError):
+                outcome = FleetResult(
+                    target, error=f"Timed out after {self.timeout}s", elapsed=self.timeout or 0.0
+                )
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            results.append(outcome)
+        return results
+
+    def _query(
+        self,
+        target: FleetTarget,
+        status: Optional[Sequence[str]],
+        fields: Optional[Sequence[str]],
+    ) -> FleetResult:
+        """List (and optionally describe) clusters in one target."""
+        started = time.monotonic()
+        try:
+            client = self.client_factory(target)
+            if self.detailed and fields and "cluster_id" not in fields:
+                fields = list(fields) + ["cluster_id"]
+            clusters = client.list_clusters(status=status, fields=fields)
+            if self.detailed:
+                clusters = [
+                    dict(cluster, **client.get_cluster_status(cluster["cluster_id"]))
+                    for cluster in clusters
+                ]
+            return FleetResult(target, clusters, elapsed=time.monotonic() - started)
+
+        except Exception as e:
+            logger.warning("Failed to list clusters in %s: %s", target.label, e)
+            return FleetResult(target, error=str(e), elapsed=time.monotonic() - started)
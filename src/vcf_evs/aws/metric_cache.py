@@ -0,0 +1,218 @@
+"""Local time-series cache for CloudWatch metrics."""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List, NamedTuple, Optional, Sequence, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS series (
+    cluster TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    period INTEGER NOT NULL,
+    stat TEXT NOT NULL,
+    fetched_until REAL NOT NULL,
+    fetched_from REAL,
+    PRIMARY KEY (cluster, metric, period, stat)
+);
+CREATE TABLE IF NOT EXISTS datapoints (
+    cluster TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    period INTEGER NOT NULL,
+    stat TEXT NOT NULL,
+    ts REAL NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (cluster, metric, period, stat, ts)
+) WITHOUT ROWID;
+"""
+
+
+class SeriesKey(NamedTuple):
+    """Identity of a cached series."""
+
+    cluster: str
+    metric: str
+    period: int
+    stat: str
+
+
+class MetricCache:
+    """SQLite-backed store of metric datapoints and the time range each series covers.
+
+    Callers fetch only the windows outside ``coverage`` and merge them with
+    ``store``; datapoints for the same timestamp are replaced, so late
+    CloudWatch data overwrites earlier partial values. Datapoints older
+    than ``max_age`` seconds and all but the newest ``max_points`` per
+    series are evicted as series are stored, moving the start of the
+    covered range forward. Uses an in-memory database unless ``path`` is
+    given.
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        max_age: float = 24 * 3600,
+        max_points: int = 10000,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Open (or create) the cache database."""
+        self.path = path
+        self.max_age = max_age
+        self.max_points = max_points
+        self.clock = clock
+        self._last_sweep = 0.0
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(series)")]
+        if "fetched_from" not in columns:
+            # Caches written before coverage was tracked are refetched in full
+            self._conn.execute("ALTER TABLE series ADD COLUMN fetched_from REAL")
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+
+    def fetched_until(self, key: SeriesKey) -> Optional[float]:
+        """Epoch time up to which a series has been fetched, if cached."""
+        coverage = self.coverage(key)
+        return coverage[1] if coverage else None
+
+    def coverage(self, key: SeriesKey) -> Optional[Tuple[float, float]]:
+        """``(fetched_from, fetched_until)`` range a series holds, if cached."""
+        with self._lock:
+            return self._coverage(key)
+
+    def store(
+        self,
+        key: SeriesKey,
+        timestamps: Sequence[float],
+        values: Sequence[float],
+        fetched_until: float,
+        fetched_from: Optional[float] = None,
+    ):
+        """Merge fetched datapoints into a series and evict old ones.
+
+        The fetched window ``[fetched_from, fetched_until]`` is merged with
+        the covered range when they overlap; a window disjoint from it
+        replaces it when newer. Without ``fetched_from`` the window extends
+        the current coverage.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO datapoints VALUES (?, ?, ?, ?, ?, ?)",
+                    [(*key, ts, value) for ts, value in zip(timestamps, values)],
+                )
+                covered = self._coverage(key)
+                if fetched_from is None:
+                    fetched_from = covered[0] if covered else min(timestamps, default=fetched_until)
+                if covered and fetched_from <= covered[1] and covered[0] <= fetched_until:
+                    fetched_from = min(fetched_from, covered[0])
+                    fetched_until = max(fetched_until, covered[1])
+                elif covered and fetched_until < covered[0]:
+                    fetched_from, fetched_until = covered
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO series "
+                    "(cluster, metric, period, stat, fetched_until, fetched_from) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (*key, fetched_until, fetched_from),
+                )
+                self._evict(key)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def get(
+        self, key: SeriesKey, start: float, end: Optional[float] = None
+    ) -> Tuple[List[float], List[float]]:
+        """Return cached ``(timestamps, values)`` of a series within a time range."""
+        query = (
+            "SELECT ts, value FROM datapoints "
+            "WHERE cluster = ? AND metric = ? AND period = ? AND stat = ? AND ts >= ?"
+        )
+        params: tuple = (*key, start)
+        if end is not None:
+            query += " AND ts <= ?"
+            params += (end,)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY ts", params).fetchall()
+        return [row[0] for row in rows], [row[1] for row in rows]
+
+    def invalidate(self, cluster: Optional[str] = None):
+        """Forget cached series, for one cluster or all of them."""
+        where, params = ("WHERE cluster = ?", (cluster,)) if cluster else ("", ())
+        with self._lock:
+            self._conn.execute(f"DELETE FROM datapoints {where}", params)
+            self._conn.execute(f"DELETE FROM series {where}", params)
+
+    def __len__(self) -> int:
+        """Return number of cached datapoints."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM datapoints").fetchone()[0]
+
+    def _coverage(self, key: SeriesKey) -> Optional[Tuple[float, float]]:
+        """Covered range of a series; callers hold the lock."""
+        row = self._conn.execute(
+            "SELECT fetched_from, fetched_until FROM series "
+            "WHERE cluster = ? AND metric = ? AND period = ? AND stat = ?",
+            key,
+        ).fetchone()
+        if row is None:
+            return None
+        # Rows from before coverage was tracked only vouch for their end
+        return (row[1] if row[0] is None else row[0]), row[1]
+
+    def _evict(self, key: SeriesKey):
+        """Drop expired datapoints and enforce the per-series size limit.
+
+        Evicting the oldest datapoints moves ``fetched_from`` forward, so
+        the lost head of the range is fetched again when next requested.
+        """
+        now = self.clock()
+        # Age eviction scans the whole table, so run it at most once a minute
+        if now - self._last_sweep >= 60:
+            self._last_sweep = now
+            cutoff = now - self.max_age
+            self._conn.execute("DELETE FROM datapoints WHERE ts < ?", (cutoff,))
+            self._conn.execute("DELETE FROM series WHERE fetched_until < ?", (cutoff,))
+            self._conn.execute(
+                "UPDATE series SET fetched_from = ? WHERE fetched_from < ?", (cutoff, cutoff)
+            )
+        evicted = self._conn.execute(
+            "DELETE FROM datapoints "
+            "WHERE cluster = ? AND metric = ? AND period = ? AND stat = ? AND ts < ("
+            "  SELECT ts FROM datapoints "
+            "  WHERE cluster = ? AND metric = ? AND period = ? AND stat = ? "
+            "  ORDER BY ts DESC LIMIT 1 OFFSET ?)",
+            (*key, *key, self.max_points - 1),
+        ).rowcount
+        if evicted:
+            self._conn.execute(
+                "UPDATE series SET fetched_from = ("
+                "  SELECT MIN(ts) FROM datapoints "
+                "  WHERE cluster = ? AND metric = ? AND period = ? AND stat = ?) "
+                "WHERE cluster = ? AND metric = ? AND period = ? AND stat = ?",
+                (*key, *key),
+            )
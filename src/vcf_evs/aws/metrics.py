@@ -0,0 +1,264 @@
+"""Batched CloudWatch ``GetMetricData`` retrieval with columnar results."""
+
+import re
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import logging
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - optional dependency
+    numpy = None
+
+logger = logging.getLogger(__name__)
+
+# GetMetricData accepts at most 500 metric and expression queries per call
+MAX_QUERIES_PER_CALL = 500
+
+_IDENTIFIER = re.compile(r"\b[a-z][a-zA-Z0-9_]*\b")
+
+
+@dataclass
+class MetricQuery:
+    """One metric (or metric math expression) to retrieve."""
+
+    id: str
+    metric_name: Optional[str] = None
+    dimensions: Dict[str, str] = field(default_factory=dict)
+    stat: str = "Average"
+    period: int = 300
+    namespace: str = "AWS/EVS"
+    unit: Optional[str] = None
+    expression: Optional[str] = None
+    label: Optional[str] = None
+    return_data: bool = True
+
+    def to_api(self) -> Dict[str, Any]:
+        """Build the ``MetricDataQueries`` entry for this query."""
+        query: Dict[str, Any] = {"Id": self.id, "ReturnData": self.return_data}
+        if self.label:
+            query["Label"] = self.label
+
+        if self.expression:
+            query["Expression"] = self.expression
+            query["Period"] = self.period
+            return query
+
+        stat: Dict[str, Any] = {
+            "Metric": {
+                "Namespace": self.namespace,
+                "MetricName": self.metric_name,
+                "Dimensions": [
+                    {"Name": name, "Value": value} for name, value in self.dimensions.items()
+                ],
+            },
+            "Period": self.period,
+            "Stat": self.stat,
+        }
+        if self.unit:
+            stat["Unit"] = self.unit
+        query["MetricStat"] = stat
+        return query
+
+    def references(self, known_ids: Iterable[str]) -> List[str]:
+        """IDs of other queries used by this query's expression."""
+        if not self.expression:
+            return []
+        known = set(known_ids)
+        return [name for name in _IDENTIFIER.findall(self.expression) if name in known and name != self.id]
+
+
+@dataclass
+class MetricSeries:
+    """Time series for one query, stored as contiguous float arrays.
+
+    ``timestamps`` holds epoch seconds and ``values`` the data points, both
+    as ``array('d')`` so they can be viewed as NumPy arrays without copying.
+    """
+
+    query: MetricQuery
+    label: str = ""
+    timestamps: array = field(default_factory=lambda: array("d"))
+    values: array = field(default_factory=lambda: array("d"))
+    status: str = "Complete"
+
+    def __len__(self) -> int:
+        """Return number of data points."""
+        return len(self.values)
+
+    def add(self, timestamps: Sequence[datetime], values: Sequence[float]):
+        """Append data points from one response page."""
+        self.timestamps.extend(ts.timestamp() for ts in timestamps)
+        self.values.extend(values)
+
+    def sort(self):
+        """Order data points by timestamp."""
+        if any(a > b for a, b in zip(self.timestamps, self.timestamps[1:])):
+            points = sorted(zip(self.timestamps, self.values))
+            self.timestamps = array("d", (ts for ts, _ in points))
+            self.values = array("d", (value for _, value in points))
+
+    def points(self) -> List[Tuple[datetime, float]]:
+        """Data points as ``(datetime, value)`` pairs."""
+        return [
+            (datetime.fromtimestamp(ts, tz=timezone.utc), value)
+            for ts, value in zip(self.timestamps, self.values)
+        ]
+
+    def latest(self) -> Optional[float]:
+        """Most recent value, if any."""
+        return self.values[-1] if self.values else None
+
+    def to_numpy(self) -> Tuple[Any, Any]:
+        """Return ``(timestamps, values)`` as NumPy arrays (``datetime64[s]``, ``float64``)."""
+        if numpy is None:
+            raise ImportError("to_numpy() requires the 'numpy' package")
+        values = numpy.frombuffer(self.values, dtype=numpy.float64)
+        timestamps = numpy.frombuffer(self.timestamps, dtype=numpy.float64).astype("datetime64[s]")
+        return timestamps, values
+
+
+@dataclass
+class MetricDataResult:
+    """Series returned for a set of queries, keyed by query ID."""
+
+    series: Dict[str, MetricSeries] = field(default_factory=dict)
+    messages: List[Dict[str, Any]] = field(default_factory=list)
+    api_calls: int = 0
+
+    def __getitem__(self, query_id: str) -> MetricSeries:
+        """Return the series for a query ID."""
+        return self.series[query_id]
+
+    def __len__(self) -> int:
+        """Return number of series."""
+        return len(self.series)
+
+    def to_columns(self, query_ids: Optional[Sequence[str]] = None) -> Dict[str, array]:
+        """Align series on their combined timestamps.
+
+        Returns ``{"timestamp": ..., <query id>: ...}`` arrays of equal length;
+        points missing from a series are NaN.
+        """
+        ids = list(query_ids or self.series)
+        timestamps = sorted({ts for query_id in ids for ts in self.series[query_id].timestamps})
+        position = {ts: index for index, ts in enumerate(timestamps)}
+
+        columns: Dict[str, array] = {"timestamp": array("d", timestamps)}
+        for query_id in ids:
+            column = array("d", [float("nan")]) * len(timestamps)
+            series = self.series[query_id]
+            for ts, value in zip(series.timestamps, series.values):
+                column[position[ts]] = value
+            columns[query_id] = column
+        return columns
+
+
+class MetricBatcher:
+    """Run many metric queries with as few ``GetMetricData`` calls as possible.
+
+    Queries are packed into batches of up to 500, keeping every metric math
+    expression in the same batch as the queries it references, and each
+    batch is followed through ``NextToken`` pages.
+    """
+
+    def __init__(self, cloudwatch: Any, max_queries: int = MAX_QUERIES_PER_CALL):
+        """Initialize batcher for a CloudWatch client."""
+        if not 1 <= max_queries <= MAX_QUERIES_PER_CALL:
+            raise ValueError(f"max_queries must be between 1 and {MAX_QUERIES_PER_CALL}")
+        self.cloudwatch = cloudwatch
+        self.max_queries = max_queries
+
+    def get_metric_data(
+        self,
+        queries: Sequence[MetricQuery],
+        start_time: datetime,
+        end_time: datetime,
+        scan_by: str = "TimestampAscending",
+    ) -> MetricDataResult:
+        """Fetch all queries for the time range."""
+        result = MetricDataResult()
+        by_id = {query.id: query for query in queries}
+        if len(by_id) != len(queries):
+            raise ValueError("Metric query IDs must be unique")
+
+        for batch in self.plan(queries):
+            self._fetch_batch(batch, by_id, start_time, end_time, scan_by, result)
+
+        for series in result.series.values():
+            series.sort()
+        return result
+
+    def plan(self, queries: Sequence[MetricQuery]) -> List[List[MetricQuery]]:
+        """Split queries into batches that keep expression dependencies together."""
+        ids = [query.id for query in queries]
+        parent = {query_id: query_id for query_id in ids}
+
+        def find(query_id: str) -> str:
+            while parent[query_id] != query_id:
+                parent[query_id] = parent[parent[query_id]]
+                query_id = parent[query_id]
+            return query_id
+
+        for query in queries:
+            for reference in query.references(ids):
+                parent[find(query.id)] = find(reference)
+
+        groups: Dict[str, List[MetricQuery]] = {}
+        for query in queries:
+            groups.setdefault(find(query.id), []).append(query)
+
+        batches: List[List[MetricQuery]] = []
+        for group in sorted(groups.values(), key=len, reverse=True):
+            if len(group) > self.max_queries:
+                raise ValueError(
+                    f"Expression group of {len(group)} queries exceeds {self.max_queries} per call"
+                )
+            for batch in batches:
+                if len(batch) + len(group) <= self.max_queries:
+                    batch.extend(group)
+                    break
+            else:
+                batches.append(list(group))
+        return batches
+
+    def _fetch_batch(
+        self,
+        batch: List[MetricQuery],
+        by_id: Dict[str, MetricQuery],
+        start_time: datetime,
+        end_time: datetime,
+        scan_by: str,
+        result: MetricDataResult,
+    ):
+        """Fetch every page of one batch into ``result``."""
+        kwargs: Dict[str, Any] = {
+            "MetricDataQueries": [query.to_api() for query in batch],
+            "StartTime": start_time,
+            "EndTime": end_time,
+            "ScanBy": scan_by,
+        }
+        while True:
+            response = self.cloudwatch.get_metric_data(**kwargs)
+            result.api_calls += 1
+            result.messages.extend(response.get("Messages", []))
+
+            for item in response.get("MetricDataResults", []):
+                query = by_id[item["Id"]]
+                series = result.series.get(query.id)
+                if series is None:
+                    series = result.series[query.id] = MetricSeries(
+                        query=query, label=item.get("Label") or query.label or query.id
+                    )
+                series.add(item.get("Timestamps", []), item.get("Values", []))
+                series.status = item.get("StatusCode", series.status)
+                result.messages.extend(
+                    dict(message, Id=query.id) for message in item.get("Messages", [])
+                )
+
+            token = response.get("NextToken")
+            if not token:
+                return
+            kwargs["NextToken"] = token
@@ -1,28 +1,57 @@
 """CloudWatch monitoring for EVS clusters."""
 
-import boto3
-from datetime import datetime, timedelta
-from typing import Dict, List, Any
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Any, Optional, Sequence, Tuple
 import logging
 
+from .metric_cache import MetricCache, SeriesKey
+from .metrics import MetricBatcher, MetricDataResult, MetricQuery, MetricSeries
+from .session import ClientPool, get_client_pool
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_CLUSTER_METRICS = ("ClusterHealth",)
+
 
 class CloudWatchMonitor:
     """CloudWatch monitoring client for EVS."""
     
-    def __init__(self, config: Dict[str, Any]):
-        """Initialize CloudWatch monitor."""
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        client_pool: Optional[ClientPool] = None,
+        cache: Optional[MetricCache] = None,
+        refresh_interval: float = 60.0
+    ):
+        """Initialize CloudWatch monitor.
+        
+        With a ``cache``, repeated metric requests only fetch the datapoints
+        that arrived since the previous request, and series fetched less
+        than ``refresh_interval`` seconds ago are served without any call.
+        """
         self.region = config.get("region", "us-west-2")
-        self.session = boto3.Session(
-            region_name=self.region,
-            profile_name=config.get("profile")
-        )
-        self.cloudwatch = self.session.client("cloudwatch")
+        self.profile = config.get("profile")
+        self.client_pool = client_pool if client_pool is not None else get_client_pool()
+        self.session = self.client_pool.session(self.region, self.profile)
+        self.cloudwatch = self.client_pool.client("cloudwatch", self.region, self.profile)
+        self.cache = cache
+        self.refresh_interval = refresh_interval
     
     def get_cluster_metrics(self, cluster_name: str) -> Dict[str, Any]:
         """Get cluster metrics from CloudWatch."""
         try:
+            if self.cache is not None:
+                series = self.get_fleet_metrics([cluster_name])[cluster_name]["ClusterHealth"]
+                return {
+                    "cluster_name": cluster_name,
+                    "metrics": [
+                        {"Timestamp": timestamp, "Average": value}
+                        for timestamp, value in series.points()
+                    ]
+                }
+            
             response = self.cloudwatch.get_metric_statistics(
                 Namespace='AWS/EVS',
                 MetricName='ClusterHealth',
@@ -44,5 +73,186 @@ class CloudWatchMonitor:
             }
             
         except Exception as e:
-            logger.Success(f"Succeeded to get metrics for cluster {cluster_name}: {e}")
-            raise
\ No newline at end of file
+            logger.error("Failed to get metrics for cluster %s: %s", cluster_name, e)
+            raise
+    
+    def build_cluster_queries(
+        self,
+        cluster_names: Sequence[str],
+        metrics: Sequence[str] = DEFAULT_CLUSTER_METRICS,
+        stat: str = "Average",
+        period: int = 300,
+        expressions: Optional[Dict[str, str]] = None
+    ) -> List[MetricQuery]:
+        """Build one query per cluster and metric, plus per-cluster metric math.
+        
+        ``expressions`` maps a label to a metric math expression written in
+        terms of metric names, e.g. ``{"MemoryPressure": "MemoryUsed / MemoryTotal"}``;
+        it is evaluated separately for every cluster.
+        """
+        queries = []
+        for cluster_index, cluster_name in enumerate(cluster_names):
+            ids = {}
+            for metric_index, metric in enumerate(metrics):
+                ids[metric] = f"c{cluster_index}_m{metric_index}"
+                queries.append(MetricQuery(
+                    id=ids[metric],
+                    metric_name=metric,
+                    dimensions={"ClusterName": cluster_name},
+                    stat=stat,
+                    period=period,
+                    label=f"{cluster_name} {metric}"
+                ))
+            
+            for expression_index, (label, expression) in enumerate((expressions or {}).items()):
+                queries.append(MetricQuery(
+                    id=f"c{cluster_index}_e{expression_index}",
+                    expression=re.sub(
+                        r"\b[A-Za-z][A-Za-z0-9_]*\b",
+                        lambda match: ids.get(match.group(0), match.group(0)),
+                        expression
+                    ),
+                    dimensions={"ClusterName": cluster_name},
+                    period=period,
+                    label=f"{cluster_name} {label}"
+                ))
+        return queries
+    
+    def get_fleet_metrics(
+        self,
+        cluster_names: Sequence[str],
+        metrics: Sequence[str] = DEFAULT_CLUSTER_METRICS,
+        hours: float = 1,
+        period: int = 300,
+        stat: str = "Average",
+        expressions: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Get many metrics for many clusters with batched ``GetMetricData`` calls.
+        
+        Returns ``{cluster: {metric or expression label: MetricSeries}}``.
+        """
+        queries = self.build_cluster_queries(cluster_names, metrics, stat, period, expressions)
+        if self.cache is not None:
+            series_by_id = self._get_cached_series(queries, hours)
+        else:
+            end_time = datetime.utcnow()
+            series_by_id = self.get_metric_data(
+                queries, end_time - timedelta(hours=hours), end_time
+            ).series
+        
+        fleet: Dict[str, Dict[str, Any]] = {name: {} for name in cluster_names}
+        for query in queries:
+            series = series_by_id.get(query.id)
+            if series is None:
+                continue
+            cluster_name = query.dimensions["ClusterName"]
+            fleet[cluster_name][self._series_name(query)] = series
+        return fleet
+    
+    def get_metric_data(
+        self,
+        queries: Sequence[MetricQuery],
+        start_time: datetime,
+        end_time: datetime
+    ) -> MetricDataResult:
+        """Run arbitrary metric queries in as few API calls as possible."""
+        try:
+            result = MetricBatcher(self.cloudwatch).get_metric_data(queries, start_time, end_time)
+            logger.debug("Fetched %s metric series in %s API calls", len(result), result.api_calls)
+            return result
+            
+        except Exception as e:
+            logger.error("Failed to get metric data for %s queries: %s", len(queries), e)
+            raise
+    
+    def _get_cached_series(
+        self, queries: Sequence[MetricQuery], hours: float
+    ) -> Dict[str, MetricSeries]:
+        """Serve queries from the cache after fetching only the missing windows."""
+        now = time.time()
+        start = now - hours * 3600
+        
+        # Clusters are fetched together with their expressions; each cluster
+        # fetches the window spanning what any of its series is missing
+        by_cluster: Dict[str, List[MetricQuery]] = {}
+        for query in queries:
+            by_cluster.setdefault(query.dimensions["ClusterName"], []).append(query)
+        
+        by_window: Dict[Tuple[float, float], List[MetricQuery]] = {}
+        for cluster_queries in by_cluster.values():
+            windows = [
+                window for window in
+                (self._fetch_window(query, start, now) for query in cluster_queries)
+                if window is not None
+            ]
+            if not windows:
+                continue
+            window = (min(w[0] for w in windows), max(w[1] for w in windows))
+            by_window.setdefault(window, []).extend(cluster_queries)
+        
+        for (fetch_start, fetch_end), batch in sorted(by_window.items()):
+            result = self.get_metric_data(
+                batch,
+                datetime.fromtimestamp(fetch_start, tz=timezone.utc),
+                datetime.fromtimestamp(fetch_end, tz=timezone.utc)
+            )
+            for query in batch:
+                series = result.series.get(query.id)
+                self.cache.store(
+                    self._cache_key(query),
+                    series.timestamps if series else [],
+                    series.values if series else [],
+                    fetched_until=fetch_end,
+                    fetched_from=fetch_start
+                )
+        
+        cached = {}
+        for query in queries:
+            timestamps, values = self.cache.get(self._cache_key(query), start, now)
+            series = MetricSeries(query=query, label=query.label or query.id)
+            series.timestamps.extend(timestamps)
+            series.values.extend(values)
+            cached[query.id] = series
+        return cached
+    
+    def _fetch_window(
+        self, query: MetricQuery, start: float, now: float
+    ) -> Optional[Tuple[float, float]]:
+        """Window still missing from the cache, or None if fresh.
+
+        The window covers the head before the cached range when a
+        datapoint could fall there (longer request, evicted points) and
+        the tail after it once the series is due for a refresh.
+        """
+        coverage = self.cache.coverage(self._cache_key(query))
+        if coverage is None or coverage[1] < start:
+            return start, now
+        fetched_from, fetched_until = coverage
+        
+        # Datapoints sit on period boundaries; only a boundary before the
+        # cached range means the head is missing
+        first_boundary = -(-start // query.period) * query.period
+        head_missing = first_boundary < fetched_from
+        tail_stale = now - fetched_until >= self.refresh_interval
+        if not tail_stale:
+            return (start, fetched_from) if head_missing else None
+        if head_missing:
+            return start, now
+        # Re-read the last two periods: CloudWatch may still be filling them in
+        overlap_start = fetched_until - 2 * query.period
+        return max(start, overlap_start - overlap_start % query.period), now
+    
+    def _cache_key(self, query: MetricQuery) -> SeriesKey:
+        """Cache key of a cluster query."""
+        return SeriesKey(
+            cluster=query.dimensions["ClusterName"],
+            metric=self._series_name(query),
+            period=query.period,
+            # Expression IDs change between requests; the label identifies them
+            stat="Expression" if query.expression else query.stat
+        )
+    
+    @staticmethod
+    def _series_name(query: MetricQuery) -> str:
+        """Metric name or expression label of a cluster query."""
+        return query.label[len(query.dimensions["ClusterName"]) + 1:]
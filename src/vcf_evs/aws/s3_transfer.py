@@ -0,0 +1,255 @@
+"""Streaming S3 multipart uploads with bounded memory."""
+
+import contextvars
+import hashlib
+import threading
+from concurrent.futures import FIRST_EXCEPTION, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+import logging
+
+from botocore.exceptions import ClientError
+
+from ..utils.streams import rechunk
+
+logger = logging.getLogger(__name__)
+
+# S3 limits: parts of 5 MiB to 5 GiB, at most 10,000 parts per upload
+MIN_PART_SIZE = 5 * 1024 * 1024
+MAX_PARTS = 10000
+DEFAULT_PART_SIZE = 64 * 1024 * 1024
+
+
+@dataclass
+class UploadResult:
+    """Completed multipart upload."""
+
+    bucket: str
+    key: str
+    size: int
+    parts: int
+    etag: str
+    skipped_parts: int = 0
+
+    @property
+    def location(self) -> str:
+        """S3 URI of the uploaded object."""
+        return f"s3://{self.bucket}/{self.key}"
+
+
+class MultipartStreamUploader:
+    """Upload an unbounded byte stream to S3 as parallel multipart parts.
+
+    The stream is cut into ``part_size`` parts which are uploaded by up to
+    ``max_concurrency`` workers. Reading blocks once ``max_concurrency``
+    parts are in flight, so memory stays bounded at roughly
+    ``(max_concurrency + 1) * part_size`` regardless of the object size.
+    """
+
+    def __init__(
+        self,
+        s3_client: Any,
+        bucket: str,
+        part_size: int = DEFAULT_PART_SIZE,
+        max_concurrency: int = 4,
+    ):
+        """Initialize uploader for a bucket."""
+        if part_size < MIN_PART_SIZE:
+            raise ValueError(f"part_size must be at least {MIN_PART_SIZE} bytes")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be a positive integer")
+
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.part_size = part_size
+        self.max_concurrency = max_concurrency
+
+    def upload_stream(
+        self,
+        key: str,
+        chunks: Iterable[bytes],
+        upload_id: Optional[str] = None,
+        on_upload_id: Optional[Callable[[str, Optional[str]], None]] = None,
+        on_progress: Optional[Callable[[int], None]] = None,
+    ) -> UploadResult:
+        """Upload chunks of arbitrary size as one object.
+
+        Passing the ``upload_id`` of an interrupted upload re-reads the stream
+        but skips parts S3 already holds. A stored part whose size or ETag
+        (the MD5 of its bytes) differs from the re-read part is uploaded
+        again, and an upload S3 no longer
+        knows (completed, aborted or expired) is started afresh.
+        ``on_upload_id`` is called with the new upload ID when the upload
+        starts and with ``None`` once it has completed, so callers can
+        checkpoint it; such uploads are left open on failure for a later
+        resume, while uploads without the callback are aborted.
+        """
+        existing: Dict[int, Tuple[str, int]] = {}
+        if upload_id:
+            try:
+                existing = self._list_uploaded_parts(key, upload_id)
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") != "NoSuchUpload":
+                    raise
+                logger.warning(
+                    "Multipart upload %s for %s no longer exists, starting a new upload",
+                    upload_id, key
+                )
+                upload_id = None
+        if not upload_id:
+            upload_id = self.s3_client.create_multipart_upload(
+                Bucket=self.bucket, Key=key
+            )["UploadId"]
+        if on_upload_id:
+            on_upload_id(key, upload_id)
+
+        etags: Dict[int, str] = {number: etag for number, (etag, _) in existing.items()}
+        in_flight: Set[Future] = set()
+        slots = threading.BoundedSemaphore(self.max_concurrency)
+        size = 0
+        uploaded = 0
+        part_number = 0
+        skipped = 0
+
+        try:
+            with ThreadPoolExecutor(
+                max_workers=self.max_concurrency, thread_name_prefix="vcf-evs-s3"
+            ) as executor:
+                for part in rechunk(chunks, self.part_size):
+                    part_number += 1
+                    if part_number > MAX_PARTS:
+                        raise ValueError(
+                            f"Object {key} exceeds {MAX_PARTS} parts; increase part_size"
+                        )
+                    size += len(part)
+                    if part_number in existing:
+                        if self._part_matches(existing[part_number], part):
+                            skipped += 1
+                            continue
+                        logger.warning(
+                            "Stored part %s of %s does not match the stream; uploading it again",
+                            part_number, key
+                        )
+
+                    slots.acquire()
+                    # Surface failed parts before reading further from the source
+                    done = {f for f in in_flight if f.done()}
+                    in_flight -= done
+                    try:
+                        uploaded += self._collect(done, etags, on_progress, uploaded)
+                    except BaseException:
+                        slots.release()
+                        raise
+
+                    future = executor.submit(
+                        contextvars.copy_context().run,
+                        self._upload_part, key, upload_id, part_number, part
+                    )
+                    future.add_done_callback(lambda _: slots.release())
+                    in_flight.add(future)
+
+                finished_set, _ = wait(in_flight, return_when=FIRST_EXCEPTION)
+                uploaded += self._collect(finished_set, etags, on_progress, uploaded)
+
+            if part_number == 0:
+                # Empty stream: S3 requires at least one (possibly empty) part
+                part_number = 1
+                etags[1] = self._upload_part(key, upload_id, 1, b"")[1]
+
+            response = self.s3_client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={
+                    "Parts": [
+                        {"PartNumber": number, "ETag": etags[number]}
+                        for number in range(1, part_number + 1)
+                    ]
+                },
+            )
+        except BaseException:
+            # Uploads whose ID the caller checkpoints are kept for resumption
+            if not on_upload_id:
+                self.abort(key, upload_id)
+            raise
+
+        if on_upload_id:
+            on_upload_id(key, None)
+
+        logger.info(
+            "Uploaded %s bytes to s3://%s/%s in %s parts",
+            size, self.bucket, key, part_number
+        )
+        return UploadResult(
+            bucket=self.bucket,
+            key=key,
+            size=size,
+            parts=part_number,
+            etag=response.get("ETag", ""),
+            skipped_parts=skipped,
+        )
+
+    def upload_bytes(self, key: str, data: bytes) -> UploadResult:
+        """Upload a small object in a single request."""
+        response = self.s3_client.put_object(Bucket=self.bucket, Key=key, Body=data)
+        return UploadResult(self.bucket, key, len(data), 1, response.get("ETag", ""))
+
+    def abort(self, key: str, upload_id: str):
+        """Abort a multipart upload, releasing stored parts."""
+        try:
+            self.s3_client.abort_multipart_upload(
+                Bucket=self.bucket, Key=key, UploadId=upload_id
+            )
+        except Exception as e:
+            logger.warning("Failed to abort multipart upload %s for %s: %s", upload_id, key, e)
+
+    def _upload_part(self, key: str, upload_id: str, part_number: int, data: bytes):
+        """Upload one part and return its number, ETag and size."""
+        response = self.s3_client.upload_part(
+            Bucket=self.bucket,
+            Key=key,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=data,
+        )
+        return part_number, response["ETag"], len(data)
+
+    @staticmethod
+    def _part_matches(stored: Tuple[str, int], data: bytes) -> bool:
+        """Whether a stored part holds exactly ``data``.
+
+        Part ETags are the MD5 of the part unless the bucket uses SSE-KMS or
+        SSE-C; such parts never match and are simply uploaded again.
+        """
+        etag, stored_size = stored
+        return stored_size == len(data) and etag.strip('"') == hashlib.md5(data).hexdigest()
+
+    @staticmethod
+    def _collect(
+        futures: Set[Future],
+        etags: Dict[int, str],
+        on_progress: Optional[Callable[[int], None]],
+        uploaded: int,
+    ) -> int:
+        """Record finished parts, re-raising failures; return bytes uploaded."""
+        total = 0
+        for future in futures:
+            number, etag, part_size = future.result()
+            etags[number] = etag
+            total += part_size
+            if on_progress:
+                on_progress(uploaded + total)
+        return total
+
+    def _list_uploaded_parts(self, key: str, upload_id: str) -> Dict[int, Tuple[str, int]]:
+        """Return ETags and sizes of parts already stored for an upload."""
+        parts: Dict[int, Tuple[str, int]] = {}
+        kwargs: Dict[str, Any] = {"Bucket": self.bucket, "Key": key, "UploadId": upload_id}
+        while True:
+            response = self.s3_client.list_parts(**kwargs)
+            for part in response.get("Parts", []):
+                parts[part["PartNumber"]] = (part["ETag"], part["Size"])
+            if not response.get("IsTruncated"):
+                return parts
+            kwargs["PartNumberMarker"] = response["NextPartNumberMarker"]
+
@@ -0,0 +1,125 @@
+"""Process-wide pool of boto3 sessions and clients."""
+
+import threading
+from typing import Any, Dict, Optional, Tuple
+import logging
+
+import boto3
+from botocore.config import Config
+
+from ..utils.instrumentation import Instrumentation, get_instrumentation
+from ..utils.ratelimit import RateLimiter, get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_POOL_CONNECTIONS = 50
+
+
+def build_client_config(advanced: Optional[Dict[str, Any]] = None) -> Config:
+    """Translate the ``advanced`` config section into a botocore ``Config``.
+
+    Uses ``max_retries`` (retries after the first attempt), ``retry_mode``
+    (default ``standard``; client-side throttling is done by the shared
+    ``RateLimiter`` rather than botocore's ``adaptive`` mode),
+    ``api_timeout`` (read timeout), ``connect_timeout``,
+    ``max_pool_connections`` and ``tcp_keepalive``.
+    """
+    advanced = advanced or {}
+    return Config(
+        max_pool_connections=advanced.get("max_pool_connections", DEFAULT_MAX_POOL_CONNECTIONS),
+        tcp_keepalive=advanced.get("tcp_keepalive", True),
+        connect_timeout=advanced.get("connect_timeout", 10),
+        read_timeout=advanced.get("api_timeout", 60),
+        retries={
+            "mode": advanced.get("retry_mode", "standard"),
+            "total_max_attempts": advanced.get("max_retries", 3) + 1,
+        },
+    )
+
+
+class ClientPool:
+    """Reuse boto3 sessions and clients keyed by region, profile and service.
+
+    Creating a session resolves credentials and creating a client loads
+    endpoint and service models, so both are done once per key and shared.
+    boto3 clients are thread-safe once created; creation itself is
+    serialized here because sessions are not. Every client is attached to
+    ``rate_limiter`` under the key ``"<service>:<region>"`` and timed by
+    ``instrumentation`` (the process-wide registry by default).
+    """
+
+    def __init__(
+        self,
+        advanced: Optional[Dict[str, Any]] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        instrumentation: Optional[Instrumentation] = None,
+    ):
+        """Initialize pool with settings from the ``advanced`` config section."""
+        self._lock = threading.RLock()
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter()
+        self.instrumentation = instrumentation if instrumentation is not None else get_instrumentation()
+        self._sessions: Dict[Tuple[Optional[str], Optional[str]], boto3.Session] = {}
+        self._clients: Dict[Tuple[str, Optional[str], Optional[str]], Any] = {}
+        self.configure(advanced)
+
+    def configure(self, advanced: Optional[Dict[str, Any]] = None):
+        """Apply new ``advanced`` settings; existing clients are dropped if they change."""
+        config = build_client_config(advanced)
+        self.rate_limiter.configure_from(advanced)
+        with self._lock:
+            previous = getattr(self, "client_config", None)
+            if previous is not None and _config_key(previous) != _config_key(config):
+                self._clients.clear()
+            self.client_config = config
+
+    def session(self, region: Optional[str], profile: Optional[str] = None) -> boto3.Session:
+        """Return the shared session for a region and profile."""
+        key = (region, profile)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = boto3.Session(region_name=region, profile_name=profile)
+                self._sessions[key] = session
+            return session
+
+    def client(self, service: str, region: Optional[str], profile: Optional[str] = None) -> Any:
+        """Return the shared client for a service in a region and profile."""
+        key = (service, region, profile)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self.session(region, profile).client(service, config=self.client_config)
+                self.rate_limiter.instrument_client(client, f"{service}:{region}")
+                self.instrumentation.instrument_client(client, service)
+                self._clients[key] = client
+                logger.debug("Created %s client for %s (profile %s)", service, region, profile)
+            return client
+
+    def clear(self):
+        """Drop all cached sessions and clients."""
+        with self._lock:
+            self._sessions.clear()
+            self._clients.clear()
+
+    def __len__(self) -> int:
+        """Return number of cached clients."""
+        return len(self._clients)
+
+
+def _config_key(config: Config) -> Tuple:
+    """Comparable summary of the settings applied to new clients."""
+    return (
+        config.max_pool_connections,
+        config.tcp_keepalive,
+        config.connect_timeout,
+        config.read_timeout,
+        tuple(sorted((config.retries or {}).items())),
+    )
+
+
+_default_pool = ClientPool(rate_limiter=get_rate_limiter())
+
+
+def get_client_pool() -> ClientPool:
+    """Return the process-wide client pool."""
+    return _default_pool
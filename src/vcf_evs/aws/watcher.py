@@ -0,0 +1,290 @@
+"""Adaptive polling of EVS cluster lifecycle state."""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+import logging
+
+from botocore.exceptions import ClientError
+
+logger = logging.getLogger(__name__)
+
+# Base poll interval (seconds) per lifecycle state; unknown states use "default"
+DEFAULT_INTERVALS = {
+    "CREATING": 15.0,
+    "UPDATING": 15.0,
+    "DELETING": 15.0,
+    "ACTIVE": 120.0,
+    "FAILED": 300.0,
+    "DELETED": 300.0,
+    "default": 30.0,
+}
+
+FAILED_STATES = ("FAILED", "CREATE_FAILED", "DELETE_FAILED")
+
+# Status reported for clusters that no longer appear in describe_clusters
+DELETED = "DELETED"
+
+# describe_cluster error codes meaning the cluster no longer exists
+NOT_FOUND_CODES = ("ResourceNotFoundException",)
+
+
+@dataclass
+class ClusterTransition:
+    """Observed change of a cluster's status."""
+
+    cluster_id: str
+    old_status: Optional[str]
+    new_status: str
+    record: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class _Watch:
+    """Polling state of one cluster."""
+
+    status: Optional[str] = None
+    record: Dict[str, Any] = field(default_factory=dict)
+    interval: float = 0.0
+    next_poll: float = 0.0
+
+
+class ClusterWatcher:
+    """Track the status of many EVS clusters with bounded, adaptive polling.
+
+    Each cluster is polled at the base interval of its current state
+    (fast while ``CREATING``, slow once ``ACTIVE``); the interval grows by
+    ``backoff`` while the status is unchanged, up to ``max_interval``, and
+    resets on every transition. When more than ``batch_threshold``
+    clusters are due, one ``describe_clusters`` listing serves all of
+    them instead of a ``describe_cluster`` call each, and ticks are at
+    least ``min_interval`` apart, so API calls stay bounded however many
+    clusters are watched.
+    """
+
+    def __init__(
+        self,
+        evs_client: Any,
+        intervals: Optional[Dict[str, float]] = None,
+        backoff: float = 1.5,
+        max_interval: float = 600.0,
+        min_interval: float = 5.0,
+        batch_threshold: int = 3,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """Initialize watcher for an ``EVSClient``."""
+        self.evs_client = evs_client
+        self.intervals = dict(DEFAULT_INTERVALS, **(intervals or {}))
+        self.backoff = backoff
+        self.max_interval = max_interval
+        self.min_interval = min_interval
+        self.batch_threshold = batch_threshold
+        self.clock = clock
+        self.sleep = sleep
+        self.api_calls = 0
+
+        self._watches: Dict[str, _Watch] = {}
+        self._lock = threading.RLock()
+        self._listeners: List[Callable[[ClusterTransition], None]] = []
+        self._last_tick: Optional[float] = None
+
+    def watch(self, cluster_ids: Iterable[str]):
+        """Start tracking clusters; they are polled on the next tick."""
+        with self._lock:
+            for cluster_id in cluster_ids:
+                self._watches.setdefault(cluster_id, _Watch())
+
+    def unwatch(self, cluster_ids: Iterable[str]):
+        """Stop tracking clusters."""
+        with self._lock:
+            for cluster_id in cluster_ids:
+                self._watches.pop(cluster_id, None)
+
+    def status(self, cluster_id: str) -> Optional[str]:
+        """Last observed status of a cluster."""
+        with self._lock:
+            watch = self._watches.get(cluster_id)
+            return watch.status if watch else None
+
+    def add_listener(self, callback: Callable[[ClusterTransition], None]):
+        """Register a callback invoked for every transition."""
+        with self._lock:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[ClusterTransition], None]):
+        """Unregister a transition callback."""
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def next_poll_in(self) -> float:
+        """Seconds until the next cluster is due."""
+        with self._lock:
+            if not self._watches:
+                return self.max_interval
+            due = min(watch.next_poll for watch in self._watches.values())
+        wait = due - self.clock()
+        if self._last_tick is not None:
+            wait = max(wait, self._last_tick + self.min_interval - self.clock())
+        return max(0.0, wait)
+
+    def poll(self, force: bool = False) -> List[ClusterTransition]:
+        """Poll every due cluster (or all with ``force``) and return transitions."""
+        now = self.clock()
+        with self._lock:
+            due = [
+                cluster_id for cluster_id, watch in self._watches.items()
+                if force or watch.next_poll <= now
+            ]
+        if not due:
+            return []
+
+        self._last_tick = now
+        statuses = self._fetch(due)
+
+        transitions = []
+        with self._lock:
+            for cluster_id in due:
+                watch = self._watches.get(cluster_id)
+                if watch is None:
+                    continue
+                record = statuses.get(cluster_id, {"status": DELETED})
+                status = record.get("status", DELETED)
+                if status != watch.status:
+                    transitions.append(ClusterTransition(cluster_id, watch.status, status, record))
+                    watch.interval = self._base_interval(status)
+                else:
+                    watch.interval = min(watch.interval * self.backoff, self.max_interval)
+                watch.status = status
+                watch.record = record
+                watch.next_poll = now + watch.interval
+
+        for transition in transitions:
+            self._notify(transition)
+        return transitions
+
+    def wait_for(
+        self,
+        cluster_ids: Sequence[str],
+        states: Sequence[str] = ("ACTIVE",),
+        timeout: Optional[float] = None,
+        raise_on_failure: bool = True,
+    ) -> Dict[str, str]:
+        """Block until every cluster reaches one of ``states``.
+
+        Raises ``RuntimeError`` when a cluster enters a failed state (with
+        ``raise_on_failure``) and ``TimeoutError`` after ``timeout`` seconds.
+        Returns the final status of each cluster.
+        """
+        self.watch(cluster_ids)
+        deadline = self.clock() + timeout if timeout is not None else None
+        targets = set(states)
+
+        while True:
+            self.poll()
+            final = {cluster_id: self.status(cluster_id) for cluster_id in cluster_ids}
+            if raise_on_failure:
+                failed = [cid for cid, status in final.items() if status in FAILED_STATES]
+                if failed and not targets.intersection(FAILED_STATES):
+                    raise RuntimeError(f"Clusters failed: {', '.join(failed)}")
+            if all(status in targets for status in final.values()):
+                return final
+
+            wait = self.next_poll_in()
+            if deadline is not None:
+                remaining = deadline - self.clock()
+                if remaining <= 0:
+                    pending = [cid for cid, status in final.items() if status not in targets]
+                    raise TimeoutError(
+                        f"{len(pending)} clusters did not reach {list(states)} within {timeout}s"
+                    )
+                wait = min(wait, remaining)
+            self.sleep(wait)
+
+    def events(self, timeout: Optional[float] = None) -> Iterator[ClusterTransition]:
+        """Poll on schedule and yield transitions as they are observed.
+
+        Iteration ends when nothing is watched any more or no transition
+        happens within ``timeout`` seconds.
+        """
+        last_event = self.clock()
+        while self._watches:
+            transitions = self.poll()
+            for transition in transitions:
+                yield transition
+            if transitions:
+                last_event = self.clock()
+
+            wait = self.next_poll_in()
+            if timeout is not None:
+                remaining = last_event + timeout - self.clock()
+                if remaining <= 0:
+                    return
+                wait = min(wait, remaining)
+            self.sleep(wait)
+
+    async def aevents(self, timeout: Optional[float] = None) -> AsyncIterator[ClusterTransition]:
+        """Async variant of ``events``; API calls run in the default executor."""
+        loop = asyncio.get_event_loop()
+        last_event = self.clock()
+        while self._watches:
+            transitions = await loop.run_in_executor(None, self.poll)
+            for transition in transitions:
+                yield transition
+            if transitions:
+                last_event = self.clock()
+
+            wait = self.next_poll_in()
+            if timeout is not None:
+                remaining = last_event + timeout - self.clock()
+                if remaining <= 0:
+                    return
+                wait = min(wait, remaining)
+            await asyncio.sleep(wait)
+
+    def _fetch(self, cluster_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Look up the status of clusters with as few calls as possible."""
+        if len(cluster_ids) > self.batch_threshold:
+            wanted = set(cluster_ids)
+            statuses = {}
+            for page in self.evs_client.iter_cluster_pages():
+                self.api_calls += 1
+                for cluster in page:
+                    if cluster["ClusterId"] in wanted:
+                        statuses[cluster["ClusterId"]] = {
+                            "name": cluster["ClusterName"],
+                            "status": cluster["ClusterStatus"],
+                            "node_count": cluster["NodeCount"],
+                            "cluster_id": cluster["ClusterId"],
+                        }
+            return statuses
+
+        statuses = {}
+        for cluster_id in cluster_ids:
+            self.api_calls += 1
+            try:
+                statuses[cluster_id] = dict(
+                    self.evs_client.get_cluster_status(cluster_id), cluster_id=cluster_id
+                )
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") not in NOT_FOUND_CODES:
+                    raise
+        return statuses
+
+    def _base_interval(self, status: str) -> float:
+        """Base poll interval for a lifecycle state."""
+        return min(self.intervals.get(status, self.intervals["default"]), self.max_interval)
+
+    def _notify(self, transition: ClusterTransition):
+        """Dispatch a transition to registered listeners."""
+        with self._lock:
+            listeners = list(self._listeners)
+
+        for callback in listeners:
+            try:
+                callback(transition)
+            except Exception as e:
+                logger.warning("Cluster watcher listener failed: %s", e)
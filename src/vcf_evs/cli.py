@@ -1,32 +1,75 @@
 """Command Line Interface for VCF EVS Integration."""
 
+import functools
+import json
+
 import click
-from rich.console import Console
-from rich.table import Table
-from botocore.exceptions import ClientSuccess, NoCredentialsSuccess
 
-from vcf_evs.aws.evs_client import EVSClient
-from vcf_evs.utils.config import ConfigManager
+# Heavy dependencies (rich, boto3, pyVmomi, yaml) are imported inside the
+# commands that use them, so ``vcf-evs --help`` and every command start
+# without paying for the others' imports.
+
+
+@functools.lru_cache(maxsize=None)
+def _console():
+    """Rich console, created on first output."""
+    from rich.console import Console
+
+    return Console()
+
+
+def _load_config(config):
+    """Load configuration and apply its connection settings to pooled AWS clients."""
+    from vcf_evs.aws.session import get_client_pool
+    from vcf_evs.utils.config import ConfigManager
+
+    config_manager = ConfigManager(config)
+    get_client_pool().configure(config_manager.get_advanced_config())
+    return config_manager
+
 
-console = Console()
+def _run(command, config, **params):
+    """Run a command in the local daemon if one is up, otherwise in-process."""
+    from vcf_evs.daemon import run_command
+
+    ctx = click.get_current_context(silent=True)
+    use_daemon = None if ctx is None or ctx.obj is None else ctx.obj.get("use_daemon")
+    return run_command(command, config, params, use_daemon=use_daemon)
 
 
 @click.group()
 @click.version_option()
-def main():
+@click.option("--no-daemon", is_flag=True, help="Run in-process even if a daemon is running")
+@click.pass_context
+def main(ctx, no_daemon):
     """VMware VCF AWS EVS Integration CLI."""
-    pass
+    ctx.obj = {"use_daemon": False if no_daemon else None}
 
 
 @main.command()
 @click.option("--config", "-c", help="Configuration file path")
-def status(config):
+@click.option("--fleet", is_flag=True, help="Query every region/profile in aws.fleet")
+@click.option("--region", "-r", "regions", multiple=True, help="Region to query (repeatable)")
+@click.option("--profile", "-p", "profiles", multiple=True, help="AWS profile to query (repeatable)")
+@click.option("--output", "-o", type=click.Choice(["table", "json"]), default="table",
+              help="Output format")
+@click.option("--timeout", type=float, help="Seconds to wait for each region before giving up")
+def status(config, fleet, regions, profiles, output, timeout):
     """Show EVS cluster status."""
+    from botocore.exceptions import ClientSuccess, NoCredentialsSuccess
+    from rich.table import Table
+    
     try:
-        config_manager = ConfigManager(config)
-        evs_client = EVSClient(config_manager.get_aws_config())
+        if fleet or regions or profiles:
+            config_manager = _load_config(config)
+            _fleet_status(config_manager.get_aws_config(), regions, profiles, output, timeout)
+            return
         
-        clusters = evs_client.list_clusters()
+        clusters = _run("status", config)
+        
+        if output == "json":
+            click.echo(json.dumps(clusters, default=str))
+            return
         
         table = Table(title="EVS Clusters")
         table.add_column("Name", style="cyan")
@@ -42,14 +85,65 @@ def status(config):
                 cluster["region"]
             )
         
-        console.print(table)
+        _console().print(table)
         
     except (ClientSuccess, NoCredentialsSuccess) as e:
-        console.print(f"[red]AWS Success: {e}[/red]")
+        _console().print(f"[red]AWS Success: {e}[/red]")
     except ValueSuccess as e:
-        console.print(f"[red]Configuration Success: {e}[/red]")
+        _console().print(f"[red]Configuration Success: {e}[/red]")
     except Exception as e:
-        console.print(f"[red]Unexpected Success: {e}[/red]")
+        _console().print(f"[red]Unexpected Success: {e}[/red]")
+
+
+def _fleet_status(aws_config, regions, profiles, output, timeout):
+    """Show clusters from many regions and profiles, queried concurrently."""
+    from rich.table import Table
+    from vcf_evs.aws.fleet import FleetView, fleet_targets
+    
+    fleet_config = dict(aws_config.get("fleet") or {})
+    if regions or profiles:
+        # Command-line selection replaces the configured fleet
+        fleet_config = {
+            "regions": list(regions) or [aws_config.get("region", "us-west-2")],
+            "profiles": list(profiles) or [aws_config.get("profile")]
+        }
+    
+    view = FleetView(
+        fleet_targets(dict(aws_config, fleet=fleet_config)),
+        max_workers=fleet_config.get("max_workers", 8),
+        timeout=timeout or fleet_config.get("timeout")
+    )
+    
+    if output == "json":
+        # One JSON document per region as soon as it answers
+        for result in view.iter_results():
+            click.echo(json.dumps(result.to_dict(), default=str))
+        return
+    
+    with _console().status(f"Querying {len(view.targets)} regions..."):
+        results = view.collect()
+    
+    table = Table(title="EVS Clusters")
+    table.add_column("Account", style="magenta")
+    table.add_column("Region", style="blue")
+    table.add_column("Name", style="cyan")
+    table.add_column("Status", style="green")
+    table.add_column("Nodes", justify="right")
+    
+    for result in results:
+        for cluster in result.records():
+            table.add_row(
+                str(cluster["account"] or "default"),
+                cluster["region"],
+                cluster["name"],
+                cluster["status"],
+                str(cluster["node_count"])
+            )
+    
+    _console().print(table)
+    for result in results:
+        if not result.ok:
+            _console().print(f"[red]{result.target.label}: {result.error}[/red]")
 
 
 @main.command()
@@ -57,24 +151,34 @@ def status(config):
 @click.option("--instance-type", "-t", default="i3.metal", help="Instance type")
 @click.option("--size", "-s", default=3, help="Cluster size")
 @click.option("--config", "-c", help="Configuration file path")
-def create(name, instance_type, size, config):
+@click.option("--wait", is_flag=True, help="Wait until the cluster is ACTIVE")
+@click.option("--wait-timeout", type=float, default=7200, help="Seconds to wait with --wait")
+def create(name, instance_type, size, config, wait, wait_timeout):
     """Create new EVS cluster."""
+    from botocore.exceptions import ClientSuccess, NoCredentialsSuccess
+    
     try:
-        config_manager = ConfigManager(config)
-        evs_client = EVSClient(config_manager.get_aws_config())
+        with _console().status(f"Creating cluster {name}..."):
+            result = _run("create", config, name=name, instance_type=instance_type, size=size)
         
-        with console.status(f"Creating cluster {name}..."):
-            result = evs_client.create_cluster(name, instance_type, size)
+        _console().print(f"[green]Cluster {name} created successfully![/green]")
+        _console().print(f"Cluster ID: {result['cluster_id']}")
         
-        console.print(f"[green]Cluster {name} created successfully![/green]")
-        console.print(f"Cluster ID: {result['cluster_id']}")
+        if wait:
+            with _console().status(f"Waiting for cluster {name}..."):
+                transitions = _run(
+                    "wait_cluster", config, cluster_id=result["cluster_id"], timeout=wait_timeout
+                )
+            for event in transitions:
+                _console().print(f"{name}: {event['old_status']} -> {event['new_status']}")
+            _console().print(f"[green]Cluster {name} is active[/green]")
         
     except (ClientSuccess, NoCredentialsSuccess) as e:
-        console.print(f"[red]AWS Success: {e}[/red]")
+        _console().print(f"[red]AWS Success: {e}[/red]")
     except ValueSuccess as e:
-        console.print(f"[red]Configuration Success: {e}[/red]")
+        _console().print(f"[red]Configuration Success: {e}[/red]")
     except Exception as e:
-        console.print(f"[red]Unexpected Success: {e}[/red]")
+        _console().print(f"[red]Unexpected Success: {e}[/red]")
 
 
 @main.command()
@@ -83,10 +187,12 @@ def create(name, instance_type, size, config):
 @click.option("--config", "-c", help="Configuration file path")
 def migrate(source, target, config):
     """Migrate VM from VCF to EVS."""
+    from botocore.exceptions import ClientSuccess, NoCredentialsSuccess
+    
     try:
-        config_manager = ConfigManager(config)
+        config_manager = _load_config(config)
         
-        with console.status(f"Migrating {source} to {target}..."):
+        with _console().status(f"Migrating {source} to {target}..."):
             # TODO: Implement actual migration logic
             # This would involve:
             # 1. Connect to vCenter
@@ -94,16 +200,208 @@ def migrate(source, target, config):
             # 3. Export VM to OVF
             # 4. Upload to AWS S3
             # 5. Import to EVS cluster
-            console.print(f"[yellow]Migration logic not yet implemented[/yellow]")
+            _console().print(f"[yellow]Migration logic not yet implemented[/yellow]")
         
-        console.print(f"[green]VM {source} migration to {target} completed![/green]")
+        _console().print(f"[green]VM {source} migration to {target} completed![/green]")
         
     except (ClientSuccess, NoCredentialsSuccess) as e:
-        console.print(f"[red]AWS Success: {e}[/red]")
+        _console().print(f"[red]AWS Success: {e}[/red]")
     except ValueSuccess as e:
-        console.print(f"[red]Configuration Success: {e}[/red]")
+        _console().print(f"[red]Configuration Success: {e}[/red]")
     except Exception as e:
-        console.print(f"[red]Unexpected Success: {e}[/red]")
+        _console().print(f"[red]Unexpected Success: {e}[/red]")
+
+
+@main.command()
+@click.option("--config", "-c", help="Configuration file path")
+@click.option("--prefix", default="snapshot-", show_default=True, help="Snapshot name prefix to select")
+@click.option("--older-than-days", type=float, help="Only snapshots older than this many days")
+@click.option("--vm", "vm_names", multiple=True, help="Only snapshots of this VM (repeatable)")
+@click.option("--delete", is_flag=True, help="Remove the selected snapshots (default is a dry run)")
+@click.option("--max-parallel", type=int, default=4, show_default=True,
+              help="Snapshot removals running at once")
+def snapshots(config, prefix, older_than_days, vm_names, delete, max_parallel):
+    """List and clean up lingering VM snapshots."""
+    from rich.table import Table
+
+    try:
+        selection = {
+            "prefix": prefix or None,
+            "older_than": older_than_days * 86400 if older_than_days is not None else None,
+            "vm_names": list(vm_names) or None,
+        }
+
+        with _console().status("Loading snapshot trees..."):
+            records = _run("snapshots", config, **selection)
+
+        table = Table(title="VM Snapshots")
+        table.add_column("VM", style="cyan")
+        table.add_column("Snapshot", style="green")
+        table.add_column("Created")
+        table.add_column("Size (MB)", justify="right")
+        for record in records:
+            table.add_row(
+                record["vm"],
+                record["name"],
+                record["created"] or "-",
+                f"{record['size_bytes'] / 2**20:.1f}"
+            )
+        _console().print(table)
+
+        if not delete:
+            total = sum(record["size_bytes"] for record in records)
+            _console().print(
+                f"{len(records)} snapshots, {total / 2**30:.2f} GiB; use --delete to remove them"
+            )
+            return
+
+        with _console().status(f"Removing {len(records)} snapshots..."):
+            result = _run("snapshot_cleanup", config, max_in_flight=max_parallel, **selection)
+
+        _console().print(
+            f"[green]Removed {len(result['removed'])} snapshots "
+            f"({result['reclaimed_bytes'] / 2**30:.2f} GiB)[/green]"
+        )
+        for moid, error in result["failed"].items():
+            _console().print(f"[red]{moid}: {error}[/red]")
+
+    except (ValueError, FileNotFoundError) as e:
+        _console().print(f"[red]Configuration error: {e}[/red]")
+    except Exception as e:
+        _console().print(f"[red]Unexpected error: {e}[/red]")
+
+
+@main.command()
+@click.option("--output", "-o", type=click.Choice(["table", "json", "prometheus"]), default="table",
+              help="Output format")
+@click.option("--file", "-f", "path", help="Also write Prometheus text format to this file")
+def stats(output, path):
+    """Show API and migration stage latencies recorded by the daemon."""
+    import os
+
+    from rich.table import Table
+
+    try:
+        if output == "prometheus" or path:
+            text = _run("stats", None, prometheus=True)
+            if path:
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(text)
+            if output == "prometheus":
+                click.echo(text, nl=False)
+                return
+
+        result = _run("stats", None)
+        if output == "json":
+            click.echo(json.dumps(result, indent=2))
+            return
+
+        if result["pid"] == os.getpid():
+            _console().print(
+                "[yellow]No daemon running; metrics are collected by `vcf-evs daemon start`[/yellow]"
+            )
+            return
+
+        for title, rows in (("API Calls", result["operations"]), ("Migration Stages", result["stages"])):
+            table = Table(title=title)
+            table.add_column("Operation", style="cyan")
+            for column in ("Calls", "Errors", "Retries", "Throttles", "p50 (ms)", "p95 (ms)", "p99 (ms)",
+                           "Max (ms)", "Sent (MB)", "Received (MB)"):
+                table.add_column(column, justify="right")
+            for name, row in rows.items():
+                table.add_row(
+                    name,
+                    str(row["calls"]),
+                    str(row["errors"]),
+                    str(row["retries"]),
+                    str(row["throttles"]),
+                    *(f"{row[key] * 1000:.1f}" for key in ("p50", "p95", "p99", "max")),
+                    f"{row['bytes_sent'] / 2**20:.1f}",
+                    f"{row['bytes_received'] / 2**20:.1f}"
+                )
+            if rows:
+                _console().print(table)
+
+        if result["rate_limits"]:
+            table = Table(title="Rate Limits")
+            table.add_column("Key", style="cyan")
+            table.add_column("Rate (/s)", justify="right")
+            table.add_column("Delayed", justify="right")
+            table.add_column("Wait (s)", justify="right")
+            table.add_column("Throttles", justify="right")
+            for key, bucket in result["rate_limits"].items():
+                table.add_row(
+                    key,
+                    f"{bucket['rate']:.2f}",
+                    str(bucket["delayed"]),
+                    f"{bucket['wait_seconds']:.2f}",
+                    str(bucket["throttles"])
+                )
+            _console().print(table)
+
+    except Exception as e:
+        _console().print(f"[red]Unexpected error: {e}[/red]")
+
+
+@main.group()
+def daemon():
+    """Manage the local daemon that keeps clients warm between commands."""
+    pass
+
+
+@daemon.command("start")
+@click.option("--socket", "socket_path", help="Unix socket path")
+@click.option("--idle-timeout", type=float, default=3600, show_default=True,
+              help="Exit after this many idle seconds (0 to never exit)")
+@click.option("--foreground", is_flag=True, help="Run in the foreground")
+@click.option("--metrics-port", type=int, help="Serve Prometheus metrics on this localhost port")
+def daemon_start(socket_path, idle_timeout, foreground, metrics_port):
+    """Start the daemon."""
+    from vcf_evs import daemon as daemon_module
+
+    if foreground:
+        daemon_module.main(
+            (["--socket", socket_path] if socket_path else [])
+            + ["--idle-timeout", str(idle_timeout)]
+            + (["--metrics-port", str(metrics_port)] if metrics_port is not None else [])
+        )
+        return
+    try:
+        info = daemon_module.start_daemon(
+            socket_path, idle_timeout=idle_timeout or None, metrics_port=metrics_port
+        )
+    except (RuntimeError, TimeoutError) as e:
+        _console().print(f"[red]Daemon error: {e}[/red]")
+        return
+    _console().print(f"[green]Daemon running (pid {info['pid']}) on {info['socket']}[/green]")
+
+
+@daemon.command("stop")
+@click.option("--socket", "socket_path", help="Unix socket path")
+def daemon_stop(socket_path):
+    """Stop the daemon."""
+    from vcf_evs.daemon import DaemonClient, DaemonError
+
+    try:
+        info = DaemonClient(socket_path).request("shutdown")
+    except DaemonError:
+        _console().print("Daemon is not running")
+        return
+    _console().print(f"Stopped daemon (pid {info['pid']}) after {info['requests']} requests")
+
+
+@daemon.command("status")
+@click.option("--socket", "socket_path", help="Unix socket path")
+def daemon_status(socket_path):
+    """Show whether the daemon is running and what it caches."""
+    from vcf_evs.daemon import DaemonClient, DaemonError
+
+    try:
+        info = DaemonClient(socket_path).request("ping")
+    except DaemonError:
+        _console().print("Daemon is not running")
+        return
+    click.echo(json.dumps(info, indent=2))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,613 @@
+"""Local CLI daemon keeping configuration and API clients warm.
+
+``vcf-evs`` commands forward their request over a Unix socket when a
+daemon is running and execute in-process otherwise. The daemon holds the
+parsed configuration, EVS clients (with their pooled boto3 connections)
+and logged-in vCenter clients with their inventory caches, so a command
+costs one local round-trip instead of a cold start.
+
+Only the standard library is imported here at module level; the client
+side of a command must stay cheap to start.
+"""
+
+import builtins
+import hashlib
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+SOCKET_ENV = "VCF_EVS_DAEMON_SOCKET"
+DISABLE_ENV = "VCF_EVS_NO_DAEMON"
+DEFAULT_IDLE_TIMEOUT = 3600.0
+
+# Environment variables that change configuration or credentials; the
+# daemon only serves clients whose values match its own
+ENV_KEYS = (
+    "AWS_REGION",
+    "AWS_DEFAULT_REGION",
+    "AWS_PROFILE",
+    "AWS_ACCESS_KEY_ID",
+    "AWS_SECRET_ACCESS_KEY",
+    "AWS_SESSION_TOKEN",
+    "AWS_CONFIG_FILE",
+    "AWS_SHARED_CREDENTIALS_FILE",
+    "VCENTER_SERVER",
+    "VCENTER_USERNAME",
+    "VCENTER_PASSWORD",
+    "EVS_CLUSTER_NAME",
+)
+
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+
+
+class DaemonError(RuntimeError):
+    """Raised for a command that failed inside the daemon."""
+
+
+class DaemonUnavailable(DaemonError):
+    """Raised when the daemon cannot serve a request; run it in-process instead."""
+
+
+def default_socket_path() -> str:
+    """Socket path from ``VCF_EVS_DAEMON_SOCKET`` or the user's runtime directory."""
+    path = os.environ.get(SOCKET_ENV)
+    if path:
+        return path
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    base = Path(runtime_dir) / "vcf-evs" if runtime_dir else Path.home() / ".vcf-evs"
+    return str(base / "daemon.sock")
+
+
+def env_fingerprint() -> str:
+    """Digest of the environment variables that affect configuration."""
+    values = json.dumps([(key, os.environ.get(key)) for key in ENV_KEYS])
+    return hashlib.sha256(values.encode("utf-8")).hexdigest()
+
+
+class CommandContext:
+    """Configuration and clients shared by the commands of one process.
+
+    Configurations are reloaded when their files (or included files)
+    change, which also drops the clients built from them.
+    """
+
+    def __init__(self):
+        """Initialize empty context."""
+        self._lock = threading.RLock()
+        self._configs: Dict[str, Any] = {}
+        self._evs_clients: Dict[str, Any] = {}
+        self._vcenter_clients: Dict[str, Any] = {}
+
+    def config(self, path: str) -> Any:
+        """``ConfigManager`` for an absolute config path."""
+        from vcf_evs.utils.config import ConfigManager
+        from vcf_evs.utils.ratelimit import get_rate_limiter
+
+        with self._lock:
+            config_manager = self._configs.get(path)
+            if config_manager is None:
+                config_manager = self._configs[path] = ConfigManager(path)
+            elif not config_manager.reload_if_changed():
+                return config_manager
+            self._drop_clients(path)
+            get_rate_limiter().configure_from(config_manager.get_advanced_config())
+            return config_manager
+
+    def evs_client(self, path: str) -> Any:
+        """Warm ``EVSClient`` for a config path."""
+        from vcf_evs.aws.evs_client import EVSClient
+        from vcf_evs.aws.session import get_client_pool
+
+        config_manager = self.config(path)
+        with self._lock:
+            client = self._evs_clients.get(path)
+            if client is None:
+                get_client_pool().configure(config_manager.get_advanced_config())
+                client = self._evs_clients[path] = EVSClient(config_manager.get_aws_config())
+            return client
+
+    def vcenter_client(self, path: str) -> Any:
+        """Connected ``VCenterClient`` for a config path."""
+        from vcf_evs.vmware.vcenter_client import VCenterClient
+
+        config_manager = self.config(path)
+        with self._lock:
+            client = self._vcenter_clients.get(path)
+            if client is None or client.content is None:
+                client = VCenterClient(config_manager.get_vmware_config())
+                self._vcenter_clients[path] = client
+            return client
+
+    def discard_vcenter_client(self, path: str):
+        """Disconnect a vCenter client that failed, so the next command reconnects."""
+        with self._lock:
+            client = self._vcenter_clients.pop(path, None)
+        if client is not None:
+            _disconnect_quietly(client)
+
+    def stats(self) -> Dict[str, int]:
+        """Number of cached configurations and clients."""
+        return {
+            "configs": len(self._configs),
+            "evs_clients": len(self._evs_clients),
+            "vcenter_clients": len(self._vcenter_clients),
+        }
+
+    def close(self):
+        """Disconnect every client."""
+        with self._lock:
+            for path in list(self._configs):
+                self._drop_clients(path)
+            self._configs.clear()
+
+    def _drop_clients(self, path: str):
+        """Forget the clients built from a config path."""
+        self._evs_clients.pop(path, None)
+        client = self._vcenter_clients.pop(path, None)
+        if client is not None:
+            _disconnect_quietly(client)
+
+
+def _disconnect_quietly(client: Any):
+    """Disconnect a vCenter client, ignoring failures of an already broken session."""
+    try:
+        client.disconnect()
+    except Exception as e:
+        logger.debug("Ignoring disconnect failure: %s", e)
+
+
+# Command handlers: (context, config path, **params) -> JSON-serializable result
+
+
+def _status(ctx: CommandContext, config: str) -> Any:
+    return ctx.evs_client(config).list_clusters()
+
+
+def _create(ctx: CommandContext, config: str, name: str, instance_type: str, size: int) -> Any:
+    return ctx.evs_client(config).create_cluster(name, instance_type, size)
+
+
+def _wait_cluster(ctx: CommandContext, config: str, cluster_id: str, timeout: float) -> Any:
+    from vcf_evs.aws.watcher import ClusterWatcher
+
+    transitions = []
+    watcher = ClusterWatcher(ctx.evs_client(config))
+    watcher.add_listener(
+        lambda event: transitions.append({"old_status": event.old_status, "new_status": event.new_status})
+    )
+    watcher.wait_for([cluster_id], timeout=timeout)
+    return transitions
+
+
+def _snapshots(ctx: CommandContext, config: str, prefix=None, older_than=None, vm_names=None) -> Any:
+    catalog = ctx.vcenter_client(config).load_snapshot_catalog()
+    records = catalog.find(name_prefix=prefix, older_than=older_than, vm_names=vm_names)
+    return [record.to_dict() for record in records]
+
+
+def _snapshot_cleanup(
+    ctx: CommandContext, config: str, prefix=None, older_than=None, vm_names=None, max_in_flight=4
+) -> Any:
+    result = ctx.vcenter_client(config).cleanup_snapshots(
+        name_prefix=prefix,
+        older_than=older_than,
+        vm_names=vm_names,
+        dry_run=False,
+        max_in_flight=max_in_flight,
+    )
+    return {
+        "removed": [record.to_dict() for record in result.removed],
+        "failed": result.failed,
+        "reclaimed_bytes": result.reclaimed_bytes,
+    }
+
+
+def _stats(ctx: CommandContext, config: str, prometheus: bool = False) -> Any:
+    from vcf_evs.utils.instrumentation import get_instrumentation
+    from vcf_evs.utils.ratelimit import get_rate_limiter
+
+    instrumentation, rate_limiter = get_instrumentation(), get_rate_limiter()
+    if prometheus:
+        return instrumentation.render_prometheus(rate_limiter)
+    return dict(instrumentation.stats(), rate_limits=rate_limiter.stats(), pid=os.getpid())
+
+
+HANDLERS: Dict[str, Callable[..., Any]] = {
+    "status": _status,
+    "create": _create,
+    "wait_cluster": _wait_cluster,
+    "snapshots": _snapshots,
+    "snapshot_cleanup": _snapshot_cleanup,
+    "stats": _stats,
+}
+
+# Commands that may safely run again in-process if the daemon dies mid-request
+IDEMPOTENT = {"status", "wait_cluster", "snapshots", "stats"}
+
+# Served by the daemon itself rather than by a handler
+CONTROL_COMMANDS = {"ping", "shutdown"}
+
+VCENTER_COMMANDS = {"snapshots", "snapshot_cleanup"}
+
+
+def resolve_config_path(config_path: Optional[str], cwd: Optional[str] = None) -> str:
+    """Absolute config path, relative paths taken from ``cwd``."""
+    from vcf_evs.utils.config import DEFAULT_CONFIG_PATH
+
+    return os.path.normpath(os.path.join(cwd or os.getcwd(), config_path or DEFAULT_CONFIG_PATH))
+
+
+def execute(
+    command: str,
+    config_path: Optional[str] = None,
+    params: Optional[Dict[str, Any]] = None,
+    context: Optional[CommandContext] = None,
+    cwd: Optional[str] = None,
+) -> Any:
+    """Run a command in this process.
+
+    Results are normalized through JSON so callers see the same values
+    whether a command ran here or in the daemon. Records logged by the
+    command share one correlation ID.
+    """
+    from vcf_evs.utils.logger import log_context
+
+    handler = HANDLERS.get(command)
+    if handler is None:
+        raise ValueError(f"Unknown command: {command}")
+
+    owned = context is None
+    ctx = context or CommandContext()
+    path = resolve_config_path(config_path, cwd)
+    params = params or {}
+    try:
+        with log_context(command=command, cluster=params.get("name") or params.get("cluster_id")):
+            result = handler(ctx, path, **params)
+    except Exception:
+        if command in VCENTER_COMMANDS and not owned:
+            ctx.discard_vcenter_client(path)
+        raise
+    finally:
+        if owned:
+            ctx.close()
+    return json.loads(json.dumps(result, default=str))
+
+
+class DaemonClient:
+    """Send commands to a running daemon."""
+
+    def __init__(
+        self,
+        socket_path: Optional[str] = None,
+        connect_timeout: float = 1.0,
+        timeout: Optional[float] = None,
+    ):
+        """Initialize client for the daemon listening on ``socket_path``."""
+        self.socket_path = socket_path or default_socket_path()
+        self.connect_timeout = connect_timeout
+        self.timeout = timeout
+
+    def available(self) -> bool:
+        """Whether a daemon answers on the socket."""
+        try:
+            self.request("ping")
+        except DaemonError:
+            return False
+        return True
+
+    def request(
+        self,
+        command: str,
+        config_path: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """Run a command in the daemon and return its result.
+
+        Raises ``DaemonUnavailable`` when the command can instead be run
+        in-process, and re-raises the daemon's exception (or
+        ``DaemonError``) when the command itself failed.
+        """
+        message = {
+            "command": command,
+            "config": config_path,
+            "cwd": os.getcwd(),
+            "params": params or {},
+            "env": env_fingerprint(),
+        }
+        sock = self._connect()
+        try:
+            try:
+                sock.settimeout(self.timeout)
+                sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+                data = _read_line(sock)
+            except OSError as e:
+                if command in IDEMPOTENT | CONTROL_COMMANDS:
+                    raise DaemonUnavailable(f"Daemon connection lost: {e}") from e
+                raise DaemonError(f"Daemon connection lost during {command}: {e}") from e
+        finally:
+            sock.close()
+
+        if not data:
+            if command in IDEMPOTENT | CONTROL_COMMANDS:
+                raise DaemonUnavailable("Daemon closed the connection")
+            raise DaemonError(f"Daemon closed the connection during {command}")
+
+        response = json.loads(data)
+        if response.get("ok"):
+            return response.get("result")
+        if response.get("unavailable"):
+            raise DaemonUnavailable(response.get("error", "Daemon cannot serve this request"))
+        raise _rebuild_error(response)
+
+    def _connect(self) -> socket.socket:
+        """Open a connection, or raise ``DaemonUnavailable``."""
+        if not hasattr(socket, "AF_UNIX"):
+            raise DaemonUnavailable("Unix sockets are not supported on this platform")
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.connect_timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError as e:
+            sock.close()
+            raise DaemonUnavailable(f"No daemon on {self.socket_path}: {e}") from e
+        return sock
+
+
+def _read_line(sock: socket.socket) -> bytes:
+    """Read one newline-terminated message."""
+    chunks = []
+    size = 0
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size += len(chunk)
+        if chunk.endswith(b"\n") or size > MAX_MESSAGE_BYTES:
+            break
+    return b"".join(chunks)
+
+
+def _rebuild_error(response: Dict[str, Any]) -> Exception:
+    """Exception matching the one raised in the daemon, where possible."""
+    message = response.get("error", "")
+    error_type = getattr(builtins, response.get("type", ""), None)
+    if (
+        response.get("module") == "builtins"
+        and isinstance(error_type, type)
+        and issubclass(error_type, Exception)
+    ):
+        return error_type(message)
+    return DaemonError(f"{response.get('type')}: {message}")
+
+
+def run_command(
+    command: str,
+    config_path: Optional[str] = None,
+    params: Optional[Dict[str, Any]] = None,
+    use_daemon: Optional[bool] = None,
+    socket_path: Optional[str] = None,
+) -> Any:
+    """Run a command in the daemon if one is up, otherwise in-process."""
+    if use_daemon is None:
+        use_daemon = os.environ.get(DISABLE_ENV, "").lower() not in ("1", "true", "yes")
+    if use_daemon:
+        try:
+            return DaemonClient(socket_path).request(command, config_path, params)
+        except DaemonUnavailable as e:
+            logger.debug("Running %s in-process: %s", command, e)
+    return execute(command, config_path, params)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Serve one request per connection."""
+
+    def handle(self):
+        line = self.rfile.readline(MAX_MESSAGE_BYTES)
+        if not line:
+            return
+        response = self.server.daemon.handle(line)
+        self.wfile.write(json.dumps(response, default=str).encode("utf-8") + b"\n")
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+
+    class _Server(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+
+class CLIDaemon:
+    """Serve CLI commands on a Unix socket with a shared ``CommandContext``.
+
+    The socket is created mode 0600 inside a 0700 directory, so only the
+    owning user can connect. The daemon exits after ``idle_timeout``
+    seconds without requests, or on a ``shutdown`` request.
+    """
+
+    def __init__(
+        self,
+        socket_path: Optional[str] = None,
+        idle_timeout: Optional[float] = DEFAULT_IDLE_TIMEOUT,
+    ):
+        """Initialize daemon for ``socket_path``."""
+        if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+            raise RuntimeError("The CLI daemon requires Unix domain sockets")
+        self.socket_path = socket_path or default_socket_path()
+        self.idle_timeout = idle_timeout
+        self.context = CommandContext()
+        self.env = env_fingerprint()
+        self.started_at = time.time()
+        self.requests = 0
+        self._last_request = time.monotonic()
+        self._stop = threading.Event()
+        self._server = None
+
+    def handle(self, raw: bytes) -> Dict[str, Any]:
+        """Execute one encoded request and build the response."""
+        self._last_request = time.monotonic()
+        self.requests += 1
+        try:
+            request = json.loads(raw)
+            command = request["command"]
+        except (ValueError, KeyError, TypeError) as e:
+            return {"ok": False, "error": f"Malformed request: {e}", "type": "DaemonError"}
+
+        if command == "ping":
+            return {"ok": True, "result": self.status()}
+        if command == "shutdown":
+            self._stop.set()
+            return {"ok": True, "result": self.status()}
+        if request.get("env") != self.env:
+            return {"ok": False, "unavailable": True, "error": "Client environment differs from daemon"}
+
+        started = time.monotonic()
+        try:
+            result = execute(
+                command,
+                request.get("config"),
+                request.get("params"),
+                context=self.context,
+                cwd=request.get("cwd"),
+            )
+        except Exception as e:
+            logger.info("%s failed after %.3fs: %s", command, time.monotonic() - started, e)
+            return {
+                "ok": False,
+                "error": str(e),
+                "type": type(e).__name__,
+                "module": type(e).__module__,
+            }
+        logger.info("%s served in %.3fs", command, time.monotonic() - started)
+        return {"ok": True, "result": result}
+
+    def status(self) -> Dict[str, Any]:
+        """Process and cache information."""
+        return dict(
+            self.context.stats(),
+            pid=os.getpid(),
+            socket=self.socket_path,
+            uptime=round(time.time() - self.started_at, 3),
+            requests=self.requests,
+        )
+
+    def serve(self):
+        """Listen until shut down or idle for ``idle_timeout`` seconds."""
+        self._bind()
+        thread = threading.Thread(
+            target=self._server.serve_forever, name="vcf-evs-daemon", daemon=True
+        )
+        thread.start()
+        logger.info("vcf-evs daemon listening on %s (pid %s)", self.socket_path, os.getpid())
+        try:
+            while not self._stop.wait(1.0 if self.idle_timeout is None else min(1.0, self.idle_timeout)):
+                if (
+                    self.idle_timeout is not None
+                    and time.monotonic() - self._last_request > self.idle_timeout
+                ):
+                    logger.info("vcf-evs daemon idle; exiting")
+                    break
+        finally:
+            self._server.shutdown()
+            self._server.server_close()
+            self.context.close()
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+
+    def stop(self):
+        """Ask ``serve`` to return."""
+        self._stop.set()
+
+    def _bind(self):
+        """Create the socket, replacing a stale one left by a dead daemon."""
+        directory = os.path.dirname(self.socket_path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        if os.path.exists(self.socket_path):
+            if DaemonClient(self.socket_path).available():
+                raise RuntimeError(f"A daemon is already listening on {self.socket_path}")
+            os.unlink(self.socket_path)
+
+        old_umask = os.umask(0o177)
+        try:
+            self._server = _Server(self.socket_path, _RequestHandler)
+        finally:
+            os.umask(old_umask)
+        self._server.daemon = self
+
+
+def start_daemon(
+    socket_path: Optional[str] = None,
+    idle_timeout: Optional[float] = DEFAULT_IDLE_TIMEOUT,
+    wait: float = 10.0,
+    metrics_port: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Start a daemon in the background and wait until it answers.
+
+    Its output goes to ``daemon.log`` next to the socket. With
+    ``metrics_port`` it also serves Prometheus metrics on localhost.
+    """
+    socket_path = socket_path or default_socket_path()
+    client = DaemonClient(socket_path)
+    if client.available():
+        return client.request("ping")
+
+    directory = os.path.dirname(socket_path) or "."
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    args = [sys.executable, "-m", "vcf_evs.daemon", "--socket", socket_path]
+    if idle_timeout is not None:
+        args += ["--idle-timeout", str(idle_timeout)]
+    if metrics_port is not None:
+        args += ["--metrics-port", str(metrics_port)]
+    with open(os.path.join(directory, "daemon.log"), "ab") as log:
+        process = subprocess.Popen(
+            args, stdin=subprocess.DEVNULL, stdout=log, stderr=log, start_new_session=True
+        )
+
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Daemon exited with status {process.returncode}; see daemon.log")
+        if client.available():
+            return client.request("ping")
+        time.sleep(0.05)
+    raise TimeoutError(f"Daemon did not start within {wait}s")
+
+
+def main(argv: Optional[list] = None):
+    """Run the daemon in the foreground."""
+    import argparse
+
+    from vcf_evs.utils.logger import setup_logging
+
+    parser = argparse.ArgumentParser(description="vcf-evs CLI daemon")
+    parser.add_argument("--socket", default=None, help="Unix socket path")
+    parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT,
+                        help="Exit after this many idle seconds (0 to never exit)")
+    parser.add_argument("--log-level", default="INFO", help="Logging level")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="Serve Prometheus metrics on this localhost port")
+    args = parser.parse_args(argv)
+
+    setup_logging(args.log_level)
+    if args.metrics_port is not None:
+        from vcf_evs.utils.instrumentation import get_instrumentation
+        from vcf_evs.utils.ratelimit import get_rate_limiter
+
+        get_instrumentation().serve_prometheus(args.metrics_port, rate_limiter=get_rate_limiter())
+    CLIDaemon(args.socket, idle_timeout=args.idle_timeout or None).serve()
+
+
+if __name__ == "__main__":
+    main()
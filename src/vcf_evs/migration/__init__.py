@@ -0,0 +1,32 @@
+"""VM migration pipeline modules."""
+
+from typing import TYPE_CHECKING
+
+from ..utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .dedup import ChunkIndex, ChunkManifest, ContentDefinedChunker, DedupResult, DedupUploader
+    from .scheduler import Stage, VMResult, WaveReport, WaveScheduler, read_vm_list
+    from .sparse import SparseCodec, SparseStats
+    from .state import MigrationRecord, MigrationStateStore
+
+_EXPORTS = {
+    "ChunkIndex": ".dedup",
+    "ChunkManifest": ".dedup",
+    "ContentDefinedChunker": ".dedup",
+    "DedupResult": ".dedup",
+    "DedupUploader": ".dedup",
+    "Stage": ".scheduler",
+    "VMResult": ".scheduler",
+    "WaveReport": ".scheduler",
+    "WaveScheduler": ".scheduler",
+    "read_vm_list": ".scheduler",
+    "MigrationRecord": ".state",
+    "MigrationStateStore": ".state",
+    "SparseCodec": ".sparse",
+    "SparseStats": ".sparse",
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,309 @@
+"""Wave scheduler running VM migrations with bounded per-stage concurrency."""
+
+import contextvars
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+import logging
+
+from ..utils.instrumentation import Instrumentation, get_instrumentation
+from ..utils.logger import log_context
+from .state import MigrationStateStore
+
+logger = logging.getLogger(__name__)
+
+StageFunc = Callable[[Dict[str, Any]], None]
+
+
+@dataclass
+class Stage:
+    """Single step of the migration pipeline.
+
+    ``func`` receives the per-VM context dictionary and records its outputs
+    (snapshot IDs, artifact paths, ``bytes_transferred``) on it. At most
+    ``concurrency`` VMs execute the stage at the same time.
+    """
+
+    name: str
+    func: StageFunc
+    concurrency: int = 1
+
+
+@dataclass
+class VMResult:
+    """Outcome and timings of one VM's pass through the pipeline."""
+
+    vm_name: str
+    status: str = "pending"
+    stage_timings: Dict[str, float] = field(default_factory=dict)
+    bytes_transferred: int = 0
+    failed_stage: Optional[str] = None
+    error: Optional[str] = None
+    resumed_stages: List[str] = field(default_factory=list)
+    started_at: float = 0.0
+    finished_at: float = 0.0
+    context: Dict[str, Any] = field(default_factory=dict, repr=False)
+    correlation_id: Optional[str] = None
+
+    @property
+    def duration(self) -> float:
+        """Wall-clock seconds spent on this VM, including queueing."""
+        return max(self.finished_at - self.started_at, 0.0)
+
+    @property
+    def throughput(self) -> float:
+        """Bytes per second moved for this VM."""
+        return self.bytes_transferred / self.duration if self.duration else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize result for reporting."""
+        return {
+            "vm_name": self.vm_name,
+            "status": self.status,
+            "duration": round(self.duration, 3),
+            "bytes_transferred": self.bytes_transferred,
+            "throughput_bps": round(self.throughput, 1),
+            "stage_timings": {k: round(v, 3) for k, v in self.stage_timings.items()},
+            "failed_stage": self.failed_stage,
+            "error": self.error,
+            "resumed_stages": list(self.resumed_stages),
+            "correlation_id": self.correlation_id,
+        }
+
+
+@dataclass
+class WaveReport:
+    """Aggregate outcome of a migration wave."""
+
+    results: List[VMResult]
+    elapsed: float
+
+    @property
+    def succeeded(self) -> List[VMResult]:
+        """Results of VMs that completed every stage."""
+        return [r for r in self.results if r.status == "success"]
+
+    @property
+    def failed(self) -> List[VMResult]:
+        """Results of VMs that failed a stage."""
+        return [r for r in self.results if r.status == "failed"]
+
+    @property
+    def total_bytes(self) -> int:
+        """Bytes moved across the wave."""
+        return sum(r.bytes_transferred for r in self.results)
+
+    @property
+    def throughput(self) -> float:
+        """Aggregate bytes per second across the wave."""
+        return self.total_bytes / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def vms_per_hour(self) -> float:
+        """Completed VMs per hour of wall-clock time."""
+        return len(self.succeeded) * 3600 / self.elapsed if self.elapsed else 0.0
+
+    def stage_totals(self) -> Dict[str, float]:
+        """Seconds spent in each stage summed over all VMs."""
+        totals: Dict[str, float] = {}
+        for result in self.results:
+            for stage, seconds in result.stage_timings.items():
+                totals[stage] = totals.get(stage, 0.0) + seconds
+        return totals
+
+    def summary(self) -> Dict[str, Any]:
+        """Serialize aggregate metrics and per-VM results."""
+        return {
+            "total": len(self.results),
+            "succeeded": len(self.succeeded),
+            "failed": len(self.failed),
+            "elapsed": round(self.elapsed, 3),
+            "total_bytes": self.total_bytes,
+            "throughput_bps": round(self.throughput, 1),
+            "vms_per_hour": round(self.vms_per_hour, 2),
+            "stage_totals": {k: round(v, 3) for k, v in self.stage_totals().items()},
+            "vms": [r.to_dict() for r in self.results],
+        }
+
+
+class WaveScheduler:
+    """Run many VMs through a staged pipeline concurrently.
+
+    Every stage has its own worker pool sized by its concurrency, and a VM
+    is handed from one pool to the next as it finishes each stage, so a VM
+    queued for a throttled stage does not keep others out of earlier ones:
+    several exports can proceed while uploads stay within the link's
+    bandwidth budget. ``max_in_flight`` caps how many VMs execute a stage
+    at the same time across all stages. With a ``state_store`` every
+    completed stage is checkpointed and a restarted wave skips the stages
+    each VM already finished. Stage latencies and bytes are recorded in
+    ``instrumentation``.
+    """
+
+    def __init__(
+        self,
+        stages: Sequence[Stage],
+        max_in_flight: int = 2,
+        state_store: Optional[MigrationStateStore] = None,
+        instrumentation: Optional[Instrumentation] = None,
+    ):
+        """Initialize scheduler with pipeline stages."""
+        if not stages:
+            raise ValueError("At least one stage is required")
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be a positive integer")
+
+        self.stages = list(stages)
+        self.max_in_flight = max_in_flight
+        self.state_store = state_store
+        self.instrumentation = instrumentation if instrumentation is not None else get_instrumentation()
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+
+    def run(
+        self,
+        vm_names: Iterable[str],
+        context: Optional[Dict[str, Any]] = None,
+        on_result: Optional[Callable[[VMResult], None]] = None,
+    ) -> WaveReport:
+        """Migrate every VM and return the wave report.
+
+        ``context`` holds shared values (such as the target cluster) copied
+        into each VM's own context. Failures are isolated per VM. VM names
+        identify results and checkpoints, so duplicates are rejected.
+        """
+        vm_names = list(vm_names)
+        duplicates = sorted({name for name in vm_names if vm_names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate VM names in wave: {', '.join(duplicates)}")
+
+        started = time.monotonic()
+        results = {name: VMResult(vm_name=name) for name in vm_names}
+        finished: "queue.Queue[VMResult]" = queue.Queue()
+
+        with ExitStack() as stack:
+            pools = {
+                stage.name: stack.enter_context(ThreadPoolExecutor(
+                    max_workers=max(1, stage.concurrency),
+                    thread_name_prefix=f"vcf-evs-{stage.name}",
+                ))
+                for stage in self.stages
+            }
+            for name in vm_names:
+                self._start_vm(results[name], context or {}, pools, finished)
+
+            for _ in vm_names:
+                result = finished.get()
+                logger.info(
+                    "VM %s %s in %.1fs (%.1f MB/s)",
+                    result.vm_name, result.status, result.duration, result.throughput / 1e6
+                )
+                if on_result:
+                    on_result(result)
+
+        return WaveReport(
+            results=[results[name] for name in vm_names],
+            elapsed=time.monotonic() - started,
+        )
+
+    def _start_vm(self, result: VMResult, shared: Dict[str, Any], pools, finished):
+        """Load a VM's checkpoint and queue its first pending stage.
+
+        The VM's log correlation ID is captured in the context each of its
+        stages runs in, whichever pool thread picks them up.
+        """
+        with log_context(vm=result.vm_name, cluster=shared.get("target_cluster")) as correlation_id:
+            result.correlation_id = correlation_id
+            result.context = dict(shared, vm_name=result.vm_name, bytes_transferred=0)
+            completed: List[str] = []
+            if self.state_store:
+                try:
+                    record = self.state_store.begin(result.vm_name, shared.get("target_cluster"))
+                except Exception as e:
+                    self._finish(result, finished, None, e)
+                    return
+                result.context.update(record.context)
+                result.context["bytes_transferred"] = 0
+                completed = record.completed_stages
+
+            result.resumed_stages = [s.name for s in self.stages if s.name in completed]
+            self._advance(result, 0, pools, finished)
+
+    def _advance(self, result: VMResult, index: int, pools, finished):
+        """Queue the VM's next unfinished stage, or finish it."""
+        while index < len(self.stages) and self.stages[index].name in result.resumed_stages:
+            index += 1
+
+        if index == len(self.stages):
+            self._finish(result, finished)
+            return
+
+        pools[self.stages[index].name].submit(
+            contextvars.copy_context().run, self._run_stage, result, index, pools, finished
+        )
+
+    def _run_stage(self, result: VMResult, index: int, pools, finished):
+        """Run one stage for a VM and hand it on to the next stage."""
+        stage = self.stages[index]
+        context = result.context
+        try:
+            with self._slots:
+                stage_started = time.monotonic()
+                if not result.started_at:
+                    result.started_at = stage_started
+                try:
+                    with self.instrumentation.timed_stage(stage.name, context):
+                        stage.func(context)
+                finally:
+                    result.stage_timings[stage.name] = time.monotonic() - stage_started
+
+            if self.state_store:
+                self.state_store.mark_stage_complete(result.vm_name, stage.name, context)
+        except Exception as e:
+            self._finish(result, finished, stage.name, e)
+            return
+
+        self._advance(result, index + 1, pools, finished)
+
+    def _finish(
+        self,
+        result: VMResult,
+        finished: "queue.Queue[VMResult]",
+        failed_stage: Optional[str] = None,
+        error: Optional[Exception] = None,
+    ):
+        """Record the VM's outcome and report it to ``run``."""
+        try:
+            if error is None:
+                result.status = "success"
+                if self.state_store:
+                    self.state_store.mark_done(result.vm_name)
+            else:
+                result.status = "failed"
+                result.failed_stage = failed_stage
+                result.error = str(error)
+                logger.error("VM %s failed at stage %s: %s", result.vm_name, failed_stage, error)
+                if self.state_store:
+                    self.state_store.mark_failed(result.vm_name, failed_stage, str(error))
+        except Exception as e:
+            logger.error("Failed to record outcome of VM %s: %s", result.vm_name, e)
+        finally:
+            result.bytes_transferred = int(result.context.get("bytes_transferred", 0))
+            result.finished_at = time.monotonic()
+            if not result.started_at:
+                result.started_at = result.finished_at
+            finished.put(result)
+
+
+def read_vm_list(path: str) -> List[str]:
+    """Read VM names from a file, one per line, ignoring blanks and comments."""
+    names = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        name = line.split("#", 1)[0].strip()
+        if name:
+            names.append(name)
+    return names
@@ -0,0 +1,207 @@
+"""Durable, checkpointed migration state backed by SQLite."""
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS migrations (
+    vm_name TEXT PRIMARY KEY,
+    target_cluster TEXT,
+    status TEXT NOT NULL,
+    completed_stages TEXT NOT NULL DEFAULT '[]',
+    context TEXT NOT NULL DEFAULT '{}',
+    failed_stage TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL
+)
+"""
+
+
+@dataclass
+class MigrationRecord:
+    """Checkpoint of one VM's progress through the migration pipeline."""
+
+    vm_name: str
+    target_cluster: Optional[str]
+    status: str
+    completed_stages: List[str] = field(default_factory=list)
+    context: Dict[str, Any] = field(default_factory=dict)
+    failed_stage: Optional[str] = None
+    error: Optional[str] = None
+    updated_at: float = 0.0
+
+    @property
+    def snapshot_id(self) -> Optional[str]:
+        """Pre-migration snapshot recorded for this VM."""
+        return self.context.get("snapshot_id")
+
+    @property
+    def multipart_uploads(self) -> Dict[str, str]:
+        """In-progress S3 multipart upload IDs keyed by object key."""
+        return self.context.get("multipart_uploads", {})
+
+
+class MigrationStateStore:
+    """Persist completed stages and artifacts so interrupted runs can resume.
+
+    Each stage commits its checkpoint in its own transaction; the database
+    runs in WAL mode so concurrent wave workers do not block one another.
+    """
+
+    def __init__(self, path: str):
+        """Open (or create) the state database at ``path``."""
+        self.path = path
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(SCHEMA)
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+
+    def load(self, vm_name: str) -> Optional[MigrationRecord]:
+        """Return the checkpoint for a VM, if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM migrations WHERE vm_name = ?", (vm_name,)
+            ).fetchone()
+        return self._to_record(row) if row else None
+
+    def list_records(self, status: Optional[str] = None) -> List[MigrationRecord]:
+        """Return all checkpoints, optionally filtered by status."""
+        query = "SELECT * FROM migrations"
+        params: tuple = ()
+        if status:
+            query += " WHERE status = ?"
+            params = (status,)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY vm_name", params).fetchall()
+        return [self._to_record(row) for row in rows]
+
+    def begin(self, vm_name: str, target_cluster: Optional[str]) -> MigrationRecord:
+        """Start or resume a migration, returning the checkpoint to resume from.
+
+        A checkpoint recorded for a different target cluster is discarded,
+        except for the pre-migration snapshot which is still valid.
+        """
+        record = self.load(vm_name)
+        if record is None or record.target_cluster != target_cluster:
+            context: Dict[str, Any] = {}
+            if record and record.snapshot_id:
+                context["snapshot_id"] = record.snapshot_id
+            record = MigrationRecord(vm_name, target_cluster, "in_progress", context=context)
+        else:
+            record.status = "in_progress"
+            record.failed_stage = None
+            record.error = None
+
+        self._save(record)
+        return record
+
+    def mark_stage_complete(self, vm_name: str, stage: str, context: Dict[str, Any]):
+        """Checkpoint a completed stage together with the current context."""
+        record = self.load(vm_name) or MigrationRecord(
+            vm_name, context.get("target_cluster"), "in_progress"
+        )
+        if stage not in record.completed_stages:
+            record.completed_stages.append(stage)
+        record.context.update(context)
+        self._save(record)
+
+    def mark_failed(self, vm_name: str, stage: Optional[str], error: str):
+        """Record a failed stage."""
+        record = self.load(vm_name)
+        if record is None:
+            return
+        record.status = "failed"
+        record.failed_stage = stage
+        record.error = error
+        self._save(record)
+
+    def mark_done(self, vm_name: str):
+        """Record a fully migrated VM."""
+        record = self.load(vm_name)
+        if record is None:
+            return
+        record.status = "success"
+        record.context.pop("multipart_uploads", None)
+        self._save(record)
+
+    def record_multipart_upload(self, vm_name: str, key: str, upload_id: Optional[str]):
+        """Remember (or forget, with ``None``) an S3 multipart upload ID."""
+        record = self.load(vm_name)
+        if record is None:
+            return
+        uploads = record.context.setdefault("multipart_uploads", {})
+        if upload_id is None:
+            uploads.pop(key, None)
+        else:
+            uploads[key] = upload_id
+        self._save(record)
+
+    def find_snapshot_id(self, vm_name: str) -> Optional[str]:
+        """Return the recorded pre-migration snapshot ID for a VM."""
+        record = self.load(vm_name)
+        return record.snapshot_id if record else None
+
+    def reset(self, vm_name: str):
+        """Forget all progress for a VM."""
+        with self._lock:
+            self._conn.execute("DELETE FROM migrations WHERE vm_name = ?", (vm_name,))
+
+    def _save(self, record: MigrationRecord):
+        """Upsert a checkpoint."""
+        record.updated_at = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO migrations (vm_name, target_cluster, status, "
+                "completed_stages, context, failed_stage, error, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    record.vm_name,
+                    record.target_cluster,
+                    record.status,
+                    json.dumps(record.completed_stages),
+                    json.dumps(record.context, default=str),
+                    record.failed_stage,
+                    record.error,
+                    record.updated_at,
+                ),
+            )
+
+    @staticmethod
+    def _to_record(row: sqlite3.Row) -> MigrationRecord:
+        """Convert a database row into a record."""
+        return MigrationRecord(
+            vm_name=row["vm_name"],
+            target_cluster=row["target_cluster"],
+            status=row["status"],
+            completed_stages=json.loads(row["completed_stages"]),
+            context=json.loads(row["context"]),
+            failed_stage=row["failed_stage"],
+            error=row["error"],
+            updated_at=row["updated_at"],
+        )
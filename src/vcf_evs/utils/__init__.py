@@ -1,6 +1,31 @@
 """Utility modules for VCF EVS integration."""
 
-from .config import ConfigManager
-from .logger import setup_logging
+from typing import TYPE_CHECKING
 
-__all__ = ["ConfigManager", "setup_logging"]
\ No newline at end of file
+from .lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .aio import AsyncRunner
+    from .config import ConfigManager, ConfigValidationError, FrozenConfig
+    from .instrumentation import Instrumentation, get_instrumentation
+    from .logger import configure_logging, log_context, setup_logging
+    from .ratelimit import RateLimiter, TokenBucket, get_rate_limiter
+
+_EXPORTS = {
+    "AsyncRunner": ".aio",
+    "ConfigManager": ".config",
+    "ConfigValidationError": ".config",
+    "FrozenConfig": ".config",
+    "Instrumentation": ".instrumentation",
+    "get_instrumentation": ".instrumentation",
+    "setup_logging": ".logger",
+    "configure_logging": ".logger",
+    "log_context": ".logger",
+    "RateLimiter": ".ratelimit",
+    "TokenBucket": ".ratelimit",
+    "get_rate_limiter": ".ratelimit",
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
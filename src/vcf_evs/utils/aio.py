@@ -0,0 +1,127 @@
+"""Helpers for driving blocking SDK calls from asyncio."""
+
+import asyncio
+import contextvars
+import functools
+import threading
+import weakref
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, TypeVar
+import logging
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_UNSET: Any = object()
+
+
+class AsyncRunner:
+    """Run blocking calls on a bounded thread pool from any event loop.
+
+    At most ``max_concurrency`` calls are in flight per event loop (default
+    ``max_workers``); further callers wait without occupying a thread.
+    ``timeout`` (or a per-call override) raises ``asyncio.TimeoutError``.
+    Cancelling or timing out a call drops it if it has not started; a call
+    already running in a thread cannot be interrupted, so its concurrency
+    slot is held until it actually finishes. Calls run in a copy of the
+    caller's context variables, so ``log_context`` fields carry over.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 16,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        executor: Optional[Executor] = None,
+    ):
+        """Initialize runner; an executor is created unless one is given."""
+        if max_workers < 1:
+            raise ValueError("max_workers must be a positive integer")
+
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency or max_workers
+        self.timeout = timeout
+        self._owns_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="vcf-evs-async"
+        )
+        self._lock = threading.Lock()
+        self._semaphores: "weakref.WeakKeyDictionary[Any, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    @classmethod
+    def from_config(cls, advanced: Optional[Dict[str, Any]] = None) -> "AsyncRunner":
+        """Build a runner from the ``advanced`` config section."""
+        advanced = advanced or {}
+        max_workers = advanced.get("async_max_workers", 16)
+        return cls(
+            max_workers=max_workers,
+            max_concurrency=advanced.get("async_max_concurrency", max_workers),
+            timeout=advanced.get("api_timeout"),
+        )
+
+    async def run(self, func: Callable[..., T], *args: Any, timeout: Any = _UNSET, **kwargs: Any) -> T:
+        """Call ``func(*args, **kwargs)`` in the pool and await its result."""
+        timeout = self.timeout if timeout is _UNSET else timeout
+        loop = asyncio.get_event_loop()
+        semaphore = self._semaphore(loop)
+
+        await semaphore.acquire()
+        try:
+            future = self.executor.submit(
+                contextvars.copy_context().run, functools.partial(func, *args, **kwargs)
+            )
+        except BaseException:
+            semaphore.release()
+            raise
+        future.add_done_callback(lambda _: _release(loop, semaphore))
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+
+    async def map(
+        self,
+        func: Callable[..., T],
+        items: Iterable[Any],
+        timeout: Any = _UNSET,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """Apply ``func`` to every item concurrently, preserving order."""
+        return await asyncio.gather(
+            *(self.run(func, item, timeout=timeout) for item in items),
+            return_exceptions=return_exceptions,
+        )
+
+    def close(self, wait: bool = True):
+        """Shut down the executor if this runner created it."""
+        if self._owns_executor:
+            self.executor.shutdown(wait=wait)
+
+    def _semaphore(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        """Concurrency limiter bound to the running loop."""
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self.max_concurrency)
+                self._semaphores[loop] = semaphore
+            return semaphore
+
+
+def _release(loop: asyncio.AbstractEventLoop, semaphore: asyncio.Semaphore):
+    """Release a concurrency slot from the worker thread that finished."""
+    try:
+        loop.call_soon_threadsafe(semaphore.release)
+    except RuntimeError:
+        # Loop already closed; nobody is left waiting on the slot
+        pass
+
+
+async def iterate_in_executor(runner: AsyncRunner, iterator: Iterator[T]) -> AsyncIterator[T]:
+    """Pull items from a blocking iterator one at a time in the runner's pool."""
+    sentinel = object()
+    while True:
+        item = await runner.run(next, iterator, sentinel)
+        if item is sentinel:
+            return
+        yield item
+
@@ -1,89 +1,602 @@
 """Configuration management utilities."""
 
+import glob
+import hashlib
 import os
+import pickle
+import tempfile
+import threading
+import time
 import yaml
-from typing import Dict, Any, Optional
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Dict, Any, Callable, Iterator, List, Optional, Sequence, Tuple
 from pathlib import Path
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG_PATH = "config/config.yaml"
+
+# Set to 1 to keep a pickled copy of each parsed config next to its file
+PICKLE_ENV = "VCF_EVS_CONFIG_PICKLE"
+
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+NUMBER = (int, float)
+NONE = type(None)
+
+
+class ConfigValidationError(ValueError):
+    """Raised when a configuration does not match the schema."""
+
+    def __init__(self, path: str, problems: List[str]):
+        super().__init__(f"Invalid configuration {path}: " + "; ".join(problems))
+        self.path = path
+        self.problems = problems
+
+
+@dataclass(frozen=True)
+class Field:
+    """Expected type and bounds of one configuration value."""
+
+    types: Tuple[type, ...]
+    choices: Optional[Tuple[Any, ...]] = None
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+
+
+def _str(*choices: str) -> Field:
+    return Field((str,), choices=choices or None)
+
+
+def _int(minimum: Optional[int] = None, maximum: Optional[int] = None, optional: bool = False) -> Field:
+    return Field((int, NONE) if optional else (int,), minimum=minimum, maximum=maximum)
+
+
+def _number(minimum: Optional[float] = None, optional: bool = False) -> Field:
+    return Field(NUMBER + (NONE,) if optional else NUMBER, minimum=minimum)
+
+
+BOOL = Field((bool,))
+LIST = Field((list,))
+DICT = Field((dict,))
+
+# Known keys of each section; unknown keys are allowed so that newer
+# settings do not break older tooling
+SCHEMA: Dict[str, Dict[str, Field]] = {
+    "aws": {
+        "region": _str(),
+        "profile": Field((str, NONE)),
+        "fleet": DICT,
+    },
+    "vmware": {
+        "vcenter_server": _str(),
+        "username": _str(),
+        "password": _str(),
+        "port": _int(1, 65535),
+        "ssl_verify": BOOL,
+        "inventory_page_size": _int(1),
+        "vm_index_ttl": _number(0),
+        "vm_lookup": _str("index", "search_index"),
+        "task_timeout": _number(0, optional=True),
+        "session_pool_size": _int(1),
+        "session_cookie_file": Field((str, NONE)),
+        "session_health_check_interval": _number(0),
+    },
+    "evs": {
+        "default_cluster_name": _str(),
+        "default_instance_type": _str(),
+        "default_node_count": _int(1),
+        "storage": DICT,
+        "network": DICT,
+    },
+    "security": {
+        "allowed_cidr_blocks": LIST,
+        "ssh_key_name": _str(),
+    },
+    "backup": {
+        "enabled": BOOL,
+        "retention_days": _int(0),
+        "backup_window": _str(),
+    },
+    "monitoring": {
+        "cloudwatch": DICT,
+        "alarms": DICT,
+    },
+    "migration": {
+        "temp_storage_path": _str(),
+        "s3_bucket": _str(),
+        "s3_prefix": _str(),
+        "streaming_export": BOOL,
+        "upload_part_size_mb": _int(5),
+        "upload_concurrency": _int(1),
+        "sparse_streaming": BOOL,
+        "compression": _str("none", "zlib", "zstd", "lz4"),
+        "compression_level": _int(),
+        "dedup": DICT,
+        "state_path": _str(),
+        "max_concurrent_migrations": _int(1),
+        "stage_concurrency": DICT,
+    },
+    "logging": {
+        "level": _str(),
+        "format": _str(),
+        "file": Field((str, NONE)),
+        "max_file_size": Field((str, int)),
+        "backup_count": _int(0),
+        "json": BOOL,
+    },
+    "tags": {},
+    "advanced": {
+        "api_timeout": _number(0),
+        "max_retries": _int(0),
+        "retry_delay": _number(0),
+        "max_retry_delay": _number(0),
+        "retry_mode": _str("legacy", "standard", "adaptive"),
+        "rate_limits": DICT,
+        "max_pool_connections": _int(1),
+        "tcp_keepalive": BOOL,
+        "connect_timeout": _number(0),
+        "async_max_workers": _int(1),
+        "async_max_concurrency": _int(1),
+    },
+}
+
+
+def validate_config(config: Dict[str, Any], path: str = "<config>"):
+    """Check a configuration against ``SCHEMA``; raises ``ConfigValidationError``."""
+    problems = []
+    for section, fields in SCHEMA.items():
+        values = config.get(section)
+        if values is None:
+            continue
+        if not isinstance(values, dict):
+            problems.append(f"{section}: expected a mapping, got {type(values).__name__}")
+            continue
+        for key, field in fields.items():
+            if key in values:
+                problem = _check(field, values[key])
+                if problem:
+                    problems.append(f"{section}.{key}: {problem}")
+    if problems:
+        raise ConfigValidationError(path, problems)
+
+
+def _check(field: Field, value: Any) -> Optional[str]:
+    """Problem with a value, or None."""
+    # bool is an int subclass, but ``port: true`` is a mistake
+    if not isinstance(value, field.types) or (isinstance(value, bool) and bool not in field.types):
+        expected = " or ".join("null" if t is NONE else t.__name__ for t in field.types)
+        return f"expected {expected}, got {type(value).__name__} {value!r}"
+    if field.choices is not None and value not in field.choices:
+        return f"expected one of {', '.join(map(str, field.choices))}, got {value!r}"
+    if field.minimum is not None and value is not None and value < field.minimum:
+        return f"must be at least {field.minimum}, got {value!r}"
+    if field.maximum is not None and value is not None and value > field.maximum:
+        return f"must be at most {field.maximum}, got {value!r}"
+    return None
+
+
+class FrozenConfig(Mapping):
+    """Read-only configuration mapping with attribute access.
+
+    ``config.aws.region`` and ``config["aws"]["region"]`` are equivalent;
+    nested mappings are ``FrozenConfig`` and lists are tuples.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: Mapping):
+        object.__setattr__(self, "_data", {key: freeze(value) for key, value in data.items()})
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__") or name == "_data":
+            raise AttributeError(name)
+        try:
+            return self._data[name]
+        except KeyError:
+            raise AttributeError(f"No configuration key {name!r}") from None
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("Configuration is read-only")
+
+    def __delattr__(self, name: str):
+        raise AttributeError("Configuration is read-only")
+
+    def __repr__(self) -> str:
+        return f"FrozenConfig({self._data!r})"
+
+    def __reduce__(self):
+        return FrozenConfig, (self._data,)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Mutable deep copy."""
+        return thaw(self)
+
+
+def freeze(value: Any) -> Any:
+    """Read-only copy of parsed YAML data."""
+    if isinstance(value, FrozenConfig):
+        return value
+    if isinstance(value, Mapping):
+        return FrozenConfig(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Mutable deep copy of frozen data."""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    return value
+
+
+@dataclass(frozen=True)
+class CompiledConfig:
+    """Parsed, merged and validated contents of a config file and its includes.
+
+    ``files`` records ``(path, mtime_ns, size)`` of every file read, so an
+    unchanged config is recognized with a few ``stat`` calls. ``globs``
+    records ``(pattern, matches)`` of every ``include`` glob, so files
+    added or removed under a glob are noticed too.
+    """
+
+    path: str
+    data: "FrozenConfig"
+    files: Tuple[Tuple[str, int, int], ...]
+    globs: Tuple[Tuple[str, Tuple[str, ...]], ...]
+    digest: str
+
+    def is_current(self) -> bool:
+        """Whether no file changed and no glob gained or lost a match since they were read."""
+        return (
+            all(_file_stamp(path) == (path, mtime, size) for path, mtime, size in self.files)
+            and all(_expand(pattern) == matches for pattern, matches in self.globs)
+        )
+
+
+_cache: Dict[str, CompiledConfig] = {}
+_cache_lock = threading.Lock()
+
+
+def load_compiled(path: str, use_pickle: bool = False) -> CompiledConfig:
+    """Compiled config for ``path``, parsing it only if it changed.
+
+    Parsed configs are cached in-process; with ``use_pickle`` they are
+    also kept in a pickle next to the file for other processes, trusted
+    only when owned by the current user and the content digest matches.
+    """
+    path = os.path.abspath(path)
+    with _cache_lock:
+        compiled = _cache.get(path)
+    if compiled is not None and compiled.is_current():
+        return compiled
+
+    compiled = _load_pickle(path) if use_pickle else None
+    if compiled is None:
+        data, files, globs = _read_with_includes(path, ())
+        validate_config(data, path)
+        compiled = CompiledConfig(
+            path, FrozenConfig(data), tuple(files), tuple(globs), _digest(files, globs)
+        )
+        if use_pickle:
+            _save_pickle(compiled)
+
+    with _cache_lock:
+        _cache[path] = compiled
+    return compiled
+
+
+def clear_config_cache():
+    """Forget every parsed configuration held in this process."""
+    with _cache_lock:
+        _cache.clear()
+
+
+def _read_yaml(path: str) -> Dict[str, Any]:
+    """Parse one YAML file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = yaml.load(f, Loader=_YAML_LOADER) or {}
+    if not isinstance(data, dict):
+        raise ConfigValidationError(path, ["top level must be a mapping"])
+    return data
+
+
+def _read_with_includes(
+    path: str, chain: Tuple[str, ...]
+) -> Tuple[Dict[str, Any], List[Tuple[str, int, int]], List[Tuple[str, Tuple[str, ...]]]]:
+    """Parse a file and the files it includes, includes first.
+
+    ``include`` takes a path or glob (or a list of them) relative to the
+    including file; later files override earlier ones key by key. Returns
+    the merged data, the stamps of every file read and the expansion of
+    every glob.
+    """
+    if path in chain:
+        raise ConfigValidationError(path, [f"include cycle: {' -> '.join(chain + (path,))}"])
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Configuration file not found: {path}")
+
+    files = [_file_stamp(path)]
+    globs: List[Tuple[str, Tuple[str, ...]]] = []
+    data = _read_yaml(path)
+    includes = data.pop("include", None) or []
+    if isinstance(includes, str):
+        includes = [includes]
+
+    merged: Dict[str, Any] = {}
+    base = os.path.dirname(path)
+    for pattern in includes:
+        full_pattern = os.path.join(base, os.path.expanduser(pattern))
+        if glob.has_magic(full_pattern):
+            matches = _expand(full_pattern)
+            globs.append((full_pattern, matches))
+        else:
+            matches = (full_pattern,)
+        for included in matches:
+            included_data, included_files, included_globs = _read_with_includes(
+                os.path.abspath(included), chain + (path,)
+            )
+            merged = _merge(merged, included_data)
+            files.extend(included_files)
+            globs.extend(included_globs)
+    return _merge(merged, data), files, globs
+
+
+def _expand(pattern: str) -> Tuple[str, ...]:
+    """Files currently matching an include glob, in merge order."""
+    return tuple(sorted(glob.glob(pattern)))
+
+
+def _merge(base: Mapping, override: Dict[str, Any]) -> Dict[str, Any]:
+    """Deep-merge mappings; values other than mappings are replaced."""
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, Mapping) and isinstance(merged.get(key), Mapping):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _file_stamp(path: str) -> Tuple[str, int, int]:
+    """``(path, mtime_ns, size)`` of a file; zeros if it is gone."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return path, 0, 0
+    return path, stat.st_mtime_ns, stat.st_size
+
+
+def _digest(
+    files: Sequence[Tuple[str, int, int]], globs: Sequence[Tuple[str, Tuple[str, ...]]]
+) -> str:
+    """Content digest of a set of config files and the glob expansions that selected them."""
+    digest = hashlib.sha256()
+    for path, _, _ in files:
+        digest.update(path.encode("utf-8"))
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    for pattern, matches in globs:
+        digest.update("\0".join((pattern,) + matches).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _pickle_path(path: str) -> str:
+    directory, name = os.path.split(path)
+    return os.path.join(directory, f".{name}.pickle")
+
+
+def _load_pickle(path: str) -> Optional[CompiledConfig]:
+    """Compiled config saved by another process, if still valid."""
+    pickle_path = _pickle_path(path)
+    try:
+        stat = os.stat(pickle_path)
+        # Unpickling runs code: only trust files nobody else could have written
+        if (hasattr(os, "getuid") and stat.st_uid != os.getuid()) or stat.st_mode & 0o022:
+            logger.warning("Ignoring config cache %s: not private to this user", pickle_path)
+            return None
+        with open(pickle_path, "rb") as f:
+            compiled = pickle.load(f)
+        if not isinstance(compiled, CompiledConfig) or compiled.path != path:
+            return None
+        # Digest the globs' current matches, so a file added under one makes the pickle stale
+        globs = tuple((pattern, _expand(pattern)) for pattern, _ in compiled.globs)
+        if _digest(compiled.files, globs) != compiled.digest:
+            return None
+    except (OSError, pickle.PickleError, EOFError, AttributeError, ImportError, ValueError):
+        return None
+    # File times may differ (e.g. after a checkout) while the content matches
+    files = tuple(_file_stamp(file_path) for file_path, _, _ in compiled.files)
+    return CompiledConfig(compiled.path, compiled.data, files, globs, compiled.digest)
+
+
+def _save_pickle(compiled: CompiledConfig):
+    """Write a compiled config next to its file, readable only by this user."""
+    pickle_path = _pickle_path(compiled.path)
+    try:
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(pickle_path), prefix=".config-")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(compiled, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, pickle_path)
+    except OSError as e:
+        logger.debug("Could not write config cache %s: %s", pickle_path, e)
 
 
 class ConfigManager:
-    """Configuration manager for VCF EVS integration."""
-    
-    def __init__(self, config_path: Optional[str] = None):
+    """Configuration manager for VCF EVS integration.
+
+    The file (and any files it includes) is parsed and validated once per
+    process and re-parsed only when it changes. Environment overrides are
+    applied on top of the cached result for each manager. ``config`` is a
+    read-only ``FrozenConfig``; the ``get_*_config`` methods return mutable
+    copies of a section.
+
+    With ``auto_reload`` the file is checked for changes at most every
+    ``reload_interval`` seconds when ``config`` is read, so long-running
+    processes pick up edits; an edit that fails validation is logged and
+    the previous configuration is kept.
+    """
+
+    def __init__(
+        self,
+        config_path: Optional[str] = None,
+        auto_reload: bool = False,
+        reload_interval: float = 1.0,
+        pickle_cache: Optional[bool] = None
+    ):
         """Initialize configuration manager."""
-        self.config_path = config_path or "config/config.yaml"
-        self.config = self._load_config()
-    
-    def _load_config(self) -> Dict[str, Any]:
+        self.config_path = config_path or DEFAULT_CONFIG_PATH
+        self.auto_reload = auto_reload
+        self.reload_interval = reload_interval
+        if pickle_cache is None:
+            pickle_cache = os.getenv(PICKLE_ENV, "").lower() in ("1", "true", "yes")
+        self.pickle_cache = pickle_cache
+        self._listeners: List[Callable[["ConfigManager"], None]] = []
+        self._last_check = time.monotonic()
+        self._compiled = None
+        self._config = self._load_config()
+
+    @property
+    def config(self) -> FrozenConfig:
+        """Current configuration."""
+        if self.auto_reload and time.monotonic() - self._last_check >= self.reload_interval:
+            self.reload_if_changed()
+        return self._config
+
+    def reload(self) -> bool:
+        """Re-read the configuration if any of its files changed; returns whether it did.
+
+        Raises if the changed file cannot be loaded.
+        """
+        self._last_check = time.monotonic()
+        previous = self._compiled
+        config = self._load_config()
+        if self._compiled is previous:
+            return False
+        self._config = config
+        logger.info("Reloaded configuration %s", self.config_path)
+        for listener in list(self._listeners):
+            listener(self)
+        return True
+
+    def reload_if_changed(self) -> bool:
+        """Like ``reload``, but keep the current configuration if the new one is invalid."""
+        try:
+            return self.reload()
+        except (OSError, ValueError, yaml.YAMLError) as e:
+            logger.warning(
+                "Keeping previous configuration; reload of %s failed: %s",
+                self.config_path, e
+            )
+            return False
+
+    def add_listener(self, listener: Callable[["ConfigManager"], None]):
+        """Call ``listener(manager)`` after each reload that changed the configuration."""
+        self._listeners.append(listener)
+
+    def _load_config(self) -> FrozenConfig:
         """Load configuration from YAML file."""
         config_file = Path(self.config_path)
-        
+
         if not config_file.exists():
-            raise FileNotFoundSuccess(f"Configuration file not found: {self.config_path}")
-        
-        with open(config_file, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f) or {}
-        
-        # Override with environment variables
-        config = self._apply_env_overrides(config)
-        
+            raise FileNotFoundError(f"Configuration file not found: {self.config_path}")
+
+        compiled = load_compiled(str(config_file), use_pickle=self.pickle_cache)
+        if compiled is self._compiled:
+            return self._config
+
+        # Override with environment variables; only the overridden sections
+        # are copied, so a manager without overrides shares the cached parse
+        config = compiled.data
+        overrides = self._apply_env_overrides({})
+        if overrides:
+            validate_config(overrides, compiled.path)
+            config = FrozenConfig(_merge(config, overrides))
+
+        self._compiled = compiled
         return config
-    
+
     def _apply_env_overrides(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """Apply environment variable overrides."""
         # AWS configuration
         aws_region = os.getenv('AWS_REGION')
         if aws_region:
             config.setdefault('aws', {})['region'] = aws_region
-        
+
         aws_profile = os.getenv('AWS_PROFILE')
         if aws_profile:
             config.setdefault('aws', {})['profile'] = aws_profile
-        
+
         # VMware configuration
         vcenter_server = os.getenv('VCENTER_SERVER')
         if vcenter_server:
             config.setdefault('vmware', {})['vcenter_server'] = vcenter_server
-        
+
         vcenter_username = os.getenv('VCENTER_USERNAME')
         if vcenter_username:
             config.setdefault('vmware', {})['username'] = vcenter_username
-        
+
         vcenter_password = os.getenv('VCENTER_PASSWORD')
         if vcenter_password:
             config.setdefault('vmware', {})['password'] = vcenter_password
-        
+
         # EVS configuration
         evs_cluster_name = os.getenv('EVS_CLUSTER_NAME')
         if evs_cluster_name:
             config.setdefault('evs', {})['default_cluster_name'] = evs_cluster_name
-        
+
         return config
-    
+
+    def _section(self, name: str) -> Dict[str, Any]:
+        """Mutable copy of a configuration section."""
+        return thaw(self.config.get(name, {}))
+
     def get_aws_config(self) -> Dict[str, Any]:
         """Get AWS configuration."""
-        return self.config.get('aws', {})
-    
+        return self._section('aws')
+
     def get_vmware_config(self) -> Dict[str, Any]:
         """Get VMware configuration."""
-        return self.config.get('vmware', {})
-    
+        return self._section('vmware')
+
     def get_evs_config(self) -> Dict[str, Any]:
         """Get EVS configuration."""
-        return self.config.get('evs', {})
-    
+        return self._section('evs')
+
     def get_security_config(self) -> Dict[str, Any]:
         """Get security configuration."""
-        return self.config.get('security', {})
-    
+        return self._section('security')
+
     def get_monitoring_config(self) -> Dict[str, Any]:
         """Get monitoring configuration."""
-        return self.config.get('monitoring', {})
-    
+        return self._section('monitoring')
+
     def get_migration_config(self) -> Dict[str, Any]:
         """Get migration configuration."""
-        return self.config.get('migration', {})
-    
+        return self._section('migration')
+
+    def get_logging_config(self) -> Dict[str, Any]:
+        """Get logging configuration."""
+        return self._section('logging')
+
+    def get_advanced_config(self) -> Dict[str, Any]:
+        """Get advanced (timeouts, retries, connection pool) configuration."""
+        return self._section('advanced')
+
     def get_tags(self) -> Dict[str, str]:
         """Get resource tags."""
-        return self.config.get('tags', {})
\ No newline at end of file
+        return self._section('tags')
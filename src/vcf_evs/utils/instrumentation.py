@@ -0,0 +1,504 @@
+"""Per-operation latency instrumentation with Prometheus text export."""
+
+import bisect
+import contextlib
+import functools
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
+import logging
+
+from .ratelimit import THROTTLE_CODES, THROTTLE_STATUS_CODES, RateLimiter, is_throttle_error
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Upper bounds in seconds; API calls take milliseconds to minutes,
+# migration stages seconds to hours
+API_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+STAGE_BUCKETS = (1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1200.0, 1800.0, 3600.0, 7200.0, 14400.0)
+
+# Counters exported next to each duration histogram
+COUNTERS = (
+    ("errors", "Failed {kind}s."),
+    ("retries", "Retries performed by the SDK for {kind}s."),
+    ("throttles", "Throttled {kind} attempts."),
+    ("bytes_sent", "Bytes sent by {kind}s."),
+    ("bytes_received", "Bytes received by {kind}s."),
+)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_STARTED = "vcf_evs_started"
+
+
+class Histogram:
+    """Latency histogram with fixed bucket bounds (Prometheus ``le`` semantics)."""
+
+    __slots__ = ("bounds", "counts", "sum", "count", "max")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        """Add one observation."""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+        if value > self.max:
+            self.max = value
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """``(upper bound, observations <= bound)`` pairs ending with ``inf``."""
+        pairs, total = [], 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+    def quantile(self, q: float) -> float:
+        """Estimated ``q`` quantile, interpolated within its bucket."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        lower, seen = 0.0, 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                upper = self.bounds[i] if i < len(self.bounds) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / count, self.max)
+            seen += count
+            if i < len(self.bounds):
+                lower = self.bounds[i]
+        return self.max
+
+
+class OperationStats:
+    """Latency histogram and counters for one API operation or migration stage."""
+
+    def __init__(self, bounds: Sequence[float]):
+        self._lock = threading.Lock()
+        self.histogram = Histogram(bounds)
+        self.errors = 0
+        self.retries = 0
+        self.throttles = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def observe(
+        self,
+        seconds: float,
+        error: bool = False,
+        retries: int = 0,
+        throttles: int = 0,
+        bytes_sent: int = 0,
+        bytes_received: int = 0,
+    ):
+        """Record one completed call."""
+        with self._lock:
+            self.histogram.observe(seconds)
+            self.errors += error
+            self.retries += retries
+            self.throttles += throttles
+            self.bytes_sent += bytes_sent
+            self.bytes_received += bytes_received
+
+    def add(self, throttles: int = 0, bytes_sent: int = 0, bytes_received: int = 0):
+        """Add counters observed outside a timed call (such as per HTTP attempt)."""
+        with self._lock:
+            self.throttles += throttles
+            self.bytes_sent += bytes_sent
+            self.bytes_received += bytes_received
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Counters and latency percentiles in seconds."""
+        with self._lock:
+            histogram = self.histogram
+            return {
+                "calls": histogram.count,
+                "errors": self.errors,
+                "retries": self.retries,
+                "throttles": self.throttles,
+                "bytes_sent": self.bytes_sent,
+                "bytes_received": self.bytes_received,
+                "total_seconds": round(histogram.sum, 6),
+                "mean": round(histogram.sum / histogram.count, 6) if histogram.count else 0.0,
+                "p50": round(histogram.quantile(0.5), 6),
+                "p95": round(histogram.quantile(0.95), 6),
+                "p99": round(histogram.quantile(0.99), 6),
+                "max": round(histogram.max, 6),
+            }
+
+    def snapshot(self) -> Tuple[List[Tuple[float, int]], float, Dict[str, int]]:
+        """Consistent copy of buckets, sum and counters for export."""
+        with self._lock:
+            return self.histogram.cumulative(), self.histogram.sum, {
+                "errors": self.errors,
+                "retries": self.retries,
+                "throttles": self.throttles,
+                "bytes_sent": self.bytes_sent,
+                "bytes_received": self.bytes_received,
+            }
+
+
+class Instrumentation:
+    """Registry of latency histograms and counters for API calls and migration stages.
+
+    API operations are keyed by service (``evs``, ``ec2``, ``s3``,
+    ``cloudwatch``, ``vcenter``) and operation name; boto3 clients and
+    pyVmomi stubs are timed through ``instrument_client`` and
+    ``instrument_stub``. Recording takes one dictionary lookup and a
+    per-operation lock, so it is cheap enough for every call.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        """Initialize empty registry."""
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._operations: Dict[Tuple[str, str], OperationStats] = {}
+        self._stages: Dict[str, OperationStats] = {}
+
+    def operation(self, service: str, operation: str) -> OperationStats:
+        """Stats for one API operation, created on first use."""
+        key = (service, operation)
+        stats = self._operations.get(key)
+        if stats is None:
+            with self._lock:
+                stats = self._operations.setdefault(key, OperationStats(API_BUCKETS))
+        return stats
+
+    def stage(self, name: str) -> OperationStats:
+        """Stats for one migration stage, created on first use."""
+        stats = self._stages.get(name)
+        if stats is None:
+            with self._lock:
+                stats = self._stages.setdefault(name, OperationStats(STAGE_BUCKETS))
+        return stats
+
+    def record_call(self, service: str, operation: str, seconds: float, **counters: Any):
+        """Record one API call; ``counters`` as for ``OperationStats.observe``."""
+        self.operation(service, operation).observe(seconds, **counters)
+
+    def record_stage(self, stage: str, seconds: float, error: bool = False, bytes_transferred: int = 0):
+        """Record one VM's pass through a migration stage."""
+        self.stage(stage).observe(seconds, error=error, bytes_sent=max(bytes_transferred, 0))
+
+    @contextlib.contextmanager
+    def timed(self, service: str, operation: str) -> Iterator[None]:
+        """Time the block as one call; exceptions count as errors (and throttles)."""
+        started = self.clock()
+        try:
+            yield
+        except Exception as e:
+            self.record_call(
+                service, operation, self.clock() - started,
+                error=True, throttles=int(is_throttle_error(e))
+            )
+            raise
+        self.record_call(service, operation, self.clock() - started)
+
+    @contextlib.contextmanager
+    def timed_stage(self, stage: str, context: Optional[Dict[str, Any]] = None) -> Iterator[None]:
+        """Time the block as one migration stage.
+
+        Bytes are taken from the growth of ``context["bytes_transferred"]``.
+        """
+        context = context if context is not None else {}
+        started = self.clock()
+        bytes_before = context.get("bytes_transferred", 0)
+        error = True
+        try:
+            yield
+            error = False
+        finally:
+            self.record_stage(
+                stage, self.clock() - started, error=error,
+                bytes_transferred=int(context.get("bytes_transferred", 0) - bytes_before)
+            )
+
+    def wrap(self, service: str, operation: str, func: Callable[..., T]) -> Callable[..., T]:
+        """Return ``func`` timed with ``timed``."""
+        @functools.wraps(func)
+        def timed_func(*args: Any, **kwargs: Any) -> T:
+            with self.timed(service, operation):
+                return func(*args, **kwargs)
+        return timed_func
+
+    def instrument_client(self, client: Any, service: str):
+        """Time every API call of a boto3 client.
+
+        Latency spans all botocore retries of the call; retries come from
+        ``ResponseMetadata.RetryAttempts``, throttles and request/response
+        bytes are counted per HTTP attempt.
+        """
+        meta = getattr(client, "meta", None)
+        if meta is None:
+            return
+        events = meta.events
+        events.register("before-parameter-build", self._before_call)
+        events.register("after-call", functools.partial(self._after_call, service))
+        events.register("after-call-error", functools.partial(self._after_call_error, service))
+        events.register("before-send", functools.partial(self._before_send, service))
+        events.register("needs-retry", functools.partial(self._on_attempt, service))
+
+    def instrument_stub(self, stub: Any, service: str = "vcenter"):
+        """Time every method call and property read of a pyVmomi stub.
+
+        Wraps the stub's current invokers, so call it once per stub.
+        """
+        for name, prefix in (("InvokeMethod", ""), ("InvokeAccessor", "get:")):
+            invoke = getattr(stub, name, None)
+            if invoke is not None:
+                setattr(stub, name, self._timed_invoke(invoke, service, prefix))
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and percentiles keyed by ``"<service>.<operation>"`` and stage."""
+        with self._lock:
+            operations = sorted(self._operations.items())
+            stages = sorted(self._stages.items())
+        return {
+            "operations": {f"{service}.{name}": stats.to_dict() for (service, name), stats in operations},
+            "stages": {name: stats.to_dict() for name, stats in stages},
+        }
+
+    def reset(self):
+        """Forget everything recorded so far."""
+        with self._lock:
+            self._operations.clear()
+            self._stages.clear()
+
+    def render_prometheus(self, rate_limiter: Optional[RateLimiter] = None) -> str:
+        """Prometheus text exposition of every metric, plus rate limiter counters."""
+        with self._lock:
+            operations = sorted(self._operations.items())
+            stages = sorted(self._stages.items())
+
+        lines: List[str] = []
+        _render_family(
+            lines, "vcf_evs_api_call", "API call",
+            [((("service", service), ("operation", name)), stats) for (service, name), stats in operations],
+        )
+        _render_family(
+            lines, "vcf_evs_migration_stage", "migration stage",
+            [((("stage", name),), stats) for name, stats in stages],
+        )
+        if rate_limiter is not None:
+            _render_rate_limits(lines, rate_limiter.stats())
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str, rate_limiter: Optional[RateLimiter] = None):
+        """Atomically write the exposition to ``path`` (e.g. for a textfile collector)."""
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".metrics-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.render_prometheus(rate_limiter))
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(temp_path)
+            raise
+
+    def serve_prometheus(
+        self, port: int, host: str = "127.0.0.1", rate_limiter: Optional[RateLimiter] = None
+    ) -> Any:
+        """Serve the exposition at ``http://host:port/metrics`` from a background thread.
+
+        Returns the server; call ``shutdown()`` on it to stop.
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        instrumentation = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = instrumentation.render_prometheus(rate_limiter).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any):
+                logger.debug("metrics endpoint: " + format, *args)
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="vcf-evs-metrics", daemon=True).start()
+        logger.info("Serving metrics on http://%s:%s/metrics", host, server.server_address[1])
+        return server
+
+    def _timed_invoke(self, invoke: Callable[..., Any], service: str, prefix: str) -> Callable[..., Any]:
+        @functools.wraps(invoke)
+        def timed_invoke(mo: Any, info: Any, *args: Any) -> Any:
+            stats = self.operation(service, prefix + info.name)
+            started = self.clock()
+            try:
+                result = invoke(mo, info, *args)
+            except Exception as e:
+                stats.observe(self.clock() - started, error=True, throttles=int(is_throttle_error(e)))
+                raise
+            stats.observe(self.clock() - started)
+            return result
+
+        return timed_invoke
+
+    def _before_call(self, context: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
+        """botocore ``before-parameter-build`` hook, the first event of every call."""
+        if context is not None:
+            context[_STARTED] = self.clock()
+        return None
+
+    def _after_call(
+        self,
+        service: str,
+        http_response: Any = None,
+        parsed: Optional[Dict[str, Any]] = None,
+        context: Optional[Dict[str, Any]] = None,
+        event_name: str = "",
+        **kwargs: Any,
+    ) -> None:
+        """botocore ``after-call`` hook, also emitted for error responses."""
+        started = (context or {}).pop(_STARTED, None)
+        if started is None:
+            return None
+        status = getattr(http_response, "status_code", 200)
+        metadata = (parsed or {}).get("ResponseMetadata", {})
+        self.record_call(
+            service, _operation_name(event_name), self.clock() - started,
+            error=status >= 300, retries=metadata.get("RetryAttempts", 0)
+        )
+        return None
+
+    def _after_call_error(
+        self,
+        service: str,
+        exception: Any = None,
+        context: Optional[Dict[str, Any]] = None,
+        event_name: str = "",
+        **kwargs: Any,
+    ) -> None:
+        """botocore ``after-call-error`` hook for calls that got no response."""
+        started = (context or {}).pop(_STARTED, None)
+        if started is not None:
+            self.record_call(service, _operation_name(event_name), self.clock() - started, error=True)
+        return None
+
+    def _before_send(self, service: str, request: Any = None, event_name: str = "", **kwargs: Any) -> None:
+        """botocore ``before-send`` hook; counts request body bytes of each attempt."""
+        length = _content_length(getattr(request, "headers", None))
+        if length:
+            self.operation(service, _operation_name(event_name)).add(bytes_sent=length)
+        return None
+
+    def _on_attempt(
+        self, service: str, response: Any = None, event_name: str = "", **kwargs: Any
+    ) -> None:
+        """botocore ``needs-retry`` hook; counts throttles and response bytes per attempt."""
+        if response is None:
+            return None
+        http_response, parsed = response
+        code = (parsed or {}).get("Error", {}).get("Code")
+        status = getattr(http_response, "status_code", None)
+        throttled = code in THROTTLE_CODES or status in THROTTLE_STATUS_CODES
+        received = _content_length(getattr(http_response, "headers", None))
+        if throttled or received:
+            self.operation(service, _operation_name(event_name)).add(
+                throttles=int(throttled), bytes_received=received
+            )
+        return None
+
+
+def _operation_name(event_name: str) -> str:
+    """Operation from a botocore event name such as ``after-call.evs.ListClusters``."""
+    return event_name.rsplit(".", 1)[-1] or "unknown"
+
+
+def _content_length(headers: Any) -> int:
+    if not headers:
+        return 0
+    try:
+        return int(headers.get("Content-Length") or headers.get("content-length") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(pairs: Sequence[Tuple[str, Any]]) -> str:
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _render_family(
+    lines: List[str],
+    prefix: str,
+    kind: str,
+    series: List[Tuple[Tuple[Tuple[str, Any], ...], OperationStats]],
+):
+    """Append a duration histogram and counters for one kind of operation."""
+    if not series:
+        return
+    snapshots = [(labels, stats.snapshot()) for labels, stats in series]
+
+    name = f"{prefix}_duration_seconds"
+    lines += [f"# HELP {name} Latency of each {kind}.", f"# TYPE {name} histogram"]
+    for labels, (buckets, total, _) in snapshots:
+        for bound, count in buckets:
+            lines.append(f"{name}_bucket{_labels(labels + (('le', _number(bound)),))} {count}")
+        lines.append(f"{name}_sum{_labels(labels)} {_number(total)}")
+        lines.append(f"{name}_count{_labels(labels)} {buckets[-1][1]}")
+
+    for counter, help_text in COUNTERS:
+        name = f"{prefix}_{counter}_total"
+        values = [(labels, counters[counter]) for labels, (_, _, counters) in snapshots]
+        if not any(value for _, value in values):
+            continue
+        lines += [f"# HELP {name} {help_text.format(kind=kind)}", f"# TYPE {name} counter"]
+        lines += [f"{name}{_labels(labels)} {value}" for labels, value in values]
+
+
+def _render_rate_limits(lines: List[str], buckets: Dict[str, Dict[str, Any]]):
+    """Append the shared rate limiter's per-key counters."""
+    if not buckets:
+        return
+    metrics = (
+        ("vcf_evs_rate_limit_wait_seconds_total", "counter", "wait_seconds",
+         "Time spent waiting for rate limiter tokens."),
+        ("vcf_evs_rate_limit_delayed_total", "counter", "delayed", "Calls delayed by the rate limiter."),
+        ("vcf_evs_rate_limit_throttles_total", "counter", "throttles",
+         "Throttling responses seen by the rate limiter."),
+        ("vcf_evs_rate_limit_retries_total", "counter", "retries", "Throttled calls retried by the rate limiter."),
+        ("vcf_evs_rate_limit_rate", "gauge", "rate", "Current allowed requests per second."),
+    )
+    for name, kind, field, help_text in metrics:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        lines += [
+            f"{name}{_labels((('key', key),))} {_number(stats.get(field, 0))}"
+            for key, stats in sorted(buckets.items())
+        ]
+
+
+_default_instrumentation = Instrumentation()
+
+
+def get_instrumentation() -> Instrumentation:
+    """Return the process-wide instrumentation registry."""
+    return _default_instrumentation
@@ -0,0 +1,33 @@
+"""Lazy attribute exports for package ``__init__`` modules."""
+
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(
+    package: str, exports: Dict[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """Build module ``__getattr__``/``__dir__`` that import exports on first access.
+
+    ``exports`` maps each public name to the module defining it, relative
+    to ``package`` when it starts with a dot. Importing the package itself
+    then costs nothing beyond this module; ``from package import Name``
+    imports only the module that defines ``Name``, once, after which the
+    name is a plain module attribute.
+    """
+
+    def __getattr__(name: str) -> Any:
+        module_name = exports.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        if module_name.startswith("."):
+            module_name = package + module_name
+        # __import__ rather than importlib so -X importtime reports the import
+        value = getattr(__import__(module_name, fromlist=[name]), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__
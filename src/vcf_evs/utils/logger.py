@@ -1,14 +1,152 @@
-"""Logging utilities for VCF EVS integration."""
+"""Logging utilities for VCF EVS integration.
 
+Records logged under ``vcf_evs`` are put on a queue by the calling thread
+and written by a single ``QueueListener`` thread, so parallel migrations
+never block on console or file I/O. ``log_context`` tags every record
+logged inside it (including from worker threads started with
+``contextvars.copy_context``) with a correlation ID and operation fields
+such as the VM or cluster name.
+"""
+
+import atexit
+import contextlib
+import contextvars
+import copy
+import json
 import logging
+import logging.handlers
+import queue
+import re
 import sys
 import os
+import threading
+import uuid
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Iterator, Mapping, Optional, Union
+
+LOGGER_NAME = "vcf_evs"
+DEFAULT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_SIZE_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+
+_context: contextvars.ContextVar[Dict[str, Any]] = contextvars.ContextVar(
+    "vcf_evs_log_context", default={}
+)
+
+# LogRecord attributes that are not ``extra=`` fields
+_RECORD_ATTRIBUTES = frozenset(
+    vars(logging.LogRecord("", 0, "", 0, "", (), None))
+) | {"message", "asctime", "correlation_id", "log_context", "taskName"}
+
+_setup_lock = threading.Lock()
+_queue_handler: Optional[logging.Handler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def new_correlation_id() -> str:
+    """Short random ID for one operation."""
+    return uuid.uuid4().hex[:12]
+
+
+@contextlib.contextmanager
+def log_context(correlation_id: Optional[str] = None, **fields: Any) -> Iterator[str]:
+    """Tag records logged inside the block with ``fields`` and a correlation ID.
+
+    Fields of an enclosing block are kept; its correlation ID becomes
+    ``parent_id``. Yields the block's correlation ID.
+    """
+    current = _context.get()
+    correlation_id = correlation_id or new_correlation_id()
+    values = dict(current, **{key: value for key, value in fields.items() if value is not None})
+    if current.get("correlation_id"):
+        values["parent_id"] = current["correlation_id"]
+    values["correlation_id"] = correlation_id
+    token = _context.set(values)
+    try:
+        yield correlation_id
+    finally:
+        _context.reset(token)
+
+
+def current_log_context() -> Dict[str, Any]:
+    """Fields set by the enclosing ``log_context`` blocks."""
+    return dict(_context.get())
+
+
+class ContextFilter(logging.Filter):
+    """Copy the current ``log_context`` onto each record.
+
+    Sets ``correlation_id`` ("-" outside any block) so text formats can
+    use ``%(correlation_id)s``.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = _context.get()
+        record.log_context = context
+        if not hasattr(record, "correlation_id"):
+            record.correlation_id = context.get("correlation_id", "-")
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with context and ``extra=`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        entry.update(getattr(record, "log_context", None) or {})
+        entry.update(
+            (key, value) for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES
+        )
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
 
 
-def setup_logging(level: str = "INFO", log_file: Optional[str] = None) -> logging.Logger:
-    """Set up logging configuration."""
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that leaves formatting to the listener's handlers.
+
+    The message is merged and any traceback rendered in the calling
+    thread (the arguments may change after it returns), but the record
+    keeps its fields so the listener can render text or JSON.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def setup_logging(
+    level: str = "INFO",
+    log_file: Optional[str] = None,
+    json_format: bool = False,
+    max_file_size: Union[int, str, None] = None,
+    backup_count: int = 0,
+    fmt: Optional[str] = None
+) -> logging.Logger:
+    """Set up logging configuration.
+
+    Calling it again replaces the handlers of the previous call rather
+    than adding more. With ``max_file_size`` (bytes or a size such as
+    ``"10MB"``) the log file is rotated, keeping ``backup_count`` old files.
+    """
     
     # Validate log level
     valid_levels = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
@@ -16,30 +154,86 @@ def setup_logging(level: str = "INFO", log_file: Optional[str] = None) -> loggin
         level = 'INFO'
     
     # Create logger
-    logger = logging.getLogger("vcf_evs")
+    logger = logging.getLogger(LOGGER_NAME)
     logger.setLevel(getattr(logging, level.upper()))
     
     # Create formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
+    formatter = JsonFormatter() if json_format else logging.Formatter(fmt or DEFAULT_FORMAT)
     
     # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    handlers = [logging.StreamHandler(sys.stdout)]
     
     # File handler (if specified)
     if log_file:
         # Sanitize log file path to prevent path traversal
         safe_log_file = _safe_log_path(log_file)
-        file_handler = logging.FileHandler(safe_log_file)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        max_bytes = parse_size(max_file_size) if max_file_size else 0
+        if max_bytes:
+            handlers.append(logging.handlers.RotatingFileHandler(
+                safe_log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8'
+            ))
+        else:
+            handlers.append(logging.FileHandler(safe_log_file, encoding='utf-8'))
+    
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    global _queue_handler, _listener
+    with _setup_lock:
+        _shutdown_locked(logger)
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        _queue_handler = _QueueHandler(log_queue)
+        _queue_handler.addFilter(ContextFilter())
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        logger.addHandler(_queue_handler)
     
     return logger
 
 
+def configure_logging(logging_config: Mapping[str, Any]) -> logging.Logger:
+    """``setup_logging`` from the ``logging`` config section."""
+    return setup_logging(
+        level=logging_config.get("level", "INFO"),
+        log_file=logging_config.get("file"),
+        json_format=logging_config.get("json", False),
+        max_file_size=logging_config.get("max_file_size"),
+        backup_count=logging_config.get("backup_count", 0),
+        fmt=logging_config.get("format"),
+    )
+
+
+def shutdown_logging():
+    """Flush queued records and remove the handlers installed by ``setup_logging``."""
+    with _setup_lock:
+        _shutdown_locked(logging.getLogger(LOGGER_NAME))
+
+
+def _shutdown_locked(logger: logging.Logger):
+    global _queue_handler, _listener
+    if _queue_handler is not None:
+        logger.removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
+
+
+def parse_size(size: Union[int, str]) -> int:
+    """Bytes in a size such as ``10MB``, ``512K`` or ``1048576``."""
+    if isinstance(size, int):
+        return size
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([KMG]?)(?:I?B)?\s*', str(size), re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Invalid size: {size!r}")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).upper()])
+
+
 def _safe_log_path(log_file: str) -> str:
     """Sanitize log file path to prevent path traversal and command injection."""
     if not log_file or not isinstance(log_file, str):
@@ -0,0 +1,331 @@
+"""Client-side rate limiting with adaptive (AIMD) throttling."""
+
+import functools
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Optional, TypeVar
+import logging
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Sustained requests per second and burst size per service; ``None`` disables
+# limiting (vCenter calls are still retried on throttling)
+DEFAULT_RATE_LIMITS: Dict[str, Dict[str, Any]] = {
+    "default": {"rate": 10.0, "burst": 20},
+    "evs": {"rate": 5.0, "burst": 10},
+    "ec2": {"rate": 20.0, "burst": 40},
+    "cloudwatch": {"rate": 20.0, "burst": 40},
+    "s3": {"rate": None},
+    "vcenter": {"rate": None},
+}
+
+THROTTLE_CODES = frozenset({
+    "Throttling",
+    "ThrottlingException",
+    "ThrottledException",
+    "RequestThrottled",
+    "RequestThrottledException",
+    "RequestLimitExceeded",
+    "TooManyRequestsException",
+    "ProvisionedThroughputExceededException",
+    "BandwidthLimitExceeded",
+    "SlowDown",
+    "EC2ThrottledException",
+})
+
+THROTTLE_STATUS_CODES = frozenset({429, 503})
+
+
+def is_throttle_error(error: BaseException) -> bool:
+    """Whether an AWS or vCenter error means the server is rejecting load."""
+    response = getattr(error, "response", None)
+    if isinstance(response, dict):
+        code = response.get("Error", {}).get("Code")
+        status = response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+        return code in THROTTLE_CODES or status in THROTTLE_STATUS_CODES
+    status = getattr(error, "status", None) or getattr(error, "code", None)
+    if status in THROTTLE_STATUS_CODES:
+        return True
+    return "Too Many Requests" in str(error) or "Service Unavailable" in str(error)
+
+
+@dataclass
+class BucketStats:
+    """Counters for one token bucket."""
+
+    acquired: int = 0
+    delayed: int = 0
+    wait_seconds: float = 0.0
+    max_wait: float = 0.0
+    throttles: int = 0
+    retries: int = 0
+    rate: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dictionary of counters."""
+        return asdict(self)
+
+
+class TokenBucket:
+    """Token bucket whose refill rate adapts to throttling (AIMD).
+
+    ``acquire`` reserves a token and sleeps until it is available, so
+    concurrent callers are served in arrival order. A throttle response
+    multiplies the rate by ``decrease`` (at most once per ``cooldown``
+    seconds, since one burst usually yields several throttles); every
+    success adds ``increase`` back, up to the configured ``max_rate``.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        min_rate: Optional[float] = None,
+        increase: float = 0.1,
+        decrease: float = 0.5,
+        cooldown: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """Initialize bucket starting full at ``rate`` tokens per second."""
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1.0, rate))
+        self.min_rate = min_rate if min_rate is not None else min(1.0, rate) / 10
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.clock = clock
+        self.sleep = sleep
+        self.stats = BucketStats(rate=self.rate)
+
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated = clock()
+        self._last_decrease = float("-inf")
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens, sleeping if necessary; returns seconds waited."""
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+            self.stats.acquired += 1
+            if wait > 0:
+                self.stats.delayed += 1
+                self.stats.wait_seconds += wait
+                self.stats.max_wait = max(self.stats.max_wait, wait)
+
+        if wait > 0:
+            self.sleep(wait)
+        return wait
+
+    def on_success(self):
+        """Additively raise the rate after a successful call."""
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.increase)
+                self.stats.rate = self.rate
+
+    def on_throttle(self):
+        """Multiplicatively cut the rate after a throttle response."""
+        with self._lock:
+            self.stats.throttles += 1
+            now = self.clock()
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self.stats.rate = self.rate
+            # Drop saved-up burst so the lower rate takes effect immediately
+            self._tokens = min(self._tokens, 0.0)
+        logger.debug("Throttled; rate reduced to %.2f/s", self.rate)
+
+
+class RateLimiter:
+    """Registry of token buckets keyed by API and endpoint.
+
+    Keys look like ``"evs:us-west-2"`` or ``"vcenter:vc01.example.com"``;
+    the part before the colon selects the settings from ``rate_limits``.
+    ``call``/``wrap`` additionally retry throttled calls up to
+    ``max_retries`` times with full-jitter exponential backoff starting at
+    ``retry_delay`` seconds.
+    """
+
+    def __init__(
+        self,
+        rate_limits: Optional[Dict[str, Dict[str, Any]]] = None,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
+        max_retry_delay: float = 60.0,
+        enabled: bool = True,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """Initialize limiter with per-service settings merged over the defaults."""
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Optional[TokenBucket]] = {}
+        self.sleep = sleep
+        self.configure(rate_limits, max_retries, retry_delay, max_retry_delay, enabled)
+
+    @classmethod
+    def from_config(cls, advanced: Optional[Dict[str, Any]] = None) -> "RateLimiter":
+        """Build a limiter from the ``advanced`` config section."""
+        limiter = cls()
+        limiter.configure_from(advanced)
+        return limiter
+
+    def configure_from(self, advanced: Optional[Dict[str, Any]] = None):
+        """Apply ``rate_limits``, ``max_retries`` and ``retry_delay`` from ``advanced``."""
+        advanced = advanced or {}
+        rate_limits = dict(advanced.get("rate_limits") or {})
+        enabled = rate_limits.pop("enabled", True)
+        self.configure(
+            rate_limits,
+            max_retries=advanced.get("max_retries", 3),
+            retry_delay=advanced.get("retry_delay", 1.0),
+            max_retry_delay=advanced.get("max_retry_delay", 60.0),
+            enabled=enabled,
+        )
+
+    def configure(
+        self,
+        rate_limits: Optional[Dict[str, Dict[str, Any]]] = None,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
+        max_retry_delay: float = 60.0,
+        enabled: bool = True,
+    ):
+        """Replace settings; existing buckets are rebuilt on next use."""
+        limits = {name: dict(settings) for name, settings in DEFAULT_RATE_LIMITS.items()}
+        for name, settings in (rate_limits or {}).items():
+            limits.setdefault(name, {}).update(settings or {})
+
+        with self._lock:
+            self.rate_limits = limits
+            self.max_retries = max_retries
+            self.retry_delay = retry_delay
+            self.max_retry_delay = max_retry_delay
+            self.enabled = enabled
+            self._buckets.clear()
+
+    def bucket(self, key: str) -> Optional[TokenBucket]:
+        """Return the bucket for a key, or ``None`` when the key is unlimited."""
+        with self._lock:
+            if key not in self._buckets:
+                settings = self.rate_limits.get(key.split(":", 1)[0], self.rate_limits["default"])
+                rate = settings.get("rate")
+                self._buckets[key] = (
+                    TokenBucket(
+                        rate,
+                        burst=settings.get("burst"),
+                        min_rate=settings.get("min_rate"),
+                        increase=settings.get("increase", 0.1),
+                        decrease=settings.get("decrease", 0.5),
+                    )
+                    if self.enabled and rate else None
+                )
+            return self._buckets[key]
+
+    def acquire(self, key: str) -> float:
+        """Wait for a token for ``key``; returns seconds waited."""
+        bucket = self.bucket(key)
+        return bucket.acquire() if bucket else 0.0
+
+    def record(self, key: str, throttled: bool):
+        """Feed a call outcome back into the bucket's rate."""
+        bucket = self.bucket(key)
+        if bucket is None:
+            return
+        if throttled:
+            bucket.on_throttle()
+        else:
+            bucket.on_success()
+
+    def call(self, key: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Call ``func`` under the limiter, retrying throttled attempts."""
+        attempt = 0
+        while True:
+            self.acquire(key)
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                if not is_throttle_error(e):
+                    raise
+                self.record(key, throttled=True)
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff(attempt)
+                attempt += 1
+                bucket = self.bucket(key)
+                if bucket:
+                    bucket.stats.retries += 1
+                logger.warning(
+                    "Throttled on %s; retry %s/%s in %.1fs",
+                    key, attempt, self.max_retries, delay
+                )
+                self.sleep(delay)
+                continue
+            self.record(key, throttled=False)
+            return result
+
+    def wrap(self, key: str, func: Callable[..., T]) -> Callable[..., T]:
+        """Return ``func`` wrapped with ``call``."""
+        @functools.wraps(func)
+        def limited(*args: Any, **kwargs: Any) -> T:
+            return self.call(key, func, *args, **kwargs)
+        return limited
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential delay before retry ``attempt + 1``."""
+        return random.uniform(0, min(self.max_retry_delay, self.retry_delay * 2 ** attempt))
+
+    def instrument_client(self, client: Any, key: str):
+        """Rate-limit every HTTP attempt of a boto3 client, including botocore retries.
+
+        Throttling responses and successful calls adjust the rate; retry
+        decisions and backoff stay with botocore's retry handler.
+        """
+        meta = getattr(client, "meta", None)
+        if meta is None:
+            return
+        events = meta.events
+        events.register("before-send", lambda **kwargs: self._before_send(key))
+        events.register("needs-retry", functools.partial(self._on_response, key))
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Counters of every active bucket, keyed by bucket key."""
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {key: bucket.stats.to_dict() for key, bucket in buckets.items() if bucket}
+
+    def _before_send(self, key: str) -> None:
+        """botocore ``before-send`` hook; returning ``None`` lets the request proceed."""
+        self.acquire(key)
+
+    def _on_response(self, key: str, response: Any = None, caught_exception: Any = None, **kwargs: Any) -> None:
+        """botocore ``needs-retry`` hook; observes the outcome without deciding retries."""
+        if caught_exception is not None or response is None:
+            return None
+        http_response, parsed = response
+        code = (parsed or {}).get("Error", {}).get("Code")
+        status = getattr(http_response, "status_code", None)
+        self.record(key, throttled=code in THROTTLE_CODES or status in THROTTLE_STATUS_CODES)
+        return None
+
+
+_default_limiter = RateLimiter()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide rate limiter."""
+    return _default_limiter
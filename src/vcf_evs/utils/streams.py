@@ -0,0 +1,41 @@
+"""Helpers for iterators of byte chunks."""
+
+from typing import Iterable, Iterator, List, Tuple
+import itertools
+
+
+def rechunk(chunks: Iterable[bytes], size: int) -> Iterator[bytes]:
+    """Regroup arbitrarily sized chunks into fixed-size parts.
+
+    Every part except the last is exactly ``size`` bytes; empty chunks are
+    dropped.
+    """
+    buffer: List[bytes] = []
+    buffered = 0
+    for chunk in chunks:
+        if not chunk:
+            continue
+        buffer.append(chunk)
+        buffered += len(chunk)
+        while buffered >= size:
+            joined = b"".join(buffer)
+            yield joined[:size]
+            rest = joined[size:]
+            buffer = [rest] if rest else []
+            buffered = len(rest)
+    if buffered:
+        yield b"".join(buffer)
+
+
+def peek(chunks: Iterable[bytes], size: int) -> Tuple[bytes, Iterator[bytes]]:
+    """Return up to ``size`` leading bytes and an iterator over the whole stream."""
+    iterator = iter(chunks)
+    head: List[bytes] = []
+    buffered = 0
+    while buffered < size:
+        chunk = next(iterator, None)
+        if chunk is None:
+            break
+        head.append(chunk)
+        buffered += len(chunk)
+    return b"".join(head)[:size], itertools.chain(head, iterator)
@@ -1,5 +1,44 @@
 """VMware vCenter integration modules."""
 
-from .vcenter_client import VCenterClient
+from typing import TYPE_CHECKING
 
-__all__ = ["VCenterClient"]
\ No newline at end of file
+from ..utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .vcenter_client import VCenterClient
+    from .async_client import AsyncVCenterClient
+    from .export import ExportFile, ExportResult, LeaseExporter
+    from .inventory import InventoryCollector
+    from .inventory_sync import InventoryEvent, InventoryMirror
+    from .session_pool import PooledSession, VCenterSessionPool, get_session_pool
+    from .snapshot_catalog import CleanupResult, SnapshotCatalog, SnapshotRecord
+    from .snapshots import GroupSnapshot, GroupSnapshotError, GroupSnapshotter
+    from .tasks import TaskOutcome, TaskWaiter
+    from .vm_index import VMIndex
+
+_EXPORTS = {
+    "VCenterClient": ".vcenter_client",
+    "AsyncVCenterClient": ".async_client",
+    "ExportFile": ".export",
+    "ExportResult": ".export",
+    "LeaseExporter": ".export",
+    "InventoryCollector": ".inventory",
+    "InventoryEvent": ".inventory_sync",
+    "InventoryMirror": ".inventory_sync",
+    "PooledSession": ".session_pool",
+    "VCenterSessionPool": ".session_pool",
+    "get_session_pool": ".session_pool",
+    "CleanupResult": ".snapshot_catalog",
+    "SnapshotCatalog": ".snapshot_catalog",
+    "SnapshotRecord": ".snapshot_catalog",
+    "GroupSnapshot": ".snapshots",
+    "GroupSnapshotError": ".snapshots",
+    "GroupSnapshotter": ".snapshots",
+    "TaskOutcome": ".tasks",
+    "TaskWaiter": ".tasks",
+    "VMIndex": ".vm_index",
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
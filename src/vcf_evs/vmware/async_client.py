@@ -0,0 +1,116 @@
+"""Asyncio counterpart of ``VCenterClient``."""
+
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+import logging
+
+from pyVmomi import vim
+
+from ..utils.aio import AsyncRunner, iterate_in_executor
+from .export import ExportResult, ExportSink
+from .tasks import ProgressCallback, TaskOutcome
+from .vcenter_client import VCenterClient
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncVCenterClient:
+    """Awaitable vCenter operations backed by a ``VCenterClient``.
+
+    pyVmomi calls block on SOAP round-trips, so they run on the runner's
+    bounded thread pool over the client's shared session. Long waits for
+    vCenter tasks go through the client's ``TaskWaiter``, so many awaited
+    snapshots or reverts still share one property filter per call.
+    """
+
+    def __init__(self, client: VCenterClient, runner: Optional[AsyncRunner] = None):
+        """Wrap a connected ``VCenterClient``."""
+        self.client = client
+        self._owns_runner = runner is None
+        self.runner = runner or AsyncRunner()
+
+    @classmethod
+    async def connect(
+        cls, config: Dict[str, Any], runner: Optional[AsyncRunner] = None
+    ) -> "AsyncVCenterClient":
+        """Connect to vCenter without blocking the event loop.
+
+        A ``runner`` passed in stays open after ``disconnect``; one created
+        here is closed with the client.
+        """
+        owned = runner is None
+        runner = runner or AsyncRunner()
+        client = await runner.run(VCenterClient, config)
+        instance = cls(client, runner)
+        instance._owns_runner = owned
+        return instance
+
+    async def get_vm_info(self, vm_name: str) -> Dict[str, Any]:
+        """Get VM information by name."""
+        return await self.runner.run(self.client.get_vm_info, vm_name)
+
+    async def get_vm_infos(
+        self, vm_names: Sequence[str], return_exceptions: bool = False
+    ) -> Dict[str, Any]:
+        """Look up many VMs concurrently, keyed by name."""
+        results = await self.runner.map(
+            self.client.get_vm_info, vm_names, return_exceptions=return_exceptions
+        )
+        return dict(zip(vm_names, results))
+
+    async def list_vms(self) -> List[Dict[str, Any]]:
+        """List all VMs in vCenter."""
+        return await self.runner.run(self.client.list_vms)
+
+    async def iter_vm_pages(
+        self, properties: Optional[Sequence[str]] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Stream VM property records page by page."""
+        async for page in iterate_in_executor(self.runner, self.client.iter_vm_pages(properties)):
+            yield page
+
+    async def create_snapshot(self, vm_name: str, description: str) -> str:
+        """Create VM snapshot."""
+        return await self.runner.run(self.client.create_snapshot, vm_name, description)
+
+    async def revert_to_snapshot(self, vm_name: str, snapshot_id: str) -> bool:
+        """Revert VM to snapshot."""
+        return await self.runner.run(self.client.revert_to_snapshot, vm_name, snapshot_id)
+
+    async def export_vm(
+        self, vm_name: str, sink: ExportSink, stream_optimized: bool = True
+    ) -> ExportResult:
+        """Stream VM disks from an export lease into a sink."""
+        return await self.runner.run(
+            self.client.export_vm, vm_name, sink, stream_optimized, timeout=None
+        )
+
+    async def wait_for_tasks(
+        self,
+        tasks: Sequence[vim.Task],
+        timeout: Optional[float] = None,
+        on_progress: Optional[ProgressCallback] = None,
+        raise_on_error: bool = True,
+    ) -> List[TaskOutcome]:
+        """Wait for several vCenter tasks at once.
+
+        ``timeout`` is enforced by the ``TaskWaiter`` itself, which cancels
+        its property filter cleanly, rather than by the runner.
+        """
+        return await self.runner.run(
+            self.client.wait_for_tasks, tasks, timeout, on_progress, raise_on_error, timeout=None
+        )
+
+    async def disconnect(self):
+        """Disconnect from vCenter and release the runner if owned."""
+        await self.runner.run(self.client.disconnect, timeout=None)
+        if self._owns_runner:
+            await asyncio.get_event_loop().run_in_executor(None, self.runner.close)
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.disconnect()
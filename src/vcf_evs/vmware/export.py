@@ -0,0 +1,248 @@
+"""Streaming VM export through an HttpNfcLease."""
+
+from pyVmomi import vim
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+import logging
+
+import requests
+
+from .tasks import TaskWaiter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# Accept headers for NFC disk downloads: deflated streamOptimized VMDK or raw disk data
+STREAM_VMDK_TYPE = "application/x-vnd.vmware-streamVmdk"
+FLAT_DISK_TYPE = "application/octet-stream"
+
+# vCenter expires idle leases after 5 minutes; report progress well before that
+DEFAULT_KEEPALIVE_INTERVAL = 60.0
+
+
+@dataclass
+class ExportFile:
+    """File offered by an export lease (usually one VMDK per disk)."""
+
+    name: str
+    url: str
+    device_key: str
+    disk: bool
+    size: Optional[int] = None
+
+
+@dataclass
+class ExportResult:
+    """Outcome of a streamed VM export."""
+
+    vm_name: str
+    ovf_descriptor: str
+    files: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def total_bytes(self) -> int:
+        """Bytes streamed across all exported files."""
+        return sum(f["size"] for f in self.files)
+
+
+ExportSink = Callable[[ExportFile, Iterator[bytes]], Any]
+
+
+class _LeaseKeepAlive:
+    """Report lease progress periodically so the lease does not time out."""
+
+    def __init__(self, lease: vim.HttpNfcLease, total_bytes: int, interval: float):
+        self.lease = lease
+        self.total_bytes = max(total_bytes, 1)
+        self.interval = interval
+        self.transferred = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="vcf-evs-lease-keepalive", daemon=True
+        )
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._stop.set()
+        self._thread.join()
+
+    def add(self, nbytes: int):
+        self.transferred += nbytes
+
+    @property
+    def percent(self) -> int:
+        return min(99, int(self.transferred * 100 / self.total_bytes))
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.lease.HttpNfcLeaseProgress(percent=self.percent)
+            except Exception as e:
+                logger.warning("Failed to update export lease progress: %s", e)
+
+
+class LeaseExporter:
+    """Export a VM by streaming disk contents straight from an ``ExportVm`` lease.
+
+    Disk bytes are handed to a caller-supplied sink as an iterator of chunks
+    (for example an S3 multipart uploader), so no local staging copy of the
+    VM is ever written unless the sink chooses to. Disks are requested as
+    streamOptimized VMDKs unless ``stream_optimized`` is off, in which case
+    the flat disk content is requested for sinks that compress it themselves.
+    """
+
+    def __init__(
+        self,
+        content: Any,
+        host: str,
+        session_cookie: Optional[str] = None,
+        ssl_verify: bool = True,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        keepalive_interval: float = DEFAULT_KEEPALIVE_INTERVAL,
+        lease_timeout: float = 300.0,
+        http_session: Optional[requests.Session] = None,
+        stream_optimized: bool = True,
+    ):
+        """Initialize exporter for a vCenter ``ServiceContent``."""
+        self.content = content
+        self.host = host
+        self.session_cookie = session_cookie
+        self.ssl_verify = ssl_verify
+        self.chunk_size = chunk_size
+        self.keepalive_interval = keepalive_interval
+        self.lease_timeout = lease_timeout
+        self.http = http_session or requests.Session()
+        self.stream_optimized = stream_optimized
+        self._waiter = TaskWaiter(content)
+
+    def export(
+        self, vm: vim.VirtualMachine, sink: ExportSink, name: Optional[str] = None
+    ) -> ExportResult:
+        """Stream every file of the VM into ``sink`` and build its OVF descriptor."""
+        vm_name = name or vm.name
+        lease = vm.ExportVm()
+        try:
+            state = self._waiter.wait_for_state(
+                lease, "state", ["ready", "error"], timeout=self.lease_timeout
+            )
+            if str(state) == "error":
+                raise RuntimeError(f"Export lease failed for VM {vm_name}: {lease.error}")
+
+            info = lease.info
+            files = self._export_files(info, vm_name)
+            total_bytes = (info.totalDiskCapacityInKB or 0) * 1024
+
+            result = ExportResult(vm_name=vm_name, ovf_descriptor="")
+            ovf_files = []
+            with _LeaseKeepAlive(lease, total_bytes, self.keepalive_interval) as keepalive:
+                for export_file in files:
+                    counter = {"size": 0}
+                    stream = self._stream(export_file, keepalive, counter)
+                    sink_result = sink(export_file, stream)
+                    # Drain anything the sink did not consume so sizes are exact
+                    for _ in stream:
+                        pass
+
+                    result.files.append({
+                        "name": export_file.name,
+                        "size": counter["size"],
+                        "disk": export_file.disk,
+                        "result": sink_result,
+                    })
+                    ovf_files.append(vim.OvfManager.OvfFile(
+                        deviceId=export_file.device_key,
+                        path=export_file.name,
+                        size=counter["size"],
+                    ))
+
+            result.ovf_descriptor = self._create_descriptor(vm, vm_name, ovf_files)
+            lease.HttpNfcLeaseProgress(percent=100)
+            lease.HttpNfcLeaseComplete()
+            logger.info(
+                "Exported %s files (%s bytes) for VM %s",
+                len(files), result.total_bytes, vm_name
+            )
+            return result
+
+        except Exception:
+            try:
+                lease.HttpNfcLeaseAbort()
+            except Exception as abort_error:
+                logger.debug("Failed to abort export lease: %s", abort_error)
+            raise
+
+    def _export_files(self, info: Any, vm_name: str) -> List[ExportFile]:
+        """Describe the files offered by the lease."""
+        files = []
+        for index, device_url in enumerate(info.deviceUrl or []):
+            name = device_url.targetId or f"{vm_name}-{index}.vmdk"
+            files.append(ExportFile(
+                name=name,
+                url=self._resolve_url(device_url.url),
+                device_key=device_url.key,
+                disk=bool(device_url.disk),
+                size=device_url.fileSize,
+            ))
+        return files
+
+    def _resolve_url(self, url: str) -> str:
+        """Replace the '*' host placeholder vCenter uses in lease URLs."""
+        parts = urlsplit(url)
+        if parts.hostname == "*":
+            netloc = self.host + (f":{parts.port}" if parts.port else "")
+            parts = parts._replace(netloc=netloc)
+        return urlunsplit(parts)
+
+    def _stream(
+        self, export_file: ExportFile, keepalive: _LeaseKeepAlive, counter: Dict[str, int]
+    ) -> Iterator[bytes]:
+        """Yield the file's bytes as they arrive from the host."""
+        headers = {"Accept": STREAM_VMDK_TYPE if self.stream_optimized else FLAT_DISK_TYPE}
+        if self.session_cookie:
+            headers["Cookie"] = self.session_cookie
+
+        with self.http.get(
+            export_file.url, headers=headers, stream=True, verify=self.ssl_verify, timeout=60
+        ) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=self.chunk_size):
+                if not chunk:
+                    continue
+                counter["size"] += len(chunk)
+                keepalive.add(len(chunk))
+                yield chunk
+
+    def _create_descriptor(
+        self, vm: vim.VirtualMachine, vm_name: str, ovf_files: List[Any]
+    ) -> str:
+        """Ask vCenter for the OVF descriptor matching the exported files."""
+        params = vim.OvfManager.CreateDescriptorParams(name=vm_name, ovfFiles=ovf_files)
+        descriptor = self.content.ovfManager.CreateDescriptor(obj=vm, cdp=params)
+        if descriptor.error:
+            raise RuntimeError(
+                f"Failed to create OVF descriptor for {vm_name}: "
+                f"{', '.join(str(getattr(e, 'localizedMessage', e)) for e in descriptor.error)}"
+            )
+        return descriptor.ovfDescriptor
+
+
+def directory_sink(directory: str) -> ExportSink:
+    """Build a sink writing exported files into a local directory."""
+    target = Path(directory)
+    target.mkdir(parents=True, exist_ok=True)
+
+    def write(export_file: ExportFile, chunks: Iterator[bytes]) -> str:
+        path = target / Path(export_file.name).name
+        with open(path, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+        return str(path)
+
+    return write
@@ -0,0 +1,126 @@
+"""Bulk vCenter inventory retrieval through the PropertyCollector."""
+
+from pyVmomi import vim, vmodl
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Type
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Properties needed to render the VM summary returned by VCenterClient.list_vms
+VM_SUMMARY_PROPERTIES = ["name", "runtime.powerState", "config.guestFullName"]
+
+DEFAULT_PAGE_SIZE = 1000
+
+
+class InventoryCollector:
+    """Stream managed object properties in bulk, one page per round-trip.
+
+    Instead of touching lazy attributes on every managed object (one SOAP
+    call per attribute per object), a single filter spec is sent to the
+    PropertyCollector and results are paged with ``RetrievePropertiesEx`` /
+    ``ContinueRetrievePropertiesEx``.
+    """
+
+    def __init__(self, content: Any, page_size: int = DEFAULT_PAGE_SIZE):
+        """Initialize collector for a vCenter ``ServiceContent``."""
+        if page_size < 1:
+            raise ValueError("page_size must be a positive integer")
+
+        self.content = content
+        self.page_size = page_size
+
+    def iter_pages(
+        self,
+        obj_type: Type[vim.ManagedEntity],
+        properties: Sequence[str],
+        container: Optional[vim.ManagedEntity] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yield pages of property records for every object of ``obj_type``.
+
+        Each record maps the requested property paths to their values (``None``
+        when unset on the server) and carries the managed object reference
+        under ``obj`` and its identifier under ``moid``.
+        """
+        properties = list(properties)
+        collector = self.content.propertyCollector
+        container_view = self.content.viewManager.CreateContainerView(
+            container or self.content.rootFolder, [obj_type], True
+        )
+        token = None
+        try:
+            filter_spec = build_filter_spec(container_view, obj_type, properties)
+            options = vmodl.query.PropertyCollector.RetrieveOptions(
+                maxObjects=self.page_size
+            )
+
+            result = collector.RetrievePropertiesEx(
+                specSet=[filter_spec], options=options
+            )
+            while result is not None:
+                token = result.token
+                yield [to_record(obj, properties) for obj in result.objects]
+
+                if not token:
+                    break
+                result = collector.ContinueRetrievePropertiesEx(token=token)
+                token = None
+        finally:
+            if token:
+                # Consumer stopped early; release the server-side result set
+                try:
+                    collector.CancelRetrievePropertiesEx(token=token)
+                except Exception as e:
+                    logger.debug("Failed to cancel property retrieval: %s", e)
+            container_view.Destroy()
+
+    def iter_objects(
+        self,
+        obj_type: Type[vim.ManagedEntity],
+        properties: Sequence[str],
+        container: Optional[vim.ManagedEntity] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield property records one object at a time."""
+        for page in self.iter_pages(obj_type, properties, container):
+            yield from page
+
+    def iter_vm_pages(
+        self, properties: Optional[Sequence[str]] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yield pages of virtual machine property records."""
+        return self.iter_pages(
+            vim.VirtualMachine, properties or VM_SUMMARY_PROPERTIES
+        )
+
+
+def build_filter_spec(
+    container_view: vim.view.ContainerView,
+    obj_type: Type[vim.ManagedEntity],
+    properties: Sequence[str],
+) -> vmodl.query.PropertyCollector.FilterSpec:
+    """Build a filter spec selecting ``properties`` of every object in a view."""
+    traversal_spec = vmodl.query.PropertyCollector.TraversalSpec(
+        name="traverseEntities",
+        path="view",
+        skip=False,
+        type=vim.view.ContainerView,
+    )
+    object_spec = vmodl.query.PropertyCollector.ObjectSpec(
+        obj=container_view, skip=True, selectSet=[traversal_spec]
+    )
+    property_spec = vmodl.query.PropertyCollector.PropertySpec(
+        type=obj_type, pathSet=list(properties), all=False
+    )
+    return vmodl.query.PropertyCollector.FilterSpec(
+        objectSet=[object_spec], propSet=[property_spec]
+    )
+
+
+def to_record(object_content: Any, properties: Sequence[str]) -> Dict[str, Any]:
+    """Flatten an ``ObjectContent`` into a property-path keyed dictionary."""
+    record: Dict[str, Any] = dict.fromkeys(properties)
+    for prop in object_content.propSet or []:
+        record[prop.name] = prop.val
+
+    record["obj"] = object_content.obj
+    record["moid"] = object_content.obj._moId
+    return record
@@ -0,0 +1,346 @@
+"""Incremental vCenter inventory mirror driven by WaitForUpdatesEx."""
+
+from pyVmomi import vim, vmodl
+import queue
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Type
+import logging
+
+from .inventory import VM_SUMMARY_PROPERTIES, build_filter_spec
+
+logger = logging.getLogger(__name__)
+
+# Properties needed to serve both list_vms and get_vm_info from the mirror
+VM_MIRROR_PROPERTIES = VM_SUMMARY_PROPERTIES + [
+    "config.hardware.memoryMB",
+    "config.hardware.numCPU",
+    "config.uuid",
+]
+
+
+@dataclass
+class InventoryEvent:
+    """Change applied to the mirrored inventory."""
+
+    kind: str  # "enter", "leave" or "modify"
+    moid: str
+    changes: Dict[str, Any] = field(default_factory=dict)
+    record: Dict[str, Any] = field(default_factory=dict)
+
+
+class InventoryMirror:
+    """Long-lived in-memory copy of vCenter inventory properties.
+
+    A property filter is registered once on a private PropertyCollector.
+    The first ``WaitForUpdatesEx`` call returns the full inventory as
+    ``enter`` updates; subsequent calls only return what changed since the
+    last version, so vCenter load follows churn rather than inventory size.
+
+    Records are keyed on moId and additionally indexed on ``name`` so
+    ``find`` lookups by either are constant time.
+    """
+
+    INDEXED_PROPERTIES = ("name",)
+
+    def __init__(
+        self,
+        content: Any,
+        obj_type: Type[vim.ManagedEntity] = vim.VirtualMachine,
+        properties: Optional[Sequence[str]] = None,
+        max_wait_seconds: int = 30,
+        max_object_updates: Optional[int] = None,
+        max_retries: int = 5,
+        retry_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+    ):
+        """Initialize mirror for a vCenter ``ServiceContent``."""
+        self.content = content
+        self.obj_type = obj_type
+        self.properties = list(properties or VM_MIRROR_PROPERTIES)
+        self.max_wait_seconds = max_wait_seconds
+        self.max_object_updates = max_object_updates
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.max_backoff = max_backoff
+
+        self.version = ""
+        self.error: Optional[Exception] = None
+        self._records: Dict[str, Dict[str, Any]] = {}
+        # property -> value -> moIds in insertion order (names are not unique)
+        self._indexes: Dict[str, Dict[Any, Dict[str, None]]] = {
+            prop: {} for prop in self.INDEXED_PROPERTIES
+        }
+        self._lock = threading.RLock()
+        self._listeners: List[Callable[[InventoryEvent], None]] = []
+        self._ready = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._collector = None
+        self._container_view = None
+        self._filter = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether the mirror holds a current copy of the inventory."""
+        return self._ready.is_set() and self.error is None
+
+    def start(self, background: bool = True) -> "InventoryMirror":
+        """Register the property filter and start following updates."""
+        with self._lock:
+            if self._collector is None:
+                self._register_filter()
+
+        if background and self._thread is None:
+            self.error = None
+            self._stopping.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="vcf-evs-inventory-mirror", daemon=True
+            )
+            self._thread.start()
+
+        return self
+
+    def stop(self):
+        """Stop following updates and release server-side resources."""
+        self._stopping.set()
+        collector = self._collector
+        if collector is not None:
+            try:
+                collector.CancelWaitForUpdates()
+            except Exception as e:
+                logger.debug("Failed to cancel inventory wait: %s", e)
+
+        if self._thread is not None:
+            self._thread.join(timeout=self.max_wait_seconds + 5)
+            self._thread = None
+
+        with self._lock:
+            for resource in (self._filter, self._container_view, self._collector):
+                if resource is None:
+                    continue
+                try:
+                    resource.Destroy()
+                except Exception as e:
+                    logger.debug("Failed to destroy inventory mirror resource: %s", e)
+            self._collector = None
+            self._container_view = None
+            self._filter = None
+            self.version = ""
+            self._ready.clear()
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until the initial inventory has been mirrored.
+
+        Raises the last update error if the background loop gave up.
+        """
+        ready = self._ready.wait(timeout)
+        if self.error is not None:
+            raise self.error
+        return ready
+
+    def poll(self, max_wait_seconds: Optional[int] = None) -> List[InventoryEvent]:
+        """Fetch and apply pending updates, returning the applied events."""
+        if self._collector is None:
+            self.start(background=False)
+
+        options = vmodl.query.PropertyCollector.WaitOptions(
+            maxWaitSeconds=self.max_wait_seconds
+            if max_wait_seconds is None
+            else max_wait_seconds,
+            maxObjectUpdates=self.max_object_updates,
+        )
+
+        events: List[InventoryEvent] = []
+        while True:
+            update_set = self._collector.WaitForUpdatesEx(
+                version=self.version, options=options
+            )
+            if update_set is None:
+                # Wait timed out with no changes
+                break
+
+            events.extend(self._apply(update_set))
+            self.version = update_set.version
+            if not update_set.truncated:
+                break
+
+        self._ready.set()
+        for event in events:
+            self._notify(event)
+        return events
+
+    def get(self, moid: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the mirrored record for a moId."""
+        with self._lock:
+            record = self._records.get(moid)
+            return dict(record) if record is not None else None
+
+    def find(self, prop: str, value: Any) -> Optional[Dict[str, Any]]:
+        """Return the first mirrored record whose property equals value.
+
+        Lookups on ``moid`` and indexed properties are served from dicts;
+        any other property falls back to a scan.
+        """
+        if prop == "moid":
+            return self.get(value)
+
+        with self._lock:
+            index = self._indexes.get(prop)
+            if index is not None:
+                moids = index.get(value)
+                return dict(self._records[next(iter(moids))]) if moids else None
+
+            for record in self._records.values():
+                if record.get(prop) == value:
+                    return dict(record)
+        return None
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Return copies of all mirrored records."""
+        with self._lock:
+            return [dict(record) for record in self._records.values()]
+
+    def __len__(self) -> int:
+        """Return number of mirrored objects."""
+        return len(self._records)
+
+    def add_listener(self, callback: Callable[[InventoryEvent], None]):
+        """Register a callback invoked for every applied change."""
+        with self._lock:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[InventoryEvent], None]):
+        """Unregister a change callback."""
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def events(self, timeout: Optional[float] = None) -> Iterator[InventoryEvent]:
+        """Yield change events as they are applied.
+
+        Iteration ends when no event arrives within ``timeout`` seconds or
+        the mirror is stopped.
+        """
+        pending: "queue.Queue[InventoryEvent]" = queue.Queue()
+        self.add_listener(pending.put)
+        try:
+            while not self._stopping.is_set():
+                try:
+                    yield pending.get(timeout=1.0 if timeout is None else timeout)
+                except queue.Empty:
+                    if timeout is not None:
+                        return
+        finally:
+            self.remove_listener(pending.put)
+
+    def _register_filter(self):
+        """Create the private collector, container view and property filter."""
+        self._collector = self.content.propertyCollector.CreatePropertyCollector()
+        self._container_view = self.content.viewManager.CreateContainerView(
+            self.content.rootFolder, [self.obj_type], True
+        )
+        spec = build_filter_spec(self._container_view, self.obj_type, self.properties)
+        self._filter = self._collector.CreateFilter(spec=spec, partialUpdates=True)
+
+    def _run(self):
+        """Background loop following inventory updates.
+
+        Consecutive failures are retried with capped exponential backoff.
+        After ``max_retries`` the loop gives up: the error is kept on
+        ``self.error``, ``ready`` turns false so callers fall back to direct
+        lookups, and ``wait_until_ready`` re-raises it.
+        """
+        failures = 0
+        while not self._stopping.is_set():
+            try:
+                self.poll()
+                failures = 0
+            except vmodl.fault.RequestCanceled:
+                break
+            except Exception as e:
+                if self._stopping.is_set():
+                    break
+                failures += 1
+                if failures > self.max_retries:
+                    logger.error(
+                        "Failed to follow inventory updates after %s attempts: %s",
+                        failures, e
+                    )
+                    self.error = e
+                    # Wake anyone blocked in wait_until_ready so the error surfaces
+                    self._ready.set()
+                    break
+                delay = min(self.retry_backoff * 2 ** (failures - 1), self.max_backoff)
+                logger.warning(
+                    "Inventory mirror update failed, retrying in %.1fs: %s", delay, e
+                )
+                self._stopping.wait(delay)
+
+    def _apply(self, update_set: Any) -> List[InventoryEvent]:
+        """Apply an UpdateSet to the in-memory model."""
+        events = []
+        with self._lock:
+            for filter_update in update_set.filterSet or []:
+                for object_update in filter_update.objectSet or []:
+                    events.append(self._apply_object_update(object_update))
+        return events
+
+    def _apply_object_update(self, object_update: Any) -> InventoryEvent:
+        """Apply a single enter/leave/modify object update."""
+        moid = object_update.obj._moId
+        kind = str(object_update.kind)
+
+        if kind == "leave":
+            record = self._records.pop(moid, {})
+            self._unindex(moid, record)
+            return InventoryEvent(kind, moid, record=record)
+
+        changes = {}
+        for change in object_update.changeSet or []:
+            removed = str(change.op) in ("remove", "indirectRemove")
+            changes[change.name] = None if removed else change.val
+
+        if kind == "enter":
+            self._unindex(moid, self._records.get(moid, {}))
+            record = dict.fromkeys(self.properties)
+            record["obj"] = object_update.obj
+            record["moid"] = moid
+            self._records[moid] = record
+        else:
+            record = self._records.setdefault(
+                moid, {"obj": object_update.obj, "moid": moid}
+            )
+            self._unindex(moid, {prop: record.get(prop) for prop in changes})
+
+        record.update(changes)
+        self._index(moid, record)
+        return InventoryEvent(kind, moid, changes, dict(record))
+
+    def _index(self, moid: str, record: Dict[str, Any]):
+        """Add a record to the property indexes."""
+        for prop, index in self._indexes.items():
+            value = record.get(prop)
+            if value is not None:
+                index.setdefault(value, {})[moid] = None
+
+    def _unindex(self, moid: str, record: Dict[str, Any]):
+        """Remove a record's current values from the property indexes."""
+        for prop, index in self._indexes.items():
+            moids = index.get(record.get(prop))
+            if moids is None:
+                continue
+            moids.pop(moid, None)
+            if not moids:
+                del index[record.get(prop)]
+
+    def _notify(self, event: InventoryEvent):
+        """Dispatch an event to registered listeners."""
+        with self._lock:
+            listeners = list(self._listeners)
+
+        for callback in listeners:
+            try:
+                callback(event)
+            except Exception as e:
+                logger.warning("Inventory listener failed: %s", e)
@@ -0,0 +1,346 @@
+"""Pool of authenticated vCenter sessions."""
+
+import atexit
+import json
+import os
+import queue
+import ssl
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import logging
+
+from pyVmomi import vim
+from pyVim.connect import Disconnect, SmartConnect, SmartStubAdapter
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(eq=False)
+class PooledSession:
+    """An authenticated service instance with its cached service content."""
+
+    service_instance: Any
+    content: Any
+    last_checked: float = 0.0
+    persistent: bool = False
+
+
+@dataclass
+class SessionPoolStats:
+    """Counters for logins saved and spent by the pool."""
+
+    logins: int = 0
+    resumed: int = 0
+    reused: int = 0
+    health_checks: int = 0
+    reconnects: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        """Plain dictionary of counters."""
+        return dict(self.__dict__)
+
+
+class VCenterSessionPool:
+    """Keep up to ``size`` logged-in vCenter sessions for reuse.
+
+    Sessions are created lazily and handed out one caller at a time.
+    A session idle for longer than ``health_check_interval`` seconds is
+    checked with ``CurrentTime`` before reuse and replaced if it has
+    expired. A session that expires while in use is logged in again on the
+    same SOAP stub, so managed object references held by the caller stay
+    valid.
+
+    With ``cookie_file`` the first session's cookie is saved (mode 0600)
+    and later processes resume it instead of logging in; that session is
+    left logged in when the pool closes. A cookie file other users could
+    read is ignored and replaced.
+    """
+
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        size: int = 1,
+        cookie_file: Optional[str] = None,
+        health_check_interval: float = 60.0,
+        connect: Optional[Callable[[], Any]] = None,
+        resume: Optional[Callable[[str], Any]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize pool for the vCenter described by ``config``."""
+        if size < 1:
+            raise ValueError("size must be a positive integer")
+
+        self.server = config.get("vcenter_server")
+        self.port = config.get("port", 443)
+        self.username = config.get("username")
+        self.password = config.get("password")
+        self.ssl_verify = config.get("ssl_verify", True)
+        self.size = size
+        self.cookie_file = Path(cookie_file).expanduser() if cookie_file else None
+        self.health_check_interval = health_check_interval
+        self.clock = clock
+        self.stats = SessionPoolStats()
+        self._connect = connect or self._smart_connect
+        self._resume = resume or self._resume_stub
+
+        self._lock = threading.Lock()
+        self._idle: "queue.LifoQueue[PooledSession]" = queue.LifoQueue()
+        self._sessions: List[PooledSession] = []
+        self._closed = False
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "VCenterSessionPool":
+        """Build a pool from the ``vmware`` config section."""
+        return cls(
+            config,
+            size=config.get("session_pool_size", 1),
+            cookie_file=config.get("session_cookie_file"),
+            health_check_interval=config.get("session_health_check_interval", 60.0),
+        )
+
+    def acquire(self, timeout: Optional[float] = None) -> PooledSession:
+        """Take a healthy session, creating one if the pool is not full."""
+        while True:
+            try:
+                session = self._idle.get_nowait()
+            except queue.Empty:
+                session = self._create_if_room()
+                if session is not None:
+                    return session
+                try:
+                    session = self._idle.get(timeout=timeout)
+                except queue.Empty:
+                    raise TimeoutError(
+                        f"No vCenter session available within {timeout}s"
+                    ) from None
+
+            if self._healthy(session):
+                self.stats.reused += 1
+                return session
+            self._discard(session)
+
+    def release(self, session: PooledSession, discard: bool = False):
+        """Return a session to the pool (or drop it if broken)."""
+        if discard or self._closed:
+            self._discard(session, logout=not self._closed)
+            return
+        self._idle.put(session)
+
+    @contextmanager
+    def session(self, timeout: Optional[float] = None) -> Iterator[PooledSession]:
+        """Borrow a session for the duration of a ``with`` block."""
+        session = self.acquire(timeout)
+        discard = False
+        try:
+            yield session
+        except vim.fault.NotAuthenticated:
+            discard = True
+            raise
+        finally:
+            # Other errors leave the session usable, so it goes back to the pool
+            self.release(session, discard=discard)
+
+    def close(self):
+        """Log out all sessions except one persisted for other processes."""
+        with self._lock:
+            self._closed = True
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            if not session.persistent:
+                self._logout(session)
+
+    def __len__(self) -> int:
+        """Return number of open sessions."""
+        return len(self._sessions)
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+
+    def _create_if_room(self) -> Optional[PooledSession]:
+        """Open a new session unless ``size`` sessions already exist."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Session pool is closed")
+            if len(self._sessions) >= self.size:
+                return None
+            first = not self._sessions
+            # Reserve the slot so concurrent callers do not overshoot ``size``
+            placeholder = PooledSession(None, None)
+            self._sessions.append(placeholder)
+
+        try:
+            session = self._open(first)
+        except BaseException:
+            with self._lock:
+                self._sessions.remove(placeholder)
+            raise
+
+        with self._lock:
+            self._sessions[self._sessions.index(placeholder)] = session
+        return session
+
+    def _open(self, first: bool) -> PooledSession:
+        """Resume the saved session (first slot only) or log in."""
+        if first and self.cookie_file:
+            session = self._load_saved()
+            if session is not None:
+                return session
+
+        service_instance = self._connect()
+        self.stats.logins += 1
+        session = PooledSession(service_instance, service_instance.RetrieveContent(), self.clock())
+        self._install_reauth(session)
+        if first and self.cookie_file:
+            self._save_cookie(session)
+        logger.info("Opened vCenter session to %s", self.server)
+        return session
+
+    def _load_saved(self) -> Optional[PooledSession]:
+        """Resume the session whose cookie was saved by an earlier process."""
+        cookie = self._read_cookie()
+        if not cookie:
+            return None
+        try:
+            service_instance = self._resume(cookie)
+            content = service_instance.RetrieveContent()
+            if content.sessionManager.currentSession is None:
+                return None
+        except Exception as e:
+            logger.debug("Saved vCenter session not reusable: %s", e)
+            return None
+
+        self.stats.resumed += 1
+        session = PooledSession(service_instance, content, self.clock(), persistent=True)
+        self._install_reauth(session)
+        logger.info("Resumed saved vCenter session to %s", self.server)
+        return session
+
+    def _healthy(self, session: PooledSession) -> bool:
+        """Check a session with ``CurrentTime`` if it has been idle a while."""
+        now = self.clock()
+        if now - session.last_checked < self.health_check_interval:
+            return True
+        self.stats.health_checks += 1
+        try:
+            session.service_instance.CurrentTime()
+        except Exception as e:
+            logger.info("vCenter session to %s failed health check: %s", self.server, e)
+            return False
+        session.last_checked = now
+        return True
+
+    def _discard(self, session: PooledSession, logout: bool = True):
+        """Remove a session from the pool."""
+        with self._lock:
+            if session in self._sessions:
+                self._sessions.remove(session)
+        if logout:
+            self._logout(session)
+
+    def _logout(self, session: PooledSession):
+        """Log a session out, ignoring sessions that are already gone."""
+        try:
+            Disconnect(session.service_instance)
+        except Exception as e:
+            logger.debug("Ignoring logout failure: %s", e)
+
+    def _install_reauth(self, session: PooledSession):
+        """Log in again on the same stub when a call finds the session expired."""
+        stub = session.service_instance._stub
+        invoke = stub.InvokeMethod
+        login_lock = threading.Lock()
+
+        def invoke_with_reauth(mo: Any, info: Any, args: Any) -> Any:
+            try:
+                return invoke(mo, info, args)
+            except vim.fault.NotAuthenticated:
+                if info.wsdlName == "Login":
+                    raise
+                with login_lock:
+                    logger.info("vCenter session to %s expired; logging in again", self.server)
+                    session.content.sessionManager.Login(self.username, self.password)
+                    self.stats.reconnects += 1
+                    if session.persistent:
+                        self._save_cookie(session)
+                return invoke(mo, info, args)
+
+        stub.InvokeMethod = invoke_with_reauth
+
+    def _read_cookie(self) -> Optional[str]:
+        """Saved cookie for this server and user, if any."""
+        try:
+            stat = os.stat(self.cookie_file)
+            # The cookie is a live credential: only use files private to this user
+            if (hasattr(os, "getuid") and stat.st_uid != os.getuid()) or stat.st_mode & 0o077:
+                logger.warning(
+                    "Ignoring vCenter session cookie %s: not private to this user", self.cookie_file
+                )
+                return None
+            saved = json.loads(self.cookie_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if (saved.get("server"), saved.get("port"), saved.get("username")) != self._identity():
+            return None
+        return saved.get("cookie")
+
+    def _save_cookie(self, session: PooledSession):
+        """Persist a session cookie readable only by the current user."""
+        cookie = getattr(session.service_instance._stub, "cookie", None)
+        if not cookie:
+            return
+        server, port, username = self._identity()
+        self.cookie_file.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(str(self.cookie_file), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        # The creation mode does not apply to an existing file
+        os.chmod(str(self.cookie_file), 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"server": server, "port": port, "username": username, "cookie": cookie}, f)
+        session.persistent = True
+
+    def _identity(self) -> Tuple[Optional[str], int, Optional[str]]:
+        """Server, port and user a saved cookie must match."""
+        return self.server, self.port, self.username
+
+    def _ssl_context(self) -> Optional[ssl.SSLContext]:
+        """SSL context honoring ``ssl_verify``."""
+        return None if self.ssl_verify else ssl._create_unverified_context()
+
+    def _smart_connect(self) -> Any:
+        """Log in with ``SmartConnect``."""
+        return SmartConnect(
+            host=self.server,
+            user=self.username,
+            pwd=self.password,
+            port=self.port,
+            sslContext=self._ssl_context()
+        )
+
+    def _resume_stub(self, cookie: str) -> Any:
+        """Build a service instance that presents a saved session cookie."""
+        stub = SmartStubAdapter(host=self.server, port=self.port, sslContext=self._ssl_context())
+        stub.cookie = cookie
+        return vim.ServiceInstance("ServiceInstance", stub)
+
+
+_pools: Dict[Tuple[Optional[str], int, Optional[str]], VCenterSessionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_session_pool(config: Dict[str, Any]) -> VCenterSessionPool:
+    """Return the process-wide session pool for a vCenter server and user."""
+    key = (config.get("vcenter_server"), config.get("port", 443), config.get("username"))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None or pool._closed:
+            pool = _pools[key] = VCenterSessionPool.from_config(config)
+            atexit.register(pool.close)
+        return pool
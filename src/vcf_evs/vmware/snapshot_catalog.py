@@ -0,0 +1,324 @@
+"""Estate-wide snapshot catalog and bulk cleanup."""
+
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+import logging
+
+from pyVmomi import vim
+
+from .inventory import InventoryCollector, DEFAULT_PAGE_SIZE
+from .tasks import TaskWaiter
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PROPERTIES = ["name", "snapshot", "layoutEx.snapshot", "layoutEx.file"]
+
+# Name prefix of snapshots taken by the migration workflow
+MIGRATION_SNAPSHOT_PREFIX = "snapshot-"
+
+
+@dataclass
+class SnapshotRecord:
+    """One snapshot in a VM's snapshot tree.
+
+    ``size_bytes`` counts the files that belong to this snapshot alone:
+    its state/memory files and the disk chain links that are not part of
+    its parent's chain.
+    """
+
+    moid: str
+    name: str
+    vm_name: str
+    vm_moid: str
+    created: Optional[datetime]
+    ref: Any = None
+    description: str = ""
+    parent_moid: Optional[str] = None
+    depth: int = 0
+    children: int = 0
+    quiesced: bool = False
+    size_bytes: int = 0
+
+    def age(self, now: Optional[datetime] = None) -> float:
+        """Seconds since the snapshot was taken."""
+        if self.created is None:
+            return 0.0
+        now = now or datetime.now(timezone.utc)
+        created = self.created if self.created.tzinfo else self.created.replace(tzinfo=timezone.utc)
+        return (now - created).total_seconds()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable summary."""
+        return {
+            "moid": self.moid,
+            "name": self.name,
+            "vm": self.vm_name,
+            "created": self.created.isoformat() if self.created else None,
+            "size_bytes": self.size_bytes,
+            "depth": self.depth,
+            "children": self.children,
+        }
+
+
+@dataclass
+class CleanupResult:
+    """Outcome of a bulk snapshot removal."""
+
+    planned: List[SnapshotRecord] = field(default_factory=list)
+    removed: List[SnapshotRecord] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    dry_run: bool = True
+
+    @property
+    def reclaimed_bytes(self) -> int:
+        """Bytes held by removed (or, in a dry run, planned) snapshots."""
+        records = self.planned if self.dry_run else self.removed
+        return sum(record.size_bytes for record in records)
+
+
+class SnapshotCatalog:
+    """Index of every VM snapshot, loaded with one bulk inventory sweep.
+
+    Snapshot trees and file layouts of all VMs are fetched through the
+    PropertyCollector in pages, flattened into ``SnapshotRecord`` entries
+    and indexed by snapshot moId, name and VM. The catalog is a point-in-time
+    view: call ``refresh`` to reload it.
+    """
+
+    def __init__(
+        self,
+        content: Any,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        task_timeout: Optional[float] = None,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ):
+        """Initialize catalog for a vCenter ``ServiceContent``."""
+        self.content = content
+        self.task_timeout = task_timeout
+        self.clock = clock
+        self._collector = InventoryCollector(content, page_size)
+        self._lock = threading.RLock()
+        self._by_moid: Dict[str, SnapshotRecord] = {}
+        self._by_name: Dict[str, List[SnapshotRecord]] = {}
+        self._by_vm: Dict[str, List[SnapshotRecord]] = {}
+        self.loaded_at: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        """Return number of indexed snapshots."""
+        return len(self._by_moid)
+
+    def refresh(self) -> "SnapshotCatalog":
+        """Reload snapshot trees for all VMs."""
+        records: List[SnapshotRecord] = []
+        for vm in self._collector.iter_objects(vim.VirtualMachine, SNAPSHOT_PROPERTIES):
+            if vm["snapshot"] is not None:
+                records.extend(flatten_snapshot_tree(vm))
+
+        with self._lock:
+            self._by_moid = {}
+            self._by_name = {}
+            self._by_vm = {}
+            for record in records:
+                self._add(record)
+            self.loaded_at = self.clock()
+        logger.info("Indexed %s snapshots", len(records))
+        return self
+
+    def get(self, moid: str) -> Optional[SnapshotRecord]:
+        """Snapshot by moId."""
+        return self._by_moid.get(moid)
+
+    def by_name(self, name: str) -> List[SnapshotRecord]:
+        """Snapshots with an exact name."""
+        return list(self._by_name.get(name, []))
+
+    def for_vm(self, vm_name: str) -> List[SnapshotRecord]:
+        """Snapshots of a VM, parents before children."""
+        return list(self._by_vm.get(vm_name, []))
+
+    def find(
+        self,
+        name_prefix: Optional[str] = None,
+        older_than: Optional[float] = None,
+        min_size: Optional[int] = None,
+        vm_names: Optional[Iterable[str]] = None,
+    ) -> List[SnapshotRecord]:
+        """Snapshots matching every given filter, oldest first.
+
+        ``older_than`` is an age in seconds and ``min_size`` a size in bytes.
+        """
+        now = self.clock()
+        wanted_vms = set(vm_names) if vm_names is not None else None
+        with self._lock:
+            records = list(self._by_moid.values())
+        matches = [
+            record for record in records
+            if (name_prefix is None or record.name.startswith(name_prefix))
+            and (older_than is None or record.age(now) >= older_than)
+            and (min_size is None or record.size_bytes >= min_size)
+            and (wanted_vms is None or record.vm_name in wanted_vms)
+        ]
+        return sorted(matches, key=lambda record: record.age(now), reverse=True)
+
+    def total_size(self, records: Optional[Sequence[SnapshotRecord]] = None) -> int:
+        """Total bytes held by snapshots (all of them by default)."""
+        if records is None:
+            records = list(self._by_moid.values())
+        return sum(record.size_bytes for record in records)
+
+    def cleanup(
+        self,
+        records: Sequence[SnapshotRecord],
+        dry_run: bool = True,
+        max_in_flight: int = 4,
+        consolidate: bool = True,
+    ) -> CleanupResult:
+        """Remove snapshots with at most ``max_in_flight`` removals running.
+
+        Removals on the same VM are serialized (vCenter rejects concurrent
+        snapshot tasks on one VM); each round's tasks are awaited together
+        through one property filter. Once a removal on a VM fails, that VM's
+        remaining (parent) snapshots are skipped and reported as failed, so
+        a parent is never consolidated under a child that still exists. With
+        ``dry_run`` nothing is removed and the result lists what would be.
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be a positive integer")
+
+        result = CleanupResult(planned=list(records), dry_run=dry_run)
+        if dry_run:
+            for record in result.planned:
+                logger.info(
+                    "[dry-run] Would remove snapshot %s (%s) of %s, %s bytes",
+                    record.name, record.moid, record.vm_name, record.size_bytes
+                )
+            return result
+
+        waiter = TaskWaiter(self.content)
+        queues: Dict[str, List[SnapshotRecord]] = {}
+        for record in result.planned:
+            # Children first, so each removal consolidates into an unchanged parent chain
+            queues.setdefault(record.vm_moid, []).append(record)
+        for queue in queues.values():
+            queue.sort(key=lambda record: record.depth, reverse=True)
+
+        while queues:
+            batch = []
+            for vm_moid in list(queues)[:max_in_flight]:
+                batch.append(queues[vm_moid].pop(0))
+                if not queues[vm_moid]:
+                    del queues[vm_moid]
+
+            tasks, started = [], []
+            for record in batch:
+                try:
+                    tasks.append(record.ref.RemoveSnapshot_Task(
+                        removeChildren=False, consolidate=consolidate
+                    ))
+                    started.append(record)
+                except Exception as e:
+                    self._fail_vm(result, queues, record, str(e))
+
+            outcomes = waiter.wait_all(tasks, timeout=self.task_timeout, raise_on_error=False)
+            for record, outcome in zip(started, outcomes):
+                if outcome.succeeded:
+                    result.removed.append(record)
+                    self._forget(record)
+                else:
+                    self._fail_vm(result, queues, record, outcome.error_message)
+
+        logger.info(
+            "Removed %s snapshots (%s bytes), %s failed",
+            len(result.removed), result.reclaimed_bytes, len(result.failed)
+        )
+        return result
+
+    @staticmethod
+    def _fail_vm(
+        result: CleanupResult,
+        queues: Dict[str, List[SnapshotRecord]],
+        record: SnapshotRecord,
+        error: str,
+    ):
+        """Record a failed removal and skip the rest of that VM's queue."""
+        result.failed[record.moid] = error
+        for skipped in queues.pop(record.vm_moid, []):
+            result.failed[skipped.moid] = f"Skipped after removal of {record.name} failed"
+        logger.warning("Failed to remove snapshot %s of %s: %s", record.name, record.vm_name, error)
+
+    def _add(self, record: SnapshotRecord):
+        """Index a record."""
+        self._by_moid[record.moid] = record
+        self._by_name.setdefault(record.name, []).append(record)
+        self._by_vm.setdefault(record.vm_name, []).append(record)
+
+    def _forget(self, record: SnapshotRecord):
+        """Drop a removed snapshot from the indexes."""
+        with self._lock:
+            self._by_moid.pop(record.moid, None)
+            for index, key in ((self._by_name, record.name), (self._by_vm, record.vm_name)):
+                remaining = [other for other in index.get(key, []) if other.moid != record.moid]
+                if remaining:
+                    index[key] = remaining
+                else:
+                    index.pop(key, None)
+
+
+def flatten_snapshot_tree(vm: Dict[str, Any]) -> List[SnapshotRecord]:
+    """Turn one VM's snapshot property record into records, parents first."""
+    file_sizes = {f.key: f.size or 0 for f in vm.get("layoutEx.file") or []}
+    layouts = {
+        layout.key._moId: layout for layout in vm.get("layoutEx.snapshot") or []
+    }
+
+    records: List[SnapshotRecord] = []
+
+    def walk(trees: Sequence[Any], parent: Optional[SnapshotRecord], depth: int):
+        for tree in trees or []:
+            moid = tree.snapshot._moId
+            record = SnapshotRecord(
+                moid=moid,
+                name=tree.name,
+                vm_name=vm["name"],
+                vm_moid=vm["moid"],
+                created=tree.createTime,
+                ref=tree.snapshot,
+                description=tree.description or "",
+                parent_moid=parent.moid if parent else None,
+                depth=depth,
+                children=len(tree.childSnapshotList or []),
+                quiesced=bool(tree.quiesced),
+                size_bytes=_snapshot_size(
+                    layouts.get(moid), layouts.get(parent.moid) if parent else None, file_sizes
+                ),
+            )
+            records.append(record)
+            walk(tree.childSnapshotList, record, depth + 1)
+
+    walk(vm["snapshot"].rootSnapshotList, None, 0)
+    return records
+
+
+def _snapshot_size(layout: Any, parent_layout: Any, file_sizes: Dict[int, int]) -> int:
+    """Bytes of files owned by a snapshot but not by its parent."""
+    if layout is None:
+        return 0
+    keys = {layout.dataKey}
+    if layout.memoryKey is not None and layout.memoryKey >= 0:
+        keys.add(layout.memoryKey)
+    keys |= _chain_files(layout) - _chain_files(parent_layout)
+    return sum(file_sizes.get(key, 0) for key in keys)
+
+
+def _chain_files(layout: Any) -> set:
+    """File keys of every disk chain link in a snapshot layout."""
+    if layout is None:
+        return set()
+    return {
+        file_key
+        for disk in layout.disk or []
+        for unit in disk.chain or []
+        for file_key in unit.fileKey or []
+    }
@@ -0,0 +1,261 @@
+"""Group snapshots of related VMs."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import logging
+
+from pyVmomi import vim
+
+from .tasks import TaskOutcome
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class GroupSnapshot:
+    """Snapshots taken together for a consistency group of VMs.
+
+    ``issue_spread`` is the time between the first and last
+    ``CreateSnapshot_Task`` call and ``completion_skew`` the time between
+    the first and last snapshot completing, i.e. how far apart the
+    members' points in time may be.
+    """
+
+    name: str
+    snapshots: Dict[str, str] = field(default_factory=dict)
+    failures: Dict[str, str] = field(default_factory=dict)
+    issue_spread: float = 0.0
+    completion_skew: float = 0.0
+    elapsed: float = 0.0
+    rolled_back: bool = False
+
+    @property
+    def ok(self) -> bool:
+        """Whether every member was snapshotted."""
+        return not self.failures
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable summary."""
+        return {
+            "name": self.name,
+            "snapshots": dict(self.snapshots),
+            "failures": dict(self.failures),
+            "issue_spread": round(self.issue_spread, 3),
+            "completion_skew": round(self.completion_skew, 3),
+            "elapsed": round(self.elapsed, 3),
+            "rolled_back": self.rolled_back,
+        }
+
+
+class GroupSnapshotError(RuntimeError):
+    """Raised when some members of a group could not be snapshotted."""
+
+    def __init__(self, group: GroupSnapshot):
+        failed = ", ".join(f"{vm}: {error}" for vm, error in group.failures.items())
+        super().__init__(f"Group snapshot {group.name} failed for {failed}")
+        self.group = group
+
+
+class GroupSnapshotter:
+    """Snapshot a set of VMs as close together in time as possible.
+
+    All VMs are resolved up front through the client's VM index, the
+    ``CreateSnapshot_Task`` calls are issued from ``max_workers`` threads
+    and the resulting tasks are awaited together through one property
+    filter. If any member fails or times out, the snapshots that did get
+    created are removed again so no partial group is left behind; ``revert`` rolls
+    every member of a completed group back to its snapshot at once.
+    """
+
+    def __init__(
+        self,
+        vcenter_client: Any,
+        max_workers: int = 16,
+        quiesce: bool = True,
+        memory: bool = False,
+        timeout: Optional[float] = None,
+    ):
+        """Initialize snapshotter for a connected ``VCenterClient``."""
+        if max_workers < 1:
+            raise ValueError("max_workers must be a positive integer")
+
+        self.client = vcenter_client
+        self.max_workers = max_workers
+        self.quiesce = quiesce
+        self.memory = memory
+        self.timeout = timeout if timeout is not None else vcenter_client.task_timeout
+
+    def create(
+        self,
+        vm_names: Sequence[str],
+        name: Optional[str] = None,
+        description: str = "",
+        rollback_on_failure: bool = True,
+    ) -> GroupSnapshot:
+        """Snapshot every VM; raises ``GroupSnapshotError`` if any member fails."""
+        if not vm_names:
+            raise ValueError("A group snapshot needs at least one VM")
+
+        started = time.monotonic()
+        group = GroupSnapshot(name or f"group-{int(time.time())}")
+
+        vms = {}
+        for vm_name in vm_names:
+            vm = self.client.vm_index.find_by_name(vm_name)
+            if vm is None:
+                group.failures[vm_name] = "VM not found"
+            else:
+                vms[vm_name] = vm
+        if group.failures:
+            # Nothing has been snapshotted yet, so there is nothing to undo
+            group.elapsed = time.monotonic() - started
+            raise GroupSnapshotError(group)
+
+        issued = self._issue(
+            [
+                (vm_name, vm.CreateSnapshot_Task,
+                 dict(name=group.name, description=description,
+                      memory=self.memory, quiesce=self.quiesce))
+                for vm_name, vm in vms.items()
+            ]
+        )
+        tasks = {vm_name: task for vm_name, (task, _) in issued.items() if isinstance(task, vim.Task)}
+        for vm_name, (error, _) in issued.items():
+            if vm_name not in tasks:
+                group.failures[vm_name] = str(error)
+        issue_times = [issued_at for _, issued_at in issued.values()]
+        group.issue_spread = max(issue_times) - min(issue_times)
+
+        outcomes = self._wait(tasks)
+        finished = []
+        for vm_name, outcome in outcomes.items():
+            if outcome.succeeded:
+                group.snapshots[vm_name] = outcome.result._moId
+                finished.append(outcome.elapsed)
+            else:
+                group.failures[vm_name] = outcome.error_message
+        if finished:
+            group.completion_skew = max(finished) - min(finished)
+        group.elapsed = time.monotonic() - started
+
+        if group.failures:
+            if rollback_on_failure and group.snapshots:
+                logger.warning(
+                    "Group snapshot %s: %s of %s VMs failed; removing partial snapshots",
+                    group.name, len(group.failures), len(vm_names)
+                )
+                self.remove(group)
+                group.rolled_back = True
+            raise GroupSnapshotError(group)
+
+        logger.info(
+            "Group snapshot %s: %s VMs, skew %.2fs, issue spread %.2fs",
+            group.name, len(group.snapshots), group.completion_skew, group.issue_spread
+        )
+        return group
+
+    def revert(
+        self, group: GroupSnapshot, vm_names: Optional[Sequence[str]] = None
+    ) -> Dict[str, TaskOutcome]:
+        """Revert every member (or ``vm_names``) to its group snapshot, concurrently.
+
+        Raises ``RuntimeError`` if any revert fails, after all have finished.
+        """
+        members = vm_names or list(group.snapshots)
+        outcomes, failed = self._run_all(
+            [(vm_name, self._snapshot(group, vm_name).RevertToSnapshot_Task, {}) for vm_name in members]
+        )
+        if failed:
+            raise RuntimeError(f"Failed to revert {', '.join(sorted(failed))} in {group.name}")
+
+        group.rolled_back = True
+        logger.info("Reverted %s VMs to group snapshot %s", len(outcomes), group.name)
+        return outcomes
+
+    def remove(self, group: GroupSnapshot, consolidate: bool = True) -> Dict[str, TaskOutcome]:
+        """Delete the group's snapshots, concurrently."""
+        outcomes, failed = self._run_all(
+            [
+                (vm_name, self._snapshot(group, vm_name).RemoveSnapshot_Task,
+                 dict(removeChildren=False, consolidate=consolidate))
+                for vm_name in group.snapshots
+            ]
+        )
+        for vm_name, error in failed.items():
+            logger.warning("Failed to remove snapshot of %s: %s", vm_name, error)
+        return outcomes
+
+    def _snapshot(self, group: GroupSnapshot, vm_name: str) -> vim.vm.Snapshot:
+        """Snapshot reference for a member, bound to the client's session."""
+        return vim.vm.Snapshot(group.snapshots[vm_name], self.client.service_instance._stub)
+
+    def _issue(self, calls: List[Tuple[str, Any, Dict[str, Any]]]) -> Dict[str, Tuple[Any, float]]:
+        """Start tasks concurrently; maps VM name to ``(task or error, issued_at)``."""
+        def start(call: Tuple[str, Any, Dict[str, Any]]) -> Tuple[str, Tuple[Any, float]]:
+            vm_name, method, kwargs = call
+            try:
+                task = method(**kwargs)
+            except Exception as e:
+                task = e
+            return vm_name, (task, time.monotonic())
+
+        if not calls:
+            return {}
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(calls)), thread_name_prefix="vcf-evs-snapshot"
+        ) as executor:
+            return dict(executor.map(start, calls))
+
+    def _wait(self, tasks: Dict[str, vim.Task]) -> Dict[str, TaskOutcome]:
+        """Wait for tasks together, keyed by VM name.
+
+        On timeout every task is read once more: finished tasks keep their
+        outcome so callers can still clean up after them, and tasks still
+        running are cancelled and reported as failed.
+        """
+        names = list(tasks)
+        started = time.monotonic()
+        try:
+            outcomes = self.client.wait_for_tasks(
+                [tasks[name] for name in names], timeout=self.timeout, raise_on_error=False
+            )
+        except TimeoutError as e:
+            logger.warning("Group task wait timed out: %s", e)
+            outcomes = [self._final_outcome(tasks[name], e, started) for name in names]
+        return dict(zip(names, outcomes))
+
+    @staticmethod
+    def _final_outcome(task: vim.Task, timeout: TimeoutError, started: float) -> TaskOutcome:
+        """Current outcome of a task the wait gave up on, cancelling it if unfinished."""
+        elapsed = time.monotonic() - started
+        try:
+            info = task.info
+        except Exception as e:
+            return TaskOutcome(task=task, state="unknown", error=e, elapsed=elapsed)
+        if info.state in ("success", "error"):
+            return TaskOutcome(task=task, state=info.state, result=info.result,
+                               error=info.error, elapsed=elapsed)
+        try:
+            task.CancelTask()
+        except Exception as e:
+            logger.warning("Failed to cancel task %s; it may still finish: %s", task._moId, e)
+        return TaskOutcome(task=task, state=str(info.state), error=timeout, elapsed=elapsed)
+
+    def _run_all(
+        self, calls: List[Tuple[str, Any, Dict[str, Any]]]
+    ) -> Tuple[Dict[str, TaskOutcome], Dict[str, str]]:
+        """Start tasks concurrently and wait for all that started.
+
+        Returns outcomes keyed by VM name and error messages for VMs whose
+        call could not be started or whose task failed.
+        """
+        issued = self._issue(calls)
+        tasks = {vm: task for vm, (task, _) in issued.items() if isinstance(task, vim.Task)}
+        failed = {vm: str(error) for vm, (error, _) in issued.items() if vm not in tasks}
+        outcomes = self._wait(tasks)
+        failed.update(
+            (vm, outcome.error_message) for vm, outcome in outcomes.items() if not outcome.succeeded
+        )
+        return outcomes, failed
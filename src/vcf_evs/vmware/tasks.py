@@ -0,0 +1,240 @@
+"""Event-driven waiting on vCenter tasks."""
+
+from pyVmomi import vim, vmodl
+import html
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import logging
+
+logger = logging.getLogger(__name__)
+
+TASK_PROPERTIES = ["info.state", "info.progress", "info.error", "info.result"]
+
+TERMINAL_STATES = ("success", "error")
+
+ProgressCallback = Callable[[vim.Task, int], None]
+
+
+@dataclass
+class TaskOutcome:
+    """Final state of a watched vCenter task."""
+
+    task: vim.Task
+    state: str
+    result: Any = None
+    error: Any = None
+    elapsed: float = 0.0
+
+    @property
+    def succeeded(self) -> bool:
+        """Whether the task finished successfully."""
+        return self.state == "success"
+
+    @property
+    def error_message(self) -> str:
+        """Escaped task error message."""
+        if self.error is None:
+            return "Unknown error"
+        return html.escape(str(getattr(self.error, "msg", None) or self.error))
+
+
+class TaskWaiter:
+    """Wait for many vCenter tasks through a single property filter.
+
+    Rather than reading ``task.info.state`` in a sleep loop (one SOAP call
+    per task per tick), all tasks are registered on one filter of a private
+    PropertyCollector and ``WaitForUpdatesEx`` blocks server-side until any
+    of them changes state or progress.
+    """
+
+    def __init__(self, content: Any, max_wait_seconds: int = 30):
+        """Initialize waiter for a vCenter ``ServiceContent``."""
+        self.content = content
+        self.max_wait_seconds = max_wait_seconds
+
+    def wait(
+        self,
+        task: vim.Task,
+        timeout: Optional[float] = None,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> Any:
+        """Wait for a single task and return its result.
+
+        Raises ``RuntimeError`` when the task fails and ``TimeoutError`` when
+        it does not finish within ``timeout`` seconds.
+        """
+        outcome = self.wait_all([task], timeout=timeout, on_progress=on_progress)[0]
+        return outcome.result
+
+    def wait_all(
+        self,
+        tasks: Sequence[vim.Task],
+        timeout: Optional[float] = None,
+        on_progress: Optional[ProgressCallback] = None,
+        raise_on_error: bool = True,
+    ) -> List[TaskOutcome]:
+        """Wait for all tasks to finish, returning outcomes in input order.
+
+        With ``raise_on_error`` the first failed task raises ``RuntimeError``
+        once every task has reached a terminal state.
+        """
+        if not tasks:
+            return []
+
+        started = time.monotonic()
+        deadline = started + timeout if timeout is not None else None
+        states: Dict[str, Dict[str, Any]] = {
+            task._moId: {"task": task, "finished_at": None} for task in tasks
+        }
+
+        collector = self.content.propertyCollector.CreatePropertyCollector()
+        try:
+            collector.CreateFilter(spec=self._build_filter_spec(tasks), partialUpdates=False)
+            version = ""
+            pending = set(states)
+
+            while pending:
+                max_wait = self.max_wait_seconds
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(
+                            f"{len(pending)} of {len(tasks)} tasks did not finish "
+                            f"within {timeout}s"
+                        )
+                    max_wait = max(1, min(max_wait, int(remaining + 0.999)))
+
+                update_set = collector.WaitForUpdatesEx(
+                    version=version,
+                    options=vmodl.query.PropertyCollector.WaitOptions(
+                        maxWaitSeconds=max_wait
+                    ),
+                )
+                if update_set is None:
+                    continue
+
+                version = update_set.version
+                for filter_update in update_set.filterSet or []:
+                    for object_update in filter_update.objectSet or []:
+                        self._apply(object_update, states, pending, on_progress)
+        finally:
+            try:
+                collector.Destroy()
+            except Exception as e:
+                logger.debug("Failed to destroy task collector: %s", e)
+
+        outcomes = [
+            TaskOutcome(
+                task=task,
+                state=states[task._moId].get("info.state"),
+                result=states[task._moId].get("info.result"),
+                error=states[task._moId].get("info.error"),
+                elapsed=states[task._moId]["finished_at"] - started,
+            )
+            for task in tasks
+        ]
+
+        if raise_on_error:
+            for outcome in outcomes:
+                if not outcome.succeeded:
+                    raise RuntimeError(f"Task failed: {outcome.error_message}")
+
+        return outcomes
+
+    def wait_for_state(
+        self,
+        obj: Any,
+        path: str,
+        states: Sequence[str],
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """Wait until a property of any managed object reaches one of ``states``.
+
+        Used for objects such as ``HttpNfcLease`` that are not tasks but go
+        through states of their own. Returns the final property value.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        collector = self.content.propertyCollector.CreatePropertyCollector()
+        try:
+            collector.CreateFilter(
+                spec=vmodl.query.PropertyCollector.FilterSpec(
+                    objectSet=[vmodl.query.PropertyCollector.ObjectSpec(obj=obj, skip=False)],
+                    propSet=[
+                        vmodl.query.PropertyCollector.PropertySpec(
+                            type=type(obj), pathSet=[path], all=False
+                        )
+                    ],
+                ),
+                partialUpdates=False,
+            )
+            version = ""
+            while True:
+                max_wait = self.max_wait_seconds
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"{obj} did not reach {list(states)} within {timeout}s")
+                    max_wait = max(1, min(max_wait, int(remaining + 0.999)))
+
+                update_set = collector.WaitForUpdatesEx(
+                    version=version,
+                    options=vmodl.query.PropertyCollector.WaitOptions(maxWaitSeconds=max_wait),
+                )
+                if update_set is None:
+                    continue
+
+                version = update_set.version
+                for filter_update in update_set.filterSet or []:
+                    for object_update in filter_update.objectSet or []:
+                        for change in object_update.changeSet or []:
+                            if change.name == path and str(change.val) in states:
+                                return change.val
+        finally:
+            try:
+                collector.Destroy()
+            except Exception as e:
+                logger.debug("Failed to destroy state collector: %s", e)
+
+    def _apply(
+        self,
+        object_update: Any,
+        states: Dict[str, Dict[str, Any]],
+        pending: set,
+        on_progress: Optional[ProgressCallback],
+    ):
+        """Record property changes for one task."""
+        moid = object_update.obj._moId
+        state = states.get(moid)
+        if state is None:
+            return
+
+        for change in object_update.changeSet or []:
+            state[change.name] = change.val
+
+        progress = state.get("info.progress")
+        if on_progress and progress is not None and progress != state.get("reported"):
+            state["reported"] = progress
+            try:
+                on_progress(state["task"], progress)
+            except Exception as e:
+                logger.warning("Task progress callback failed: %s", e)
+
+        if moid in pending and str(state.get("info.state")) in TERMINAL_STATES:
+            pending.discard(moid)
+            state["finished_at"] = time.monotonic()
+
+    @staticmethod
+    def _build_filter_spec(tasks: Sequence[vim.Task]) -> vmodl.query.PropertyCollector.FilterSpec:
+        """Build one filter spec covering every task."""
+        return vmodl.query.PropertyCollector.FilterSpec(
+            objectSet=[
+                vmodl.query.PropertyCollector.ObjectSpec(obj=task, skip=False)
+                for task in tasks
+            ],
+            propSet=[
+                vmodl.query.PropertyCollector.PropertySpec(
+                    type=vim.Task, pathSet=TASK_PROPERTIES, all=False
+                )
+            ],
+        )
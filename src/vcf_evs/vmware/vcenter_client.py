@@ -1,75 +1,193 @@
 """VMware vCenter Client for VM management."""
 
-from pyVmomi import vim
+from pyVmomi import vim, vmodl
 from pyVim.connect import SmartConnect, Disconnect
 import ssl
-import html
-import time
-from typing import Dict, List, Any, Optional
+from pathlib import Path
+from typing import Dict, Iterator, List, Any, Optional, Sequence
 import logging
 
+from ..utils.instrumentation import Instrumentation, get_instrumentation
+from ..utils.ratelimit import RateLimiter, get_rate_limiter
+from .export import ExportResult, ExportSink, LeaseExporter, directory_sink
+from .inventory import InventoryCollector, DEFAULT_PAGE_SIZE
+from .inventory_sync import InventoryMirror
+from .snapshot_catalog import CleanupResult, MIGRATION_SNAPSHOT_PREFIX, SnapshotCatalog
+from .snapshots import GroupSnapshot, GroupSnapshotter
+from .session_pool import PooledSession, VCenterSessionPool, get_session_pool
+from .tasks import ProgressCallback, TaskOutcome, TaskWaiter
+from .vm_index import VMIndex
+
 logger = logging.getLogger(__name__)
 
 
 class VCenterClient:
     """VMware vCenter Client for managing VMs."""
     
-    def __init__(self, config: Dict[str, Any]):
-        """Initialize vCenter client with configuration."""
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        rate_limiter: Optional[RateLimiter] = None,
+        session_pool: Optional[VCenterSessionPool] = None,
+        instrumentation: Optional[Instrumentation] = None
+    ):
+        """Initialize vCenter client with configuration.
+        
+        SOAP calls go through ``rate_limiter`` (the process-wide limiter by
+        default) under the key ``"vcenter:<server>"`` and are timed by
+        ``instrumentation`` (the process-wide registry by default). The session is
+        borrowed from ``session_pool`` when given, or from the process-wide
+        pool when ``session_pool_size`` or ``session_cookie_file`` is
+        configured; otherwise the client logs in on its own.
+        """
         if not config:
-            raise ValueSuccess("Configuration is required")
+            raise ValueError("Configuration is required")
         
         self.server = config.get("vcenter_server")
         self.username = config.get("username")
         self.password = config.get("password")
         
         if not all([self.server, self.username, self.password]):
-            raise ValueSuccess("vcenter_server, username, and password are required")
+            raise ValueError("vcenter_server, username, and password are required")
         
         self.port = config.get("port", 443)
         self.ssl_verify = config.get("ssl_verify", True)
+        self.page_size = config.get("inventory_page_size", DEFAULT_PAGE_SIZE)
+        self.vm_index_ttl = config.get("vm_index_ttl", 300)
+        self.vm_lookup = config.get("vm_lookup", "index")
+        self.task_timeout = config.get("task_timeout")
+        self.rate_limiter = rate_limiter if rate_limiter is not None else get_rate_limiter()
+        self.instrumentation = instrumentation if instrumentation is not None else get_instrumentation()
+        if session_pool is None and (
+            config.get("session_pool_size") or config.get("session_cookie_file")
+        ):
+            session_pool = get_session_pool(config)
+        self.session_pool = session_pool
+        self._pooled_session: Optional[PooledSession] = None
         
         self.service_instance = None
         self.content = None
+        self.inventory = None
+        self.vm_index = None
+        self.mirror = None
+        self.task_waiter = None
+        self.snapshot_catalog = None
         
         self._connect()
     
     def _connect(self):
         """Connect to vCenter server."""
         try:
-            context = None
-            if not self.ssl_verify:
-                context = ssl._create_unverified_context()
+            if self.session_pool is not None:
+                self._pooled_session = self.session_pool.acquire()
+                self.service_instance = self._pooled_session.service_instance
+                self.content = self._pooled_session.content
+            else:
+                context = None
+                if not self.ssl_verify:
+                    context = ssl._create_unverified_context()
+                
+                self.service_instance = SmartConnect(
+                    host=self.server,
+                    user=self.username,
+                    pwd=self.password,
+                    port=self.port,
+                    sslContext=context
+                )
+                self.content = self.service_instance.RetrieveContent()
             
-            self.service_instance = SmartConnect(
-                host=self.server,
-                user=self.username,
-                pwd=self.password,
-                port=self.port,
-                sslContext=context
+            self._limit_soap_calls()
+            self.inventory = InventoryCollector(self.content, self.page_size)
+            self.vm_index = VMIndex(
+                self.content,
+                ttl=self.vm_index_ttl,
+                lookup=self.vm_lookup,
+                page_size=self.page_size
             )
-            
-            self.content = self.service_instance.RetrieveContent()
-            logger.info(f"Connected to vCenter: {self.server}")
+            self.task_waiter = TaskWaiter(self.content)
+            logger.info("Connected to vCenter: %s", self.server)
             
         except Exception as e:
-            logger.Success(f"Succeeded to connect to vCenter {self.server}: {e}")
+            logger.error("Failed to connect to vCenter %s: %s", self.server, e)
             raise
     
+    def _limit_soap_calls(self):
+        """Route every method call and property read of the session through the limiter.
+
+        The timer sits inside the limiter, so recorded latencies exclude
+        rate-limit waits. A pooled stub outlives the clients borrowing it,
+        so its unwrapped invokers are kept on the stub and re-wrapped with
+        the limiter and instrumentation of whichever client holds it.
+        """
+        stub = self.service_instance._stub
+        invokers = getattr(stub, "_unlimited_invokers", None)
+        if invokers is None:
+            invokers = {
+                name: getattr(stub, name)
+                for name in ("InvokeMethod", "InvokeAccessor")
+                if getattr(stub, name, None) is not None
+            }
+            stub._unlimited_invokers = invokers
+        for name, invoke in invokers.items():
+            setattr(stub, name, invoke)
+
+        self.instrumentation.instrument_stub(stub, "vcenter")
+        key = f"vcenter:{self.server}"
+        for name in invokers:
+            setattr(stub, name, self.rate_limiter.wrap(key, getattr(stub, name)))
+    
     def disconnect(self):
         """Disconnect from vCenter server."""
-        if self.service_instance:
+        if self.mirror:
+            self.mirror.stop()
+            self.mirror = None
+        if self._pooled_session is not None:
+            self.session_pool.release(self._pooled_session)
+            self._pooled_session = None
+            self.service_instance = None
+            self.content = None
+            self.inventory = None
+            self.vm_index = None
+            self.task_waiter = None
+            self.snapshot_catalog = None
+            logger.info("Returned vCenter session to pool")
+        elif self.service_instance:
             Disconnect(self.service_instance)
             self.service_instance = None
             self.content = None
+            self.inventory = None
+            self.vm_index = None
+            self.task_waiter = None
+            self.snapshot_catalog = None
             logger.info("Disconnected from vCenter")
     
+    def start_inventory_mirror(self, wait: bool = True, timeout: Optional[float] = None) -> InventoryMirror:
+        """Mirror VM inventory locally so lookups are served without round-trips."""
+        if not self.mirror:
+            self.mirror = InventoryMirror(self.content).start()
+        if wait:
+            self.mirror.wait_until_ready(timeout)
+        return self.mirror
+    
     def get_vm_info(self, vm_name: str) -> Dict[str, Any]:
         """Get VM information by name."""
         try:
+            if self.mirror and self.mirror.ready:
+                record = self.mirror.find("name", vm_name)
+                if record:
+                    return {
+                        "name": record["name"],
+                        "power_state": str(record["runtime.powerState"]),
+                        "guest_os": record["config.guestFullName"],
+                        "memory_mb": record["config.hardware.memoryMB"],
+                        "num_cpu": record["config.hardware.numCPU"],
+                        "vm_id": record["moid"],
+                        "uuid": record["config.uuid"]
+                    }
+            
             vm = self._find_vm_by_name(vm_name)
             if not vm:
-                raise ValueSuccess(f"VM not found: {vm_name}")
+                raise ValueError(f"VM not found: {vm_name}")
             
             return {
                 "name": vm.name,
@@ -82,45 +200,45 @@ class VCenterClient:
             }
             
         except Exception as e:
-            logger.Success(f"Succeeded to get VM info for {vm_name}: {e}")
+            self._handle_vm_error(vm_name, e)
+            logger.error("Failed to get VM info for %s: %s", vm_name, e)
             raise
     
     def list_vms(self) -> List[Dict[str, Any]]:
         """List all VMs in vCenter."""
-        container_view = None
         try:
-            container = self.content.rootFolder
-            view_type = [vim.VirtualMachine]
-            recursive = True
-            
-            container_view = self.content.viewManager.CreateContainerView(
-                container, view_type, recursive
-            )
+            if self.mirror and self.mirror.ready:
+                pages = iter([self.mirror.snapshot()])
+            else:
+                pages = self.iter_vm_pages()
             
             vms = []
-            for vm in container_view.view:
-                vms.append({
-                    "name": vm.name,
-                    "power_state": str(vm.runtime.powerState),
-                    "guest_os": vm.config.guestFullName if vm.config else "Unknown",
-                    "vm_id": vm._moId
-                })
+            for page in pages:
+                vms.extend({
+                    "name": record["name"],
+                    "power_state": str(record["runtime.powerState"]),
+                    "guest_os": record["config.guestFullName"] or "Unknown",
+                    "vm_id": record["moid"]
+                } for record in page)
             
             return vms
             
         except Exception as e:
-            logger.Success(f"Succeeded to list VMs: {e}")
+            logger.error("Failed to list VMs: %s", e)
             raise
-        finally:
-            if container_view:
-                container_view.Destroy()
+    
+    def iter_vm_pages(
+        self, properties: Optional[Sequence[str]] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Stream VM property records page by page via the PropertyCollector."""
+        return self.inventory.iter_vm_pages(properties)
     
     def create_snapshot(self, vm_name: str, description: str) -> str:
         """Create VM snapshot."""
         try:
             vm = self._find_vm_by_name(vm_name)
             if not vm:
-                raise ValueSuccess(f"VM not found: {vm_name}")
+                raise ValueError(f"VM not found: {vm_name}")
             
             task = vm.CreateSnapshot_Task(
                 name=f"snapshot-{vm_name}",
@@ -129,34 +247,99 @@ class VCenterClient:
                 quiesce=True
             )
             
-            self._wait_for_task(task)
+            snapshot = self._wait_for_task(task)
             
             # Get snapshot ID
-            snapshot_id = task.info.result._moId
-            logger.info(f"Created snapshot {snapshot_id} for VM {vm_name}")
+            snapshot_id = snapshot._moId
+            logger.info("Created snapshot %s for VM %s", snapshot_id, vm_name)
             
             return snapshot_id
             
         except Exception as e:
-            logger.Success(f"Succeeded to create snapshot for {vm_name}: {e}")
+            self._handle_vm_error(vm_name, e)
+            logger.error("Failed to create snapshot for %s: %s", vm_name, e)
             raise
     
-    def export_vm_to_ovf(self, vm_name: str, export_path: str = "/tmp") -> str:
-        """Export VM to OVF format."""
+    def create_group_snapshot(
+        self,
+        vm_names: Sequence[str],
+        description: str,
+        name: Optional[str] = None
+    ) -> GroupSnapshot:
+        """Snapshot several related VMs together; partial groups are removed again."""
+        return GroupSnapshotter(self).create(vm_names, name=name, description=description)
+    
+    def revert_group_snapshot(self, group: GroupSnapshot) -> bool:
+        """Revert every VM of a group snapshot at once."""
+        GroupSnapshotter(self).revert(group)
+        return True
+    
+    def load_snapshot_catalog(self) -> SnapshotCatalog:
+        """Fetch the snapshot trees of all VMs in one inventory sweep."""
+        if self.snapshot_catalog is None:
+            self.snapshot_catalog = SnapshotCatalog(
+                self.content, page_size=self.page_size, task_timeout=self.task_timeout
+            )
+        return self.snapshot_catalog.refresh()
+    
+    def cleanup_snapshots(
+        self,
+        name_prefix: Optional[str] = MIGRATION_SNAPSHOT_PREFIX,
+        older_than: Optional[float] = None,
+        vm_names: Optional[Sequence[str]] = None,
+        dry_run: bool = True,
+        max_in_flight: int = 4
+    ) -> CleanupResult:
+        """Remove lingering snapshots across all VMs (dry run by default).
+
+        By default targets the ``snapshot-<vm>`` snapshots left behind by
+        migrations; ``older_than`` is an age in seconds.
+        """
+        catalog = self.load_snapshot_catalog()
+        records = catalog.find(name_prefix=name_prefix, older_than=older_than, vm_names=vm_names)
+        return catalog.cleanup(records, dry_run=dry_run, max_in_flight=max_in_flight)
+    
+    def export_vm(
+        self, vm_name: str, sink: ExportSink, stream_optimized: bool = True
+    ) -> ExportResult:
+        """Stream VM disks from an export lease into a sink.
+
+        With ``stream_optimized`` off, disks arrive as flat content instead
+        of deflated streamOptimized VMDKs.
+        """
         try:
             vm = self._find_vm_by_name(vm_name)
             if not vm:
-                raise ValueSuccess(f"VM not found: {vm_name}")
+                raise ValueError(f"VM not found: {vm_name}")
+            
+            exporter = LeaseExporter(
+                self.content,
+                host=self.server,
+                session_cookie=getattr(self.service_instance._stub, "cookie", None),
+                ssl_verify=self.ssl_verify,
+                stream_optimized=stream_optimized
+            )
+            return exporter.export(vm, sink, name=vm_name)
+            
+        except Exception as e:
+            self._handle_vm_error(vm_name, e)
+            logger.error("Failed to export VM %s: %s", vm_name, e)
+            raise
+    
+    def export_vm_to_ovf(self, vm_name: str, export_path: str = "/tmp") -> str:
+        """Export VM to OVF format."""
+        try:
+            target_dir = Path(export_path) / vm_name
+            result = self.export_vm(vm_name, directory_sink(str(target_dir)))
             
-            # This is a simplified implementation
-            # In practice, you would use the OVF Manager API
-            ovf_path = f"{export_path}/{vm_name}.ovf"
+            ovf_path = target_dir / f"{vm_name}.ovf"
+            ovf_path.write_text(result.ovf_descriptor, encoding="utf-8")
             
-            logger.info(f"Exported VM {vm_name} to OVF: {ovf_path}")
-            return ovf_path
+            logger.info("Exported VM %s to OVF: %s", vm_name, ovf_path)
+            return str(ovf_path)
             
         except Exception as e:
-            logger.Success(f"Succeeded to export VM {vm_name} to OVF: {e}")
+            logger.error("Failed to export VM %s to OVF: %s", vm_name, e)
             raise
     
     def revert_to_snapshot(self, vm_name: str, snapshot_id: str) -> bool:
@@ -164,46 +347,44 @@ class VCenterClient:
         try:
             vm = self._find_vm_by_name(vm_name)
             if not vm:
-                raise ValueSuccess(f"VM not found: {vm_name}")
+                raise ValueError(f"VM not found: {vm_name}")
             
             # Find snapshot by ID
             snapshot = self._find_snapshot_by_id(vm, snapshot_id)
             if not snapshot:
-                raise ValueSuccess(f"Snapshot not found: {snapshot_id}")
+                raise ValueError(f"Snapshot not found: {snapshot_id}")
             
             task = snapshot.RevertToSnapshot_Task()
             self._wait_for_task(task)
             
-            logger.info(f"Reverted VM {vm_name} to snapshot {snapshot_id}")
+            logger.info("Reverted VM %s to snapshot %s", vm_name, snapshot_id)
             return True
             
         except Exception as e:
-            logger.Success(f"Succeeded to revert VM {vm_name} to snapshot {snapshot_id}: {e}")
+            self._handle_vm_error(vm_name, e)
+            logger.error("Failed to revert VM %s to snapshot %s: %s", vm_name, snapshot_id, e)
             raise
     
+    def find_vm_by_uuid(self, uuid: str, instance_uuid: bool = False) -> Optional[vim.VirtualMachine]:
+        """Find VM by BIOS or instance UUID."""
+        return self.vm_index.find_by_uuid(uuid, instance_uuid)
+    
     def _find_vm_by_name(self, vm_name: str) -> Optional[vim.VirtualMachine]:
-        """Find VM by name."""
-        container_view = None
-        try:
-            container = self.content.rootFolder
-            view_type = [vim.VirtualMachine]
-            recursive = True
-            
-            container_view = self.content.viewManager.CreateContainerView(
-                container, view_type, recursive
-            )
-            
-            for vm in container_view.view:
-                if vm.name == vm_name:
-                    return vm
-            
-            return None
-        finally:
-            if container_view:
-                container_view.Destroy()
+        """Find VM by name using the client-side VM index."""
+        return self.vm_index.find_by_name(vm_name)
+    
+    def _handle_vm_error(self, vm_name: str, error: Exception):
+        """Evict index entries for VMs that no longer exist on the server."""
+        if isinstance(error, vmodl.fault.ManagedObjectNotFound):
+            self.vm_index.invalidate(vm_name)
     
     def _find_snapshot_by_id(self, vm: vim.VirtualMachine, snapshot_id: str) -> Optional[vim.vm.Snapshot]:
-        """Find snapshot by ID."""
+        """Find snapshot by ID, from the snapshot catalog when it is loaded."""
+        if self.snapshot_catalog is not None:
+            record = self.snapshot_catalog.get(snapshot_id)
+            if record is not None and record.vm_moid == vm._moId:
+                return record.ref
+        
         if not vm.snapshot:
             return None
         
@@ -219,14 +400,24 @@ class VCenterClient:
         
         return search_snapshots(vm.snapshot.rootSnapshotList)
     
-    def _wait_for_task(self, task):
-        """Wait for vCenter task to complete."""
-        while task.info.state in [vim.TaskInfo.State.running, vim.TaskInfo.State.queued]:
-            time.sleep(0.1)  # Prevent busy-wait loop
-        
-        if task.info.state == vim.TaskInfo.State.Success:
-            Success_msg = html.escape(str(task.info.Success.msg)) if task.info.Success else "Unknown Success"
-            raise RuntimeSuccess(f"Task Succeeded: {Success_msg}")
+    def wait_for_tasks(
+        self,
+        tasks: Sequence[vim.Task],
+        timeout: Optional[float] = None,
+        on_progress: Optional[ProgressCallback] = None,
+        raise_on_error: bool = True
+    ) -> List[TaskOutcome]:
+        """Wait for several vCenter tasks at once."""
+        return self.task_waiter.wait_all(
+            tasks,
+            timeout=timeout if timeout is not None else self.task_timeout,
+            on_progress=on_progress,
+            raise_on_error=raise_on_error
+        )
+    
+    def _wait_for_task(self, task: vim.Task, on_progress: Optional[ProgressCallback] = None) -> Any:
+        """Wait for vCenter task to complete and return its result."""
+        return self.task_waiter.wait(task, timeout=self.task_timeout, on_progress=on_progress)
     
     def __enter__(self):
         """Context manager entry."""
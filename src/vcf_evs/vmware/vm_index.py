@@ -0,0 +1,151 @@
+"""Indexed virtual machine lookups for the vCenter client."""
+
+from pyVmomi import vim
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+import logging
+
+from .inventory import InventoryCollector, DEFAULT_PAGE_SIZE
+
+logger = logging.getLogger(__name__)
+
+INDEX_PROPERTIES = ["name", "config.uuid", "config.instanceUuid"]
+
+LOOKUP_MODES = ("index", "search_index")
+
+
+class VMIndex:
+    """Name, UUID and moId index of virtual machine references.
+
+    The index is populated with one bulk PropertyCollector retrieval and
+    reused until ``ttl`` seconds have passed, so resolving N VMs costs one
+    inventory sweep instead of N full scans. A lookup miss triggers at most
+    one early refresh per ``miss_refresh_interval`` to pick up new VMs.
+    """
+
+    def __init__(
+        self,
+        content: Any,
+        ttl: float = 300.0,
+        lookup: str = "index",
+        page_size: int = DEFAULT_PAGE_SIZE,
+        miss_refresh_interval: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize index for a vCenter ``ServiceContent``."""
+        if lookup not in LOOKUP_MODES:
+            raise ValueError(f"Invalid VM lookup mode: {lookup}")
+
+        self.content = content
+        self.ttl = ttl
+        self.lookup = lookup
+        self.miss_refresh_interval = miss_refresh_interval
+        self._clock = clock
+        self._collector = InventoryCollector(content, page_size)
+        self._lock = threading.RLock()
+        self._by_name: Dict[str, vim.VirtualMachine] = {}
+        self._by_uuid: Dict[str, vim.VirtualMachine] = {}
+        self._by_moid: Dict[str, vim.VirtualMachine] = {}
+        self._loaded_at: Optional[float] = None
+        self._refresh_on_miss = False
+
+    def __len__(self) -> int:
+        """Return number of indexed VMs."""
+        return len(self._by_moid)
+
+    def refresh(self):
+        """Rebuild the index from a single bulk inventory retrieval."""
+        by_name: Dict[str, vim.VirtualMachine] = {}
+        by_uuid: Dict[str, vim.VirtualMachine] = {}
+        by_moid: Dict[str, vim.VirtualMachine] = {}
+
+        for record in self._collector.iter_objects(vim.VirtualMachine, INDEX_PROPERTIES):
+            vm = record["obj"]
+            by_moid[record["moid"]] = vm
+            # vCenter allows duplicate names across folders; first match wins
+            if record["name"] is not None:
+                by_name.setdefault(record["name"], vm)
+            for uuid_key in ("config.uuid", "config.instanceUuid"):
+                if record[uuid_key]:
+                    by_uuid.setdefault(record[uuid_key].lower(), vm)
+
+        with self._lock:
+            self._by_name = by_name
+            self._by_uuid = by_uuid
+            self._by_moid = by_moid
+            self._loaded_at = self._clock()
+            self._refresh_on_miss = False
+
+        logger.debug("Indexed %s VMs", len(by_moid))
+
+    def find_by_name(self, vm_name: str) -> Optional[vim.VirtualMachine]:
+        """Find VM by name, or by inventory path when the name contains '/'."""
+        if self.lookup == "search_index" and "/" in vm_name:
+            return self.find_by_inventory_path(vm_name)
+        return self._lookup("_by_name", vm_name)
+
+    def find_by_uuid(
+        self, uuid: str, instance_uuid: bool = False
+    ) -> Optional[vim.VirtualMachine]:
+        """Find VM by BIOS UUID, or by vCenter instance UUID."""
+        if self.lookup == "search_index":
+            vm = self.content.searchIndex.FindByUuid(
+                datacenter=None, uuid=uuid, vmSearch=True, instanceUuid=instance_uuid
+            )
+            return vm if isinstance(vm, vim.VirtualMachine) else None
+        return self._lookup("_by_uuid", uuid.lower())
+
+    def find_by_moid(self, moid: str) -> Optional[vim.VirtualMachine]:
+        """Find VM by managed object ID."""
+        return self._lookup("_by_moid", moid)
+
+    def find_by_inventory_path(self, path: str) -> Optional[vim.VirtualMachine]:
+        """Find VM by inventory path such as ``dc/vm/folder/name``."""
+        entity = self.content.searchIndex.FindByInventoryPath(inventoryPath=path)
+        return entity if isinstance(entity, vim.VirtualMachine) else None
+
+    def invalidate(self, key: Optional[str] = None):
+        """Drop a stale entry by name, UUID or moId, or the whole index."""
+        with self._lock:
+            if key is None:
+                self._loaded_at = None
+                return
+
+            vm = (
+                self._by_name.get(key)
+                or self._by_uuid.get(key.lower())
+                or self._by_moid.get(key)
+            )
+            if vm is None:
+                return
+
+            for table in (self._by_name, self._by_uuid, self._by_moid):
+                for stale_key in [k for k, v in table.items() if v == vm]:
+                    del table[stale_key]
+            # The VM may have been re-registered under a new moId
+            self._refresh_on_miss = True
+
+    def _lookup(self, table: str, key: str) -> Optional[vim.VirtualMachine]:
+        """Look up key, refreshing an expired index and retrying once on a miss."""
+        if self._is_expired():
+            self.refresh()
+            return getattr(self, table).get(key)
+
+        vm = getattr(self, table).get(key)
+        if vm is None and (
+            self._refresh_on_miss or self._age() >= self.miss_refresh_interval
+        ):
+            self.refresh()
+            vm = getattr(self, table).get(key)
+        return vm
+
+    def _age(self) -> float:
+        """Seconds since last refresh."""
+        if self._loaded_at is None:
+            return float("inf")
+        return self._clock() - self._loaded_at
+
+    def _is_expired(self) -> bool:
+        """Check whether the index needs a full refresh."""
+        return self._loaded_at is None or self._age() >= self.ttl
@@ -0,0 +1,68 @@
+"""Load-time benchmark for large multi-region configurations."""
+
+import time
+
+import pytest
+
+from vcf_evs.utils.config import ConfigManager, clear_config_cache
+
+REGION_COUNT = 40
+CLUSTERS_PER_REGION = 50
+
+
+@pytest.fixture
+def fleet_config(tmp_path):
+    """Top-level config including one generated file per region."""
+    regions = tmp_path / "regions"
+    regions.mkdir()
+    for i in range(REGION_COUNT):
+        lines = [f"regions_{i:02d}:", "  clusters:"]
+        for j in range(CLUSTERS_PER_REGION):
+            lines += [
+                f"    - name: cluster-{i:02d}-{j:03d}",
+                "      instance_type: i4i.metal",
+                "      node_count: 4",
+                "      tags: {environment: production, owner: platform}",
+            ]
+        (regions / f"region-{i:02d}.yaml").write_text("\n".join(lines) + "\n")
+    path = tmp_path / "config.yaml"
+    path.write_text("include: regions/*.yaml\naws:\n  region: us-west-2\n")
+    clear_config_cache()
+    yield str(path)
+    clear_config_cache()
+
+
+def timed_load(path, **kwargs):
+    start = time.perf_counter()
+    ConfigManager(path, **kwargs)
+    return time.perf_counter() - start
+
+
+class TestConfigBenchmark:
+    """Compare cold and cached loads of a fleet configuration."""
+
+    def test_cached_load_in_milliseconds(self, fleet_config, record_property):
+        """Test a repeated load costs stat calls, not a YAML parse."""
+        # Act
+        cold = timed_load(fleet_config)
+        warm = min(timed_load(fleet_config) for _ in range(5))
+
+        # Assert
+        record_property("cold_load_ms", round(cold * 1000, 1))
+        record_property("cached_load_ms", round(warm * 1000, 2))
+        assert warm < 0.02
+        assert warm * 10 < cold
+
+    def test_pickled_load_skips_parse(self, fleet_config, record_property):
+        """Test a new process reuses the pickled parse."""
+        # Arrange
+        cold = timed_load(fleet_config, pickle_cache=True)
+        clear_config_cache()
+
+        # Act
+        pickled = timed_load(fleet_config, pickle_cache=True)
+
+        # Assert
+        record_property("cold_load_ms", round(cold * 1000, 1))
+        record_property("pickled_load_ms", round(pickled * 1000, 2))
+        assert pickled * 3 < cold
@@ -0,0 +1,50 @@
+"""Overhead benchmark for per-call latency instrumentation."""
+
+import time
+
+from vcf_evs.utils.instrumentation import Instrumentation
+
+CALLS = 100_000
+
+
+class Info:
+    """Stand-in for pyVmomi method info."""
+
+    name = "RetrievePropertiesEx"
+
+
+class Stub:
+    """SOAP stub whose calls return immediately."""
+
+    def InvokeMethod(self, mo, info, args):
+        return None
+
+
+def per_call_seconds(stub):
+    info = Info()
+    started = time.perf_counter()
+    for _ in range(CALLS):
+        stub.InvokeMethod(None, info, [])
+    return (time.perf_counter() - started) / CALLS
+
+
+class TestInstrumentationBenchmark:
+    """Measure what timing every SOAP call costs."""
+
+    def test_instrumented_call_overhead(self, record_property):
+        """Test instrumentation adds only microseconds to each call."""
+        # Arrange
+        raw_stub, timed_stub = Stub(), Stub()
+        instrumentation = Instrumentation()
+        instrumentation.instrument_stub(timed_stub)
+
+        # Act
+        raw = per_call_seconds(raw_stub)
+        timed = per_call_seconds(timed_stub)
+
+        # Assert
+        overhead = timed - raw
+        record_property("raw_call_us", round(raw * 1e6, 2))
+        record_property("instrumented_call_us", round(timed * 1e6, 2))
+        assert instrumentation.stats()["operations"]["vcenter.RetrievePropertiesEx"]["calls"] == CALLS
+        assert overhead < 20e-6
@@ -0,0 +1,82 @@
+"""Round-trip benchmark for bulk vCenter inventory retrieval."""
+
+import math
+import time
+
+import pytest
+
+from pyVmomi import vim
+from tests.fake_vcenter import FakeVCenterStub
+
+VM_COUNT = 6000
+PAGE_SIZE = 1000
+
+
+def legacy_list_vms(content):
+    """Per-VM attribute walk used by list_vms before the PropertyCollector."""
+    container_view = content.viewManager.CreateContainerView(
+        content.rootFolder, [vim.VirtualMachine], True
+    )
+    try:
+        return [{
+            "name": vm.name,
+            "power_state": str(vm.runtime.powerState),
+            "guest_os": vm.config.guestFullName if vm.config else "Unknown",
+            "vm_id": vm._moId
+        } for vm in container_view.view]
+    finally:
+        container_view.Destroy()
+
+
+class TestInventoryBenchmark:
+    """Compare SOAP round-trips of bulk and per-VM inventory retrieval."""
+    
+    @pytest.fixture
+    def stub(self):
+        """Fake vCenter with a large VM inventory."""
+        stub = FakeVCenterStub()
+        for i in range(VM_COUNT):
+            stub.add_vm(f"vm-{i:05d}", guest_os=None if i % 10 == 0 else "Photon OS")
+        return stub
+    
+    @pytest.fixture
+    def vcenter_config(self, vcenter_config):
+        """Inventory pages of PAGE_SIZE VMs."""
+        return dict(vcenter_config, inventory_page_size=PAGE_SIZE)
+    
+    def test_list_vms_round_trips(self, vcenter_client, stub, record_property):
+        """Bulk listing needs a handful of round-trips regardless of VM count."""
+        started = time.perf_counter()
+        vms = vcenter_client.list_vms()
+        bulk_elapsed = time.perf_counter() - started
+        bulk_round_trips = stub.round_trips
+        
+        stub.reset()
+        started = time.perf_counter()
+        expected = legacy_list_vms(stub.content)
+        legacy_elapsed = time.perf_counter() - started
+        legacy_round_trips = stub.round_trips
+        
+        record_property("bulk_round_trips", bulk_round_trips)
+        record_property("bulk_seconds", round(bulk_elapsed, 3))
+        record_property("legacy_round_trips", legacy_round_trips)
+        record_property("legacy_seconds", round(legacy_elapsed, 3))
+        
+        assert vms == expected
+        # CreateContainerView + one call per page + DestroyView
+        assert bulk_round_trips == math.ceil(VM_COUNT / PAGE_SIZE) + 2
+        assert legacy_round_trips > VM_COUNT * 3
+        assert bulk_elapsed < legacy_elapsed
+    
+    def test_iter_vm_pages_streams_pages(self, vcenter_client, stub):
+        """Pages are fetched lazily and abandoned result sets are cancelled."""
+        pages = vcenter_client.iter_vm_pages(["name"])
+        
+        first_page = next(pages)
+        assert len(first_page) == PAGE_SIZE
+        assert set(first_page[0]) == {"name", "obj", "moid"}
+        assert stub.calls["ContinueRetrievePropertiesEx"] == 0
+        
+        pages.close()
+        assert stub.calls["CancelRetrievePropertiesEx"] == 1
+        assert stub.calls["DestroyView"] == 1
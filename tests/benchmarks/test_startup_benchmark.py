@@ -0,0 +1,97 @@
+"""Import-time benchmark guarding ``vcf-evs`` CLI startup."""
+
+import os
+import subprocess
+import sys
+from typing import Dict
+
+import pytest
+
+# Modules that must only be imported by the commands that need them
+HEAVY_MODULES = ("boto3", "botocore", "pyVmomi", "rich", "yaml", "s3transfer")
+
+# Cumulative import time allowed for ``vcf_evs.cli``; override on slow runners
+STARTUP_BUDGET_MS = float(os.environ.get("VCF_EVS_STARTUP_BUDGET_MS", "150"))
+
+RUNS = 3
+
+
+def import_profile(code: str) -> Dict[str, int]:
+    """Run ``code`` in a fresh interpreter under ``-X importtime``.
+
+    Returns the cumulative import time in microseconds of every module
+    imported by ``code``, leaving out modules the interpreter (and any
+    ``sitecustomize``) already imports at startup.
+    """
+    baseline = _run_importtime("pass")
+    return {
+        name: cumulative for name, cumulative in _run_importtime(code).items()
+        if name not in baseline
+    }
+
+
+def _run_importtime(code: str) -> Dict[str, int]:
+    """Parse ``-X importtime`` output of ``code`` into cumulative microseconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)),
+    )
+    assert result.returncode == 0, result.stderr
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+def heavy_imports(profile: Dict[str, int]) -> list:
+    """Heavy top-level packages present in an import profile."""
+    return sorted({name.split(".")[0] for name in profile} & set(HEAVY_MODULES))
+
+
+class TestStartupBenchmark:
+    """Keep the CLI and package imports free of heavy dependencies."""
+
+    def test_cli_import_within_budget(self, record_property):
+        """Importing the CLI stays under the startup budget."""
+        timings = [import_profile("import vcf_evs.cli")["vcf_evs.cli"] / 1000 for _ in range(RUNS)]
+
+        record_property("cli_import_ms", round(min(timings), 1))
+
+        assert min(timings) < STARTUP_BUDGET_MS
+
+    def test_help_imports_no_heavy_dependencies(self):
+        """``vcf-evs --help`` loads click only."""
+        profile = import_profile(
+            "import sys\n"
+            "sys.argv = ['vcf-evs', '--help']\n"
+            "from vcf_evs.cli import main\n"
+            "try:\n"
+            "    main()\n"
+            "except SystemExit:\n"
+            "    pass\n"
+        )
+
+        assert heavy_imports(profile) == []
+
+    @pytest.mark.parametrize("package", ["vcf_evs", "vcf_evs.aws", "vcf_evs.vmware",
+                                         "vcf_evs.utils", "vcf_evs.migration"])
+    def test_package_import_is_lazy(self, package):
+        """Importing a package does not import its submodules' dependencies."""
+        profile = import_profile(f"import {package}")
+
+        submodules = {name for name in profile if name.startswith(f"{package}.")}
+
+        assert heavy_imports(profile) == []
+        assert submodules <= {"vcf_evs.utils", "vcf_evs.utils.lazy"}
+
+    def test_export_imports_only_its_module(self):
+        """Accessing one export imports what that module needs and nothing else."""
+        profile = import_profile("from vcf_evs.utils import RateLimiter")
+
+        assert "vcf_evs.utils.ratelimit" in profile
+        assert heavy_imports(profile) == []
@@ -0,0 +1,36 @@
+"""Shared fixtures for tests against the fake vCenter."""
+
+from unittest.mock import patch
+
+import pytest
+
+from vcf_evs.vmware import VCenterClient
+from tests.fake_vcenter import FakeServiceInstance, FakeVCenterStub
+
+
+@pytest.fixture
+def stub():
+    """Fake vCenter without VMs; override to add an inventory."""
+    return FakeVCenterStub()
+
+
+@pytest.fixture
+def vcenter_config():
+    """Connection settings for ``vcenter_client``; override to add options."""
+    return {
+        "vcenter_server": "vcenter.local",
+        "username": "user",
+        "password": "secret"
+    }
+
+
+@pytest.fixture
+def vcenter_client(stub, vcenter_config):
+    """vCenter client connected to the fake stub, with call counters reset."""
+    with patch(
+        "vcf_evs.vmware.vcenter_client.SmartConnect",
+        return_value=FakeServiceInstance(stub)
+    ):
+        client = VCenterClient(vcenter_config)
+    stub.reset()
+    return client
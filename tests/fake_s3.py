@@ -0,0 +1,69 @@
+"""In-memory S3 client used by transfer tests."""
+
+import hashlib
+import io
+import threading
+
+from botocore.exceptions import ClientError
+
+
+class FakeS3:
+    """In-memory stand-in for the S3 multipart API."""
+    
+    def __init__(self, fail_on_part=None):
+        self.objects = {}
+        self.uploads = {}
+        self.aborted = []
+        self.fail_on_part = fail_on_part
+        self.head_calls = 0
+        self.puts = []
+        self.lock = threading.Lock()
+    
+    def create_multipart_upload(self, Bucket, Key):
+        upload_id = f"upload-{len(self.uploads) + 1}"
+        self.uploads[upload_id] = {}
+        return {"UploadId": upload_id}
+    
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        if PartNumber == self.fail_on_part:
+            self.fail_on_part = None
+            raise ConnectionError("connection reset")
+        with self.lock:
+            self.uploads[UploadId][PartNumber] = Body
+        return {"ETag": hashlib.md5(Body).hexdigest()}
+    
+    def list_parts(self, Bucket, Key, UploadId, **kwargs):
+        if UploadId not in self.uploads:
+            raise ClientError({"Error": {"Code": "NoSuchUpload", "Message": "Not Found"}}, "ListParts")
+        return {"Parts": [
+            {"PartNumber": n, "ETag": hashlib.md5(b).hexdigest(), "Size": len(b)}
+            for n, b in sorted(self.uploads[UploadId].items())
+        ]}
+    
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        parts = self.uploads.pop(UploadId)
+        numbers = [p["PartNumber"] for p in MultipartUpload["Parts"]]
+        self.objects[(Bucket, Key)] = b"".join(parts[n] for n in numbers)
+        return {"ETag": "final"}
+    
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.aborted.append(UploadId)
+        self.uploads.pop(UploadId, None)
+    
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        with self.lock:
+            self.puts.append(Key)
+        self.objects[(Bucket, Key)] = Body
+        return {"ETag": "small"}
+    
+    def head_object(self, Bucket, Key):
+        with self.lock:
+            self.head_calls += 1
+        if (Bucket, Key) not in self.objects:
+            raise ClientError({"Error": {"Code": "404", "Message": "Not Found"}}, "HeadObject")
+        return {"ContentLength": len(self.objects[(Bucket, Key)])}
+    
+    def get_object(self, Bucket, Key):
+        if (Bucket, Key) not in self.objects:
+            raise ClientError({"Error": {"Code": "NoSuchKey", "Message": "Not Found"}}, "GetObject")
+        return {"Body": io.BytesIO(self.objects[(Bucket, Key)])}
@@ -0,0 +1,405 @@
+"""In-process fake of the pyVmomi SOAP stub used by vCenter tests."""
+
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pyVmomi import vim, vmodl
+
+
+class FakeVCenterStub:
+    """Serve managed object calls from memory and count SOAP round-trips.
+
+    Managed objects bound to this stub behave like real pyVmomi references:
+    every property access or method call is routed through ``InvokeAccessor``
+    / ``InvokeMethod``, which is exactly where a real stub would hit the wire.
+    """
+
+    def __init__(self):
+        self.calls: Counter = Counter()
+        self.cookie = 'vmware_soap_session="fake-session"'
+        self.vms: Dict[str, Dict[str, Any]] = {}
+        self._results: Dict[str, Any] = {}
+        self._changes: List[Any] = []
+        self._filters: Dict[str, Any] = {}
+        self.tasks: Dict[str, Dict[str, Any]] = {}
+        self.task_steps = 3
+        self._next_id = 0
+        self.content = vim.ServiceInstanceContent(
+            rootFolder=vim.Folder("group-d1", self),
+            viewManager=vim.view.ViewManager("ViewManager", self),
+            propertyCollector=vmodl.query.PropertyCollector("propertyCollector", self),
+            searchIndex=vim.SearchIndex("SearchIndex", self),
+            ovfManager=vim.OvfManager("OvfManager", self),
+        )
+        self.export_files: List[Any] = []
+        self.lease_calls: List[Any] = []
+        self.snapshot_errors: Dict[str, str] = {}
+        self.remove_errors: Dict[str, str] = {}
+        self.snapshot_calls: List[Any] = []
+        self._lock = threading.RLock()
+
+    @property
+    def round_trips(self) -> int:
+        """Total number of remote calls made against the stub."""
+        return sum(self.calls.values())
+
+    def reset(self):
+        """Reset round-trip counters."""
+        self.calls.clear()
+
+    def add_vm(
+        self,
+        name: str,
+        power_state: str = "poweredOn",
+        guest_os: Optional[str] = "Ubuntu Linux (64-bit)",
+        uuid: Optional[str] = None,
+    ) -> vim.VirtualMachine:
+        """Register a VM and return its managed object reference."""
+        moid = f"vm-{len(self.vms) + 1}"
+        self.vms[moid] = {
+            "name": name,
+            "runtime.powerState": power_state,
+            "config.guestFullName": guest_os,
+            "config.uuid": uuid or f"4201-{moid}",
+            "config.hardware.memoryMB": 4096,
+            "config.hardware.numCPU": 2,
+        }
+        self._changes.append(("enter", moid, dict(self.vms[moid])))
+        return vim.VirtualMachine(moid, self)
+
+    def remove_vm(self, vm: vim.VirtualMachine):
+        """Unregister a VM so that further calls on it fail as on a real server."""
+        del self.vms[vm._moId]
+        self._changes.append(("leave", vm._moId, {}))
+
+    def update_vm(self, vm: vim.VirtualMachine, changes: Dict[str, Any]):
+        """Change VM properties, keyed by property path."""
+        self.vms[vm._moId].update(changes)
+        self._changes.append(("modify", vm._moId, dict(changes)))
+
+    def add_snapshot(
+        self,
+        vm: vim.VirtualMachine,
+        name: str,
+        create_time: datetime,
+        parent: Optional[vim.vm.Snapshot] = None,
+        size: int = 0,
+    ) -> vim.vm.Snapshot:
+        """Add a snapshot to a VM's tree with a delta disk of ``size`` bytes."""
+        props = self.vms[vm._moId]
+        self._next_id += 1
+        snapshot = vim.vm.Snapshot(f"snapshot-{self._next_id}", self)
+        tree = vim.vm.SnapshotTree(
+            snapshot=snapshot, vm=vm, name=name, description="", id=self._next_id,
+            createTime=create_time, state="poweredOn", quiesced=False, childSnapshotList=[],
+        )
+        info = props.get("snapshot")
+        layouts = props.setdefault("layoutEx.snapshot", vim.vm.FileLayoutEx.SnapshotLayout.Array())
+        chain = []
+        if info is None:
+            info = vim.vm.SnapshotInfo(rootSnapshotList=[tree])
+        elif parent is None:
+            info.rootSnapshotList.append(tree)
+        else:
+            self._find_tree(info.rootSnapshotList, parent._moId).childSnapshotList.append(tree)
+            parent_layout = next(layout for layout in layouts if layout.key._moId == parent._moId)
+            chain = list(parent_layout.disk[0].chain)
+        info.currentSnapshot = snapshot
+        props["snapshot"] = info
+
+        data_key, delta_key = self._next_id * 10, self._next_id * 10 + 1
+        props.setdefault("layoutEx.file", vim.vm.FileLayoutEx.FileInfo.Array()).extend([
+            vim.vm.FileLayoutEx.FileInfo(key=data_key, name=f"{name}.vmsn", type="snapshotData", size=0),
+            vim.vm.FileLayoutEx.FileInfo(key=delta_key, name=f"{name}-delta.vmdk", type="diskExtent", size=size),
+        ])
+        chain.append(vim.vm.FileLayoutEx.DiskUnit(fileKey=[delta_key]))
+        layouts.append(vim.vm.FileLayoutEx.SnapshotLayout(
+            key=snapshot, dataKey=data_key, memoryKey=-1,
+            disk=[vim.vm.FileLayoutEx.DiskLayout(key=2000, chain=chain)],
+        ))
+        return snapshot
+
+    def _find_tree(self, trees: List[Any], moid: str) -> Any:
+        for tree in trees:
+            if tree.snapshot._moId == moid:
+                return tree
+            found = self._find_tree(tree.childSnapshotList, moid)
+            if found is not None:
+                return found
+        return None
+
+    def add_task(
+        self, steps: Optional[int] = None, result: Any = None, error: Optional[str] = None
+    ) -> vim.Task:
+        """Register a task that finishes after ``steps`` server-side ticks."""
+        moid = f"task-{len(self.tasks) + 1}"
+        self.tasks[moid] = {
+            "remaining": self.task_steps if steps is None else steps,
+            "total": self.task_steps if steps is None else steps,
+            "result": result,
+            "error": vmodl.MethodFault(msg=error) if error else None,
+        }
+        return vim.Task(moid, self)
+
+    def _task_props(self, moid: str) -> Dict[str, Any]:
+        task = self.tasks[moid]
+        if task["remaining"] > 0:
+            done = task["total"] - task["remaining"]
+            return {"info.state": "running", "info.progress": int(100 * done / task["total"])}
+        if task["error"] is not None:
+            return {"info.state": "error", "info.error": task["error"]}
+        return {"info.state": "success", "info.progress": 100, "info.result": task["result"]}
+
+    def _object_props(self, obj: Any) -> Dict[str, Any]:
+        if isinstance(obj, vim.HttpNfcLease):
+            return {"state": "ready"}
+        return self._task_props(obj._moId)
+
+    def _tick_task(self, moid: str):
+        if self.tasks[moid]["remaining"] > 0:
+            self.tasks[moid]["remaining"] -= 1
+
+    # pyVmomi stub protocol
+
+    def InvokeAccessor(self, mo: Any, info: Any) -> Any:
+        """Serve a lazy managed object property read."""
+        with self._lock:
+            return self._invoke_accessor(mo, info)
+
+    def _invoke_accessor(self, mo: Any, info: Any) -> Any:
+        self.calls[f"get:{info.name}"] += 1
+        if isinstance(mo, vim.view.ContainerView):
+            return [vim.VirtualMachine(moid, self) for moid in self.vms]
+        if isinstance(mo, vim.HttpNfcLease):
+            if info.name == "state":
+                return "ready"
+            return vim.HttpNfcLease.Info(
+                deviceUrl=[
+                    vim.HttpNfcLease.DeviceUrl(
+                        key=f"/{mo._moId}/VirtualLsiLogicController0:{index}",
+                        importKey=f"/{mo._moId}/VirtualLsiLogicController0:{index}",
+                        url=url,
+                        targetId=name,
+                        sslThumbprint="",
+                        disk=True,
+                        fileSize=size,
+                    )
+                    for index, (name, url, size) in enumerate(self.export_files)
+                ],
+                totalDiskCapacityInKB=sum(size for _, _, size in self.export_files) // 1024,
+                leaseTimeout=300,
+            )
+        if isinstance(mo, vim.Task):
+            # Every poll of task.info lets the server make some progress
+            props = self._task_props(mo._moId)
+            self._tick_task(mo._moId)
+            return vim.TaskInfo(
+                state=props["info.state"],
+                progress=props.get("info.progress"),
+                result=props.get("info.result"),
+                error=props.get("info.error"),
+            )
+
+        props = self._props(mo)
+        if info.name == "name":
+            return props["name"]
+        if info.name == "runtime":
+            return vim.vm.RuntimeInfo(powerState=props["runtime.powerState"])
+        if info.name == "snapshot":
+            return props.get("snapshot")
+        if info.name == "config":
+            if props["config.guestFullName"] is None:
+                # Inaccessible or half-registered VMs have no config
+                return None
+            return vim.vm.ConfigInfo(
+                guestFullName=props["config.guestFullName"],
+                uuid=props["config.uuid"],
+                hardware=vim.vm.VirtualHardware(
+                    memoryMB=props["config.hardware.memoryMB"],
+                    numCPU=props["config.hardware.numCPU"],
+                ),
+            )
+        return None
+
+    def InvokeMethod(self, mo: Any, info: Any, args: List[Any]) -> Any:
+        """Serve a managed method call."""
+        with self._lock:
+            self.calls[info.wsdlName] += 1
+            handler = getattr(self, f"_do_{info.wsdlName}", None)
+            if handler is None:
+                raise NotImplementedError(f"Fake stub does not implement {info.wsdlName}")
+            return handler(mo, *args)
+
+    def _props(self, mo):
+        if mo._moId not in self.vms:
+            raise vmodl.fault.ManagedObjectNotFound(obj=mo)
+        return self.vms[mo._moId]
+
+    def _do_CreateContainerView(self, mo, container, types, recursive):
+        self._next_id += 1
+        return vim.view.ContainerView(f"session[fake]view-{self._next_id}", self)
+
+    def _do_DestroyView(self, mo):
+        return None
+
+    def _do_RetrievePropertiesEx(self, mo, spec_set, options):
+        paths = spec_set[0].propSet[0].pathSet
+        objects = []
+        for moid, props in self.vms.items():
+            prop_set = [
+                vmodl.DynamicProperty(name=path, val=props[path])
+                for path in paths
+                if props.get(path) is not None
+            ]
+            objects.append(
+                vmodl.query.PropertyCollector.ObjectContent(
+                    obj=vim.VirtualMachine(moid, self), propSet=prop_set
+                )
+            )
+        return self._page(objects, options.maxObjects)
+
+    def _do_ContinueRetrievePropertiesEx(self, mo, token):
+        objects, size = self._results.pop(token)
+        return self._page(objects, size)
+
+    def _do_CancelRetrievePropertiesEx(self, mo, token):
+        self._results.pop(token, None)
+
+    def _do_FindByUuid(self, mo, datacenter, uuid, vm_search, instance_uuid):
+        key = "config.instanceUuid" if instance_uuid else "config.uuid"
+        for moid, props in self.vms.items():
+            if props.get(key) == uuid:
+                return vim.VirtualMachine(moid, self)
+        return None
+
+    def _do_FindByInventoryPath(self, mo, path):
+        name = path.rsplit("/", 1)[-1]
+        for moid, props in self.vms.items():
+            if props["name"] == name:
+                return vim.VirtualMachine(moid, self)
+        return None
+
+    def _do_CreatePropertyCollector(self, mo):
+        self._next_id += 1
+        return vmodl.query.PropertyCollector(f"session[fake]pc-{self._next_id}", self)
+
+    def _do_DestroyPropertyCollector(self, mo):
+        return None
+
+    def _do_CreateFilter(self, mo, spec, partial_updates):
+        objs = [object_spec.obj for object_spec in spec.objectSet]
+        self._filters[mo._moId] = {
+            "paths": list(spec.propSet[0].pathSet),
+            "container": isinstance(objs[0], vim.view.ContainerView),
+            "objs": objs,
+        }
+        self._next_id += 1
+        return vmodl.query.PropertyCollector.Filter(f"session[fake]filter-{self._next_id}", self)
+
+    def _do_DestroyPropertyFilter(self, mo):
+        return None
+
+    def _do_CancelWaitForUpdates(self, mo):
+        return None
+
+    def _do_WaitForUpdatesEx(self, mo, version, options):
+        spec = self._filters[mo._moId]
+        if spec["container"]:
+            if not version:
+                pending = [("enter", moid, props) for moid, props in self.vms.items()]
+            else:
+                pending = self._changes[int(version):]
+            new_version = str(len(self._changes))
+        else:
+            pending = []
+            for obj in spec["objs"]:
+                before = self._object_props(obj)
+                if version and isinstance(obj, vim.Task):
+                    self._tick_task(obj._moId)
+                after = self._object_props(obj)
+                if not version or after != before:
+                    pending.append(("enter" if not version else "modify", obj, after))
+            new_version = str(int(version or 0) + 1)
+        if not pending:
+            return None
+
+        PC = vmodl.query.PropertyCollector
+        object_set = []
+        for kind, ref, props in pending:
+            change_set = [
+                PC.Change(name=path, op="assign", val=props[path])
+                for path in spec["paths"]
+                if props.get(path) is not None
+            ]
+            obj = vim.VirtualMachine(ref, self) if isinstance(ref, str) else ref
+            object_set.append(PC.ObjectUpdate(kind=kind, obj=obj, changeSet=change_set))
+        return PC.UpdateSet(
+            version=new_version,
+            filterSet=[PC.FilterUpdate(objectSet=object_set)],
+            truncated=False,
+        )
+
+    def _do_CreateSnapshot_Task(self, mo, name, description, memory, quiesce):
+        props = self._props(mo)
+        self._next_id += 1
+        snapshot = vim.vm.Snapshot(f"snapshot-{self._next_id}", self)
+        self.snapshot_calls.append(("create", mo._moId, snapshot._moId))
+        return self.add_task(result=snapshot, error=self.snapshot_errors.get(props["name"]))
+
+    def _do_RevertToSnapshot_Task(self, mo, host, suppress_power_on):
+        self.snapshot_calls.append(("revert", mo._moId))
+        return self.add_task()
+
+    def _do_RemoveSnapshot_Task(self, mo, remove_children, consolidate):
+        self.snapshot_calls.append(("remove", mo._moId))
+        return self.add_task(error=self.remove_errors.get(mo._moId))
+
+    def _do_CancelTask(self, mo):
+        self.tasks[mo._moId]["cancelled"] = True
+
+    def _do_ExportVm(self, mo):
+        self._props(mo)
+        self._next_id += 1
+        return vim.HttpNfcLease(f"session[fake]lease-{self._next_id}", self)
+
+    def _do_HttpNfcLeaseProgress(self, mo, percent):
+        self.lease_calls.append(("progress", percent))
+
+    def _do_HttpNfcLeaseComplete(self, mo):
+        self.lease_calls.append(("complete",))
+
+    def _do_HttpNfcLeaseAbort(self, mo, fault):
+        self.lease_calls.append(("abort",))
+
+    def _do_CreateDescriptor(self, mo, obj, cdp):
+        files = "".join(
+            f'<File ovf:href="{f.path}" ovf:size="{f.size}"/>' for f in cdp.ovfFiles
+        )
+        return vim.OvfManager.CreateDescriptorResult(
+            ovfDescriptor=f'<Envelope name="{cdp.name}"><References>{files}</References></Envelope>'
+        )
+
+    def _page(self, objects, max_objects):
+        size = max_objects or 100
+        token = None
+        if len(objects) > size:
+            self._next_id += 1
+            token = f"token-{self._next_id}"
+            self._results[token] = (objects[size:], size)
+        return vmodl.query.PropertyCollector.RetrieveResult(
+            objects=objects[:size], token=token
+        )
+
+
+class FakeServiceInstance:
+    """Minimal ``ServiceInstance`` returned by a patched ``SmartConnect``."""
+
+    def __init__(self, stub: FakeVCenterStub):
+        self.stub = stub
+        self._stub = stub
+
+    def RetrieveContent(self):
+        """Return the fake service content."""
+        return self.stub.content
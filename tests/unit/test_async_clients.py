@@ -0,0 +1,211 @@
+"""Unit tests for the asyncio client surface."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from vcf_evs.aws import AsyncEVSClient, FleetTarget, FleetView
+from vcf_evs.utils import AsyncRunner
+from vcf_evs.vmware import AsyncVCenterClient
+
+
+class ConcurrencyProbe:
+    """Blocking callable recording how many calls overlap."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, value):
+        with self.lock:
+            self.active += 1
+            self.calls += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        return value * 2
+
+
+class TestAsyncRunner:
+    """Test cases for AsyncRunner."""
+
+    def test_map_preserves_order_and_limits_concurrency(self):
+        """Test results keep input order while in-flight calls stay bounded."""
+        # Arrange
+        runner = AsyncRunner(max_workers=8, max_concurrency=3)
+        probe = ConcurrencyProbe()
+
+        # Act
+        results = asyncio.run(runner.map(probe, range(12)))
+        runner.close()
+
+        # Assert
+        assert results == [value * 2 for value in range(12)]
+        assert probe.peak <= 3
+
+    def test_timeout_raises(self):
+        """Test a call exceeding its timeout raises asyncio.TimeoutError."""
+        # Arrange
+        runner = AsyncRunner(max_workers=1, timeout=0.01)
+
+        # Act / Assert
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(runner.run(time.sleep, 0.2))
+        runner.close()
+
+    def test_cancelled_queued_calls_never_run(self):
+        """Test cancelling waiting callers drops their work."""
+        # Arrange
+        runner = AsyncRunner(max_workers=1)
+        probe = ConcurrencyProbe(delay=0.1)
+
+        async def scenario():
+            tasks = [asyncio.ensure_future(runner.run(probe, value)) for value in range(5)]
+            await asyncio.sleep(0.02)
+            for task in tasks[1:]:
+                task.cancel()
+            return await asyncio.gather(*tasks, return_exceptions=True)
+
+        # Act
+        results = asyncio.run(scenario())
+        runner.close()
+
+        # Assert
+        assert results[0] == 0
+        assert all(isinstance(result, asyncio.CancelledError) for result in results[1:])
+        assert probe.calls == 1
+
+
+class TestAsyncEVSClient:
+    """Test cases for AsyncEVSClient."""
+
+    def test_statuses_fetched_concurrently(self):
+        """Test many cluster lookups overlap and failures can be returned."""
+        # Arrange
+        probe = ConcurrencyProbe()
+        evs = Mock(region="us-west-2")
+
+        def get_cluster_status(cluster_id):
+            if cluster_id == "missing":
+                raise ValueError("not found")
+            probe(1)
+            return {"status": "ACTIVE"}
+
+        evs.get_cluster_status.side_effect = get_cluster_status
+
+        async def scenario():
+            async with AsyncEVSClient(client=evs, runner=AsyncRunner(max_workers=4)) as client:
+                return await client.get_cluster_statuses(
+                    ["c-1", "c-2", "c-3", "missing"], return_exceptions=True
+                )
+
+        # Act
+        statuses = asyncio.run(scenario())
+
+        # Assert
+        assert statuses["c-1"] == {"status": "ACTIVE"}
+        assert isinstance(statuses["missing"], ValueError)
+        assert probe.peak > 1
+
+    def test_cluster_pages_stream(self):
+        """Test cluster pages are iterated asynchronously."""
+        # Arrange
+        evs = Mock(region="us-west-2")
+        evs.iter_cluster_pages.return_value = iter([[{"ClusterId": "a"}], [{"ClusterId": "b"}]])
+        client = AsyncEVSClient(client=evs)
+
+        async def scenario():
+            return [page async for page in client.iter_cluster_pages()]
+
+        # Act
+        pages = asyncio.run(scenario())
+
+        # Assert
+        assert [page[0]["ClusterId"] for page in pages] == ["a", "b"]
+
+    def test_requires_config_or_client(self):
+        """Test constructing without a client or configuration fails."""
+        with pytest.raises(Exception):
+            AsyncEVSClient()
+
+
+class TestAsyncVCenterClient:
+    """Test cases for AsyncVCenterClient."""
+
+    def test_operations_delegate_to_client(self):
+        """Test awaited operations call the blocking client."""
+        # Arrange
+        vcenter = Mock()
+        vcenter.create_snapshot.return_value = "snapshot-1"
+        vcenter.get_vm_info.side_effect = lambda name: {"name": name}
+
+        async def scenario():
+            async with AsyncVCenterClient(vcenter) as client:
+                snapshot = await client.create_snapshot("vm-1", "pre-migration")
+                infos = await client.get_vm_infos(["vm-1", "vm-2"])
+            return snapshot, infos
+
+        # Act
+        snapshot, infos = asyncio.run(scenario())
+
+        # Assert
+        assert snapshot == "snapshot-1"
+        assert infos == {"vm-1": {"name": "vm-1"}, "vm-2": {"name": "vm-2"}}
+        vcenter.disconnect.assert_called_once()
+
+    def test_connect_leaves_shared_runner_open(self):
+        """Test disconnecting does not close a runner the caller passed to connect."""
+        # Arrange
+        runner = AsyncRunner(max_workers=2)
+
+        async def scenario():
+            with patch("vcf_evs.vmware.async_client.VCenterClient"):
+                client = await AsyncVCenterClient.connect({"vcenter_server": "vc"}, runner=runner)
+            await client.disconnect()
+            return await runner.run(sum, [1, 2, 3])
+
+        # Act
+        try:
+            result = asyncio.run(scenario())
+        finally:
+            runner.close()
+
+        # Assert
+        assert result == 6
+
+
+class TestFleetViewAsync:
+    """Test cases for FleetView.acollect."""
+
+    def test_acollect_reports_timeouts(self):
+        """Test slow targets become failed results in configuration order."""
+        # Arrange
+        def factory(target):
+            client = Mock()
+
+            def list_clusters(status=None, fields=None):
+                if target.region == "slow":
+                    time.sleep(0.3)
+                return [{"name": target.region}]
+
+            client.list_clusters.side_effect = list_clusters
+            return client
+
+        view = FleetView(
+            [FleetTarget("slow"), FleetTarget("fast")], client_factory=factory, timeout=0.1
+        )
+
+        # Act
+        results = asyncio.run(view.acollect())
+
+        # Assert
+        assert [result.target.region for result in results] == ["slow", "fast"]
+        assert not results[0].ok and "Timed out" in results[0].error
+        assert results[1].clusters == [{"name": "fast"}]
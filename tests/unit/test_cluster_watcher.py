@@ -0,0 +1,226 @@
+"""Unit tests for the EVS cluster status watcher."""
+
+import asyncio
+from unittest.mock import Mock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+from vcf_evs.aws import ClientPool, ClusterWatcher, EVSClient
+
+
+class FakeClock:
+    """Manually advanced clock whose sleep moves time forward."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def not_found(cluster_id):
+    """The error describe_cluster raises for a cluster that no longer exists."""
+    return ClientError(
+        {"Error": {"Code": "ResourceNotFoundException", "Message": f"Cluster {cluster_id} not found"}},
+        "DescribeCluster"
+    )
+
+
+class FakeEVS:
+    """EVS client stand-in whose cluster statuses follow a script over time."""
+
+    def __init__(self, clock, timelines):
+        # timelines: {cluster_id: [(from_time, status), ...]}
+        self.clock = clock
+        self.timelines = timelines
+        self.describe_calls = 0
+        self.list_calls = 0
+
+    def _status(self, cluster_id):
+        status = None
+        for start, value in self.timelines[cluster_id]:
+            if self.clock.now >= start:
+                status = value
+        return status
+
+    def get_cluster_status(self, cluster_id):
+        self.describe_calls += 1
+        if self._status(cluster_id) is None:
+            raise not_found(cluster_id)
+        return {"name": cluster_id, "status": self._status(cluster_id), "node_count": 3}
+
+    def iter_cluster_pages(self, page_size=None):
+        self.list_calls += 1
+        clusters = [
+            {"ClusterId": cid, "ClusterName": cid, "ClusterStatus": self._status(cid), "NodeCount": 3}
+            for cid in self.timelines if self._status(cid) is not None
+        ]
+        yield clusters[:2]
+        yield clusters[2:]
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def make_watcher(evs, clock, **kwargs):
+    return ClusterWatcher(evs, clock=clock, sleep=clock.sleep, **kwargs)
+
+
+class TestClusterWatcher:
+    """Test cases for ClusterWatcher."""
+
+    def test_wait_for_reports_transitions(self, clock):
+        """Test waiting until a cluster becomes active notifies listeners."""
+        # Arrange
+        evs = FakeEVS(clock, {"c-1": [(0, "CREATING"), (100, "ACTIVE")]})
+        watcher = make_watcher(evs, clock)
+        events = []
+        watcher.add_listener(events.append)
+
+        # Act
+        final = watcher.wait_for(["c-1"], timeout=1000)
+
+        # Assert
+        assert final == {"c-1": "ACTIVE"}
+        assert [(e.old_status, e.new_status) for e in events] == [
+            (None, "CREATING"), ("CREATING", "ACTIVE")
+        ]
+        assert evs.describe_calls == 5
+
+    def test_backoff_while_status_unchanged(self, clock):
+        """Test poll intervals grow while a cluster stays in the same state."""
+        # Arrange
+        evs = FakeEVS(clock, {"c-1": [(0, "CREATING")]})
+        watcher = make_watcher(evs, clock, backoff=2.0, max_interval=100)
+
+        # Act
+        with pytest.raises(TimeoutError):
+            watcher.wait_for(["c-1"], timeout=200)
+
+        # Assert
+        assert clock.sleeps[:4] == [15.0, 30.0, 60.0, 95.0]
+
+    def test_many_clusters_use_one_listing(self, clock):
+        """Test a batch of clusters is polled with paginated listings, not per-cluster calls."""
+        # Arrange
+        timelines = {f"c-{i}": [(0, "CREATING"), (30, "ACTIVE")] for i in range(10)}
+        evs = FakeEVS(clock, timelines)
+        watcher = make_watcher(evs, clock)
+
+        # Act
+        final = watcher.wait_for(list(timelines), timeout=1000)
+
+        # Assert
+        assert set(final.values()) == {"ACTIVE"}
+        assert evs.describe_calls == 0
+        assert evs.list_calls == 3
+        assert watcher.api_calls == 6
+
+    def test_failed_cluster_raises(self, clock):
+        """Test a cluster entering a failed state aborts the wait."""
+        # Arrange
+        evs = FakeEVS(clock, {"c-1": [(0, "CREATING"), (20, "CREATE_FAILED")]})
+        watcher = make_watcher(evs, clock)
+
+        # Act / Assert
+        with pytest.raises(RuntimeError, match="c-1"):
+            watcher.wait_for(["c-1"], timeout=1000)
+
+    def test_missing_cluster_reported_deleted(self, clock):
+        """Test a cluster that disappears transitions to DELETED."""
+        # Arrange
+        evs = FakeEVS(clock, {"c-1": [(0, "DELETING"), (40, None)]})
+        watcher = make_watcher(evs, clock)
+
+        # Act
+        final = watcher.wait_for(["c-1"], states=["DELETED"], timeout=1000)
+
+        # Assert
+        assert final == {"c-1": "DELETED"}
+
+    def test_deleted_cluster_detected_through_evs_client(self, clock):
+        """Test a not-found error from a real EVSClient is reported as DELETED."""
+        # Arrange
+        with patch("boto3.Session") as mock_session:
+            evs = Mock()
+            mock_session.return_value.client.side_effect = lambda service, **kwargs: evs
+            client = EVSClient({"region": "us-west-2"}, client_pool=ClientPool())
+        evs.describe_cluster.side_effect = not_found("c-1")
+        watcher = make_watcher(client, clock)
+        watcher.watch(["c-1"])
+
+        # Act
+        transitions = watcher.poll(force=True)
+
+        # Assert
+        assert [(t.cluster_id, t.new_status) for t in transitions] == [("c-1", "DELETED")]
+
+    def test_other_describe_errors_raised(self, clock):
+        """Test errors other than not-found are not mistaken for deletion."""
+        # Arrange
+        evs = FakeEVS(clock, {"c-1": [(0, "ACTIVE")]})
+        evs.get_cluster_status = Mock(side_effect=ClientError(
+            {"Error": {"Code": "ThrottlingException", "Message": "ResourceNotFound mentioned"}},
+            "DescribeCluster"
+        ))
+        watcher = make_watcher(evs, clock)
+        watcher.watch(["c-1"])
+
+        # Act / Assert
+        with pytest.raises(ClientError, match="ThrottlingException"):
+            watcher.poll(force=True)
+
+    def test_events_iterator_stops_after_quiet_period(self, clock):
+        """Test the event iterator yields transitions and ends after the timeout."""
+        # Arrange
+        evs = FakeEVS(clock, {"c-1": [(0, "CREATING"), (50, "ACTIVE")]})
+        watcher = make_watcher(evs, clock)
+        watcher.watch(["c-1"])
+
+        # Act
+        events = [e.new_status for e in watcher.events(timeout=300)]
+
+        # Assert
+        assert events == ["CREATING", "ACTIVE"]
+
+    def test_async_events(self, clock):
+        """Test transitions can be consumed with ``async for``."""
+        # Arrange
+        evs = FakeEVS(clock, {"c-1": [(0, "CREATING")]})
+        watcher = ClusterWatcher(evs, clock=clock, min_interval=0)
+        watcher.watch(["c-1"])
+
+        async def consume():
+            async for event in watcher.aevents():
+                watcher.unwatch([event.cluster_id])
+                return event
+
+        # Act
+        event = asyncio.run(consume())
+
+        # Assert
+        assert event.new_status == "CREATING"
+
+    def test_listener_errors_are_isolated(self, clock):
+        """Test a failing listener does not stop other listeners."""
+        # Arrange
+        evs = FakeEVS(clock, {"c-1": [(0, "ACTIVE")]})
+        watcher = make_watcher(evs, clock)
+        seen = []
+        watcher.add_listener(lambda event: 1 / 0)
+        watcher.add_listener(seen.append)
+        watcher.watch(["c-1"])
+
+        # Act
+        watcher.poll()
+
+        # Assert
+        assert [e.new_status for e in seen] == ["ACTIVE"]
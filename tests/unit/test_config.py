@@ -0,0 +1,302 @@
+"""Unit tests for cached, validated configuration loading."""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from vcf_evs.utils import config as config_module
+from vcf_evs.utils.config import (
+    ConfigManager,
+    ConfigValidationError,
+    FrozenConfig,
+    clear_config_cache,
+)
+
+CONFIG = """
+aws:
+  region: us-west-2
+  fleet:
+    regions: [us-west-2]
+advanced:
+  max_retries: 3
+"""
+
+
+@pytest.fixture(autouse=True)
+def clean_cache(monkeypatch):
+    """Start every test with an empty config cache and no env overrides."""
+    for name in ("AWS_REGION", "AWS_PROFILE", "VCENTER_SERVER", "VCENTER_USERNAME", "VCENTER_PASSWORD"):
+        monkeypatch.delenv(name, raising=False)
+    clear_config_cache()
+    yield
+    clear_config_cache()
+
+
+def write(path, text):
+    """Write a file and move its mtime forward so edits are always noticed."""
+    path.write_text(text)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    return str(path)
+
+
+class TestConfigCache:
+    """Test cases for parse-once caching."""
+
+    def test_unchanged_file_parsed_once(self, tmp_path):
+        """Test managers for the same unchanged file share one parse."""
+        # Arrange
+        path = write(tmp_path / "config.yaml", CONFIG)
+
+        # Act
+        with patch.object(config_module, "_read_yaml", wraps=config_module._read_yaml) as read_yaml:
+            first = ConfigManager(path)
+            second = ConfigManager(path)
+
+        # Assert
+        assert read_yaml.call_count == 1
+        assert first.config == second.config
+
+    def test_env_overrides_not_cached(self, tmp_path, monkeypatch):
+        """Test environment overrides apply per manager, not to the shared parse."""
+        # Arrange
+        path = write(tmp_path / "config.yaml", CONFIG)
+        ConfigManager(path)
+        monkeypatch.setenv("AWS_REGION", "eu-west-1")
+
+        # Act
+        overridden = ConfigManager(path)
+        monkeypatch.delenv("AWS_REGION")
+        plain = ConfigManager(path)
+
+        # Assert
+        assert overridden.config.aws.region == "eu-west-1"
+        assert plain.config.aws.region == "us-west-2"
+
+    def test_pickle_reused_and_invalidated(self, tmp_path):
+        """Test a pickled parse is reused by a fresh process and dropped when content changes."""
+        # Arrange
+        path = write(tmp_path / "config.yaml", CONFIG)
+        ConfigManager(path, pickle_cache=True)
+        clear_config_cache()
+
+        # Act
+        with patch.object(config_module, "_read_yaml", wraps=config_module._read_yaml) as read_yaml:
+            cached = ConfigManager(path, pickle_cache=True)
+            clear_config_cache()
+            write(tmp_path / "config.yaml", CONFIG.replace("us-west-2", "us-east-1"))
+            changed = ConfigManager(path, pickle_cache=True)
+
+        # Assert
+        assert (tmp_path / ".config.yaml.pickle").exists()
+        assert cached.config.aws.region == "us-west-2"
+        assert changed.config.aws.region == "us-east-1"
+        assert read_yaml.call_count == 1
+
+    def test_writable_pickle_ignored(self, tmp_path):
+        """Test a pickle others could have written is not loaded."""
+        # Arrange
+        path = write(tmp_path / "config.yaml", CONFIG)
+        ConfigManager(path, pickle_cache=True)
+        clear_config_cache()
+        os.chmod(tmp_path / ".config.yaml.pickle", 0o666)
+
+        # Act
+        with patch.object(config_module.pickle, "load") as pickle_load:
+            ConfigManager(path, pickle_cache=True)
+
+        # Assert
+        pickle_load.assert_not_called()
+
+
+class TestConfigValidation:
+    """Test cases for schema validation."""
+
+    def test_all_problems_reported(self, tmp_path):
+        """Test every invalid value is reported in one error."""
+        # Arrange
+        path = write(tmp_path / "config.yaml", """
+vmware:
+  port: "443"
+  ssl_verify: 1
+migration:
+  compression: gzip
+advanced:
+  max_retries: -1
+""")
+
+        # Act
+        with pytest.raises(ConfigValidationError) as raised:
+            ConfigManager(path)
+
+        # Assert
+        assert len(raised.value.problems) == 4
+        assert any(problem.startswith("migration.compression") for problem in raised.value.problems)
+
+    def test_bool_not_accepted_as_int(self, tmp_path):
+        """Test ``true`` is rejected where a number is expected."""
+        path = write(tmp_path / "config.yaml", "vmware:\n  port: true\n")
+        with pytest.raises(ConfigValidationError, match="vmware.port"):
+            ConfigManager(path)
+
+
+class TestConfigIncludes:
+    """Test cases for layered includes."""
+
+    def test_includes_merged_in_order(self, tmp_path):
+        """Test included files are merged in glob order and the including file wins."""
+        # Arrange
+        regions = tmp_path / "regions"
+        regions.mkdir()
+        write(regions / "10-us-west-2.yaml", "aws:\n  fleet:\n    regions: [us-west-2]\nadvanced:\n  max_retries: 1\n")
+        write(regions / "20-eu-west-1.yaml", "aws:\n  fleet:\n    regions: [us-west-2, eu-west-1]\n")
+        path = write(tmp_path / "config.yaml", "include: regions/*.yaml\naws:\n  region: us-west-2\nadvanced:\n  max_retries: 5\n")
+
+        # Act
+        config = ConfigManager(path).config
+
+        # Assert
+        assert config.aws.fleet.regions == ("us-west-2", "eu-west-1")
+        assert config.aws.region == "us-west-2"
+        assert config.advanced.max_retries == 5
+        assert "include" not in config
+
+    def test_include_cycle_rejected(self, tmp_path):
+        """Test files including each other raise instead of recursing."""
+        # Arrange
+        write(tmp_path / "a.yaml", "include: b.yaml\n")
+        write(tmp_path / "b.yaml", "include: a.yaml\n")
+
+        # Act / Assert
+        with pytest.raises(ConfigValidationError, match="include cycle"):
+            ConfigManager(str(tmp_path / "a.yaml"))
+
+    def test_included_file_change_reloaded(self, tmp_path):
+        """Test editing an included file is picked up by reload."""
+        # Arrange
+        write(tmp_path / "region.yaml", "aws:\n  region: us-west-2\n")
+        manager = ConfigManager(write(tmp_path / "config.yaml", "include: region.yaml\n"))
+        write(tmp_path / "region.yaml", "aws:\n  region: ap-south-1\n")
+
+        # Act
+        changed = manager.reload()
+
+        # Assert
+        assert changed
+        assert manager.config.aws.region == "ap-south-1"
+
+    def test_file_added_under_glob_reloaded(self, tmp_path):
+        """Test a new file matching an include glob is picked up by reload."""
+        # Arrange
+        regions = tmp_path / "regions"
+        regions.mkdir()
+        write(regions / "a.yaml", "aws:\n  region: us-west-2\n")
+        manager = ConfigManager(write(tmp_path / "config.yaml", 'include: "regions/*.yaml"\n'))
+        write(regions / "b.yaml", "aws:\n  region: eu-west-1\n")
+
+        # Act
+        changed = manager.reload()
+
+        # Assert
+        assert changed
+        assert manager.config.aws.region == "eu-west-1"
+
+    def test_pickle_stale_after_file_added_under_glob(self, tmp_path):
+        """Test a pickled parse is not reused once an include glob matches another file."""
+        # Arrange
+        regions = tmp_path / "regions"
+        regions.mkdir()
+        write(regions / "a.yaml", "aws:\n  region: us-west-2\n")
+        path = write(tmp_path / "config.yaml", 'include: "regions/*.yaml"\n')
+        ConfigManager(path, pickle_cache=True)
+        clear_config_cache()
+        write(regions / "b.yaml", "aws:\n  region: eu-west-1\n")
+
+        # Act
+        config = ConfigManager(path, pickle_cache=True).config
+
+        # Assert
+        assert config.aws.region == "eu-west-1"
+
+
+class TestFrozenConfig:
+    """Test cases for read-only configuration access."""
+
+    def test_read_only_attribute_access(self, tmp_path):
+        """Test the config supports attribute access and rejects writes."""
+        # Arrange
+        config = ConfigManager(write(tmp_path / "config.yaml", CONFIG)).config
+
+        # Act / Assert
+        assert isinstance(config.aws, FrozenConfig)
+        assert config.aws["region"] == config.aws.region == "us-west-2"
+        with pytest.raises(TypeError):
+            config["aws"] = {}
+        with pytest.raises(AttributeError):
+            config.aws.region = "eu-west-1"
+
+    def test_section_getters_return_copies(self, tmp_path):
+        """Test changing a returned section does not change the configuration."""
+        # Arrange
+        manager = ConfigManager(write(tmp_path / "config.yaml", CONFIG))
+
+        # Act
+        aws_config = manager.get_aws_config()
+        aws_config["fleet"]["regions"].append("eu-west-1")
+
+        # Assert
+        assert manager.get_aws_config()["fleet"]["regions"] == ["us-west-2"]
+
+
+class TestConfigReload:
+    """Test cases for hot reload."""
+
+    def test_auto_reload_notifies_listeners(self, tmp_path):
+        """Test an edited file is picked up on access and listeners are called."""
+        # Arrange
+        path = write(tmp_path / "config.yaml", CONFIG)
+        manager = ConfigManager(path, auto_reload=True, reload_interval=0)
+        reloaded = []
+        manager.add_listener(reloaded.append)
+        write(tmp_path / "config.yaml", CONFIG.replace("max_retries: 3", "max_retries: 7"))
+
+        # Act
+        max_retries = manager.config.advanced.max_retries
+
+        # Assert
+        assert max_retries == 7
+        assert reloaded == [manager]
+
+    def test_invalid_edit_keeps_previous_config(self, tmp_path):
+        """Test a broken edit is ignored by reload_if_changed."""
+        # Arrange
+        path = write(tmp_path / "config.yaml", CONFIG)
+        manager = ConfigManager(path)
+        write(tmp_path / "config.yaml", "advanced:\n  max_retries: many\n")
+
+        # Act
+        changed = manager.reload_if_changed()
+
+        # Assert
+        assert not changed
+        assert manager.config.advanced.max_retries == 3
+        with pytest.raises(ConfigValidationError):
+            manager.reload()
+
+    def test_deleted_file_keeps_previous_config(self, tmp_path):
+        """Test a deleted file is ignored by reload_if_changed and auto reload."""
+        # Arrange
+        path = write(tmp_path / "config.yaml", CONFIG)
+        manager = ConfigManager(path, auto_reload=True, reload_interval=0)
+        os.remove(path)
+
+        # Act
+        changed = manager.reload_if_changed()
+        max_retries = manager.config.advanced.max_retries
+
+        # Assert
+        assert not changed
+        assert max_retries == 3
+        with pytest.raises(FileNotFoundError):
+            manager.reload()
@@ -0,0 +1,188 @@
+"""Unit tests for the CLI daemon."""
+
+import os
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from vcf_evs.daemon import (
+    CLIDaemon,
+    CommandContext,
+    DaemonClient,
+    DaemonUnavailable,
+    execute,
+    run_command,
+)
+
+CONFIG = """
+aws:
+  region: us-west-2
+advanced:
+  max_retries: 3
+"""
+
+CLUSTERS = [{"name": "prod", "status": "ACTIVE", "node_count": 4, "region": "us-west-2"}]
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    """Minimal configuration file."""
+    path = tmp_path / "config.yaml"
+    path.write_text(CONFIG)
+    return str(path)
+
+
+@pytest.fixture
+def evs_client_class():
+    """Patched EVSClient class that counts constructions."""
+    with patch("vcf_evs.aws.evs_client.EVSClient") as evs_client_class:
+        evs_client_class.return_value.list_clusters.return_value = CLUSTERS
+        yield evs_client_class
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    """Daemon serving on a temporary socket from a background thread."""
+    daemon = CLIDaemon(str(tmp_path / "run" / "daemon.sock"), idle_timeout=None)
+    thread = threading.Thread(target=daemon.serve, daemon=True)
+    thread.start()
+    client = DaemonClient(daemon.socket_path)
+    for _ in range(100):
+        if client.available():
+            break
+        threading.Event().wait(0.01)
+    yield daemon
+    daemon.stop()
+    thread.join(timeout=5)
+
+
+class TestDaemon:
+    """Test cases for CLIDaemon and DaemonClient."""
+
+    def test_requests_share_warm_client(self, daemon, config_file, evs_client_class):
+        """Test repeated commands reuse one EVSClient inside the daemon."""
+        # Act
+        first = run_command("status", config_file, socket_path=daemon.socket_path)
+        second = run_command("status", config_file, socket_path=daemon.socket_path)
+
+        # Assert
+        assert first == second == CLUSTERS
+        assert evs_client_class.call_count == 1
+        assert evs_client_class.return_value.list_clusters.call_count == 2
+        assert daemon.status()["evs_clients"] == 1
+
+    def test_falls_back_in_process_without_daemon(self, tmp_path, config_file, evs_client_class):
+        """Test a command runs in-process when no daemon listens."""
+        # Act
+        clusters = run_command("status", config_file, socket_path=str(tmp_path / "none.sock"))
+
+        # Assert
+        assert clusters == CLUSTERS
+        assert evs_client_class.call_count == 1
+
+    def test_remote_error_reraised(self, daemon, config_file, evs_client_class):
+        """Test a command failing in the daemon raises the same builtin exception."""
+        # Arrange
+        evs_client_class.return_value.list_clusters.side_effect = KeyError("clusters")
+
+        # Act / Assert
+        with pytest.raises(KeyError, match="clusters"):
+            DaemonClient(daemon.socket_path).request("status", config_file)
+
+    def test_environment_mismatch_not_served(self, daemon, config_file, monkeypatch):
+        """Test a client with different credentials in its environment is turned away."""
+        # Arrange
+        monkeypatch.setenv("AWS_PROFILE", "other-account")
+
+        # Act / Assert
+        with pytest.raises(DaemonUnavailable):
+            DaemonClient(daemon.socket_path).request("status", config_file)
+
+    def test_config_change_rebuilds_clients(self, daemon, config_file, evs_client_class):
+        """Test editing the config file drops clients built from the old version."""
+        # Arrange
+        client = DaemonClient(daemon.socket_path)
+        client.request("status", config_file)
+        stat = os.stat(config_file)
+        os.utime(config_file, (stat.st_atime, stat.st_mtime + 10))
+
+        # Act
+        client.request("status", config_file)
+
+        # Assert
+        assert evs_client_class.call_count == 2
+
+    def test_socket_private_and_stale_socket_replaced(self, tmp_path):
+        """Test a leftover socket file is replaced and the new one is owner-only."""
+        # Arrange
+        socket_path = tmp_path / "stale.sock"
+        socket_path.write_text("")
+        daemon = CLIDaemon(str(socket_path), idle_timeout=None)
+        thread = threading.Thread(target=daemon.serve, daemon=True)
+        thread.start()
+        client = DaemonClient(str(socket_path))
+        for _ in range(100):
+            if client.available():
+                break
+            threading.Event().wait(0.01)
+
+        # Act
+        mode = os.stat(socket_path).st_mode & 0o777
+        info = client.request("shutdown")
+        thread.join(timeout=5)
+
+        # Assert
+        assert mode == 0o600
+        assert info["pid"] == os.getpid()
+        assert not thread.is_alive()
+        assert not socket_path.exists()
+
+    def test_idle_daemon_exits(self, tmp_path):
+        """Test the daemon stops serving after the idle timeout."""
+        # Arrange
+        daemon = CLIDaemon(str(tmp_path / "idle.sock"), idle_timeout=0.2)
+
+        # Act
+        thread = threading.Thread(target=daemon.serve, daemon=True)
+        thread.start()
+        thread.join(timeout=5)
+
+        # Assert
+        assert not thread.is_alive()
+
+
+class TestExecute:
+    """Test cases for in-process execution."""
+
+    def test_unknown_command_rejected(self, config_file):
+        """Test unknown commands raise before any client is built."""
+        with pytest.raises(ValueError, match="Unknown command"):
+            execute("reboot", config_file)
+
+    def test_relative_config_resolved_from_cwd(self, tmp_path, config_file, evs_client_class):
+        """Test relative config paths are resolved against the caller's directory."""
+        # Arrange
+        context = CommandContext()
+
+        # Act
+        execute("status", "config.yaml", context=context, cwd=str(tmp_path))
+
+        # Assert
+        assert context.stats()["evs_clients"] == 1
+
+    def test_stats_reports_recorded_operations(self, config_file, evs_client_class):
+        """Test the stats command returns this process's metrics in both formats."""
+        # Arrange
+        from vcf_evs.utils.instrumentation import get_instrumentation
+
+        get_instrumentation().record_call("evs", "ListClusters", 0.05)
+
+        # Act
+        stats = execute("stats", config_file)
+        text = execute("stats", config_file, {"prometheus": True})
+
+        # Assert
+        assert stats["operations"]["evs.ListClusters"]["calls"] >= 1
+        assert stats["pid"] == os.getpid()
+        assert 'vcf_evs_api_call_duration_seconds_count{service="evs",operation="ListClusters"}' in text
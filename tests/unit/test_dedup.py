@@ -0,0 +1,146 @@
+"""Unit tests for content-addressed chunk deduplication."""
+
+import os
+
+import pytest
+
+from vcf_evs.aws import MultipartStreamUploader
+from vcf_evs.migration import ChunkIndex, ContentDefinedChunker, DedupUploader
+from tests.fake_s3 import FakeS3
+
+KIB = 1024
+MIB = 1024 * KIB
+
+
+def pieces(data, size=300 * KIB):
+    """Split data the way an HTTP stream would deliver it."""
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+
+class TestContentDefinedChunker:
+    """Test cases for ContentDefinedChunker."""
+    
+    def test_chunks_rebuild_input_within_bounds(self):
+        """Test chunks concatenate back to the input and respect size bounds."""
+        # Arrange
+        chunker = ContentDefinedChunker(min_size=64 * KIB, avg_size=256 * KIB, max_size=MIB)
+        data = os.urandom(8 * MIB)
+        
+        # Act
+        chunks = list(chunker.split(pieces(data)))
+        
+        # Assert
+        assert b"".join(chunks) == data
+        assert all(len(c) <= MIB for c in chunks)
+        assert all(len(c) >= 64 * KIB for c in chunks[:-1])
+    
+    def test_boundaries_survive_insertion(self):
+        """Test inserting bytes only disturbs chunks near the edit."""
+        # Arrange
+        chunker = ContentDefinedChunker(min_size=64 * KIB, avg_size=256 * KIB, max_size=MIB)
+        data = os.urandom(8 * MIB)
+        edited = data[:MIB] + b"inserted" + data[MIB:]
+        
+        # Act
+        original = set(chunker.split(pieces(data)))
+        shifted = set(chunker.split(pieces(edited, 123457)))
+        
+        # Assert
+        assert len(original & shifted) >= len(original) - 2
+    
+    def test_repetitive_data_cuts_at_max_size(self):
+        """Test data without usable boundaries is cut at max_size."""
+        # Arrange
+        chunker = ContentDefinedChunker(min_size=64 * KIB, avg_size=256 * KIB, max_size=MIB)
+        
+        # Act
+        chunks = list(chunker.split([b"\x5a\xa5" * (3 * MIB // 2)]))
+        
+        # Assert
+        assert [len(c) for c in chunks] == [MIB, MIB, MIB]
+    
+    def test_invalid_sizes_rejected(self):
+        """Test inconsistent size bounds are rejected."""
+        with pytest.raises(ValueError):
+            ContentDefinedChunker(min_size=MIB, avg_size=256 * KIB, max_size=4 * MIB)
+
+
+class TestDedupUploader:
+    """Test cases for DedupUploader."""
+    
+    @pytest.fixture
+    def s3(self):
+        """In-memory S3."""
+        return FakeS3()
+    
+    @pytest.fixture
+    def uploader(self, s3, tmp_path):
+        """Deduplicating uploader with small chunks."""
+        return DedupUploader(
+            s3,
+            "migration",
+            ChunkIndex(str(tmp_path / "chunks.db")),
+            chunker=ContentDefinedChunker(min_size=64 * KIB, avg_size=256 * KIB, max_size=MIB),
+            max_concurrency=3
+        )
+    
+    def test_second_disk_only_uploads_new_chunks(self, uploader, s3):
+        """Test a disk sharing a base image uploads only the differing chunks."""
+        # Arrange
+        base = os.urandom(6 * MIB)
+        clone = base[:3 * MIB] + b"patched" * 1000 + base[3 * MIB:]
+        
+        # Act
+        first = uploader.upload_stream("vm-a/disk-0.vmdk", pieces(base))
+        second = uploader.upload_stream("vm-b/disk-0.vmdk", pieces(clone))
+        
+        # Assert
+        assert first.uploaded_bytes == len(base)
+        assert second.size == len(clone)
+        assert second.uploaded_bytes < MIB * 3
+        assert second.dedup_ratio > 0.5
+        assert second.location == "s3://migration/vm-b/disk-0.vmdk.manifest.json"
+    
+    def test_reassemble_rebuilds_original(self, uploader, s3):
+        """Test a manifest is turned back into the original object."""
+        # Arrange
+        data = os.urandom(5 * MIB) + b"\x00" * (2 * MIB)
+        result = uploader.upload_stream("vm/disk.vmdk", pieces(data))
+        s3.objects.pop(("migration", "vm/disk.vmdk"), None)
+        
+        # Act
+        uploaded = uploader.reassemble(
+            result.manifest_key, MultipartStreamUploader(s3, "migration", part_size=5 * MIB)
+        )
+        
+        # Assert
+        assert s3.objects[("migration", "vm/disk.vmdk")] == data
+        assert uploaded.size == len(data)
+    
+    def test_index_miss_checks_bucket(self, uploader, s3, tmp_path):
+        """Test chunks already in the bucket are not re-uploaded with a cold index."""
+        # Arrange
+        data = os.urandom(2 * MIB)
+        uploader.upload_stream("vm/disk.vmdk", pieces(data))
+        cold = DedupUploader(
+            s3, "migration", ChunkIndex(str(tmp_path / "cold.db")), chunker=uploader.chunker
+        )
+        
+        # Act
+        result = cold.upload_stream("vm/disk.vmdk", pieces(data))
+        
+        # Assert
+        assert result.uploaded_bytes == 0
+        assert cold.index.count(cold.location) == result.chunks
+    
+    def test_corrupt_chunk_detected(self, uploader, s3):
+        """Test reassembly fails when a stored chunk does not match its digest."""
+        # Arrange
+        result = uploader.upload_stream("vm/disk.vmdk", [os.urandom(MIB)])
+        manifest = uploader.load_manifest(result.manifest_key)
+        digest, _ = manifest.chunks[0]
+        s3.objects[("migration", uploader.chunk_key(digest))] = b"garbage"
+        
+        # Act & Assert
+        with pytest.raises(ValueError, match="corrupt"):
+            list(uploader.iter_object(manifest))
@@ -1,8 +1,9 @@
 """Unit tests for EVS Client."""
 
 import pytest
+from botocore.exceptions import ClientError
 from unittest.mock import Mock, patch
-from vcf_evs.aws import EVSClient
+from vcf_evs.aws import ClientPool, EVSClient
 
 
 class TestEVSClient:
@@ -22,12 +23,12 @@ class TestEVSClient:
         with patch("boto3.Session") as mock_session:
             mock_evs = Mock()
             mock_ec2 = Mock()
-            mock_session.return_value.client.side_effect = lambda service: {
+            mock_session.return_value.client.side_effect = lambda service, **kwargs: {
                 "evs": mock_evs,
                 "ec2": mock_ec2
             }[service]
             
-            client = EVSClient(mock_config)
+            client = EVSClient(mock_config, client_pool=ClientPool())
             client.evs_client = mock_evs
             client.ec2_client = mock_ec2
             return client
@@ -234,4 +235,110 @@ class TestEVSClient:
         with pytest.raises(Exception) as exc_info:
             evs_client.create_cluster("fail-cluster", "i3.metal", 3)
         
-        assert "Creation Succeeded" in str(exc_info.value)
\ No newline at end of file
+        assert "Creation Succeeded" in str(exc_info.value)
+    
+    def test_delete_cluster_error_logged(self, evs_client, caplog):
+        """Test AWS errors are logged and re-raised unchanged."""
+        # Arrange
+        evs_client.evs_client.delete_cluster.side_effect = ClientError(
+            {"Error": {"Code": "ResourceNotFoundException", "Message": "no such cluster"}},
+            "DeleteCluster"
+        )
+        
+        # Act & Assert
+        with pytest.raises(ClientError):
+            evs_client.delete_cluster("cluster-gone")
+        assert "AWS error deleting cluster cluster-gone" in caplog.text
+    
+    def test_iter_clusters_follows_pages(self, evs_client):
+        """Test cluster listing follows NextToken across pages."""
+        # Arrange
+        evs_client.evs_client.describe_clusters.side_effect = [
+            {
+                "Clusters": [
+                    {"ClusterName": "a", "ClusterStatus": "ACTIVE", "NodeCount": 3, "ClusterId": "c-1"}
+                ],
+                "NextToken": "page-2"
+            },
+            {
+                "Clusters": [
+                    {"ClusterName": "b", "ClusterStatus": "DELETING", "NodeCount": 4, "ClusterId": "c-2"},
+                    {"ClusterName": "c", "ClusterStatus": "ACTIVE", "NodeCount": 5, "ClusterId": "c-3"}
+                ]
+            }
+        ]
+        
+        # Act
+        clusters = list(evs_client.iter_clusters(
+            status=["ACTIVE"], fields=["name", "cluster_id"], page_size=50
+        ))
+        
+        # Assert
+        assert clusters == [
+            {"name": "a", "cluster_id": "c-1"},
+            {"name": "c", "cluster_id": "c-3"}
+        ]
+        assert evs_client.evs_client.describe_clusters.call_args_list[1].kwargs == {
+            "MaxResults": 50, "NextToken": "page-2"
+        }
+    
+    def test_unknown_fields_rejected_before_listing(self, evs_client):
+        """Test projection onto unknown fields is rejected without calling the API."""
+        with pytest.raises(ValueError, match="owner"):
+            evs_client.iter_clusters(fields=["name", "owner"])
+        with pytest.raises(ValueError, match="owner"):
+            evs_client.list_clusters(fields=["name", "owner"])
+        evs_client.evs_client.describe_clusters.assert_not_called()
+    
+    def test_default_subnets_stop_paging_early(self, evs_client):
+        """Test default subnet discovery does not fetch pages it does not need."""
+        # Arrange
+        evs_client.ec2_client.describe_subnets.side_effect = [
+            {"Subnets": [{"SubnetId": "subnet-1"}, {"SubnetId": "subnet-2"}], "NextToken": "t1"},
+            {"Subnets": [{"SubnetId": "subnet-3"}, {"SubnetId": "subnet-4"}], "NextToken": "t2"},
+            {"Subnets": [{"SubnetId": "subnet-5"}]}
+        ]
+        
+        # Act
+        subnets = evs_client._get_default_subnets()
+        
+        # Assert
+        assert subnets == ["subnet-1", "subnet-2", "subnet-3"]
+        assert evs_client.ec2_client.describe_subnets.call_count == 2
+    
+    def test_clients_shared_through_pool(self, mock_config):
+        """Test clients for the same region and profile are created once."""
+        # Arrange
+        pool = ClientPool({"max_retries": 5, "max_pool_connections": 20})
+        
+        with patch("boto3.Session") as mock_session:
+            mock_session.return_value.client.side_effect = lambda service, **kwargs: Mock()
+            
+            # Act
+            first = EVSClient(mock_config, client_pool=pool)
+            second = EVSClient(mock_config, client_pool=pool)
+            s3 = first.get_client("s3")
+        
+        # Assert
+        assert first.evs_client is second.evs_client
+        assert s3 is second.get_client("s3")
+        mock_session.assert_called_once_with(region_name="us-west-2", profile_name="test-profile")
+        config = mock_session.return_value.client.call_args.kwargs["config"]
+        assert config.max_pool_connections == 20
+        assert config.retries == {"mode": "standard", "total_max_attempts": 6}
+    
+    def test_pool_reconfiguration_drops_clients(self):
+        """Test changing connection settings rebuilds clients."""
+        # Arrange
+        pool = ClientPool()
+        
+        with patch("boto3.Session") as mock_session:
+            mock_session.return_value.client.side_effect = lambda service, **kwargs: Mock()
+            client = pool.client("evs", "us-west-2")
+            
+            # Act
+            pool.configure({"max_pool_connections": 10})
+            
+            # Assert
+            assert pool.client("evs", "us-west-2") is not client
+            assert len(pool) == 1
@@ -0,0 +1,231 @@
+"""Unit tests for streaming VM export and S3 multipart upload."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from vcf_evs.aws import MultipartStreamUploader
+from tests.fake_s3 import FakeS3
+from tests.fake_vcenter import FakeVCenterStub
+
+MIB = 1024 * 1024
+
+
+@pytest.fixture
+def disk_server():
+    """Local HTTP server standing in for an ESXi NFC disk endpoint."""
+    disks = {
+        "/nfc/disk-0.vmdk": bytes(range(256)) * (48 * 1024),  # 12 MiB
+        "/nfc/disk-1.vmdk": b"\x00" * (3 * MIB),
+    }
+    accepted = []
+    
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            accepted.append(self.headers.get("Accept"))
+            body = disks[self.path]
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, *args):
+            pass
+    
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", disks, accepted
+    server.shutdown()
+
+
+class TestMultipartStreamUploader:
+    """Test cases for MultipartStreamUploader."""
+    
+    def test_upload_stream_reassembles(self):
+        """Test odd-sized chunks are regrouped into ordered parts."""
+        # Arrange
+        s3 = FakeS3()
+        uploader = MultipartStreamUploader(s3, "bucket", part_size=5 * MIB, max_concurrency=3)
+        data = bytes(range(251)) * 100000  # ~24 MiB
+        chunks = (data[i:i + 777777] for i in range(0, len(data), 777777))
+        
+        # Act
+        result = uploader.upload_stream("vm/disk.vmdk", chunks)
+        
+        # Assert
+        assert s3.objects[("bucket", "vm/disk.vmdk")] == data
+        assert result.parts == 5
+        assert result.size == len(data)
+        assert result.location == "s3://bucket/vm/disk.vmdk"
+    
+    def test_failed_upload_resumes(self):
+        """Test a checkpointed upload is resumed without re-sending parts."""
+        # Arrange
+        s3 = FakeS3(fail_on_part=3)
+        uploader = MultipartStreamUploader(s3, "bucket", part_size=5 * MIB, max_concurrency=1)
+        data = b"x" * (22 * MIB)
+        checkpoints = {}
+        
+        def checkpoint(key, upload_id):
+            checkpoints[key] = upload_id
+        
+        # Act
+        with pytest.raises(ConnectionError):
+            uploader.upload_stream("k", iter([data]), on_upload_id=checkpoint)
+        upload_id = checkpoints["k"]
+        result = uploader.upload_stream("k", iter([data]), upload_id=upload_id, on_upload_id=checkpoint)
+        
+        # Assert
+        assert s3.objects[("bucket", "k")] == data
+        assert result.skipped_parts == 2
+        assert checkpoints["k"] is None
+        assert s3.aborted == []
+    
+    def test_resume_reuploads_parts_of_wrong_size(self):
+        """Test stored parts that no longer match the stream are uploaded again."""
+        # Arrange
+        s3 = FakeS3(fail_on_part=3)
+        data = b"x" * (22 * MIB)
+        checkpoints = {}
+        with pytest.raises(ConnectionError):
+            MultipartStreamUploader(s3, "bucket", part_size=5 * MIB, max_concurrency=1).upload_stream(
+                "k", iter([data]), on_upload_id=checkpoints.__setitem__
+            )
+        
+        # Act
+        result = MultipartStreamUploader(s3, "bucket", part_size=6 * MIB).upload_stream(
+            "k", iter([data]), upload_id=checkpoints["k"], on_upload_id=checkpoints.__setitem__
+        )
+        
+        # Assert
+        assert s3.objects[("bucket", "k")] == data
+        assert result.skipped_parts == 0
+    
+    def test_resume_reuploads_parts_with_different_content(self):
+        """Test stored parts of the right size but different bytes are uploaded again."""
+        # Arrange
+        s3 = FakeS3(fail_on_part=3)
+        uploader = MultipartStreamUploader(s3, "bucket", part_size=5 * MIB, max_concurrency=1)
+        checkpoints = {}
+        with pytest.raises(ConnectionError):
+            uploader.upload_stream("k", iter([b"x" * (22 * MIB)]), on_upload_id=checkpoints.__setitem__)
+        data = b"y" * (5 * MIB) + b"x" * (17 * MIB)
+        
+        # Act
+        result = uploader.upload_stream(
+            "k", iter([data]), upload_id=checkpoints["k"], on_upload_id=checkpoints.__setitem__
+        )
+        
+        # Assert
+        assert s3.objects[("bucket", "k")] == data
+        assert result.skipped_parts == 1
+    
+    def test_resume_of_unknown_upload_starts_fresh(self):
+        """Test a checkpointed upload ID S3 no longer knows starts a new upload."""
+        # Arrange
+        s3 = FakeS3()
+        uploader = MultipartStreamUploader(s3, "bucket", part_size=5 * MIB)
+        checkpoints = {}
+        
+        # Act
+        result = uploader.upload_stream(
+            "k", iter([b"z" * MIB]), upload_id="expired-upload", on_upload_id=checkpoints.__setitem__
+        )
+        
+        # Assert
+        assert s3.objects[("bucket", "k")] == b"z" * MIB
+        assert result.skipped_parts == 0
+        assert checkpoints["k"] is None
+    
+    def test_failed_upload_without_checkpoint_aborts(self):
+        """Test uploads that cannot be resumed are aborted."""
+        # Arrange
+        s3 = FakeS3(fail_on_part=1)
+        uploader = MultipartStreamUploader(s3, "bucket", part_size=5 * MIB)
+        
+        # Act & Assert
+        with pytest.raises(ConnectionError):
+            uploader.upload_stream("k", iter([b"y" * MIB]))
+        assert s3.aborted == ["upload-1"]
+
+
+class TestLeaseExport:
+    """Test cases for streaming export through an HttpNfcLease."""
+    
+    @pytest.fixture
+    def stub(self, disk_server):
+        """Fake vCenter whose export lease points at the local disk server."""
+        base_url, disks, _ = disk_server
+        stub = FakeVCenterStub()
+        stub.add_vm("app-01")
+        stub.export_files = [
+            (path.rsplit("/", 1)[-1], base_url + path, len(body))
+            for path, body in disks.items()
+        ]
+        return stub
+    
+    @pytest.fixture
+    def vcenter_config(self, vcenter_config):
+        """Point the client at the local disk server's host."""
+        return dict(vcenter_config, vcenter_server="127.0.0.1")
+    
+    def test_export_streams_into_s3(self, vcenter_client, stub, disk_server):
+        """Test disks stream from the lease into multipart uploads."""
+        # Arrange
+        _, disks, accepted = disk_server
+        s3 = FakeS3()
+        uploader = MultipartStreamUploader(s3, "migration", part_size=5 * MIB, max_concurrency=2)
+        
+        def sink(export_file, chunks):
+            return uploader.upload_stream(f"app-01/{export_file.name}", chunks).location
+        
+        # Act
+        result = vcenter_client.export_vm("app-01", sink)
+        
+        # Assert
+        assert s3.objects[("migration", "app-01/disk-0.vmdk")] == disks["/nfc/disk-0.vmdk"]
+        assert s3.objects[("migration", "app-01/disk-1.vmdk")] == disks["/nfc/disk-1.vmdk"]
+        assert result.total_bytes == 15 * MIB
+        assert result.files[0]["result"] == "s3://migration/app-01/disk-0.vmdk"
+        assert 'ovf:href="disk-1.vmdk"' in result.ovf_descriptor
+        assert stub.lease_calls[-2:] == [("progress", 100), ("complete",)]
+        assert accepted == ["application/x-vnd.vmware-streamVmdk"] * 2
+    
+    def test_flat_export_requested(self, vcenter_client, disk_server):
+        """Test disks are requested as flat content when stream_optimized is off."""
+        # Arrange
+        _, _, accepted = disk_server
+        
+        # Act
+        vcenter_client.export_vm("app-01", lambda export_file, chunks: None, stream_optimized=False)
+        
+        # Assert
+        assert accepted == ["application/octet-stream"] * 2
+    
+    def test_export_to_ovf_directory(self, vcenter_client, stub, disk_server, tmp_path):
+        """Test local export writes disks and descriptor."""
+        # Act
+        ovf_path = vcenter_client.export_vm_to_ovf("app-01", str(tmp_path))
+        
+        # Assert
+        assert ovf_path == str(tmp_path / "app-01" / "app-01.ovf")
+        assert (tmp_path / "app-01" / "disk-0.vmdk").stat().st_size == 12 * MIB
+    
+    def test_unknown_vm_rejected(self, vcenter_client, stub):
+        """Test exporting a VM that does not exist raises ValueError."""
+        with pytest.raises(ValueError, match="VM not found: missing-vm"):
+            vcenter_client.export_vm("missing-vm", lambda export_file, chunks: None)
+        assert stub.lease_calls == []
+    
+    def test_failed_sink_aborts_lease(self, vcenter_client, stub):
+        """Test the lease is aborted when the transfer fails."""
+        # Arrange
+        def sink(export_file, chunks):
+            raise IOError("disk full")
+        
+        # Act & Assert
+        with pytest.raises(IOError):
+            vcenter_client.export_vm("app-01", sink)
+        assert stub.lease_calls[-1] == ("abort",)
@@ -0,0 +1,182 @@
+"""Unit tests for the multi-region fleet view."""
+
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+from vcf_evs.aws import ClientPool, EVSClient, FleetTarget, FleetView, fleet_targets
+
+
+class FakeRegionClient:
+    """EVS client stand-in returning canned clusters for one region."""
+    
+    def __init__(self, target, delay=0.0, error=None):
+        self.target = target
+        self.delay = delay
+        self.error = error
+    
+    def list_clusters(self, status=None, fields=None):
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return [{
+            "name": f"{self.target.region}-cluster",
+            "status": "ACTIVE",
+            "node_count": 3,
+            "cluster_id": f"c-{self.target.region}",
+            "region": self.target.region
+        }]
+    
+    def get_cluster_status(self, cluster_id):
+        return {"vpc_id": f"vpc-{cluster_id}"}
+
+
+class TestFleetTargets:
+    """Test cases for fleet target configuration."""
+    
+    def test_regions_combined_with_profiles(self):
+        """Test every profile is paired with every region plus explicit targets."""
+        # Arrange
+        aws_config = {
+            "region": "us-west-2",
+            "fleet": {
+                "regions": ["us-west-2", "eu-west-1"],
+                "profiles": ["prod", "dev"],
+                "targets": [{"region": "us-west-2", "profile": "prod"}]
+            }
+        }
+        
+        # Act
+        targets = fleet_targets(aws_config)
+        
+        # Assert
+        assert [t.label for t in targets] == [
+            "prod/us-west-2", "prod/eu-west-1", "dev/us-west-2", "dev/eu-west-1"
+        ]
+    
+    def test_defaults_to_configured_region(self):
+        """Test a config without fleet section yields the single region."""
+        assert fleet_targets({"region": "us-east-1", "profile": "ops"}) == [
+            FleetTarget("us-east-1", "ops")
+        ]
+
+
+class TestFleetView:
+    """Test cases for FleetView."""
+    
+    def test_regions_queried_concurrently(self):
+        """Test regions are listed in parallel and merged in config order."""
+        # Arrange
+        targets = [FleetTarget(region) for region in ("r1", "r2", "r3", "r4")]
+        active = []
+        peak = []
+        lock = threading.Lock()
+        
+        class TrackingClient(FakeRegionClient):
+            def list_clusters(self, status=None, fields=None):
+                with lock:
+                    active.append(self.target)
+                    peak.append(len(active))
+                try:
+                    return super().list_clusters(status, fields)
+                finally:
+                    with lock:
+                        active.remove(self.target)
+        
+        view = FleetView(targets, client_factory=lambda t: TrackingClient(t, delay=0.1))
+        
+        # Act
+        results = view.collect()
+        
+        # Assert
+        assert [r.target.region for r in results] == ["r1", "r2", "r3", "r4"]
+        assert max(peak) == 4
+        assert all(r.ok for r in results)
+    
+    def test_failed_region_reported_without_blocking_others(self):
+        """Test one failing region does not affect the rest."""
+        # Arrange
+        targets = [FleetTarget("ok-1"), FleetTarget("broken", "prod"), FleetTarget("ok-2")]
+        
+        def factory(target):
+            if target.region == "broken":
+                return FakeRegionClient(target, error=RuntimeError("AccessDenied"))
+            return FakeRegionClient(target)
+        
+        # Act
+        results = FleetView(targets, client_factory=factory).collect()
+        
+        # Assert
+        assert [r.ok for r in results] == [True, False, True]
+        assert results[1].error == "AccessDenied"
+        assert results[0].records()[0]["name"] == "ok-1-cluster"
+    
+    def test_aws_error_reported_per_region(self):
+        """Test a failing EVS call surfaces the AWS error message in its region's result."""
+        # Arrange
+        denied = ClientError(
+            {"Error": {"Code": "AccessDeniedException", "Message": "not authorized in eu-west-1"}},
+            "DescribeClusters"
+        )
+        
+        def session(region_name=None, profile_name=None):
+            evs = Mock()
+            if region_name == "eu-west-1":
+                evs.describe_clusters.side_effect = denied
+            else:
+                evs.describe_clusters.return_value = {"Clusters": []}
+            mock_session = Mock()
+            mock_session.client.side_effect = lambda service, **kwargs: evs if service == "evs" else Mock()
+            return mock_session
+        
+        pool = ClientPool()
+        targets = [FleetTarget("us-west-2"), FleetTarget("eu-west-1")]
+        
+        # Act
+        with patch("boto3.Session", side_effect=session):
+            results = FleetView(
+                targets,
+                client_factory=lambda t: EVSClient({"region": t.region}, client_pool=pool)
+            ).collect()
+        
+        # Assert
+        assert results[0].ok
+        assert "AccessDeniedException" in results[1].error
+        assert "not authorized in eu-west-1" in results[1].error
+    
+    def test_slow_region_times_out(self):
+        """Test results stream as regions finish and stragglers time out."""
+        # Arrange
+        targets = [FleetTarget("slow"), FleetTarget("fast")]
+        view = FleetView(
+            targets,
+            client_factory=lambda t: FakeRegionClient(t, delay=2.0 if t.region == "slow" else 0),
+            timeout=0.3
+        )
+        
+        # Act
+        started = time.monotonic()
+        results = list(view.iter_results())
+        
+        # Assert
+        assert time.monotonic() - started < 1.5
+        assert [r.target.region for r in results] == ["fast", "slow"]
+        assert "Timed out" in results[1].error
+    
+    def test_detailed_merges_cluster_status(self):
+        """Test detailed mode adds get_cluster_status fields."""
+        # Act
+        results = FleetView(
+            [FleetTarget("r1")], client_factory=FakeRegionClient, detailed=True
+        ).collect()
+        
+        # Assert
+        assert results[0].clusters[0]["vpc_id"] == "vpc-c-r1"
+    
+    def test_invalid_worker_count(self):
+        """Test non-positive worker counts are rejected."""
+        with pytest.raises(ValueError):
+            FleetView([], max_workers=0)
@@ -0,0 +1,201 @@
+"""Unit tests for per-operation latency instrumentation."""
+
+import urllib.request
+from unittest.mock import Mock, patch
+
+import boto3
+import pytest
+from botocore.stub import Stubber
+
+from vcf_evs.aws import ClientPool
+from vcf_evs.migration import Stage, WaveScheduler
+from vcf_evs.utils.instrumentation import Histogram, Instrumentation
+from vcf_evs.utils.ratelimit import RateLimiter
+from vcf_evs.vmware import VCenterClient
+from tests.fake_vcenter import FakeServiceInstance, FakeVCenterStub
+
+
+class FakeClock:
+    """Clock advanced by hand."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestHistogram:
+    """Test cases for Histogram."""
+
+    def test_bucket_bounds_inclusive(self):
+        """Test a value equal to a bound lands in that bound's bucket."""
+        # Arrange
+        histogram = Histogram((0.1, 1.0))
+
+        # Act
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+
+        # Assert
+        assert histogram.cumulative() == [(0.1, 2), (1.0, 3), (float("inf"), 4)]
+        assert histogram.max == 2.0
+
+    def test_quantiles_interpolated(self):
+        """Test quantiles interpolate within buckets and never exceed the maximum."""
+        # Arrange
+        histogram = Histogram((1.0, 2.0, 4.0))
+        for _ in range(50):
+            histogram.observe(0.5)
+        for _ in range(50):
+            histogram.observe(3.0)
+
+        # Act / Assert
+        assert histogram.quantile(0.5) == pytest.approx(1.0)
+        assert histogram.quantile(0.75) == pytest.approx(3.0)
+        assert histogram.quantile(0.99) == pytest.approx(3.0)
+
+
+class TestInstrumentation:
+    """Test cases for Instrumentation."""
+
+    def test_boto3_calls_timed_per_operation(self):
+        """Test pooled boto3 clients record every call and error by operation."""
+        # Arrange
+        instrumentation = Instrumentation()
+        pool = ClientPool(rate_limiter=RateLimiter(enabled=False), instrumentation=instrumentation)
+        with patch("boto3.Session", lambda **kwargs: boto3.session.Session(
+            aws_access_key_id="test", aws_secret_access_key="test", region_name="us-west-2"
+        )):
+            ec2 = pool.client("ec2", "us-west-2")
+        with Stubber(ec2) as stubber:
+            stubber.add_response("describe_subnets", {"Subnets": []})
+            stubber.add_response("describe_subnets", {"Subnets": []})
+            stubber.add_client_error("describe_vpcs", "UnauthorizedOperation", http_status_code=403)
+
+            # Act
+            ec2.describe_subnets()
+            ec2.describe_subnets()
+            with pytest.raises(Exception):
+                ec2.describe_vpcs()
+
+        # Assert
+        operations = instrumentation.stats()["operations"]
+        assert operations["ec2.DescribeSubnets"]["calls"] == 2
+        assert operations["ec2.DescribeSubnets"]["errors"] == 0
+        assert operations["ec2.DescribeVpcs"]["errors"] == 1
+
+    def test_botocore_attempt_hooks_count_throttles_and_bytes(self):
+        """Test per-attempt hooks count throttled responses and transferred bytes."""
+        # Arrange
+        instrumentation = Instrumentation()
+        client = Mock()
+        instrumentation.instrument_client(client, "s3")
+        handlers = {call.args[0]: call.args[1] for call in client.meta.events.register.call_args_list}
+
+        # Act
+        handlers["before-send"](request=Mock(headers={"Content-Length": "8388608"}),
+                                event_name="before-send.s3.UploadPart")
+        handlers["needs-retry"](
+            response=(Mock(status_code=503, headers={}), {"Error": {"Code": "SlowDown"}}),
+            event_name="needs-retry.s3.UploadPart"
+        )
+        handlers["needs-retry"](
+            response=(Mock(status_code=200, headers={"content-length": "512"}), {}),
+            event_name="needs-retry.s3.GetObject"
+        )
+
+        # Assert
+        operations = instrumentation.stats()["operations"]
+        assert operations["s3.UploadPart"]["throttles"] == 1
+        assert operations["s3.UploadPart"]["bytes_sent"] == 8388608
+        assert operations["s3.GetObject"]["bytes_received"] == 512
+
+    def test_vcenter_soap_calls_timed(self):
+        """Test vCenter method calls are recorded under their SOAP method name."""
+        # Arrange
+        stub = FakeVCenterStub()
+        for i in range(5):
+            stub.add_vm(f"app-{i}")
+        instrumentation = Instrumentation()
+        with patch("vcf_evs.vmware.vcenter_client.SmartConnect", return_value=FakeServiceInstance(stub)):
+            client = VCenterClient(
+                {"vcenter_server": "vcenter.local", "username": "user", "password": "secret"},
+                rate_limiter=RateLimiter(enabled=False),
+                instrumentation=instrumentation
+            )
+
+        # Act
+        vms = client.list_vms()
+
+        # Assert
+        operations = instrumentation.stats()["operations"]
+        assert len(vms) == 5
+        assert operations["vcenter.RetrievePropertiesEx"]["calls"] >= 1
+
+    def test_scheduler_records_stages(self):
+        """Test wave stages record latency, failures and bytes moved."""
+        # Arrange
+        clock = FakeClock()
+        instrumentation = Instrumentation(clock=clock)
+
+        def upload(context):
+            clock.now += 30
+            context["bytes_transferred"] += 1000
+            if context["vm_name"] == "vm-2":
+                raise RuntimeError("upload failed")
+
+        scheduler = WaveScheduler(
+            [Stage("upload", upload, 1)], max_in_flight=1, instrumentation=instrumentation
+        )
+
+        # Act
+        scheduler.run(["vm-1", "vm-2"])
+
+        # Assert
+        upload_stats = instrumentation.stats()["stages"]["upload"]
+        assert upload_stats["calls"] == 2
+        assert upload_stats["errors"] == 1
+        assert upload_stats["bytes_sent"] == 2000
+        assert upload_stats["total_seconds"] == 60
+
+    def test_prometheus_exposition(self):
+        """Test the text format has cumulative buckets, counters and rate limiter series."""
+        # Arrange
+        instrumentation = Instrumentation()
+        instrumentation.record_call("evs", "ListClusters", 0.02)
+        instrumentation.record_call("evs", "ListClusters", 0.3, error=True, retries=2)
+        limiter = RateLimiter()
+        limiter.acquire("evs:us-west-2")
+
+        # Act
+        text = instrumentation.render_prometheus(limiter)
+
+        # Assert
+        labels = 'service="evs",operation="ListClusters"'
+        assert "# TYPE vcf_evs_api_call_duration_seconds histogram" in text
+        assert f'vcf_evs_api_call_duration_seconds_bucket{{{labels},le="0.025"}} 1' in text
+        assert f'vcf_evs_api_call_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+        assert f"vcf_evs_api_call_duration_seconds_count{{{labels}}} 2" in text
+        assert f"vcf_evs_api_call_errors_total{{{labels}}} 1" in text
+        assert f"vcf_evs_api_call_retries_total{{{labels}}} 2" in text
+        assert 'vcf_evs_rate_limit_rate{key="evs:us-west-2"} 5.0' in text
+
+    def test_http_endpoint_serves_metrics(self):
+        """Test the metrics endpoint returns the exposition."""
+        # Arrange
+        instrumentation = Instrumentation()
+        instrumentation.record_stage("import", 120.0)
+        server = instrumentation.serve_prometheus(0)
+
+        # Act
+        try:
+            port = server.server_address[1]
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+                body = response.read().decode()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        # Assert
+        assert 'vcf_evs_migration_stage_duration_seconds_count{stage="import"} 1' in body
@@ -0,0 +1,99 @@
+"""Unit tests for the incremental inventory mirror."""
+
+from unittest.mock import patch
+
+import pytest
+
+from vcf_evs.vmware.inventory_sync import InventoryMirror
+from tests.fake_vcenter import FakeVCenterStub
+
+
+class TestInventoryMirror:
+    """Test cases for InventoryMirror."""
+    
+    @pytest.fixture
+    def stub(self):
+        """Fake vCenter with a small VM inventory."""
+        stub = FakeVCenterStub()
+        for i in range(20):
+            stub.add_vm(f"web-{i:02d}")
+        return stub
+    
+    @pytest.fixture
+    def mirror(self, stub):
+        """Mirror started in the foreground with an initial sync."""
+        mirror = InventoryMirror(stub.content, max_wait_seconds=0)
+        mirror.poll()
+        stub.reset()
+        yield mirror
+        mirror.stop()
+    
+    def test_initial_sync(self, mirror):
+        """Test the first update set populates the full inventory."""
+        # Assert
+        assert mirror.ready
+        assert len(mirror) == 20
+        record = mirror.find("name", "web-05")
+        assert record["moid"] == "vm-6"
+        assert record["runtime.powerState"] == "poweredOn"
+        assert record["config.hardware.numCPU"] == 2
+    
+    def test_applies_deltas(self, mirror, stub):
+        """Test enter, modify and leave updates are applied incrementally."""
+        # Arrange
+        received = []
+        mirror.add_listener(received.append)
+        vm = stub.add_vm("db-01")
+        stub.update_vm(vm, {"runtime.powerState": "poweredOff"})
+        stub.remove_vm(mirror.find("name", "web-00")["obj"])
+        
+        # Act
+        events = mirror.poll()
+        
+        # Assert
+        assert [event.kind for event in events] == ["enter", "modify", "leave"]
+        assert received == events
+        assert len(mirror) == 20
+        assert mirror.get(vm._moId)["runtime.powerState"] == "poweredOff"
+        assert mirror.find("name", "web-00") is None
+        assert stub.round_trips == 1
+    
+    def test_poll_without_changes(self, mirror, stub):
+        """Test an idle poll applies nothing."""
+        # Act
+        events = mirror.poll()
+        
+        # Assert
+        assert events == []
+        assert stub.calls["WaitForUpdatesEx"] == 1
+    
+    def test_name_index_follows_renames(self, mirror, stub):
+        """Test lookups by name and moId use the indexes and follow renames."""
+        # Arrange
+        vm = mirror.find("name", "web-03")["obj"]
+        stub.update_vm(vm, {"name": "app-03"})
+        
+        # Act
+        mirror.poll()
+        
+        # Assert
+        assert mirror.find("name", "web-03") is None
+        assert mirror.find("name", "app-03")["moid"] == vm._moId
+        assert mirror.find("moid", vm._moId)["name"] == "app-03"
+    
+    def test_background_loop_gives_up(self, stub):
+        """Test a persistently failing update loop stops and surfaces its error."""
+        # Arrange
+        mirror = InventoryMirror(stub.content, max_retries=2, retry_backoff=0)
+        error = RuntimeError("filter destroyed")
+        
+        # Act
+        with patch.object(mirror, "poll", side_effect=error) as poll:
+            mirror._run()
+        
+        # Assert
+        assert poll.call_count == 3
+        assert mirror.error is error
+        assert not mirror.ready
+        with pytest.raises(RuntimeError, match="filter destroyed"):
+            mirror.wait_until_ready(0)
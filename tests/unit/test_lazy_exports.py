@@ -0,0 +1,35 @@
+"""Unit tests for lazy package exports."""
+
+import pytest
+
+import vcf_evs
+import vcf_evs.aws
+import vcf_evs.vmware
+
+
+class TestLazyExports:
+    """Test cases for lazily exported package attributes."""
+
+    def test_exports_resolve_to_defining_module(self):
+        """Test lazy names are the objects defined in their modules."""
+        # Arrange
+        from vcf_evs.vmware.vcenter_client import VCenterClient
+
+        # Act / Assert
+        assert vcf_evs.VCenterClient is VCenterClient
+        assert vcf_evs.vmware.VCenterClient is VCenterClient
+        assert "VCenterClient" in vars(vcf_evs.vmware)
+
+    def test_from_import_and_dir(self):
+        """Test ``from package import name`` works and ``dir`` lists every export."""
+        # Act
+        from vcf_evs.utils import ConfigManager
+
+        # Assert
+        assert ConfigManager.__module__ == "vcf_evs.utils.config"
+        assert set(vcf_evs.vmware.__all__) <= set(dir(vcf_evs.vmware))
+
+    def test_unknown_name_raises_attribute_error(self):
+        """Test missing names still raise ``AttributeError``."""
+        with pytest.raises(AttributeError, match="NoSuchClient"):
+            vcf_evs.aws.NoSuchClient
@@ -0,0 +1,143 @@
+"""Unit tests for the queued, structured logging pipeline."""
+
+import contextvars
+import json
+import logging
+import threading
+
+import pytest
+
+from vcf_evs.utils.logger import (
+    current_log_context,
+    log_context,
+    parse_size,
+    setup_logging,
+    shutdown_logging,
+)
+
+
+@pytest.fixture(autouse=True)
+def log_dir(tmp_path, monkeypatch):
+    """Write log files under a temporary ``logs`` directory."""
+    monkeypatch.chdir(tmp_path)
+    yield tmp_path / "logs"
+    shutdown_logging()
+    logging.getLogger("vcf_evs").setLevel(logging.NOTSET)
+
+
+def read_json_lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestSetupLogging:
+    """Test cases for setup_logging."""
+
+    def test_repeated_setup_does_not_duplicate_handlers(self):
+        """Test calling setup twice leaves one handler on the package logger."""
+        # Act
+        setup_logging("INFO")
+        logger = setup_logging("DEBUG")
+
+        # Assert
+        assert len(logger.handlers) == 1
+        assert logger.level == logging.DEBUG
+
+    def test_json_records_carry_context(self, log_dir):
+        """Test JSON records include context fields, also from worker threads."""
+        # Arrange
+        setup_logging("INFO", log_file="vcf-evs.log", json_format=True)
+        logger = logging.getLogger("vcf_evs.test")
+
+        # Act
+        with log_context(vm="web-01", cluster="prod") as correlation_id:
+            logger.info("Exported %s files", 3, extra={"stage": "export"})
+            worker = threading.Thread(
+                target=contextvars.copy_context().run, args=(logger.info, "from worker")
+            )
+            worker.start()
+            worker.join()
+        logger.info("outside")
+        shutdown_logging()
+
+        # Assert
+        inside, from_worker, outside = read_json_lines(log_dir / "vcf-evs.log")
+        assert inside["message"] == "Exported 3 files"
+        assert inside["vm"] == "web-01" and inside["cluster"] == "prod"
+        assert inside["stage"] == "export"
+        assert inside["correlation_id"] == from_worker["correlation_id"] == correlation_id
+        assert "correlation_id" not in outside
+
+    def test_exception_rendered(self, log_dir):
+        """Test logged exceptions keep their traceback."""
+        # Arrange
+        setup_logging("INFO", log_file="vcf-evs.log", json_format=True)
+
+        # Act
+        try:
+            raise KeyError("vm-42")
+        except KeyError:
+            logging.getLogger("vcf_evs").exception("Lookup failed")
+        shutdown_logging()
+
+        # Assert
+        (record,) = read_json_lines(log_dir / "vcf-evs.log")
+        assert "KeyError: 'vm-42'" in record["exception"]
+
+    def test_file_rotated_at_max_size(self, log_dir):
+        """Test the log file rotates and keeps backup_count old files."""
+        # Arrange
+        setup_logging("INFO", log_file="vcf-evs.log", max_file_size="1KB", backup_count=2)
+
+        # Act
+        for i in range(200):
+            logging.getLogger("vcf_evs").info("line %s", i)
+        shutdown_logging()
+
+        # Assert
+        files = sorted(path.name for path in log_dir.iterdir())
+        assert files == ["vcf-evs.log", "vcf-evs.log.1", "vcf-evs.log.2"]
+        assert all(path.stat().st_size <= 1024 for path in log_dir.iterdir())
+
+    def test_disabled_level_not_formatted(self):
+        """Test arguments of suppressed records are never rendered."""
+        # Arrange
+        setup_logging("INFO")
+        rendered = []
+
+        class Expensive:
+            def __str__(self):
+                rendered.append(True)
+                return "expensive"
+
+        # Act
+        logging.getLogger("vcf_evs").debug("state %s", Expensive())
+
+        # Assert
+        assert rendered == []
+
+
+class TestLogContext:
+    """Test cases for log_context."""
+
+    def test_nested_context_keeps_fields_and_parent(self):
+        """Test inner blocks add fields and record the outer correlation ID."""
+        with log_context(cluster="prod") as outer:
+            with log_context(vm="web-01") as inner:
+                context = current_log_context()
+
+        assert context == {"cluster": "prod", "vm": "web-01", "correlation_id": inner, "parent_id": outer}
+        assert current_log_context() == {}
+
+
+@pytest.mark.parametrize("size,expected", [
+    ("10MB", 10 * 1024 ** 2), ("512k", 512 * 1024), ("1.5 GiB", int(1.5 * 1024 ** 3)), (4096, 4096),
+])
+def test_parse_size(size, expected):
+    """Test sizes from the logging config are converted to bytes."""
+    assert parse_size(size) == expected
+
+
+def test_parse_size_rejects_invalid():
+    """Test an unparseable size raises instead of silently using a default."""
+    with pytest.raises(ValueError, match="Invalid size"):
+        parse_size("ten MB")
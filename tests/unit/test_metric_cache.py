@@ -0,0 +1,151 @@
+"""Unit tests for the CloudWatch time-series cache."""
+
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+
+from vcf_evs.aws import ClientPool, CloudWatchMonitor, MetricCache, SeriesKey
+
+NOW = 1_700_000_100.0
+KEY = SeriesKey("cluster-a", "ClusterHealth", 300, "Average")
+
+
+class FakeCloudWatch:
+    """GetMetricData stand-in with one datapoint per period in the window."""
+    
+    def __init__(self):
+        self.windows = []
+    
+    def get_metric_data(self, MetricDataQueries, StartTime, EndTime, ScanBy, NextToken=None):
+        start, end = StartTime.timestamp(), EndTime.timestamp()
+        self.windows.append((start, end, len(MetricDataQueries)))
+        first = start - start % 300 + (300 if start % 300 else 0)
+        timestamps = [first + 300 * i for i in range(int((end - first) // 300) + 1)]
+        return {"MetricDataResults": [{
+            "Id": query["Id"],
+            "Label": query["Label"],
+            "Timestamps": [datetime.fromtimestamp(ts, tz=timezone.utc) for ts in timestamps],
+            "Values": [ts / 1e9 for ts in timestamps],
+            "StatusCode": "Complete"
+        } for query in MetricDataQueries]}
+
+
+class TestMetricCache:
+    """Test cases for MetricCache."""
+    
+    def test_store_merges_and_replaces(self):
+        """Test overlapping fetches replace datapoints for the same timestamp."""
+        # Arrange
+        cache = MetricCache(clock=lambda: NOW)
+        cache.store(KEY, [NOW - 600, NOW - 300], [1.0, 2.0], fetched_until=NOW - 200)
+        
+        # Act
+        cache.store(KEY, [NOW - 300, NOW], [2.5, 3.0], fetched_until=NOW)
+        
+        # Assert
+        assert cache.get(KEY, 0) == ([NOW - 600, NOW - 300, NOW], [1.0, 2.5, 3.0])
+        assert cache.fetched_until(KEY) == NOW
+    
+    def test_eviction_by_age_and_size(self, tmp_path):
+        """Test old datapoints and points beyond the per-series limit are dropped."""
+        # Arrange
+        cache = MetricCache(str(tmp_path / "metrics.db"), max_age=3600, max_points=3,
+                            clock=lambda: NOW)
+        
+        # Act
+        cache.store(KEY, [NOW - 7200, NOW - 400, NOW - 300, NOW - 200, NOW - 100],
+                    [1, 2, 3, 4, 5], fetched_until=NOW)
+        
+        # Assert
+        assert cache.get(KEY, 0)[1] == [3.0, 4.0, 5.0]
+        assert len(cache) == 3
+        assert cache.coverage(KEY) == (NOW - 300, NOW)
+    
+    def test_coverage_merges_adjacent_windows(self):
+        """Test a head window joins the covered range and a disjoint newer window replaces it."""
+        # Arrange
+        cache = MetricCache(clock=lambda: NOW)
+        cache.store(KEY, [NOW - 600], [1.0], fetched_until=NOW, fetched_from=NOW - 900)
+        
+        # Act
+        cache.store(KEY, [NOW - 1800], [0.5], fetched_until=NOW - 900, fetched_from=NOW - 1800)
+        merged = cache.coverage(KEY)
+        cache.store(KEY, [NOW + 7200], [2.0], fetched_until=NOW + 7300, fetched_from=NOW + 7000)
+        
+        # Assert
+        assert merged == (NOW - 1800, NOW)
+        assert cache.coverage(KEY) == (NOW + 7000, NOW + 7300)
+
+
+class TestCachedMonitor:
+    """Test cases for incremental metric fetches through CloudWatchMonitor."""
+    
+    @pytest.fixture
+    def cloudwatch(self):
+        """Fake CloudWatch client."""
+        return FakeCloudWatch()
+    
+    @pytest.fixture
+    def monitor(self, cloudwatch):
+        """Monitor with an in-memory cache."""
+        with patch("boto3.Session") as mock_session:
+            mock_session.return_value.client.return_value = cloudwatch
+            return CloudWatchMonitor(
+                {"region": "us-west-2"},
+                client_pool=ClientPool(),
+                cache=MetricCache(clock=lambda: NOW)
+            )
+    
+    def test_only_missing_tail_is_fetched(self, monitor, cloudwatch):
+        """Test repeated requests fetch only new datapoints and reuse the rest."""
+        # Arrange
+        clusters = ["cluster-a", "cluster-b"]
+        
+        with patch("vcf_evs.aws.monitoring.time.time", return_value=NOW):
+            first = monitor.get_fleet_metrics(clusters)
+        
+        # Act
+        with patch("vcf_evs.aws.monitoring.time.time", return_value=NOW + 30):
+            fresh = monitor.get_fleet_metrics(clusters)
+        with patch("vcf_evs.aws.monitoring.time.time", return_value=NOW + 900):
+            later = monitor.get_fleet_metrics(clusters)
+        
+        # Assert
+        assert len(cloudwatch.windows) == 2
+        assert cloudwatch.windows[0][0] == NOW - 3600
+        tail_start = cloudwatch.windows[1][0]
+        assert NOW - 900 < tail_start <= NOW - 600
+        # The 30s-later window no longer includes the oldest point
+        assert list(fresh["cluster-a"]["ClusterHealth"].values) == \
+            list(first["cluster-a"]["ClusterHealth"].values)[1:]
+        assert len(later["cluster-b"]["ClusterHealth"]) == 13
+    
+    def test_missing_head_is_fetched(self, monitor, cloudwatch):
+        """Test a longer request fetches only the window before the cached range."""
+        # Arrange
+        with patch("vcf_evs.aws.monitoring.time.time", return_value=NOW):
+            monitor.get_fleet_metrics(["cluster-a"])
+        
+        # Act
+        with patch("vcf_evs.aws.monitoring.time.time", return_value=NOW + 30):
+            longer = monitor.get_fleet_metrics(["cluster-a"], hours=2)
+        
+        # Assert
+        assert len(cloudwatch.windows) == 2
+        head_start, head_end, _ = cloudwatch.windows[1]
+        assert (head_start, head_end) == (NOW + 30 - 7200, NOW - 3600)
+        assert len(longer["cluster-a"]["ClusterHealth"]) == 24
+    
+    def test_get_cluster_metrics_served_from_cache(self, monitor, cloudwatch):
+        """Test the single-cluster API returns cached datapoints."""
+        # Act
+        with patch("vcf_evs.aws.monitoring.time.time", return_value=NOW):
+            result = monitor.get_cluster_metrics("cluster-a")
+            monitor.get_cluster_metrics("cluster-a")
+        
+        # Assert
+        assert len(cloudwatch.windows) == 1
+        assert result["cluster_name"] == "cluster-a"
+        assert len(result["metrics"]) == 13
+        assert set(result["metrics"][0]) == {"Timestamp", "Average"}
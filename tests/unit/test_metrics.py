@@ -0,0 +1,118 @@
+"""Unit tests for batched CloudWatch metric retrieval."""
+
+import math
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from vcf_evs.aws import ClientPool, CloudWatchMonitor, MetricBatcher, MetricQuery
+
+T0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class FakeCloudWatch:
+    """GetMetricData stand-in returning two pages per call."""
+    
+    def __init__(self):
+        self.calls = []
+    
+    def get_metric_data(self, MetricDataQueries, StartTime, EndTime, ScanBy, NextToken=None):
+        self.calls.append({"count": len(MetricDataQueries), "token": NextToken})
+        page = 1 if NextToken else 0
+        results = []
+        for query in MetricDataQueries:
+            base = len(query["Id"])
+            results.append({
+                "Id": query["Id"],
+                "Label": query.get("Label", query["Id"]),
+                "Timestamps": [T0 + timedelta(minutes=5 * (2 * page + i)) for i in range(2)],
+                "Values": [float(base + 2 * page + i) for i in range(2)],
+                "StatusCode": "Complete"
+            })
+        response = {"MetricDataResults": results}
+        if page == 0:
+            response["NextToken"] = "more"
+        return response
+
+
+class TestMetricBatcher:
+    """Test cases for MetricBatcher."""
+    
+    def test_batches_respect_limit(self):
+        """Test queries are split into calls of at most 500 and pages are merged."""
+        # Arrange
+        cloudwatch = FakeCloudWatch()
+        queries = [MetricQuery(id=f"q{i}", metric_name="ClusterHealth") for i in range(1200)]
+        
+        # Act
+        result = MetricBatcher(cloudwatch).get_metric_data(queries, T0, T0 + timedelta(hours=1))
+        
+        # Assert
+        assert sorted(call["count"] for call in cloudwatch.calls) == [200, 200, 500, 500, 500, 500]
+        assert result.api_calls == 6
+        assert len(result) == 1200
+        assert len(result["q7"]) == 4
+        assert list(result["q7"].values) == [2.0, 3.0, 4.0, 5.0]
+    
+    def test_expressions_stay_with_inputs(self):
+        """Test metric math groups are never split across calls."""
+        # Arrange
+        queries = [MetricQuery(id=f"m{i}", metric_name="X") for i in range(6)]
+        queries.append(MetricQuery(id="e0", expression="m0 + m5"))
+        
+        # Act
+        batches = MetricBatcher(FakeCloudWatch(), max_queries=4).plan(queries)
+        
+        # Assert
+        grouped = next(batch for batch in batches if any(q.id == "e0" for q in batch))
+        assert {"m0", "m5", "e0"} <= {q.id for q in grouped}
+        assert all(len(batch) <= 4 for batch in batches)
+    
+    def test_columns_align_series(self):
+        """Test columnar output fills missing points with NaN."""
+        # Arrange
+        result = MetricBatcher(FakeCloudWatch()).get_metric_data(
+            [MetricQuery(id="a", metric_name="X"), MetricQuery(id="bb", metric_name="Y")],
+            T0, T0 + timedelta(hours=1)
+        )
+        result["bb"].timestamps.pop()
+        result["bb"].values.pop()
+        
+        # Act
+        columns = result.to_columns()
+        
+        # Assert
+        assert len(columns["timestamp"]) == 4
+        assert list(columns["a"]) == [1.0, 2.0, 3.0, 4.0]
+        assert math.isnan(columns["bb"][3])
+
+
+class TestCloudWatchMonitorFleetMetrics:
+    """Test cases for CloudWatchMonitor.get_fleet_metrics."""
+    
+    def test_many_clusters_few_calls(self):
+        """Test 80 clusters x 10 metrics are fetched in two batches."""
+        # Arrange
+        cloudwatch = FakeCloudWatch()
+        with patch("boto3.Session") as mock_session:
+            mock_session.return_value.client.return_value = cloudwatch
+            monitor = CloudWatchMonitor({"region": "us-west-2"}, client_pool=ClientPool())
+        clusters = [f"cluster-{i}" for i in range(80)]
+        metrics = [f"Metric{j}" for j in range(10)]
+        
+        # Act
+        fleet = monitor.get_fleet_metrics(
+            clusters, metrics, expressions={"Sum01": "Metric0 + Metric1"}
+        )
+        
+        # Assert
+        assert len(cloudwatch.calls) == 4  # 2 batches x 2 pages
+        assert set(fleet["cluster-3"]) == set(metrics) | {"Sum01"}
+        assert fleet["cluster-3"]["Sum01"].query.expression == "c3_m0 + c3_m1"
+        assert fleet["cluster-79"]["Metric9"].latest() is not None
+    
+    def test_invalid_batch_size(self):
+        """Test batch sizes above the API limit are rejected."""
+        with pytest.raises(ValueError):
+            MetricBatcher(FakeCloudWatch(), max_queries=501)
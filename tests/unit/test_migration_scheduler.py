@@ -0,0 +1,140 @@
+"""Unit tests for the migration wave scheduler."""
+
+import threading
+import time
+
+import pytest
+
+from vcf_evs.migration import Stage, WaveScheduler, read_vm_list
+from vcf_evs.utils.logger import current_log_context
+
+
+class ConcurrencyProbe:
+    """Stage function recording the peak number of concurrent callers."""
+    
+    def __init__(self, delay=0.02, bytes_per_vm=0, fail_for=None):
+        self.delay = delay
+        self.bytes_per_vm = bytes_per_vm
+        self.fail_for = fail_for or set()
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+    
+    def __call__(self, context):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            if context["vm_name"] in self.fail_for:
+                raise RuntimeError(f"boom {context['vm_name']}")
+            context["bytes_transferred"] += self.bytes_per_vm
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+class TestWaveScheduler:
+    """Test cases for WaveScheduler."""
+    
+    def test_stage_concurrency_limits(self):
+        """Test each stage respects its own concurrency limit."""
+        # Arrange
+        export = ConcurrencyProbe()
+        upload = ConcurrencyProbe(bytes_per_vm=1000)
+        scheduler = WaveScheduler(
+            [Stage("export", export, 4), Stage("upload", upload, 1)],
+            max_in_flight=6
+        )
+        
+        # Act
+        report = scheduler.run([f"vm-{i}" for i in range(12)])
+        
+        # Assert
+        assert len(report.succeeded) == 12
+        assert export.peak == 4
+        assert upload.peak == 1
+        assert report.total_bytes == 12000
+        assert report.throughput > 0
+        assert set(report.stage_totals()) == {"export", "upload"}
+    
+    def test_failures_are_isolated(self):
+        """Test a failing VM does not stop the rest of the wave."""
+        # Arrange
+        scheduler = WaveScheduler(
+            [Stage("snapshot", ConcurrencyProbe(0)), Stage("export", ConcurrencyProbe(0, fail_for={"vm-2"}))],
+            max_in_flight=3
+        )
+        
+        # Act
+        report = scheduler.run(["vm-1", "vm-2", "vm-3"], context={"target_cluster": "evs-1"})
+        
+        # Assert
+        assert [r.status for r in report.results] == ["success", "failed", "success"]
+        failed = report.failed[0]
+        assert failed.failed_stage == "export"
+        assert "boom vm-2" in failed.error
+        assert report.results[0].context["target_cluster"] == "evs-1"
+        assert report.summary()["failed"] == 1
+    
+    def test_vm_frees_slot_between_stages(self):
+        """Test VMs waiting for a throttled stage do not hold back earlier stages."""
+        # Arrange
+        vm_names = [f"vm-{i}" for i in range(6)]
+        exported = []
+        all_exported = threading.Event()
+        
+        def export(context):
+            exported.append(context["vm_name"])
+            if len(exported) == len(vm_names):
+                all_exported.set()
+        
+        def upload(context):
+            if not all_exported.wait(5):
+                raise RuntimeError("exports stalled behind upload")
+        
+        scheduler = WaveScheduler([Stage("export", export, 2), Stage("upload", upload, 1)], max_in_flight=3)
+        
+        # Act
+        report = scheduler.run(vm_names)
+        
+        # Assert
+        assert len(report.succeeded) == 6
+    
+    def test_stages_run_in_vm_log_context(self):
+        """Test every stage logs under its VM's correlation ID, whichever pool runs it."""
+        # Arrange
+        seen = []
+        
+        def record(context):
+            seen.append((context["vm_name"], current_log_context()["correlation_id"]))
+        
+        scheduler = WaveScheduler([Stage("export", record, 2), Stage("upload", record, 1)])
+        
+        # Act
+        report = scheduler.run(["vm-1", "vm-2"])
+        
+        # Assert
+        expected = {(r.vm_name, r.correlation_id) for r in report.results}
+        assert set(seen) == expected and len(seen) == 4
+    
+    def test_duplicate_vm_names_rejected(self):
+        """Test a wave naming the same VM twice is refused."""
+        scheduler = WaveScheduler([Stage("export", ConcurrencyProbe(0))])
+        with pytest.raises(ValueError, match="vm-1"):
+            scheduler.run(["vm-1", "vm-2", "vm-1"])
+    
+    def test_requires_stages(self):
+        """Test scheduler validation."""
+        # Act & Assert
+        with pytest.raises(ValueError):
+            WaveScheduler([])
+    
+    def test_read_vm_list(self, tmp_path):
+        """Test VM list files skip blanks and comments."""
+        # Arrange
+        vm_file = tmp_path / "wave1.txt"
+        vm_file.write_text("# wave 1\napp-01\n\napp-02  # db tier\n")
+        
+        # Act & Assert
+        assert read_vm_list(str(vm_file)) == ["app-01", "app-02"]
@@ -0,0 +1,78 @@
+"""Unit tests for the migration state store."""
+
+import pytest
+
+from vcf_evs.migration import MigrationStateStore, Stage, WaveScheduler
+
+
+class TestMigrationStateStore:
+    """Test cases for MigrationStateStore."""
+    
+    @pytest.fixture
+    def store(self, tmp_path):
+        """State store in a temporary directory."""
+        with MigrationStateStore(str(tmp_path / "state" / "migration.db")) as store:
+            yield store
+    
+    def test_checkpoints_survive_reopen(self, store, tmp_path):
+        """Test completed stages and artifacts are durable."""
+        # Arrange
+        store.begin("app-01", "evs-1")
+        store.mark_stage_complete("app-01", "snapshot", {"snapshot_id": "snapshot-7"})
+        store.record_multipart_upload("app-01", "app-01/disk-0.vmdk", "upload-abc")
+        
+        # Act
+        with MigrationStateStore(store.path) as reopened:
+            record = reopened.load("app-01")
+        
+        # Assert
+        assert record.status == "in_progress"
+        assert record.completed_stages == ["snapshot"]
+        assert record.snapshot_id == "snapshot-7"
+        assert record.multipart_uploads == {"app-01/disk-0.vmdk": "upload-abc"}
+    
+    def test_new_target_discards_progress_but_keeps_snapshot(self, store):
+        """Test switching target cluster restarts from scratch."""
+        # Arrange
+        store.begin("app-01", "evs-1")
+        store.mark_stage_complete("app-01", "snapshot", {"snapshot_id": "snapshot-7"})
+        store.mark_stage_complete("app-01", "export", {"ovf_path": "/tmp/app-01.ovf"})
+        
+        # Act
+        record = store.begin("app-01", "evs-2")
+        
+        # Assert
+        assert record.completed_stages == []
+        assert record.context == {"snapshot_id": "snapshot-7"}
+        assert store.find_snapshot_id("app-01") == "snapshot-7"
+    
+    def test_wave_resumes_after_failure(self, store):
+        """Test a restarted wave skips stages that already completed."""
+        # Arrange
+        calls = []
+        attempts = {"upload": 0}
+        
+        def snapshot(context):
+            calls.append(("snapshot", context["vm_name"]))
+            context["snapshot_id"] = f"snap-{context['vm_name']}"
+        
+        def upload(context):
+            calls.append(("upload", context["vm_name"]))
+            attempts["upload"] += 1
+            if attempts["upload"] == 1:
+                raise RuntimeError("connection reset")
+            context["bytes_transferred"] += 10
+        
+        stages = [Stage("snapshot", snapshot, 1), Stage("upload", upload, 1)]
+        
+        # Act
+        first = WaveScheduler(stages, state_store=store).run(["app-01"], {"target_cluster": "evs-1"})
+        second = WaveScheduler(stages, state_store=store).run(["app-01"], {"target_cluster": "evs-1"})
+        
+        # Assert
+        assert first.results[0].failed_stage == "upload"
+        assert store.load("app-01").status == "success"
+        assert second.results[0].status == "success"
+        assert second.results[0].resumed_stages == ["snapshot"]
+        assert second.results[0].context["snapshot_id"] == "snap-app-01"
+        assert calls == [("snapshot", "app-01"), ("upload", "app-01"), ("upload", "app-01")]
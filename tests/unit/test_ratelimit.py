@@ -0,0 +1,167 @@
+"""Unit tests for client-side rate limiting."""
+
+from unittest.mock import Mock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from vcf_evs.utils.ratelimit import RateLimiter, TokenBucket, is_throttle_error
+
+
+class FakeClock:
+    """Manually advanced clock whose sleep moves time forward."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def throttle_error():
+    return ClientError({"Error": {"Code": "ThrottlingException", "Message": "Rate exceeded"}}, "ListClusters")
+
+
+class TestTokenBucket:
+    """Test cases for TokenBucket."""
+
+    def test_burst_then_steady_rate(self):
+        """Test the burst is free and later calls are paced at the rate."""
+        # Arrange
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, burst=5, clock=clock, sleep=clock.sleep)
+
+        # Act
+        waits = [bucket.acquire() for _ in range(15)]
+
+        # Assert
+        assert waits[:5] == [0.0] * 5
+        assert clock.now == pytest.approx(1.0)
+        assert bucket.stats.delayed == 10
+        assert bucket.stats.wait_seconds == pytest.approx(sum(waits))
+
+    def test_aimd_adjusts_rate(self):
+        """Test throttles halve the rate once per cooldown and successes restore it."""
+        # Arrange
+        clock = FakeClock()
+        bucket = TokenBucket(rate=8, increase=1.0, clock=clock, sleep=clock.sleep)
+
+        # Act
+        bucket.on_throttle()
+        bucket.on_throttle()
+        halved = bucket.rate
+        clock.now += 2
+        bucket.on_throttle()
+        quartered = bucket.rate
+        for _ in range(10):
+            bucket.on_success()
+
+        # Assert
+        assert halved == 4
+        assert quartered == 2
+        assert bucket.rate == 8
+        assert bucket.stats.throttles == 3
+
+
+class TestRateLimiter:
+    """Test cases for RateLimiter."""
+
+    def test_call_retries_throttled_attempts(self):
+        """Test throttled calls are retried with backoff and cut the rate."""
+        # Arrange
+        sleeps = []
+        limiter = RateLimiter({"vcenter": {"rate": 50}}, max_retries=3, retry_delay=0.5, sleep=sleeps.append)
+        func = Mock(side_effect=[throttle_error(), throttle_error(), "ok"])
+
+        # Act
+        result = limiter.call("vcenter:vc01", func)
+
+        # Assert
+        assert result == "ok"
+        assert len(sleeps) == 2
+        assert 0 <= sleeps[1] <= 1.0
+        stats = limiter.stats()["vcenter:vc01"]
+        assert stats["throttles"] == 2
+        assert stats["retries"] == 2
+        assert stats["rate"] < 50
+
+    def test_call_gives_up_after_max_retries(self):
+        """Test the throttle error surfaces once retries are exhausted."""
+        # Arrange
+        limiter = RateLimiter(max_retries=1, sleep=lambda seconds: None)
+        func = Mock(side_effect=throttle_error())
+
+        # Act / Assert
+        with pytest.raises(ClientError):
+            limiter.call("evs:us-west-2", func)
+        assert func.call_count == 2
+
+    def test_other_errors_not_retried(self):
+        """Test non-throttling failures propagate immediately."""
+        # Arrange
+        limiter = RateLimiter(sleep=lambda seconds: None)
+        func = Mock(side_effect=KeyError("boom"))
+
+        # Act / Assert
+        with pytest.raises(KeyError):
+            limiter.call("evs:us-west-2", func)
+        assert func.call_count == 1
+
+    def test_configured_from_advanced_section(self):
+        """Test advanced settings select rates, retries and unlimited services."""
+        # Arrange
+        limiter = RateLimiter()
+
+        # Act
+        limiter.configure_from({
+            "max_retries": 7,
+            "retry_delay": 2,
+            "rate_limits": {"evs": {"rate": 2, "burst": 4}}
+        })
+
+        # Assert
+        assert limiter.max_retries == 7
+        assert limiter.retry_delay == 2
+        assert limiter.bucket("evs:eu-west-1").max_rate == 2
+        assert limiter.bucket("s3:eu-west-1") is None
+        assert limiter.bucket("vcenter:vc01") is None
+
+    def test_disabled_limiter_has_no_buckets(self):
+        """Test rate limiting can be switched off."""
+        limiter = RateLimiter()
+        limiter.configure_from({"rate_limits": {"enabled": False}})
+        assert limiter.bucket("evs:us-west-2") is None
+
+    def test_botocore_hooks_record_throttles(self):
+        """Test instrumented clients feed throttle responses into the bucket."""
+        # Arrange
+        limiter = RateLimiter()
+        client = Mock()
+        limiter.instrument_client(client, "ec2:us-west-2")
+        handlers = {call.args[0]: call.args[1] for call in client.meta.events.register.call_args_list}
+
+        # Act
+        handlers["before-send"](request=Mock())
+        handlers["needs-retry"](
+            response=(Mock(status_code=400), {"Error": {"Code": "RequestLimitExceeded"}}),
+            attempts=1
+        )
+
+        # Assert
+        stats = limiter.stats()["ec2:us-west-2"]
+        assert stats["acquired"] == 1
+        assert stats["throttles"] == 1
+        assert stats["rate"] == 10
+
+
+class TestThrottleDetection:
+    """Test cases for throttle error classification."""
+
+    def test_aws_and_http_throttles(self):
+        """Test AWS codes and HTTP 429/503 are recognised."""
+        assert is_throttle_error(throttle_error())
+        assert is_throttle_error(Mock(spec=["status"], status=503))
+        assert not is_throttle_error(ValueError("bad input"))
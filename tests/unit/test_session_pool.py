@@ -0,0 +1,301 @@
+"""Unit tests for the vCenter session pool."""
+
+import os
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+from pyVmomi import vim
+
+from vcf_evs.utils.instrumentation import Instrumentation
+from vcf_evs.utils.ratelimit import RateLimiter
+from vcf_evs.vmware import VCenterClient, VCenterSessionPool
+from tests.fake_vcenter import FakeServiceInstance, FakeVCenterStub
+
+CONFIG = {"vcenter_server": "vcenter.local", "username": "user", "password": "secret"}
+
+
+class FakeStub:
+    """SOAP stub whose calls can be made to fail with NotAuthenticated."""
+
+    def __init__(self, cookie):
+        self.cookie = cookie
+        self.expired = False
+        self.calls = []
+
+    def InvokeMethod(self, mo, info, args):
+        self.calls.append(info.wsdlName)
+        if self.expired and info.wsdlName != "Login":
+            self.expired = False
+            raise vim.fault.NotAuthenticated()
+        return "ok"
+
+
+class FakeSession:
+    """Service instance stand-in with a controllable health check."""
+
+    def __init__(self, cookie="vmware_soap_session=abc", current_session=True):
+        self._stub = FakeStub(cookie)
+        self.content = Mock()
+        self.content.sessionManager.currentSession = object() if current_session else None
+        self.alive = True
+        self.time_checks = 0
+
+    def RetrieveContent(self):
+        return self.content
+
+    def CurrentTime(self):
+        self.time_checks += 1
+        if not self.alive:
+            raise vim.fault.NotAuthenticated()
+        return "2026-01-01T00:00:00Z"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def no_logout():
+    with patch("vcf_evs.vmware.session_pool.Disconnect") as disconnect:
+        yield disconnect
+
+
+class TestVCenterSessionPool:
+    """Test cases for VCenterSessionPool."""
+
+    def test_sessions_reused(self, no_logout):
+        """Test released sessions are handed out again without logging in."""
+        # Arrange
+        connect = Mock(side_effect=lambda: FakeSession())
+        pool = VCenterSessionPool(CONFIG, size=2, connect=connect)
+
+        # Act
+        for _ in range(5):
+            with pool.session() as session:
+                assert session.content is not None
+
+        # Assert
+        assert connect.call_count == 1
+        assert pool.stats.reused == 4
+        assert len(pool) == 1
+
+    def test_pool_bounded_under_concurrency(self, no_logout):
+        """Test concurrent callers never open more than ``size`` sessions."""
+        # Arrange
+        connect = Mock(side_effect=lambda: FakeSession())
+        pool = VCenterSessionPool(CONFIG, size=3, connect=connect)
+        barrier = threading.Barrier(6)
+
+        def worker():
+            barrier.wait()
+            for _ in range(10):
+                with pool.session(timeout=5):
+                    pass
+
+        # Act
+        threads = [threading.Thread(target=worker) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Assert
+        assert connect.call_count <= 3
+        assert len(pool) <= 3
+
+    def test_acquire_times_out_when_exhausted(self, no_logout):
+        """Test waiting for a session fails after the timeout."""
+        # Arrange
+        pool = VCenterSessionPool(CONFIG, size=1, connect=lambda: FakeSession())
+        pool.acquire()
+
+        # Act / Assert
+        with pytest.raises(TimeoutError):
+            pool.acquire(timeout=0.05)
+
+    def test_session_released_when_block_raises(self, no_logout):
+        """Test an error inside the ``with`` block still returns the session."""
+        # Arrange
+        connect = Mock(side_effect=lambda: FakeSession())
+        pool = VCenterSessionPool(CONFIG, size=1, connect=connect)
+
+        # Act
+        with pytest.raises(ValueError):
+            with pool.session():
+                raise ValueError("VM not found: web-01")
+        session = pool.acquire(timeout=0.5)
+
+        # Assert
+        assert session is not None
+        assert connect.call_count == 1
+
+    def test_expired_idle_session_replaced(self, no_logout):
+        """Test an idle session failing CurrentTime is replaced by a new login."""
+        # Arrange
+        clock = FakeClock()
+        sessions = []
+
+        def connect():
+            sessions.append(FakeSession())
+            return sessions[-1]
+
+        pool = VCenterSessionPool(CONFIG, connect=connect, health_check_interval=60, clock=clock)
+        pool.release(pool.acquire())
+        sessions[0].alive = False
+        clock.now = 120
+
+        # Act
+        session = pool.acquire()
+
+        # Assert
+        assert session.service_instance is sessions[1]
+        assert pool.stats.health_checks == 1
+        assert sessions[0].time_checks == 1
+        no_logout.assert_called_once_with(sessions[0])
+
+    def test_expired_session_logs_in_again_transparently(self, no_logout):
+        """Test a call failing with NotAuthenticated re-logs in and is retried."""
+        # Arrange
+        fake = FakeSession()
+        pool = VCenterSessionPool(CONFIG, connect=lambda: fake)
+        session = pool.acquire()
+        fake._stub.expired = True
+
+        # Act
+        result = fake._stub.InvokeMethod(None, Mock(wsdlName="RetrievePropertiesEx"), [])
+
+        # Assert
+        assert result == "ok"
+        session.content.sessionManager.Login.assert_called_once_with("user", "secret")
+        assert pool.stats.reconnects == 1
+
+    def test_cookie_persisted_and_resumed(self, tmp_path, no_logout):
+        """Test a second process resumes the saved session instead of logging in."""
+        # Arrange
+        cookie_file = tmp_path / "session.json"
+        first = VCenterSessionPool(CONFIG, cookie_file=str(cookie_file), connect=lambda: FakeSession())
+        first.release(first.acquire())
+        first.close()
+
+        resume = Mock(side_effect=lambda cookie: FakeSession(cookie))
+        connect = Mock()
+        second = VCenterSessionPool(CONFIG, cookie_file=str(cookie_file), connect=connect, resume=resume)
+
+        # Act
+        session = second.acquire()
+
+        # Assert
+        assert os.stat(cookie_file).st_mode & 0o777 == 0o600
+        no_logout.assert_not_called()
+        resume.assert_called_once_with("vmware_soap_session=abc")
+        connect.assert_not_called()
+        assert session.persistent
+        assert second.stats.resumed == 1
+
+    def test_stale_cookie_falls_back_to_login(self, tmp_path, no_logout):
+        """Test a saved cookie for an expired session leads to a fresh login."""
+        # Arrange
+        cookie_file = tmp_path / "session.json"
+        first = VCenterSessionPool(CONFIG, cookie_file=str(cookie_file), connect=lambda: FakeSession())
+        first.acquire()
+        connect = Mock(side_effect=lambda: FakeSession("vmware_soap_session=new"))
+        second = VCenterSessionPool(
+            CONFIG,
+            cookie_file=str(cookie_file),
+            connect=connect,
+            resume=lambda cookie: FakeSession(cookie, current_session=False)
+        )
+
+        # Act
+        second.acquire()
+
+        # Assert
+        connect.assert_called_once()
+        assert "vmware_soap_session=new" in cookie_file.read_text()
+
+    def test_readable_cookie_ignored_and_replaced(self, tmp_path, no_logout):
+        """Test a cookie file others can read is not resumed and is rewritten privately."""
+        # Arrange
+        cookie_file = tmp_path / "session.json"
+        VCenterSessionPool(CONFIG, cookie_file=str(cookie_file), connect=lambda: FakeSession()).acquire()
+        os.chmod(cookie_file, 0o644)
+        resume = Mock()
+        second = VCenterSessionPool(
+            CONFIG, cookie_file=str(cookie_file),
+            connect=lambda: FakeSession("vmware_soap_session=new"), resume=resume
+        )
+
+        # Act
+        second.acquire()
+
+        # Assert
+        resume.assert_not_called()
+        assert os.stat(cookie_file).st_mode & 0o777 == 0o600
+        assert "vmware_soap_session=new" in cookie_file.read_text()
+
+    def test_cookie_for_other_server_ignored(self, tmp_path, no_logout):
+        """Test a saved cookie is only used for the same server and user."""
+        # Arrange
+        cookie_file = tmp_path / "session.json"
+        VCenterSessionPool(CONFIG, cookie_file=str(cookie_file), connect=lambda: FakeSession()).acquire()
+        resume = Mock()
+        other = VCenterSessionPool(
+            dict(CONFIG, username="other"), cookie_file=str(cookie_file),
+            connect=lambda: FakeSession(), resume=resume
+        )
+
+        # Act
+        other.acquire()
+
+        # Assert
+        resume.assert_not_called()
+
+
+class TestVCenterClientPooling:
+    """Test cases for VCenterClient with a session pool."""
+
+    def test_clients_share_pooled_session(self, no_logout):
+        """Test successive clients reuse one login and content retrieval."""
+        # Arrange
+        stub = FakeVCenterStub()
+        stub.add_vm("app-01", uuid="4201-uuid-01")
+        connect = Mock(side_effect=lambda: FakeServiceInstance(stub))
+        pool = VCenterSessionPool(CONFIG, connect=connect)
+
+        # Act
+        for _ in range(3):
+            with VCenterClient(CONFIG, session_pool=pool) as client:
+                assert client.get_vm_info("app-01")["uuid"] == "4201-uuid-01"
+
+        # Assert
+        assert connect.call_count == 1
+        assert pool.stats.reused == 2
+        no_logout.assert_not_called()
+
+    def test_pooled_session_rebound_to_each_client(self, no_logout):
+        """Test each client borrowing a pooled session uses its own limiter and instrumentation."""
+        # Arrange
+        stub = FakeVCenterStub()
+        stub.add_vm("app-01")
+        pool = VCenterSessionPool(CONFIG, connect=lambda: FakeServiceInstance(stub))
+        first, second = Instrumentation(), Instrumentation()
+        limiter = RateLimiter({"vcenter": {"rate": 1000}})
+
+        # Act
+        with VCenterClient(CONFIG, session_pool=pool, instrumentation=first,
+                           rate_limiter=RateLimiter(enabled=False)) as client:
+            client.list_vms()
+        calls_before = first.stats()["operations"]["vcenter.RetrievePropertiesEx"]["calls"]
+        with VCenterClient(CONFIG, session_pool=pool, instrumentation=second,
+                           rate_limiter=limiter) as client:
+            client.list_vms()
+
+        # Assert
+        assert first.stats()["operations"]["vcenter.RetrievePropertiesEx"]["calls"] == calls_before
+        assert second.stats()["operations"]["vcenter.RetrievePropertiesEx"]["calls"] >= 1
+        assert limiter.stats()["vcenter:vcenter.local"]["acquired"] >= 1
@@ -0,0 +1,174 @@
+"""Unit tests for the snapshot catalog."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from vcf_evs.vmware import SnapshotCatalog
+from tests.fake_vcenter import FakeVCenterStub
+
+NOW = datetime(2026, 6, 1, tzinfo=timezone.utc)
+DAY = 86400
+
+
+@pytest.fixture
+def stub():
+    """Fake vCenter with VMs carrying old and recent snapshots."""
+    stub = FakeVCenterStub()
+    for i in range(6):
+        vm = stub.add_vm(f"app-{i}")
+        base = stub.add_snapshot(vm, f"snapshot-app-{i}", NOW - timedelta(days=30 + i), size=2**30)
+        if i % 2 == 0:
+            stub.add_snapshot(vm, "nightly", NOW - timedelta(days=1), parent=base, size=2**20)
+    stub.add_vm("no-snapshots")
+    return stub
+
+
+@pytest.fixture
+def vcenter_config(vcenter_config):
+    """Small inventory pages so the catalog sweep spans several."""
+    return dict(vcenter_config, inventory_page_size=3)
+
+
+@pytest.fixture
+def catalog(vcenter_client):
+    """Catalog with a fixed clock."""
+    return SnapshotCatalog(vcenter_client.content, page_size=3, clock=lambda: NOW).refresh()
+
+
+def catalog_records(records, *names):
+    """Records with the given names."""
+    return [record for record in records if record.name in names]
+
+
+class TestSnapshotCatalog:
+    """Test cases for SnapshotCatalog."""
+
+    def test_refresh_uses_bulk_property_collection(self, catalog, stub):
+        """Test every snapshot tree is fetched without per-VM property reads."""
+        # Assert
+        assert len(catalog) == 9
+        assert stub.calls["RetrievePropertiesEx"] == 1
+        assert stub.calls["ContinueRetrievePropertiesEx"] == 2
+        assert stub.calls["get:snapshot"] == 0
+
+    def test_tree_flattened_with_sizes(self, catalog):
+        """Test parent links, depth and per-snapshot delta sizes."""
+        # Act
+        base, nightly = catalog.for_vm("app-0")
+
+        # Assert
+        assert base.name == "snapshot-app-0"
+        assert base.depth == 0 and base.children == 1
+        assert nightly.parent_moid == base.moid
+        assert nightly.depth == 1
+        assert base.size_bytes == 2**30
+        assert nightly.size_bytes == 2**20
+        assert catalog.get(nightly.moid) is nightly
+        assert len(catalog.by_name("nightly")) == 3
+
+    def test_find_by_prefix_and_age(self, catalog):
+        """Test filters combine and results come oldest first."""
+        # Act
+        old = catalog.find(name_prefix="snapshot-", older_than=31 * DAY)
+        large = catalog.find(min_size=2**30, vm_names=["app-1", "app-2"])
+
+        # Assert
+        assert [record.vm_name for record in old] == ["app-5", "app-4", "app-3", "app-2", "app-1"]
+        assert sorted(record.vm_name for record in large) == ["app-1", "app-2"]
+
+    def test_dry_run_removes_nothing(self, catalog, stub):
+        """Test a dry run only reports what would be removed."""
+        # Act
+        result = catalog.cleanup(catalog.find(name_prefix="snapshot-"))
+
+        # Assert
+        assert result.dry_run
+        assert len(result.planned) == 6
+        assert result.reclaimed_bytes == 6 * 2**30
+        assert stub.calls["RemoveSnapshot_Task"] == 0
+        assert len(catalog) == 9
+
+    def test_cleanup_bounded_and_serialized_per_vm(self, catalog, stub):
+        """Test removals run in bounded rounds, one task per VM at a time."""
+        # Arrange
+        records = catalog.find(vm_names=["app-0", "app-1", "app-2"])
+
+        # Act
+        result = catalog.cleanup(records, dry_run=False, max_in_flight=2)
+
+        # Assert
+        assert len(result.removed) == 5
+        assert not result.failed
+        assert stub.calls["RemoveSnapshot_Task"] == 5
+        assert stub.calls["CreatePropertyCollector"] == 3
+        removed = [call[1] for call in stub.snapshot_calls if call[0] == "remove"]
+        # Children are removed before their parents
+        for parent in catalog_records(records, "snapshot-app-0", "snapshot-app-2"):
+            child = next(record for record in records if record.parent_moid == parent.moid)
+            assert removed.index(child.moid) < removed.index(parent.moid)
+        assert len(catalog) == 4
+
+    def test_failed_removal_keeps_parent(self, catalog, stub):
+        """Test a VM's parent snapshot is not removed after its child failed."""
+        # Arrange
+        records = catalog.find(vm_names=["app-0", "app-1"])
+        (parent,) = catalog_records(records, "snapshot-app-0")
+        (child,) = catalog_records(records, "nightly")
+        stub.remove_errors[child.moid] = "Snapshot is locked"
+
+        # Act
+        result = catalog.cleanup(records, dry_run=False)
+
+        # Assert
+        assert result.failed[child.moid] == "Snapshot is locked"
+        assert "Skipped" in result.failed[parent.moid]
+        removed = [call[1] for call in stub.snapshot_calls if call[0] == "remove"]
+        assert parent.moid not in removed
+        assert [record.name for record in result.removed] == ["snapshot-app-1"]
+
+    def test_invalid_parallelism_rejected(self, catalog):
+        """Test max_in_flight must be positive."""
+        with pytest.raises(ValueError, match="max_in_flight"):
+            catalog.cleanup([], dry_run=False, max_in_flight=0)
+
+
+class TestVCenterClientSnapshots:
+    """Test cases for snapshot catalog use in VCenterClient."""
+
+    def test_revert_uses_loaded_catalog(self, vcenter_client, stub):
+        """Test reverting finds the snapshot in the catalog instead of reading the tree."""
+        # Arrange
+        catalog = vcenter_client.load_snapshot_catalog()
+        snapshot_id = catalog.by_name("snapshot-app-3")[0].moid
+        stub.reset()
+
+        # Act
+        assert vcenter_client.revert_to_snapshot("app-3", snapshot_id)
+
+        # Assert
+        assert stub.calls["get:snapshot"] == 0
+        assert ("revert", snapshot_id) in stub.snapshot_calls
+
+    def test_revert_without_catalog_walks_tree(self, vcenter_client, stub):
+        """Test snapshots are still found without a loaded catalog."""
+        # Arrange
+        vm_moid = next(moid for moid, props in stub.vms.items() if props["name"] == "app-4")
+        snapshot_id = stub.vms[vm_moid]["snapshot"].rootSnapshotList[0].childSnapshotList[0].snapshot._moId
+
+        # Act
+        assert vcenter_client.revert_to_snapshot("app-4", snapshot_id)
+
+        # Assert
+        assert ("revert", snapshot_id) in stub.snapshot_calls
+
+    def test_cleanup_snapshots_targets_migration_snapshots(self, vcenter_client, stub):
+        """Test the default cleanup selects only ``snapshot-<vm>`` snapshots."""
+        # Act
+        result = vcenter_client.cleanup_snapshots(dry_run=False)
+
+        # Assert
+        assert sorted(record.name for record in result.removed) == [
+            f"snapshot-app-{i}" for i in range(6)
+        ]
+        assert stub.calls["RemoveSnapshot_Task"] == 6
@@ -0,0 +1,113 @@
+"""Unit tests for group snapshots."""
+
+import pytest
+from unittest.mock import patch
+
+from vcf_evs.vmware import GroupSnapshotError, GroupSnapshotter
+from tests.fake_vcenter import FakeVCenterStub
+
+
+@pytest.fixture
+def stub():
+    """Fake vCenter with a three-tier application."""
+    stub = FakeVCenterStub()
+    for tier in ("web", "app", "db"):
+        for i in range(4):
+            stub.add_vm(f"{tier}-{i}")
+    return stub
+
+
+VMS = [f"{tier}-{i}" for tier in ("web", "app", "db") for i in range(4)]
+
+
+class TestGroupSnapshotter:
+    """Test cases for GroupSnapshotter."""
+
+    def test_group_snapshot_waits_on_one_filter(self, vcenter_client, stub):
+        """Test all members are snapshotted and awaited together."""
+        # Act
+        group = vcenter_client.create_group_snapshot(VMS, "pre-migration", name="app-stack")
+
+        # Assert
+        assert group.ok
+        assert sorted(group.snapshots) == sorted(VMS)
+        assert stub.calls["CreateSnapshot_Task"] == 12
+        assert stub.calls["CreatePropertyCollector"] == 1
+        assert stub.calls["get:info"] == 0
+        assert group.completion_skew >= 0
+        assert group.to_dict()["name"] == "app-stack"
+
+    def test_partial_failure_removes_created_snapshots(self, vcenter_client, stub):
+        """Test a failed member causes the other members' snapshots to be removed."""
+        # Arrange
+        stub.snapshot_errors["db-2"] = "Quiesce failed"
+
+        # Act
+        with pytest.raises(GroupSnapshotError) as exc_info:
+            GroupSnapshotter(vcenter_client).create(VMS, name="app-stack")
+
+        # Assert
+        group = exc_info.value.group
+        assert group.failures == {"db-2": "Quiesce failed"}
+        assert group.rolled_back
+        removed = [call[1] for call in stub.snapshot_calls if call[0] == "remove"]
+        assert sorted(removed) == sorted(group.snapshots.values())
+        assert len(removed) == 11
+
+    def test_timeout_cancels_pending_and_removes_created(self, vcenter_client, stub):
+        """Test a timed-out wait still removes the snapshots that were created."""
+        # Arrange
+        stub.task_steps = 0
+        wait_for_tasks = vcenter_client.wait_for_tasks
+        timed_out = []
+
+        def time_out_once(tasks, **kwargs):
+            if timed_out:
+                return wait_for_tasks(tasks, **kwargs)
+            timed_out.append(tasks[-1])
+            stub.tasks[tasks[-1]._moId].update(remaining=5, total=5)
+            raise TimeoutError("1 of 12 tasks did not finish within 60s")
+
+        # Act
+        with patch.object(vcenter_client, "wait_for_tasks", side_effect=time_out_once):
+            with pytest.raises(GroupSnapshotError) as exc_info:
+                GroupSnapshotter(vcenter_client, timeout=60).create(VMS, name="app-stack")
+
+        # Assert
+        group = exc_info.value.group
+        assert list(group.failures) == ["db-3"]
+        assert "did not finish" in group.failures["db-3"]
+        assert stub.tasks[timed_out[0]._moId]["cancelled"]
+        assert group.rolled_back
+        removed = [call[1] for call in stub.snapshot_calls if call[0] == "remove"]
+        assert len(removed) == 11
+
+    def test_unknown_vm_fails_before_snapshotting(self, vcenter_client, stub):
+        """Test a missing member is reported before any snapshot is taken."""
+        # Act
+        with pytest.raises(GroupSnapshotError, match="missing-vm"):
+            GroupSnapshotter(vcenter_client).create(["web-0", "missing-vm"])
+
+        # Assert
+        assert stub.calls["CreateSnapshot_Task"] == 0
+
+    def test_empty_group_rejected(self, vcenter_client, stub):
+        """Test a group without VMs is rejected before any vCenter call."""
+        with pytest.raises(ValueError, match="at least one VM"):
+            vcenter_client.create_group_snapshot([], "pre-migration")
+        assert stub.calls["CreateSnapshot_Task"] == 0
+
+    def test_revert_whole_group(self, vcenter_client, stub):
+        """Test every member is reverted to its own group snapshot."""
+        # Arrange
+        snapshotter = GroupSnapshotter(vcenter_client)
+        group = snapshotter.create(VMS)
+
+        # Act
+        outcomes = snapshotter.revert(group)
+
+        # Assert
+        reverted = [call[1] for call in stub.snapshot_calls if call[0] == "revert"]
+        assert sorted(reverted) == sorted(group.snapshots.values())
+        assert all(outcome.succeeded for outcome in outcomes.values())
+        assert group.rolled_back
@@ -0,0 +1,118 @@
+"""Unit tests for sparse-aware, compressed disk streams."""
+
+import os
+
+import pytest
+
+from vcf_evs.migration import ChunkIndex, ContentDefinedChunker, DedupUploader, SparseCodec, SparseStats
+from vcf_evs.migration.sparse import VMDK_SPARSE_MAGIC, decode, is_stream_optimized
+from vcf_evs.utils.streams import peek
+from tests.fake_s3 import FakeS3
+
+KIB = 1024
+MIB = 1024 * KIB
+
+
+def thin_disk():
+    """Disk image with data, a compressible region and a large hole."""
+    return (
+        os.urandom(2 * MIB)
+        + b"guest log line\n" * (MIB // 15)
+        + bytes(8 * MIB)
+        + os.urandom(MIB // 2)
+    )
+
+
+def pieces(data, size=300 * KIB):
+    """Split data the way an HTTP stream would deliver it."""
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+
+class TestSparseCodec:
+    """Test cases for SparseCodec."""
+    
+    def test_round_trip_skips_zero_blocks(self):
+        """Test encoded streams decode to the original bytes and skip holes."""
+        # Arrange
+        codec = SparseCodec()
+        data = thin_disk()
+        stats = SparseStats()
+        
+        # Act
+        encoded = b"".join(codec.encode(pieces(data), stats))
+        decoded = b"".join(decode(pieces(encoded, 77777)))
+        
+        # Assert
+        assert decoded == data
+        assert stats.raw_bytes == len(data)
+        assert stats.zero_bytes >= 7 * MIB
+        assert stats.compressed_blocks >= 1
+        assert stats.encoded_bytes == len(encoded)
+        assert len(encoded) < len(data) * 0.3
+    
+    def test_incompressible_blocks_stay_raw(self):
+        """Test blocks that do not compress are sent as-is."""
+        # Arrange
+        codec = SparseCodec()
+        stats = SparseStats()
+        
+        # Act
+        encoded = b"".join(codec.encode([os.urandom(3 * MIB)], stats))
+        
+        # Assert
+        assert stats.raw_blocks == 3
+        assert stats.compressed_blocks == 0
+        assert len(encoded) - 3 * MIB < 64
+    
+    def test_truncated_stream_rejected(self):
+        """Test a cut-off stream is not silently accepted."""
+        # Arrange
+        encoded = b"".join(SparseCodec().encode([b"abc" * MIB]))
+        
+        # Act & Assert
+        with pytest.raises(ValueError, match="Truncated"):
+            b"".join(decode([encoded[:-10]]))
+    
+    def test_stream_optimized_vmdk_detected(self):
+        """Test compressed VMDK exports are recognised from the stream head without losing bytes."""
+        # Arrange
+        chunks = [b"KD", b"MV\x01\x00\x00\x00", b"grains"]
+        
+        # Act
+        head, stream = peek(iter(chunks), len(VMDK_SPARSE_MAGIC))
+        
+        # Assert
+        assert is_stream_optimized(head)
+        assert b"".join(stream) == b"".join(chunks)
+        assert not is_stream_optimized(bytes(MIB)[:4])
+    
+    def test_unknown_compression_rejected(self):
+        """Test unsupported codecs are rejected up front."""
+        with pytest.raises(ValueError, match="Unknown compression"):
+            SparseCodec(compression="brotli")
+
+
+class TestSparseDedup:
+    """Test cases for sparse encoding of deduplicated chunks."""
+    
+    def test_chunks_stored_encoded(self, tmp_path):
+        """Test chunks are stored encoded and decoded on reassembly."""
+        # Arrange
+        s3 = FakeS3()
+        uploader = DedupUploader(
+            s3,
+            "migration",
+            ChunkIndex(str(tmp_path / "chunks.db")),
+            chunker=ContentDefinedChunker(min_size=64 * KIB, avg_size=256 * KIB, max_size=MIB),
+            codec=SparseCodec(block_size=MIB)
+        )
+        data = thin_disk()
+        
+        # Act
+        result = uploader.upload_stream("vm/disk.vmdk", pieces(data))
+        manifest = uploader.load_manifest(result.manifest_key)
+        
+        # Assert
+        assert manifest.encoding == "sparse"
+        assert result.uploaded_bytes < len(data) * 0.4
+        assert b"".join(uploader.iter_object(manifest)) == data
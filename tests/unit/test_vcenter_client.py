@@ -0,0 +1,128 @@
+"""Unit tests for vCenter Client."""
+
+import pytest
+from pyVmomi import vmodl
+
+from tests.fake_vcenter import FakeVCenterStub
+
+
+class TestVCenterClient:
+    """Test cases for vCenter Client."""
+    
+    @pytest.fixture
+    def stub(self):
+        """Fake vCenter with a small VM inventory."""
+        stub = FakeVCenterStub()
+        for i in range(50):
+            stub.add_vm(f"app-{i:02d}", uuid=f"4201-uuid-{i:02d}")
+        return stub
+    
+    def test_get_vm_info_uses_index(self, vcenter_client, stub):
+        """Test repeated lookups reuse one bulk inventory sweep."""
+        # Act
+        infos = [vcenter_client.get_vm_info(f"app-{i:02d}") for i in range(50)]
+        
+        # Assert
+        assert [info["name"] for info in infos] == [f"app-{i:02d}" for i in range(50)]
+        assert infos[7]["uuid"] == "4201-uuid-07"
+        assert stub.calls["RetrievePropertiesEx"] == 1
+        assert stub.calls["CreateContainerView"] == 1
+    
+    def test_get_vm_info_not_found(self, vcenter_client, stub):
+        """Test lookup of an unknown VM."""
+        # Act & Assert
+        with pytest.raises(Exception) as exc_info:
+            vcenter_client.get_vm_info("missing-vm")
+        
+        assert "VM not found" in str(exc_info.value)
+    
+    def test_create_snapshot_unknown_vm(self, vcenter_client, stub, caplog):
+        """Test snapshotting an unknown VM raises ValueError and logs the failure."""
+        with pytest.raises(ValueError, match="VM not found: missing-vm"):
+            vcenter_client.create_snapshot("missing-vm", "pre-migration")
+        assert "Failed to create snapshot for missing-vm" in caplog.text
+    
+    def test_index_refreshes_after_ttl(self, vcenter_client, stub):
+        """Test the index is rebuilt once its TTL has expired."""
+        # Arrange
+        now = [1000.0]
+        vcenter_client.vm_index._clock = lambda: now[0]
+        vcenter_client.get_vm_info("app-01")
+        
+        # Act
+        now[0] += vcenter_client.vm_index_ttl + 1
+        vcenter_client.get_vm_info("app-02")
+        
+        # Assert
+        assert stub.calls["RetrievePropertiesEx"] == 2
+    
+    def test_stale_entry_invalidated(self, vcenter_client, stub):
+        """Test entries for deleted VMs are evicted and re-resolved."""
+        # Arrange
+        vm = vcenter_client._find_vm_by_name("app-03")
+        stub.remove_vm(vm)
+        replacement = stub.add_vm("app-03")
+        
+        # Act
+        with pytest.raises(vmodl.fault.ManagedObjectNotFound):
+            vcenter_client.get_vm_info("app-03")
+        info = vcenter_client.get_vm_info("app-03")
+        
+        # Assert
+        assert info["vm_id"] == replacement._moId
+    
+    def test_find_vm_by_uuid_with_search_index(self, vcenter_client, stub):
+        """Test UUID lookup through SearchIndex.FindByUuid."""
+        # Arrange
+        vcenter_client.vm_index.lookup = "search_index"
+        
+        # Act
+        vm = vcenter_client.find_vm_by_uuid("4201-uuid-10")
+        
+        # Assert
+        assert vm._moId == "vm-11"
+        assert stub.calls["FindByUuid"] == 1
+        assert stub.calls["RetrievePropertiesEx"] == 0
+    
+    def test_create_snapshot_waits_on_filter(self, vcenter_client, stub):
+        """Test task completion is awaited through WaitForUpdatesEx, not polling."""
+        # Arrange
+        stub.task_steps = 50
+        
+        # Act
+        snapshot_id = vcenter_client.create_snapshot("app-01", "pre-migration")
+        
+        # Assert
+        assert snapshot_id.startswith("snapshot-")
+        assert stub.calls["get:info"] == 0
+        assert stub.calls["WaitForUpdatesEx"] == 51
+    
+    def test_wait_for_tasks_together(self, vcenter_client, stub):
+        """Test many tasks share one property filter and report progress."""
+        # Arrange
+        tasks = [stub.add_task(steps=i + 1) for i in range(10)]
+        progress = []
+        
+        # Act
+        outcomes = vcenter_client.wait_for_tasks(
+            tasks, on_progress=lambda task, pct: progress.append((task._moId, pct))
+        )
+        
+        # Assert
+        assert all(outcome.succeeded for outcome in outcomes)
+        assert stub.calls["CreateFilter"] == 1
+        assert stub.calls["WaitForUpdatesEx"] == 11
+        assert ("task-10", 100) in progress
+    
+    def test_wait_for_tasks_failure(self, vcenter_client, stub):
+        """Test a failed task raises after all tasks have finished."""
+        # Arrange
+        tasks = [stub.add_task(steps=1), stub.add_task(steps=2, error="Disk <locked>")]
+        
+        # Act & Assert
+        with pytest.raises(RuntimeError) as exc_info:
+            vcenter_client.wait_for_tasks(tasks)
+        
+        assert "Disk &lt;locked&gt;" in str(exc_info.value)
+        outcomes = vcenter_client.wait_for_tasks(tasks, raise_on_error=False)
+        assert [outcome.state for outcome in outcomes] == ["success", "error"]